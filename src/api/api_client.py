@@ -3,10 +3,13 @@ API客户端
 用于UI与后端API之间的通信
 """
 
+import json
 import requests
-from typing import Dict, Any, List, Optional
+from typing import Dict, Any, Iterator, List, Optional, Tuple
 import logging
 
+from src.api.task_event_subscriber import iter_sse
+
 logger = logging.getLogger(__name__)
 
 
@@ -55,6 +58,75 @@ class APIClient:
             logger.error(f"文本搜索失败: {e}")
             return {"status": "error", "error": str(e), "results": []}
 
+    def search_text_stream(
+        self, query: str, top_k: int = 20, threshold: float = None
+    ) -> Iterator[Dict[str, Any]]:
+        """
+        流式文本搜索（连接断开或出错时抛出异常）
+
+        Args:
+            query: 搜索查询
+            top_k: 返回结果数量
+            threshold: 相似度阈值
+
+        Yields:
+            搜索事件（results/hydrated/done/error）
+        """
+        data = {"query": query, "top_k": top_k}
+        if threshold is not None:
+            data["threshold"] = threshold
+
+        with self.session.post(
+            f"{self.base_url}/search/text/stream", json=data, stream=True, timeout=(5, 60)
+        ) as response:
+            response.raise_for_status()
+            for line in response.iter_lines(decode_unicode=True):
+                if line:
+                    yield json.loads(line)
+
+    def submit_feedback(
+        self, query_id: str, result_id: str, feedback: int
+    ) -> Dict[str, Any]:
+        """
+        提交搜索结果反馈
+
+        Args:
+            query_id: 搜索响应中的query_id
+            result_id: 结果的file_uuid
+            feedback: 反馈 (-1: 不相关, 0: 中性, 1: 相关)
+
+        Returns:
+            响应结果
+        """
+        try:
+            data = {"query_id": query_id, "result_id": result_id, "feedback": feedback}
+            response = self.session.post(f"{self.base_url}/search/feedback", json=data)
+            response.raise_for_status()
+            return response.json()
+        except Exception as e:
+            logger.error(f"提交反馈失败: {e}")
+            return {"success": False, "message": str(e)}
+
+    def refine_search(self, query_id: str, top_k: int = 20) -> Dict[str, Any]:
+        """
+        根据已提交的反馈精化搜索（在原搜索的候选集上重新排序）
+
+        Args:
+            query_id: 搜索响应中的query_id
+            top_k: 返回结果数量
+
+        Returns:
+            搜索结果
+        """
+        try:
+            data = {"query_id": query_id, "top_k": top_k}
+            response = self.session.post(f"{self.base_url}/search/refine", json=data)
+            response.raise_for_status()
+            return response.json()
+        except Exception as e:
+            logger.error(f"精化搜索失败: {e}")
+            return {"status": "error", "error": str(e), "results": []}
+
     def search_image(self, image_path: str, top_k: int = 20) -> Dict[str, Any]:
         """
         图像搜索
@@ -363,6 +435,34 @@ class APIClient:
             logger.error(f"获取任务列表失败: {e}")
             return []
 
+    def stream_events(
+        self, since: Optional[int] = None, stream_id: Optional[str] = None
+    ) -> Iterator[Tuple[str, Dict[str, Any], Optional[str]]]:
+        """
+        订阅任务事件流（连接断开或出错时抛出异常，由调用方重连）
+
+        Args:
+            since: 已收到的最后一个事件序号
+            stream_id: 事件流ID
+
+        Yields:
+            (事件类型, 事件数据, 事件ID)
+        """
+        params = {}
+        if since is not None:
+            params["since"] = since
+            params["stream_id"] = stream_id
+
+        with self.session.get(
+            f"{self.base_url}/events",
+            params=params,
+            stream=True,
+            # 读超时需大于服务端心跳间隔
+            timeout=(5, 60),
+        ) as response:
+            response.raise_for_status()
+            yield from iter_sse(response.iter_lines(decode_unicode=True))
+
     def get_task(self, task_id: str) -> Optional[Dict[str, Any]]:
         """
         获取单个任务
@@ -0,0 +1,170 @@
+"""
+任务事件订阅器
+客户端侧订阅 /api/v1/events，在本地维护任务列表，替代定时拉取全量任务
+"""
+
+import json
+import logging
+import threading
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+
+def iter_sse(lines: Iterable[str]) -> Iterator[Tuple[str, Dict[str, Any], Optional[str]]]:
+    """
+    解析Server-Sent Events文本流
+
+    Args:
+        lines: 按行迭代的响应内容
+
+    Yields:
+        (事件类型, 事件数据, 事件ID)
+    """
+    event_type, data_lines, event_id = "message", [], None
+    for line in lines:
+        if line is None:
+            continue
+        if not line:
+            if data_lines:
+                yield event_type, json.loads("\n".join(data_lines)), event_id
+            event_type, data_lines = "message", []
+            continue
+        if line.startswith(":"):
+            # 心跳注释
+            continue
+
+        field, _, value = line.partition(":")
+        if value.startswith(" "):
+            value = value[1:]
+        if field == "event":
+            event_type = value
+        elif field == "data":
+            data_lines.append(value)
+        elif field == "id":
+            event_id = value
+
+
+class TaskEventSubscriber:
+    """
+    任务事件订阅器
+
+    后台线程保持事件流连接：收到reset时调用snapshot_loader拉取一次全量任务，
+    之后只应用增量事件。断线后按上次的事件ID续传，失败时指数退避重连。
+    """
+
+    def __init__(
+        self,
+        stream_factory: Callable[..., Iterator[Tuple[str, Dict[str, Any], Optional[str]]]],
+        snapshot_loader: Callable[[], List[Dict[str, Any]]],
+        on_event: Optional[Callable[[str, Dict[str, Any]], None]] = None,
+        max_backoff: float = 30.0,
+    ):
+        """
+        初始化订阅器
+
+        Args:
+            stream_factory: 打开事件流，参数为since和stream_id，返回iter_sse格式的迭代器
+            snapshot_loader: 拉取全量任务列表
+            on_event: 每个事件应用后的回调（事件类型, 事件数据），reset时数据为空
+            max_backoff: 最大重连间隔（秒）
+        """
+        self.stream_factory = stream_factory
+        self.snapshot_loader = snapshot_loader
+        self.on_event = on_event
+        self.max_backoff = max_backoff
+
+        self._tasks: Dict[str, Dict[str, Any]] = {}
+        self._lock = threading.Lock()
+        self._stop_event = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+        self.stream_id: Optional[str] = None
+        self.last_seq: Optional[int] = None
+        self.connected = False
+
+    def start(self) -> None:
+        """启动后台订阅线程"""
+        if self._thread is not None and self._thread.is_alive():
+            return
+        self._stop_event.clear()
+        self._thread = threading.Thread(
+            target=self._run, daemon=True, name="task-event-subscriber"
+        )
+        self._thread.start()
+
+    def stop(self) -> None:
+        """停止订阅（当前连接在下一个事件或心跳时退出）"""
+        self._stop_event.set()
+
+    def get_tasks(self) -> List[Dict[str, Any]]:
+        """
+        获取本地维护的任务列表
+
+        Returns:
+            任务字典列表
+        """
+        with self._lock:
+            return [dict(task) for task in self._tasks.values()]
+
+    def _run(self) -> None:
+        backoff = 1.0
+        while not self._stop_event.is_set():
+            try:
+                stream = self.stream_factory(since=self.last_seq, stream_id=self.stream_id)
+                for event_type, data, event_id in stream:
+                    if not self.connected:
+                        self.connected = True
+                        backoff = 1.0
+                    self.apply(event_type, data, event_id)
+                    if self._stop_event.is_set():
+                        break
+            except Exception as e:
+                logger.debug(f"任务事件流断开: {e}")
+
+            self.connected = False
+            if self._stop_event.wait(backoff):
+                break
+            backoff = min(backoff * 2, self.max_backoff)
+
+    def apply(
+        self, event_type: str, data: Dict[str, Any], event_id: Optional[str] = None
+    ) -> None:
+        """
+        应用一个事件到本地任务列表
+
+        Args:
+            event_type: 事件类型
+            data: 事件数据
+            event_id: 事件ID（"<stream_id>-<seq>"）
+        """
+        if event_type == "reset":
+            tasks = self.snapshot_loader()
+            with self._lock:
+                self._tasks = {
+                    task.get("task_id") or task.get("id"): task for task in tasks
+                }
+                self.stream_id = data.get("stream_id")
+                self.last_seq = data.get("seq")
+        else:
+            task_id = data.get("task_id")
+            if task_id:
+                with self._lock:
+                    task = self._tasks.get(task_id)
+                    if task is None:
+                        task = self._tasks[task_id] = {"id": task_id}
+                    task.update(
+                        (key, value)
+                        for key, value in data.items()
+                        if key not in ("seq", "ts")
+                    )
+                    self.last_seq = data.get("seq", self.last_seq)
+
+        if event_id and self.stream_id is None:
+            self.stream_id = event_id.rpartition("-")[0]
+
+        if self.on_event is not None:
+            try:
+                self.on_event(event_type, data)
+            except Exception as e:
+                logger.error(f"任务事件回调执行失败: {e}")
@@ -5,15 +5,19 @@ API处理器
 
 import logging
 import asyncio
+import base64
+import json
 import time
 from datetime import datetime
-from typing import List, Dict, Any, Optional
+from typing import AsyncIterator, List, Dict, Any, Optional
 
 from .schemas import (
     TextSearchRequest,
     ImageSearchRequest,
     VideoSearchRequest,
     AudioSearchRequest,
+    SearchFeedbackRequest,
+    RefineSearchRequest,
     SearchResponse,
     SearchResultItem,
     ModalityType,
@@ -37,6 +41,38 @@ from .schemas import (
 
 logger = logging.getLogger(__name__)
 
+# 任务列表中总是返回的字段（TaskInfo的必填字段）
+TASK_CORE_FIELDS = ("task_id", "task_type", "status", "priority", "created_at")
+
+
+def _encode_cursor(values) -> str:
+    """将分页游标值编码为URL安全的字符串"""
+    raw = json.dumps(list(values), separators=(",", ":")).encode("utf-8")
+    return base64.urlsafe_b64encode(raw).decode("ascii").rstrip("=")
+
+
+def _decode_cursor(cursor: str) -> tuple:
+    """解析分页游标，格式错误时抛出ValueError"""
+    try:
+        raw = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4))
+        values = json.loads(raw)
+    except Exception:
+        raise ValueError(f"无效的分页游标: {cursor}")
+    if not isinstance(values, list) or len(values) != 2:
+        raise ValueError(f"无效的分页游标: {cursor}")
+    return tuple(values)
+
+
+def _parse_priority_ranges(priority: Optional[str]) -> Optional[List[tuple]]:
+    """解析优先级范围字符串，如 "1-3,8-10" """
+    if not priority:
+        return None
+    ranges = []
+    for part in priority.split(","):
+        low, high = part.split("-")
+        ranges.append((int(low), int(high)))
+    return ranges
+
 
 class APIHandlers:
     """API处理器类"""
@@ -96,44 +132,7 @@ class APIHandlers:
             results = search_response.get("results", [])
 
             # 转换结果格式
-            search_results = []
-            for result in results:
-                # 从modality推断file_type
-                modality = result.get("modality", "unknown")
-                file_type_map = {
-                    "image": "image",
-                    "video": "video",
-                    "audio": "audio",
-                    "text": "text",
-                }
-                file_type = file_type_map.get(modality, "unknown")
-
-                search_results.append(
-                    SearchResultItem(
-                        file_uuid=result.get("file_id", ""),
-                        file_path=result.get("file_path", ""),
-                        file_name=result.get("file_name", ""),
-                        file_type=file_type,
-                        score=result.get("similarity", 0.0),
-                        modality=(
-                            ModalityType(modality)
-                            if modality in ["image", "video", "audio", "text"]
-                            else ModalityType.TEXT
-                        ),
-                        thumbnail_path=result.get("thumbnail_path"),
-                        preview_path=result.get("preview_path"),
-                        metadata=result.get("metadata"),
-                        timestamp_info=(
-                            {
-                                "start_time": result.get("start_time", 0.0),
-                                "end_time": result.get("end_time", 0.0),
-                                "is_full_video": result.get("is_full_video", False),
-                            }
-                            if result.get("start_time") is not None
-                            else None
-                        ),
-                    )
-                )
+            search_results = [self._to_search_result_item(result) for result in results]
 
             return SearchResponse(
                 query=request.query,
@@ -141,12 +140,156 @@ class APIHandlers:
                 results=search_results,
                 search_time=search_time,
                 query_type=ModalityType.TEXT,
+                query_id=search_response.get("query_id"),
             )
 
         except Exception as e:
             logger.error(f"文本搜索失败: {e}")
             raise
 
+    async def handle_search_feedback(
+        self, request: SearchFeedbackRequest
+    ) -> SuccessResponse:
+        """
+        处理搜索结果反馈请求
+
+        Args:
+            request: 反馈请求
+
+        Returns:
+            成功响应
+        """
+        relevance_feedback = getattr(self.search_engine, "relevance_feedback", None)
+        if relevance_feedback is None:
+            raise ValueError("未启用相关性反馈")
+
+        await relevance_feedback.record_feedback(
+            query_id=request.query_id,
+            result_id=request.result_id,
+            user_feedback=request.feedback,
+            feedback_type=request.feedback_type,
+        )
+        return SuccessResponse(success=True, message="反馈已记录")
+
+    async def handle_search_refine(self, request: RefineSearchRequest) -> SearchResponse:
+        """
+        处理精化搜索请求
+
+        在原搜索缓存的候选集上按反馈重新打分，不重新执行向量检索。
+
+        Args:
+            request: 精化搜索请求
+
+        Returns:
+            搜索响应
+        """
+        search_response = await self.search_engine.refine_search(
+            request.query_id, k=request.top_k
+        )
+        if search_response.get("status") != "success":
+            raise LookupError(search_response.get("error", "精化搜索失败"))
+
+        results = search_response.get("results", [])
+        return SearchResponse(
+            query=search_response.get("query") or "",
+            total_results=len(results),
+            results=[self._to_search_result_item(result) for result in results],
+            search_time=search_response.get("search_time", 0.0),
+            query_type=ModalityType.TEXT,
+            query_id=request.query_id,
+        )
+
+    async def handle_text_search_stream(
+        self, request: TextSearchRequest
+    ) -> AsyncIterator[Dict[str, Any]]:
+        """
+        处理流式文本搜索请求
+
+        最快的模态返回后立即推送第一批结果，之后推送合并更新、缩略图路径，
+        最后发送done事件。
+
+        Args:
+            request: 文本搜索请求
+
+        Yields:
+            搜索事件字典（results事件中的结果为SearchResultItem格式）
+        """
+        async for event in self.search_engine.search_stream(
+            query=request.query,
+            k=request.top_k,
+            modalities=["image", "video", "audio", "text"],
+        ):
+            if event["event"] == "results":
+                event = dict(
+                    event,
+                    query=request.query,
+                    results=[
+                        self._to_search_result_item(result).model_dump(mode="json")
+                        for result in event["results"]
+                    ],
+                )
+            elif event["event"] == "hydrated":
+                # 与SearchResultItem一致，使用file_uuid标识文件
+                event = dict(
+                    event,
+                    paths=[
+                        {
+                            "file_uuid": item.get("file_id") or "",
+                            "thumbnail_path": item.get("thumbnail_path"),
+                            "preview_path": item.get("preview_path"),
+                        }
+                        for item in event["paths"]
+                    ],
+                )
+            yield event
+
+    @staticmethod
+    def _to_search_result_item(result: Dict[str, Any]) -> SearchResultItem:
+        """
+        将搜索引擎结果转换为SearchResultItem
+
+        Args:
+            result: 搜索引擎返回的结果
+
+        Returns:
+            SearchResultItem对象
+        """
+        # 从modality推断file_type
+        modality = result.get("modality", "unknown")
+        file_type_map = {
+            "image": "image",
+            "video": "video",
+            "audio": "audio",
+            "text": "text",
+        }
+        file_type = file_type_map.get(modality, "unknown")
+
+        return SearchResultItem(
+            file_uuid=result.get("file_id", ""),
+            file_path=result.get("file_path", ""),
+            file_name=result.get("file_name", ""),
+            file_type=file_type,
+            score=result.get("similarity", result.get("score", 0.0)),
+            modality=(
+                ModalityType(modality)
+                if modality in ["image", "video", "audio", "text"]
+                else ModalityType.TEXT
+            ),
+            thumbnail_path=result.get("thumbnail_path"),
+            preview_path=result.get("preview_path"),
+            metadata=result.get("metadata"),
+            timestamp_info=(
+                {
+                    "start_time": result.get("start_time", 0.0),
+                    "end_time": result.get("end_time", 0.0),
+                    "is_full_video": result.get("is_full_video", False),
+                }
+                if result.get("start_time") is not None
+                else None
+            ),
+            segments=result.get("segments") or None,
+        )
+
     async def handle_image_search(self, request: ImageSearchRequest) -> SearchResponse:
         """处理图像搜索请求"""
         try:
@@ -562,6 +705,9 @@ class APIHandlers:
         """
         处理文件列表请求
 
+        使用键集分页：响应中的next_cursor传回cursor参数获取下一页，
+        总数为带缓存的近似值。
+
         Args:
             request: 文件列表请求
 
@@ -569,13 +715,23 @@ class APIHandlers:
             文件列表响应
         """
         try:
-            # 从数据库获取文件列表
+            after = _decode_cursor(request.cursor) if request.cursor else None
+
+            # 多取一行用于判断是否还有下一页
             files_data = self.database_manager.list_files(
                 file_type=request.file_type,
                 indexed_only=request.indexed_only,
-                limit=request.limit,
+                limit=request.limit + 1,
+                sort_by=request.sort_by,
+                descending=request.order == "desc",
+                after=after,
                 offset=request.offset,
             )
+            next_cursor = None
+            if len(files_data) > request.limit:
+                files_data = files_data[: request.limit]
+                last = files_data[-1]
+                next_cursor = _encode_cursor((last[request.sort_by], last["id"]))
 
             # 转换为FileInfo对象
             files = []
@@ -588,13 +744,13 @@ class APIHandlers:
                         file_type=file_data.get("file_type", ""),
                         file_size=file_data.get("file_size", 0),
                         created_at=(
-                            datetime.fromisoformat(file_data["created_at"])
+                            datetime.fromtimestamp(file_data["created_at"])
                             if file_data.get("created_at")
                             else datetime.now()
                         ),
                         modified_at=(
-                            datetime.fromisoformat(file_data["modified_at"])
-                            if file_data.get("modified_at")
+                            datetime.fromtimestamp(file_data["updated_at"])
+                            if file_data.get("updated_at")
                             else datetime.now()
                         ),
                         indexed=file_data.get("indexed", False),
@@ -603,10 +759,17 @@ class APIHandlers:
                     )
                 )
 
-            # 获取总数
-            total_files = self.database_manager.get_total_files()
+            # 获取总数（带缓存的近似值）
+            total_files = self.database_manager.count_files(
+                file_type=request.file_type, indexed_only=request.indexed_only
+            )
 
-            return FilesListResponse(total_files=total_files, files=files)
+            return FilesListResponse(
+                total_files=total_files,
+                files=files,
+                next_cursor=next_cursor,
+                total_is_estimate=True,
+            )
 
         except Exception as e:
             logger.error(f"获取文件列表失败: {e}")
@@ -660,6 +823,9 @@ class APIHandlers:
         """
         处理任务列表请求
 
+        过滤、排序和分页在服务端完成，使用键集分页：响应中的next_cursor
+        传回cursor参数获取下一页。指定fields时只返回必填字段和所列字段。
+
         Args:
             request: 任务列表请求
 
@@ -667,70 +833,99 @@ class APIHandlers:
             任务列表响应
         """
         try:
-            # 获取任务列表 - 不传递limit和offset参数因为CentralTaskManager.list_tasks不支持
-            all_tasks = self.task_manager.list_tasks(
-                task_type=request.task_type,
-                status=request.status.value if request.status else None,
+            statuses = [status.value for status in request.statuses or []]
+            if request.status:
+                statuses.append(request.status.value)
+            task_types = list(request.task_types or [])
+            if request.task_type:
+                task_types.append(request.task_type)
+
+            after = _decode_cursor(request.cursor) if request.cursor else None
+            # 兼容偏移量分页：多取offset条后丢弃
+            skip = request.offset if after is None else 0
+
+            page = self.task_manager.query_tasks(
+                statuses=statuses or None,
+                task_types=task_types or None,
+                search=request.search,
+                priority_ranges=_parse_priority_ranges(request.priority),
+                created_after=request.created_after,
+                sort_by=request.sort_by,
+                descending=request.order == "desc",
+                after=after,
+                limit=request.limit + skip,
+                archived=request.archived,
             )
 
-            # 转换为TaskInfo对象
-            all_task_infos = []
-            for task in all_tasks:
-                # 确保task对象有必要的属性
-                if hasattr(task, 'to_dict'):
-                    task_dict = task.to_dict()
-                else:
-                    # 如果是字典格式，直接使用
-                    task_dict = task if isinstance(task, dict) else {}
-                
-                # 获取状态值
-                status_value = task_dict.get('status', getattr(task, 'status', 'pending'))
-                # 确保状态值是有效的TaskStatus
-                try:
-                    task_status = TaskStatus(status_value)
-                except ValueError:
-                    # 如果状态值无效，使用默认的pending状态
-                    task_status = TaskStatus.PENDING
-                
-                # 创建TaskInfo对象
-                # 从result中提取file_path（如果有）
-                result_data = task_dict.get('result', getattr(task, 'result', None)) or {}
-                file_path = result_data.get('file_path', '') if isinstance(result_data, dict) else ''
-                
-                # 使用 task_id 字段，因为现在 Task.to_dict() 同时包含 id 和 task_id
-                task_id = task_dict.get('task_id', getattr(task, 'task_id', task_dict.get('id', getattr(task, 'id', ''))))
-                
-                task_info = TaskInfo(
-                    task_id=task_id,
-                    task_type=task_dict.get('task_type', getattr(task, 'task_type', '')),
-                    status=task_status,
-                    priority=task_dict.get('priority', getattr(task, 'priority', 5)),
-                    created_at=task_dict.get('created_at', getattr(task, 'created_at', None)),
-                    started_at=task_dict.get('started_at', getattr(task, 'started_at', None)),
-                    completed_at=task_dict.get('completed_at', getattr(task, 'completed_at', None)),
-                    error_message=task_dict.get('error', getattr(task, 'error', None)),
-                    progress=task_dict.get('progress', getattr(task, 'progress', 0.0)),
-                    result=result_data,
-                    file_path=file_path,
-                    duration=task_dict.get('duration', getattr(task, 'duration', None)),
-                    tags=task_dict.get('tags', getattr(task, 'tags', None)) or [],
-                )
-                all_task_infos.append(task_info)
-
-            # 应用分页
-            total_tasks = len(all_task_infos)
-            
-            # 按offset和limit进行分页
-            start_index = request.offset
-            end_index = start_index + request.limit
-            paged_tasks = all_task_infos[start_index:end_index]
-
-            return TasksListResponse(total_tasks=total_tasks, tasks=paged_tasks)
+            fields = set(request.fields) if request.fields else None
+            tasks = [
+                self._to_task_info(task_dict, fields)
+                for task_dict in page["tasks"][skip:]
+            ]
+            next_cursor = page["next_cursor"]
+
+            return TasksListResponse(
+                total_tasks=page["total"],
+                tasks=tasks,
+                next_cursor=_encode_cursor(next_cursor) if next_cursor else None,
+                status_counts=page["status_counts"],
+            )
 
         except Exception as e:
             logger.error(f"获取任务列表失败: {e}")
             raise
 
+    @staticmethod
+    def _to_task_info(task_dict: Dict[str, Any], fields: Optional[set] = None) -> TaskInfo:
+        """
+        将任务字典转换为TaskInfo
+
+        Args:
+            task_dict: 任务字典
+            fields: 需要返回的可选字段，为None时返回全部字段
+
+        Returns:
+            TaskInfo对象（只设置了所需字段）
+        """
+        # 确保状态值是有效的TaskStatus，无效时使用pending
+        try:
+            task_status = TaskStatus(task_dict.get("status", "pending"))
+        except ValueError:
+            task_status = TaskStatus.PENDING
+
+        result_data = task_dict.get("result") or {}
+        started_at = task_dict.get("started_at")
+        completed_at = task_dict.get("completed_at")
+        duration = None
+        if started_at and completed_at:
+            duration = (
+                datetime.fromisoformat(completed_at) - datetime.fromisoformat(started_at)
+            ).total_seconds()
+
+        values = {
+            "task_id": task_dict.get("task_id") or task_dict.get("id", ""),
+            "task_type": task_dict.get("task_type", ""),
+            "status": task_status,
+            "priority": task_dict.get("priority", 5),
+            "created_at": task_dict.get("created_at"),
+            "started_at": started_at,
+            "completed_at": completed_at,
+            "error_message": task_dict.get("error"),
+            "progress": task_dict.get("progress", 0.0),
+            "result": result_data,
+            "file_path": task_dict.get("file_path")
+            or (result_data.get("file_path", "") if isinstance(result_data, dict) else ""),
+            "duration": duration,
+            "tags": task_dict.get("tags") or [],
+        }
+        if fields is not None:
+            values = {
+                key: value
+                for key, value in values.items()
+                if key in TASK_CORE_FIELDS or key in fields
+            }
+        return TaskInfo(**values)
+
     async def handle_task_status(self, task_id: str) -> TaskStatusResponse:
         """
         处理任务状态请求
@@ -1031,6 +1226,7 @@ class APIHandlers:
         """
         try:
             import psutil
+            from src.core.utils.resource_monitor import get_resource_sampler
 
             # 获取任务统计
             all_tasks = self.task_manager.list_tasks()
@@ -1038,13 +1234,13 @@ class APIHandlers:
             completed_tasks = [t for t in all_tasks if t.status.value == "completed"]
             failed_tasks = [t for t in all_tasks if t.status.value == "failed"]
 
-            # 获取内存使用
-            memory = psutil.virtual_memory()
+            # 获取内存使用（资源采样器的最新快照）
+            snapshot = get_resource_sampler().snapshot()
             memory_usage = {
-                "total_gb": memory.total / (1024**3),
-                "used_gb": memory.used / (1024**3),
-                "available_gb": memory.available / (1024**3),
-                "percent": memory.percent,
+                "total_gb": snapshot.memory_total_gb,
+                "used_gb": snapshot.memory_used_gb,
+                "available_gb": snapshot.memory_available_gb,
+                "percent": snapshot.memory_percent,
             }
 
             # 获取磁盘使用
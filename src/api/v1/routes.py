@@ -3,21 +3,27 @@ API路由定义
 定义所有API端点
 """
 
-from fastapi import APIRouter, HTTPException, Depends, Form, UploadFile, File
-from typing import Optional
+from fastapi import APIRouter, HTTPException, Depends, Form, UploadFile, File, Request, Response
+from typing import List, Optional
 
 from .schemas import (
     TextSearchRequest,
     ImageSearchRequest,
     VideoSearchRequest,
     AudioSearchRequest,
+    SearchFeedbackRequest,
+    RefineSearchRequest,
     SearchResponse,
     IndexAddRequest,
     IndexRemoveRequest,
     IndexStatusResponse,
+    VectorMigrationRequest,
     FilesListRequest,
     FilesListResponse,
     FileInfo,
+    ThumbnailBatchRequest,
+    ThumbnailBatchItem,
+    ThumbnailBatchResponse,
     TasksListRequest,
     TasksListResponse,
     TaskStatusResponse,
@@ -87,6 +93,66 @@ async def search_text(
         raise HTTPException(status_code=500, detail=str(e))
 
 
+@router.post("/search/feedback", response_model=SuccessResponse)
+async def search_feedback(
+    request: SearchFeedbackRequest, handlers: APIHandlers = Depends(get_handlers)
+):
+    """
+    搜索结果反馈
+
+    记录用户对某次搜索结果的相关性反馈，反馈持久化保存，并用于之后相同查询的排序
+    """
+    try:
+        return await handlers.handle_search_feedback(request)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=str(e))
+
+
+@router.post("/search/refine", response_model=SearchResponse)
+async def search_refine(
+    request: RefineSearchRequest, handlers: APIHandlers = Depends(get_handlers)
+):
+    """
+    根据反馈精化搜索
+
+    按已记录的反馈更新查询向量，在原搜索的候选集上重新排序
+    """
+    try:
+        return await handlers.handle_search_refine(request)
+    except LookupError as e:
+        raise HTTPException(status_code=404, detail=str(e))
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=str(e))
+
+
+@router.post("/search/text/stream")
+async def search_text_stream(
+    request: TextSearchRequest, handlers: APIHandlers = Depends(get_handlers)
+):
+    """
+    流式文本搜索（NDJSON）
+
+    每行一个JSON事件：results（当前合并后的结果，最快的模态返回即推送，
+    pending为尚未返回的模态）、hydrated（缩略图和预览路径）、done（结束），
+    出错时为error。
+    """
+    import json
+
+    from fastapi.responses import StreamingResponse
+
+    async def _generate():
+        async for event in handlers.handle_text_search_stream(request):
+            yield json.dumps(event, ensure_ascii=False, default=str) + "\n"
+
+    return StreamingResponse(
+        _generate(),
+        media_type="application/x-ndjson",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
+
+
 @router.post("/search/image", response_model=SearchResponse)
 async def search_image(
     file: Optional[UploadFile] = File(None),
@@ -289,33 +355,29 @@ async def list_files(
     indexed_only: bool = False,
     limit: int = 100,
     offset: int = 0,
+    cursor: Optional[str] = None,
+    sort_by: str = "created_at",
+    order: str = "desc",
     handlers: APIHandlers = Depends(get_handlers),
 ):
     """
     获取文件列表
 
-    获取系统中所有文件的列表
+    获取系统中所有文件的列表，使用next_cursor翻页
     """
     try:
         request = FilesListRequest(
-            file_type=file_type, indexed_only=indexed_only, limit=limit, offset=offset
+            file_type=file_type,
+            indexed_only=indexed_only,
+            limit=limit,
+            offset=offset,
+            cursor=cursor,
+            sort_by=sort_by,
+            order=order,
         )
         return await handlers.handle_files_list(request)
-    except Exception as e:
-        raise HTTPException(status_code=500, detail=str(e))
-
-
-@router.get("/files/{file_uuid}", response_model=FileInfo)
-async def get_file_info(file_uuid: str, handlers: APIHandlers = Depends(get_handlers)):
-    """
-    获取文件信息
-
-    获取指定文件的详细信息
-    """
-    try:
-        return await handlers.handle_file_info(file_uuid)
     except ValueError as e:
-        raise HTTPException(status_code=404, detail=str(e))
+        raise HTTPException(status_code=400, detail=str(e))
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
@@ -355,51 +417,127 @@ async def upload_file(
         raise HTTPException(status_code=500, detail=str(e))
 
 
+# 带版本令牌的URL内容不会变化，可被客户端永久缓存
+_IMMUTABLE_CACHE_CONTROL = "public, max-age=31536000, immutable"
+_REVALIDATE_CACHE_CONTROL = "no-cache"
+
+# 预览图默认尺寸
+_PREVIEW_SIZE = 1024
+
+
+def get_thumbnail_service():
+    """获取缩略图服务（与索引阶段的预渲染共用同一个实例）"""
+    from src.services.media.thumbnail_service import get_thumbnail_service as get_service
+
+    config = {}
+    if _api_server_instance is not None and _api_server_instance.config is not None:
+        config = _api_server_instance.config.config
+    return get_service(config)
+
+
+def _etag_matches(if_none_match: Optional[str], etag: str) -> bool:
+    """判断If-None-Match是否命中当前ETag"""
+    if not if_none_match:
+        return False
+    for candidate in if_none_match.split(","):
+        candidate = candidate.strip()
+        if candidate == "*":
+            return True
+        if candidate.startswith("W/"):
+            candidate = candidate[2:]
+        if candidate.strip('"') == etag:
+            return True
+    return False
+
+
+def _thumbnail_url(path: str, size: int, version: str) -> str:
+    from urllib.parse import urlencode
+
+    return "/api/v1/files/thumbnail?" + urlencode({"path": path, "size": size, "v": version})
+
+
+def _thumbnail_response(request: Request, thumbnail, version: Optional[str]) -> Response:
+    """
+    构造缩略图响应
+
+    请求携带的版本令牌与当前一致时返回immutable，否则要求客户端每次校验ETag
+    """
+    from fastapi.responses import FileResponse
+
+    headers = {
+        "ETag": f'"{thumbnail.etag}"',
+        "Cache-Control": (
+            _IMMUTABLE_CACHE_CONTROL
+            if version == thumbnail.version
+            else _REVALIDATE_CACHE_CONTROL
+        ),
+    }
+
+    if _etag_matches(request.headers.get("if-none-match"), thumbnail.etag):
+        return Response(status_code=304, headers=headers)
+
+    if thumbnail.path is not None:
+        return FileResponse(thumbnail.path, media_type=thumbnail.media_type, headers=headers)
+    return Response(content=thumbnail.data, media_type=thumbnail.media_type, headers=headers)
+
+
 @router.get("/files/preview")
-async def get_file_preview(path: str, handlers: APIHandlers = Depends(get_handlers)):
+async def get_file_preview(
+    request: Request,
+    path: str,
+    size: Optional[int] = None,
+    v: Optional[str] = None,
+):
     """
     获取文件预览
 
-    返回文件的预览内容（图像、视频缩略图等）
+    图像未指定尺寸时返回原图，视频未指定尺寸且已预渲染预览片段时返回片段，
+    其余情况返回按需渲染的预览图（视频帧、音频波形）
     """
     try:
+        import asyncio
         from fastapi.responses import FileResponse
         from pathlib import Path
 
         file_path = Path(path)
+        service = get_thumbnail_service()
+        kind = service.media_kind(path)
 
-        if not file_path.exists():
-            raise HTTPException(status_code=404, detail="文件不存在")
-
-        # 如果是图像文件，直接返回
-        if file_path.suffix.lower() in [
-            ".jpg",
-            ".jpeg",
-            ".png",
-            ".gif",
-            ".bmp",
-            ".webp",
-        ]:
-            return FileResponse(file_path, media_type=f"image/{file_path.suffix[1:]}")
-
-        # 如果是视频文件，返回预览图
-        elif file_path.suffix.lower() in [".mp4", ".avi", ".mov", ".mkv", ".flv"]:
-            # 查找对应的缩略图
-            thumbnail_path = handlers.database_manager.get_thumbnail_by_path(
-                str(file_path)
-            )
-            if thumbnail_path and Path(thumbnail_path).exists():
-                return FileResponse(thumbnail_path, media_type="image/jpeg")
-            else:
-                raise HTTPException(status_code=404, detail="预览图不存在")
+        if kind is None:
+            raise HTTPException(status_code=400, detail="不支持的文件类型")
 
-        # 如果是音频文件，返回音频可视化
-        elif file_path.suffix.lower() in [".mp3", ".wav", ".flac", ".aac", ".ogg"]:
-            # 返回音频波形图
-            return {"error": "音频预览功能开发中"}
+        if kind == "image" and size is None:
+            # 原图以文件版本令牌作为ETag
+            version = service.get_version(path, 0)
+            if version is None:
+                raise HTTPException(status_code=404, detail="文件不存在")
+            headers = {
+                "ETag": f'"{version}"',
+                "Cache-Control": (
+                    _IMMUTABLE_CACHE_CONTROL if v == version else _REVALIDATE_CACHE_CONTROL
+                ),
+            }
+            if _etag_matches(request.headers.get("if-none-match"), version):
+                return Response(status_code=304, headers=headers)
+            return FileResponse(
+                file_path, media_type=f"image/{file_path.suffix[1:].lower()}", headers=headers
+            )
 
-        else:
-            raise HTTPException(status_code=400, detail="不支持的文件类型")
+        if kind == "video" and size is None:
+            clip = service.get_preview(path)
+            if clip is not None:
+                return FileResponse(
+                    clip,
+                    media_type=f"video/{clip.suffix[1:]}",
+                    headers={"Cache-Control": _REVALIDATE_CACHE_CONTROL},
+                )
+
+        thumbnail = await asyncio.to_thread(
+            service.get_thumbnail, path, size or _PREVIEW_SIZE
+        )
+        if thumbnail is None:
+            raise HTTPException(status_code=404, detail="预览图不存在")
+        return _thumbnail_response(request, thumbnail, v)
 
     except HTTPException:
         raise
@@ -408,22 +546,27 @@ async def get_file_preview(path: str, handlers: APIHandlers = Depends(get_handle
 
 
 @router.get("/files/thumbnail")
-async def get_file_thumbnail(path: str, handlers: APIHandlers = Depends(get_handlers)):
+async def get_file_thumbnail(
+    request: Request,
+    path: str,
+    size: Optional[int] = None,
+    v: Optional[str] = None,
+):
     """
     获取文件缩略图
 
-    返回文件的缩略图
+    首次访问时按请求尺寸渲染并写入缓存，之后直接返回缓存的数据块。
+    支持If-None-Match，携带当前版本令牌v的请求可被永久缓存。
     """
     try:
-        from fastapi.responses import FileResponse
-        from pathlib import Path
+        import asyncio
 
-        thumbnail_path = Path(path)
-
-        if not thumbnail_path.exists():
+        thumbnail = await asyncio.to_thread(
+            get_thumbnail_service().get_thumbnail, path, size
+        )
+        if thumbnail is None:
             raise HTTPException(status_code=404, detail="缩略图不存在")
-
-        return FileResponse(thumbnail_path, media_type="image/jpeg")
+        return _thumbnail_response(request, thumbnail, v)
 
     except HTTPException:
         raise
@@ -431,32 +574,119 @@ async def get_file_thumbnail(path: str, handlers: APIHandlers = Depends(get_hand
         raise HTTPException(status_code=500, detail=str(e))
 
 
+@router.post("/files/thumbnails", response_model=ThumbnailBatchResponse)
+async def get_file_thumbnails(request: ThumbnailBatchRequest):
+    """
+    批量获取缩略图
+
+    一次请求返回一组文件的缩略图（默认内联base64数据），结果网格只需一次往返。
+    known_etags中ETag未变化的文件只返回not_modified标记。
+    """
+    try:
+        import asyncio
+        import base64
+
+        thumbnails = await asyncio.to_thread(
+            get_thumbnail_service().get_thumbnails, request.paths, request.size
+        )
+
+        items = []
+        for path in request.paths:
+            thumbnail = thumbnails.get(path)
+            if thumbnail is None:
+                items.append(ThumbnailBatchItem(path=path, found=False))
+                continue
+
+            not_modified = request.known_etags.get(path, "").strip('"') == thumbnail.etag
+            data = None
+            if request.inline and not not_modified:
+                raw = thumbnail.data
+                if raw is None:
+                    raw = await asyncio.to_thread(thumbnail.path.read_bytes)
+                data = base64.b64encode(raw).decode("ascii")
+
+            items.append(
+                ThumbnailBatchItem(
+                    path=path,
+                    found=True,
+                    url=_thumbnail_url(path, thumbnail.size, thumbnail.version),
+                    etag=thumbnail.etag,
+                    version=thumbnail.version,
+                    media_type=thumbnail.media_type,
+                    not_modified=not_modified,
+                    data=data,
+                )
+            )
+
+        return ThumbnailBatchResponse(items=items)
+
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=str(e))
+
+
+@router.get("/files/{file_uuid}", response_model=FileInfo)
+async def get_file_info(file_uuid: str, handlers: APIHandlers = Depends(get_handlers)):
+    """
+    获取文件信息
+
+    获取指定文件的详细信息
+    """
+    try:
+        return await handlers.handle_file_info(file_uuid)
+    except ValueError as e:
+        raise HTTPException(status_code=404, detail=str(e))
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=str(e))
+
+
 # ==================== 任务管理端点 ====================
 
 
-@router.get("/tasks", response_model=TasksListResponse)
+@router.get(
+    "/tasks", response_model=TasksListResponse, response_model_exclude_unset=True
+)
 async def list_tasks(
     task_type: Optional[str] = None,
     status: Optional[str] = None,
     limit: int = 100,
     offset: int = 0,
+    search: Optional[str] = None,
+    priority: Optional[str] = None,
+    created_after: Optional[float] = None,
+    sort_by: str = "created_at",
+    order: str = "desc",
+    cursor: Optional[str] = None,
+    fields: Optional[str] = None,
+    archived: bool = False,
     handlers: APIHandlers = Depends(get_handlers),
 ):
     """
     获取任务列表
 
-    获取系统中所有任务的列表
+    获取系统中的任务列表，过滤、排序和分页在服务端完成。
+    task_type、status 和 fields 可用逗号分隔多个值，使用next_cursor翻页。
     """
     try:
-        from .schemas import TaskStatus as TaskStatusEnum
-        
+        def split(value: Optional[str]) -> Optional[List[str]]:
+            return [item for item in value.split(",") if item] if value else None
+
         request = TasksListRequest(
-            task_type=task_type,
-            status=TaskStatusEnum(status) if status else None,
+            task_types=split(task_type),
+            statuses=split(status),
             limit=limit,
             offset=offset,
+            search=search,
+            priority=priority,
+            created_after=created_after,
+            sort_by=sort_by,
+            order=order,
+            cursor=cursor,
+            fields=split(fields),
+            archived=archived,
         )
         return await handlers.handle_tasks_list(request)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
@@ -529,12 +759,13 @@ async def get_task_stats(handlers: APIHandlers = Depends(get_handlers)):
 
         # 获取资源使用
         try:
-            import psutil
+            from src.core.utils.resource_monitor import get_resource_sampler
 
+            snapshot = get_resource_sampler().snapshot()
             resource_usage = {
-                "cpu_percent": psutil.cpu_percent(),
-                "memory_percent": psutil.virtual_memory().percent,
-                "gpu_percent": 0.0,  # 简化处理
+                "cpu_percent": snapshot.cpu_percent,
+                "memory_percent": snapshot.memory_percent,
+                "gpu_percent": snapshot.gpu_percent or 0.0,
             }
         except:
             resource_usage = {
@@ -790,6 +1021,120 @@ async def archive_task(task_id: str, handlers: APIHandlers = Depends(get_handler
         raise HTTPException(status_code=500, detail=str(e))
 
 
+# ==================== 事件推送端点 ====================
+
+# 没有新事件时发送心跳的间隔（秒）
+_EVENT_KEEPALIVE_INTERVAL = 15.0
+
+_event_stream = None
+
+
+def get_event_stream():
+    """获取任务事件流（首次调用时订阅任务监控器）"""
+    global _event_stream
+    if _event_stream is None:
+        from src.core.task.task_event_stream import TaskEventStream
+
+        _event_stream = TaskEventStream()
+        task_manager = getattr(_api_server_instance, "task_manager", None)
+        task_monitor = getattr(task_manager, "task_monitor", None)
+        if task_monitor is not None:
+            _event_stream.attach(task_monitor)
+    return _event_stream
+
+
+def _format_sse(event_type: str, data: dict, event_id: Optional[str] = None) -> str:
+    """格式化为Server-Sent Events消息"""
+    import json
+
+    lines = []
+    if event_id is not None:
+        lines.append(f"id: {event_id}")
+    lines.append(f"event: {event_type}")
+    lines.append(f"data: {json.dumps(data, ensure_ascii=False, default=str)}")
+    return "\n".join(lines) + "\n\n"
+
+
+def _parse_event_id(event_id: Optional[str]) -> tuple:
+    """解析 "<stream_id>-<seq>" 形式的事件ID"""
+    if not event_id:
+        return None, None
+    stream_id, _, seq = event_id.rpartition("-")
+    try:
+        return stream_id, int(seq)
+    except ValueError:
+        return None, None
+
+
+@router.get("/events")
+async def stream_events(
+    request: Request,
+    since: Optional[int] = None,
+    stream_id: Optional[str] = None,
+):
+    """
+    任务事件流（Server-Sent Events）
+
+    推送任务的增量事件（created/started/progress/completed/failed/cancelled），
+    同一任务的进度事件在服务端合并。事件ID为 "<stream_id>-<seq>"，断线重连时
+    浏览器会通过Last-Event-ID自动续传，也可以用since/stream_id参数指定。
+    无法续传（首次连接、服务重启或序号已过期）时先发送reset事件，客户端应
+    重新拉取一次全量任务列表。
+    """
+    from fastapi.responses import StreamingResponse
+
+    stream = get_event_stream()
+
+    last_stream_id, last_seq = _parse_event_id(request.headers.get("last-event-id"))
+    if since is None:
+        since, stream_id = last_seq, last_stream_id
+
+    async def _generate():
+        cursor = since
+        if cursor is None or stream_id != stream.stream_id:
+            cursor = stream.last_seq
+            yield _format_sse(
+                "reset",
+                {"stream_id": stream.stream_id, "seq": cursor},
+                f"{stream.stream_id}-{cursor}",
+            )
+
+        while not await request.is_disconnected():
+            events, reset = stream.read(cursor)
+            if reset:
+                cursor = stream.last_seq
+                yield _format_sse(
+                    "reset",
+                    {"stream_id": stream.stream_id, "seq": cursor},
+                    f"{stream.stream_id}-{cursor}",
+                )
+                continue
+
+            for event in events:
+                cursor = event["seq"]
+                payload = dict(event["data"], seq=cursor, ts=event["ts"])
+                yield _format_sse(event["type"], payload, f"{stream.stream_id}-{cursor}")
+
+            if not events and not await stream.wait(cursor, _EVENT_KEEPALIVE_INTERVAL):
+                yield ": keepalive\n\n"
+
+    return StreamingResponse(
+        _generate(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
+
+
+@router.get("/events/stats")
+async def get_event_stats():
+    """
+    获取事件流统计
+
+    返回最新序号、缓冲事件数、订阅者数和合并的进度事件数
+    """
+    return get_event_stream().get_stats()
+
+
 # ==================== 向量存储端点 ====================
 
 
@@ -828,6 +1173,60 @@ async def get_vector_stats(handlers: APIHandlers = Depends(get_handlers)):
         raise HTTPException(status_code=500, detail=str(e))
 
 
+def get_vector_migration():
+    """获取向量迁移服务（首次使用时创建，与APIServer实例绑定）"""
+    if _api_server_instance is None:
+        raise RuntimeError("APIServer实例未设置，请先调用set_api_server_instance()")
+
+    migration = getattr(_api_server_instance, "vector_migration", None)
+    if migration is None:
+        from src.services.migration import ReembeddingMigration
+
+        config_manager = _api_server_instance.config
+        migration = ReembeddingMigration(
+            vector_store=_api_server_instance.vector_store,
+            embedding_engine=_api_server_instance.embedding_engine,
+            db_manager=_api_server_instance.database_manager,
+            config=getattr(config_manager, "config", config_manager),
+            audio_vector_store=getattr(_api_server_instance, "audio_vector_store", None),
+        )
+        _api_server_instance.vector_migration = migration
+    return migration
+
+
+@router.post("/vector/migrate")
+async def start_vector_migration(request: VectorMigrationRequest):
+    """
+    启动向量迁移
+
+    在后台用目标模型重新向量化当前表中的条目，写入模型专用的新表；
+    迁移期间检索继续使用旧表，覆盖率达标后切换
+    """
+    migration = get_vector_migration()
+    try:
+        status = migration.start(request.target_model)
+        return {"success": True, "message": "向量迁移已启动", "result": status}
+    except RuntimeError as e:
+        raise HTTPException(status_code=409, detail=str(e))
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=str(e))
+
+
+@router.get("/vector/migration")
+async def get_vector_migration_status():
+    """
+    获取向量迁移状态
+
+    包括条目数、已迁移数、复用的向量化结果数、跳过数和覆盖率
+    """
+    try:
+        return get_vector_migration().get_status()
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=str(e))
+
+
 # ==================== 系统信息端点 ====================
 
 
@@ -865,6 +1264,33 @@ async def health_check():
     """
     健康检查
 
-    检查API服务是否正常运行
+    检查API服务是否正常运行。服务绑定端口后立即可用，
+    ready和startup表示向量库、模型等组件是否已在后台创建完成
     """
-    return {"status": "healthy", "service": "msearch API", "version": "1.0.0"}
+    startup = (
+        _api_server_instance.get_startup_status()
+        if hasattr(_api_server_instance, "get_startup_status")
+        else {"state": "ready", "components": {}}
+    )
+    return {
+        "status": "healthy" if startup["state"] != "failed" else "unhealthy",
+        "service": "msearch API",
+        "version": "1.0.0",
+        "ready": startup["state"] == "ready",
+        "startup": startup,
+    }
+
+
+@router.get("/metrics")
+async def metrics():
+    """
+    运行指标（Prometheus文本格式）
+
+    包括向量化和向量检索的延迟分位数、处理条数、任务队列长度、缓存命中率和资源使用
+    """
+    from src.core.utils.metrics import get_metrics_registry
+
+    return Response(
+        content=get_metrics_registry().render(),
+        media_type="text/plain; version=0.0.4; charset=utf-8",
+    )
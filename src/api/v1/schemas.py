@@ -39,6 +39,24 @@ class TextSearchRequest(BaseModel):
     threshold: Optional[float] = Field(None, ge=0.0, le=1.0, description="相似度阈值")
 
 
+class SearchFeedbackRequest(BaseModel):
+    """搜索结果反馈请求"""
+
+    query_id: str = Field(..., description="搜索响应中的query_id")
+    result_id: str = Field(..., description="结果的file_uuid")
+    feedback: int = Field(..., ge=-1, le=1, description="反馈 (-1: 不相关, 0: 中性, 1: 相关)")
+    feedback_type: str = Field(
+        "explicit", pattern="^(explicit|implicit)$", description="反馈类型"
+    )
+
+
+class RefineSearchRequest(BaseModel):
+    """根据反馈精化搜索请求"""
+
+    query_id: str = Field(..., description="搜索响应中的query_id")
+    top_k: int = Field(20, ge=1, le=100, description="返回结果数量")
+
+
 class ImageSearchRequest(BaseModel):
     """图像搜索请求"""
 
@@ -78,6 +96,7 @@ class SearchResultItem(BaseModel):
     preview_path: Optional[str] = None
     metadata: Optional[Dict[str, Any]] = None
     timestamp_info: Optional[Dict[str, float]] = None  # 视频时间戳信息
+    segments: Optional[List[Dict[str, Any]]] = None  # 视频命中片段（合并后的连续区间）
 
 
 class SearchResponse(BaseModel):
@@ -88,6 +107,7 @@ class SearchResponse(BaseModel):
     results: List[SearchResultItem]
     search_time: float
     query_type: ModalityType
+    query_id: Optional[str] = Field(None, description="查询ID，用于提交反馈和精化搜索")
 
 
 # ==================== 索引相关 ====================
@@ -101,6 +121,12 @@ class IndexAddRequest(BaseModel):
     priority: int = Field(5, ge=1, le=10, description="任务优先级")
 
 
+class VectorMigrationRequest(BaseModel):
+    """向量迁移请求"""
+
+    target_model: str = Field(..., description="目标模型ID（available_models中的模型）")
+
+
 class IndexRemoveRequest(BaseModel):
     """移除索引请求"""
 
@@ -141,7 +167,12 @@ class FilesListRequest(BaseModel):
     file_type: Optional[str] = Field(None, description="文件类型过滤")
     indexed_only: bool = Field(False, description="仅返回已索引的文件")
     limit: int = Field(100, ge=1, le=1000, description="返回数量限制")
-    offset: int = Field(0, ge=0, description="偏移量")
+    offset: int = Field(0, ge=0, description="偏移量（未提供cursor时使用）")
+    cursor: Optional[str] = Field(None, description="上一页返回的next_cursor")
+    sort_by: str = Field(
+        "created_at", pattern="^(created_at|file_name|file_size)$", description="排序字段"
+    )
+    order: str = Field("desc", pattern="^(asc|desc)$", description="排序方向")
 
 
 class FilesListResponse(BaseModel):
@@ -149,6 +180,38 @@ class FilesListResponse(BaseModel):
 
     total_files: int
     files: List[FileInfo]
+    next_cursor: Optional[str] = None
+    total_is_estimate: bool = False
+
+
+class ThumbnailBatchRequest(BaseModel):
+    """批量缩略图请求"""
+
+    paths: List[str] = Field(..., description="源文件路径列表（单次最多200个，更多时分批请求）", min_length=1, max_length=200)
+    size: Optional[int] = Field(None, ge=16, le=1024, description="缩略图尺寸")
+    inline: bool = Field(True, description="是否在响应中内联base64数据")
+    known_etags: Dict[str, str] = Field(
+        default_factory=dict, description="客户端已缓存的ETag {路径: ETag}，未变化的不再返回数据"
+    )
+
+
+class ThumbnailBatchItem(BaseModel):
+    """批量缩略图结果项"""
+
+    path: str
+    found: bool
+    url: Optional[str] = None
+    etag: Optional[str] = None
+    version: Optional[str] = None
+    media_type: Optional[str] = None
+    not_modified: bool = False
+    data: Optional[str] = None  # base64编码的缩略图
+
+
+class ThumbnailBatchResponse(BaseModel):
+    """批量缩略图响应"""
+
+    items: List[ThumbnailBatchItem]
 
 
 # ==================== 任务管理相关 ====================
@@ -178,7 +241,25 @@ class TasksListRequest(BaseModel):
     task_type: Optional[str] = Field(None, description="任务类型过滤")
     status: Optional[TaskStatus] = Field(None, description="状态过滤")
     limit: int = Field(100, ge=1, le=1000, description="返回数量限制")
-    offset: int = Field(0, ge=0, description="偏移量")
+    offset: int = Field(0, ge=0, description="偏移量（未提供cursor时使用）")
+    task_types: Optional[List[str]] = Field(None, description="任务类型过滤（多个）")
+    statuses: Optional[List[TaskStatus]] = Field(None, description="状态过滤（多个）")
+    search: Optional[str] = Field(None, description="按任务ID、类型、文件路径和错误信息搜索")
+    priority: Optional[str] = Field(
+        None, pattern=r"^\d+-\d+(,\d+-\d+)*$", description="优先级范围，如 1-3,8-10"
+    )
+    created_after: Optional[float] = Field(None, description="只返回该时间戳之后创建的任务")
+    sort_by: str = Field(
+        "created_at",
+        pattern="^(created_at|priority|status|progress|duration)$",
+        description="排序字段",
+    )
+    order: str = Field("desc", pattern="^(asc|desc)$", description="排序方向")
+    cursor: Optional[str] = Field(None, description="上一页返回的next_cursor")
+    fields: Optional[List[str]] = Field(
+        None, description="额外返回的可选字段，默认全部返回（任务ID、类型、状态、优先级和创建时间总是返回）"
+    )
+    archived: bool = Field(False, description="查询已归档的任务")
 
 
 class TasksListResponse(BaseModel):
@@ -186,6 +267,8 @@ class TasksListResponse(BaseModel):
 
     total_tasks: int
     tasks: List[TaskInfo]
+    next_cursor: Optional[str] = None
+    status_counts: Dict[str, int] = Field(default_factory=dict)
 
 
 class TaskStatusResponse(BaseModel):
@@ -5,6 +5,7 @@ API服务器 - 单进程架构
 
 import os
 import sys
+import time
 import asyncio
 from pathlib import Path
 from typing import Any, Dict, List, Optional
@@ -20,6 +21,19 @@ sys.path.insert(0, str(project_root))
 # 导入API路由
 from src.api.v1.routes import router as api_v1_router
 
+# 组件就绪前仍然放行的路径（其余API返回503）
+STARTUP_EXEMPT_PATHS = ("/api/v1/health", "/api/v1/metrics")
+
+# 后台创建的组件（APIServer的属性名）
+COMPONENT_NAMES = (
+    "database_manager",
+    "vector_store",
+    "embedding_engine",
+    "task_manager",
+    "search_engine",
+    "file_indexer",
+)
+
 
 class ConfigManager(ABC):
     """配置管理器接口"""
@@ -120,16 +134,21 @@ class APIServer:
     def __init__(
         self,
         config: ConfigManager,
-        database_manager: DatabaseManager,
-        vector_store: VectorStore,
-        embedding_engine: EmbeddingEngine,
-        task_manager: TaskManager,
-        search_engine: SearchEngine,
-        file_indexer: FileIndexer,
+        database_manager: Optional[DatabaseManager] = None,
+        vector_store: Optional[VectorStore] = None,
+        embedding_engine: Optional[EmbeddingEngine] = None,
+        task_manager: Optional[TaskManager] = None,
+        search_engine: Optional[SearchEngine] = None,
+        file_indexer: Optional[FileIndexer] = None,
+        multi_vector_store: Optional[Any] = None,
+        audio_vector_store: Optional[VectorStore] = None,
     ):
         """
         初始化API服务器（使用依赖注入）
 
+        组件都传入时服务立即就绪；不传组件时由warm_up在后台创建，
+        期间端口已经绑定，/health可以立即响应，其余API返回503。
+
         Args:
             config: 配置管理器
             database_manager: 数据库管理器
@@ -138,6 +157,8 @@ class APIServer:
             task_manager: 任务管理器
             search_engine: 搜索引擎
             file_indexer: 文件索引器
+            multi_vector_store: 多向量存储（可选，默认图像模型为多向量模型时使用）
+            audio_vector_store: 音频模型专用的向量存储（可选，按模型分表时使用）
         """
         self.config = config
         self.database_manager = database_manager
@@ -146,6 +167,20 @@ class APIServer:
         self.task_manager = task_manager
         self.search_engine = search_engine
         self.file_indexer = file_indexer
+        self.multi_vector_store = multi_vector_store
+        self.audio_vector_store = audio_vector_store
+
+        # 启动状态：starting（后台创建组件中）/ready/failed
+        self.startup_state = (
+            "ready"
+            if all(getattr(self, name) is not None for name in COMPONENT_NAMES)
+            else "starting"
+        )
+        self.startup_error: Optional[str] = None
+        self._started_at = time.time()
+        self._ready_at: Optional[float] = (
+            self._started_at if self.startup_state == "ready" else None
+        )
 
         # 创建FastAPI应用
         self.app = FastAPI(
@@ -171,6 +206,27 @@ class APIServer:
         from src.api.v1 import routes
 
         routes.set_api_server_instance(self)
+        if self.startup_state == "ready":
+            # 尽早订阅任务事件，保证事件序号从服务启动开始连续
+            routes.get_event_stream()
+
+        # 组件就绪前只放行健康检查和运行指标
+        @self.app.middleware("http")
+        async def startup_gate(request, call_next):
+            if (
+                self.startup_state != "ready"
+                and request.url.path.startswith("/api/")
+                and request.url.path not in STARTUP_EXEMPT_PATHS
+            ):
+                return JSONResponse(
+                    status_code=503,
+                    content={
+                        "detail": "服务正在启动，组件尚未就绪",
+                        "startup": self.get_startup_status(),
+                    },
+                    headers={"Retry-After": "1"},
+                )
+            return await call_next(request)
 
         self.app.include_router(api_v1_router)
 
@@ -195,13 +251,12 @@ class APIServer:
             """启动事件：启动文件监控和执行初始文件扫描"""
             self.logger.info("API服务器启动事件：开始启动服务")
 
-            # 启动文件监控器
-            await self._start_file_monitor()
-
-            # 异步执行初始扫描，避免阻塞启动
-            import asyncio
+            if self.startup_state != "ready":
+                # 组件在后台创建，不阻塞端口绑定；就绪后再启动文件监控
+                self._warm_up_task = asyncio.create_task(self.warm_up())
+                return
 
-            asyncio.create_task(self._perform_initial_scan())
+            await self._start_background_services()
 
         # 添加关闭事件
         @self.app.on_event("shutdown")
@@ -222,6 +277,65 @@ class APIServer:
         self.logger = logging.getLogger("api_server")
         self.logger.info("API服务器初始化完成（多进程架构）")
 
+    def get_startup_status(self) -> Dict[str, Any]:
+        """
+        获取启动状态
+
+        Returns:
+            启动状态、各组件是否就绪、已用时间和失败原因
+        """
+        status = {
+            "state": self.startup_state,
+            "components": {
+                name: getattr(self, name) is not None for name in COMPONENT_NAMES
+            },
+            "elapsed_seconds": round(
+                (self._ready_at or time.time()) - self._started_at, 3
+            ),
+        }
+        if self.startup_error:
+            status["error"] = self.startup_error
+        return status
+
+    async def warm_up(self) -> bool:
+        """
+        在后台创建组件（导入向量库和模型相关模块、打开向量表、启动任务管理器）
+
+        Returns:
+            是否成功
+        """
+        from src.api.v1 import routes
+
+        try:
+            self.logger.info("后台创建服务组件...")
+            # 组件的构造和重依赖的导入都是阻塞操作，放到线程中执行，事件循环继续响应/health
+            components = await asyncio.to_thread(build_components, self.config)
+            await components["embedding_engine"].initialize()
+        except Exception as e:
+            self.startup_state = "failed"
+            self.startup_error = str(e)
+            self.logger.error(f"服务组件创建失败: {e}", exc_info=True)
+            return False
+
+        for name, component in components.items():
+            setattr(self, name, component)
+        routes.get_event_stream()
+        self.startup_state = "ready"
+        self._ready_at = time.time()
+        self.logger.info(
+            f"服务组件已就绪，用时 {self._ready_at - self._started_at:.2f}秒"
+        )
+
+        await self._start_background_services()
+        return True
+
+    async def _start_background_services(self):
+        """启动文件监控并在后台执行初始扫描"""
+        await self._start_file_monitor()
+
+        # 异步执行初始扫描，避免阻塞启动
+        asyncio.create_task(self._perform_initial_scan())
+
     async def _start_file_monitor(self):
         """启动文件监控器"""
         try:
@@ -435,13 +549,19 @@ class APIServer:
                                             ".gif",
                                             ".webp",
                                         ]:
-                                            # 图像向量化
-                                            vector = (
-                                                await self.embedding_engine.embed_image(
+                                            modality = "image"
+                                            if self.multi_vector_store is not None:
+                                                # 多向量模型保留每个patch的向量
+                                                vector = (
+                                                    await self.embedding_engine.embed_multi_vector(
+                                                        file_path, input_type="image"
+                                                    )
+                                                )[0]
+                                            else:
+                                                # 图像向量化
+                                                vector = await self.embedding_engine.embed_image(
                                                     file_path
                                                 )
-                                            )
-                                            modality = "image"
                                         elif file_ext in [
                                             ".mp4",
                                             ".avi",
@@ -492,7 +612,25 @@ class APIServer:
                                             "is_full_video": True,
                                             "created_at": result.created_at,
                                         }
-                                        self.vector_store.add_vector(vector_data)
+                                        if (
+                                            modality == "image"
+                                            and self.multi_vector_store is not None
+                                        ):
+                                            vector_data["vectors"] = vector_data.pop(
+                                                "vector"
+                                            )
+                                            self.multi_vector_store.insert_items(
+                                                [vector_data]
+                                            )
+                                        elif (
+                                            modality == "audio"
+                                            and self.audio_vector_store is not None
+                                        ):
+                                            self.audio_vector_store.add_vector(
+                                                vector_data
+                                            )
+                                        else:
+                                            self.vector_store.add_vector(vector_data)
 
                                         self.logger.info(f"✓ 向量化成功: {file_path}")
 
@@ -542,22 +680,27 @@ class APIServer:
             return {"error": str(e)}
 
 
-async def create_api_server(config_path: Optional[str] = None) -> APIServer:
+def build_components(config) -> Dict[str, Any]:
     """
-    创建APIServer实例
+    创建API服务器依赖的组件
+
+    组件实现（向量库、模型、任务系统）在这里才导入，只导入api_server模块不会加载它们。
 
     Args:
-        config_path: 配置文件路径
+        config: 配置管理器
 
     Returns:
-        APIServer实例
+        组件名 -> 组件实例
     """
     # 导入实际实现
-    from src.core.config.config_manager import ConfigManager as ConfigManagerImpl
     from src.core.database.database_manager import (
         DatabaseManager as DatabaseManagerImpl,
     )
-    from src.core.vector.vector_store import VectorStore as VectorStoreImpl
+    from src.core.vector.vector_store import (
+        VectorStore as VectorStoreImpl,
+        open_active_vector_store,
+        open_audio_vector_store,
+    )
     from src.core.embedding.embedding_engine import (
         EmbeddingEngine as EmbeddingEngineImpl,
     )
@@ -567,13 +710,10 @@ async def create_api_server(config_path: Optional[str] = None) -> APIServer:
     from src.core.task.task_monitor import OptimizedTaskMonitor
     from src.core.task.group_manager import OptimizedGroupManager
     from src.services.search.search_engine import SearchEngine as SearchEngineImpl
+    from src.services.search.relevance_feedback import RelevanceFeedback
     from src.services.file.file_indexer import FileIndexer as FileIndexerImpl
-
-    # 创建配置管理器
-    if config_path:
-        config = ConfigManagerImpl(config_path=config_path)
-    else:
-        config = ConfigManagerImpl()
+    from src.services.media.media_probe import initialize_media_probe
+    from src.services.media.thumbnail_service import get_thumbnail_service
 
     # 创建数据库管理器
     db_path = config.config.get("database", {}).get(
@@ -581,12 +721,37 @@ async def create_api_server(config_path: Optional[str] = None) -> APIServer:
     )
     database_manager = DatabaseManagerImpl(db_path)
 
-    # 创建向量存储
-    vector_store = VectorStoreImpl(config.config)
+    # 媒体探测结果持久化到配置的路径，媒体组件通过get_media_probe共用
+    initialize_media_probe(config.config.get("media", {}).get("probe_db_path"))
 
     # 创建向量化引擎
     embedding_engine = EmbeddingEngineImpl(config.config)
-    await embedding_engine.initialize()
+
+    # 创建向量存储（按模型分表时使用当前提供检索的模型表，并让默认模型与之一致；
+    # 音频向量保存在音频模型专用的表中）
+    audio_vector_store = None
+    if config.config.get("database", {}).get("table_per_model", False):
+        vector_store = open_active_vector_store(
+            config.config,
+            embedding_engine._get_default_model_id(),
+            embedding_engine.get_embedding_dim(),
+        )
+        embedding_engine.set_default_visual_model(vector_store.model_id)
+        audio_model_id = embedding_engine.get_default_audio_model_id()
+        audio_vector_store = open_audio_vector_store(
+            config.config,
+            audio_model_id,
+            embedding_engine.get_embedding_dim(audio_model_id),
+        )
+    else:
+        vector_store = VectorStoreImpl(config.config)
+
+    # 默认图像模型为多向量模型（如ColQwen）时，图像的token向量保存在多向量存储中
+    multi_vector_store = None
+    if embedding_engine.is_multi_vector():
+        from src.core.vector.multi_vector_store import create_multi_vector_store
+
+        multi_vector_store = create_multi_vector_store(config.config)
 
     # 获取设备配置
     device = config.config.get("device", "cpu")
@@ -594,7 +759,13 @@ async def create_api_server(config_path: Optional[str] = None) -> APIServer:
     # 创建任务管理器的依赖组件
     task_scheduler = TaskScheduler(config.config)
     task_executor = OptimizedTaskExecutor()
-    task_monitor = OptimizedTaskMonitor()
+    task_manager_config = config.config.get("task_manager", {})
+    task_monitor = OptimizedTaskMonitor(
+        max_terminal_tasks=task_manager_config.get("max_terminal_tasks", 5000),
+        archive_path=task_manager_config.get(
+            "task_archive_path", "data/database/sqlite/task_archive.db"
+        ),
+    )
     task_group_manager = OptimizedGroupManager()
 
     # 创建任务管理器
@@ -609,29 +780,70 @@ async def create_api_server(config_path: Optional[str] = None) -> APIServer:
     task_manager.start()
 
     # 创建搜索引擎
+    search_config = config.config.get("search", {})
     search_engine = SearchEngineImpl(
-        embedding_engine=embedding_engine, vector_store=vector_store
+        embedding_engine=embedding_engine,
+        vector_store=vector_store,
+        config=search_config,
+        relevance_feedback=RelevanceFeedback(search_config),
+        multi_vector_store=multi_vector_store,
+        audio_vector_store=audio_vector_store,
     )
     search_engine.initialize()
 
     # 创建文件索引器
-    file_indexer = FileIndexerImpl(config=config.config, task_manager=task_manager)
+    # 缩略图服务与API共用，索引时以后台优先级预渲染
+    file_indexer = FileIndexerImpl(
+        config=config.config,
+        task_manager=task_manager,
+        thumbnail_service=get_thumbnail_service(config.config),
+    )
     # 将依赖传递给file_indexer
     file_indexer.vector_store = vector_store
     file_indexer.embedding_engine = embedding_engine
 
-    # 创建API服务器实例
-    api_server = APIServer(
-        config=config,
-        database_manager=database_manager,
-        vector_store=vector_store,
-        embedding_engine=embedding_engine,
-        task_manager=task_manager,
-        search_engine=search_engine,
-        file_indexer=file_indexer,
-    )
+    return {
+        "database_manager": database_manager,
+        "vector_store": vector_store,
+        "embedding_engine": embedding_engine,
+        "task_manager": task_manager,
+        "search_engine": search_engine,
+        "file_indexer": file_indexer,
+        "multi_vector_store": multi_vector_store,
+        "audio_vector_store": audio_vector_store,
+    }
+
+
+async def create_api_server(
+    config_path: Optional[str] = None, warm_up_in_background: bool = False
+) -> APIServer:
+    """
+    创建APIServer实例
+
+    Args:
+        config_path: 配置文件路径
+        warm_up_in_background: 是否在服务启动后再在后台创建组件。
+            为True时立即返回只含配置的APIServer，端口绑定后/health即可响应
+
+    Returns:
+        APIServer实例
+    """
+    from src.core.config.config_manager import ConfigManager as ConfigManagerImpl
 
-    return api_server
+    # 创建配置管理器
+    if config_path:
+        config = ConfigManagerImpl(config_path=config_path)
+    else:
+        config = ConfigManagerImpl()
+
+    if warm_up_in_background:
+        return APIServer(config=config)
+
+    components = build_components(config)
+    await components["embedding_engine"].initialize()
+
+    # 创建API服务器实例
+    return APIServer(config=config, **components)
 
 
 async def main():
@@ -645,8 +857,8 @@ async def main():
 
     args = parser.parse_args()
 
-    # 创建API服务器
-    api_server = await create_api_server(args.config)
+    # 创建API服务器（先绑定端口，组件在后台创建）
+    api_server = await create_api_server(args.config, warm_up_in_background=True)
 
     # 启动服务器
     import uvicorn
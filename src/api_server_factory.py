@@ -12,10 +12,16 @@ sys.path.insert(0, str(project_root))
 
 from src.core.config.config_manager import ConfigManager
 from src.core.database.database_manager import DatabaseManager
-from src.core.vector.vector_store import VectorStore
+from src.core.vector.vector_store import (
+    VectorStore,
+    open_active_vector_store,
+    open_audio_vector_store,
+)
+from src.core.vector.multi_vector_store import create_multi_vector_store
 from src.core.embedding.embedding_engine import EmbeddingEngine
 from src.core.task.central_task_manager import CentralTaskManager
 from src.services.search.search_engine import SearchEngine
+from src.services.search.relevance_feedback import RelevanceFeedback
 from src.services.file.file_indexer import FileIndexer
 from src.api_server import APIServer
 
@@ -36,22 +42,47 @@ def create_api_server(config_path: str = "config/config.yml") -> APIServer:
     # 2. 创建数据库管理器
     database_manager = DatabaseManager(config_manager.config)
 
-    # 3. 创建向量存储
-    vector_store = VectorStore(config_manager.config)
-
-    # 4. 创建向量化引擎
+    # 3. 创建向量化引擎
     embedding_engine = EmbeddingEngine(config_manager.config)
 
+    # 4. 创建向量存储（按模型分表时使用当前提供检索的模型表，并让默认模型与之一致；
+    # 音频向量保存在音频模型专用的表中）
+    audio_vector_store = None
+    if config_manager.config.get("database", {}).get("table_per_model", False):
+        vector_store = open_active_vector_store(
+            config_manager.config,
+            embedding_engine._get_default_model_id(),
+            embedding_engine.get_embedding_dim(),
+        )
+        embedding_engine.set_default_visual_model(vector_store.model_id)
+        audio_model_id = embedding_engine.get_default_audio_model_id()
+        audio_vector_store = open_audio_vector_store(
+            config_manager.config,
+            audio_model_id,
+            embedding_engine.get_embedding_dim(audio_model_id),
+        )
+    else:
+        vector_store = VectorStore(config_manager.config)
+
+    # 默认图像模型为多向量模型（如ColQwen）时，图像的token向量保存在多向量存储中
+    multi_vector_store = None
+    if embedding_engine.is_multi_vector():
+        multi_vector_store = create_multi_vector_store(config_manager.config)
+
     # 5. 创建任务管理器
     device = config_manager.config.get("models", {}).get("device", "cpu")
     task_manager = CentralTaskManager(config_manager.config, device)
     task_manager.initialize()
 
     # 6. 创建搜索引擎
+    search_config = config_manager.config.get("search", {})
     search_engine = SearchEngine(
         embedding_engine=embedding_engine,
         vector_store=vector_store,
-        config=config_manager.config.get("search", {}),
+        config=search_config,
+        relevance_feedback=RelevanceFeedback(search_config),
+        multi_vector_store=multi_vector_store,
+        audio_vector_store=audio_vector_store,
     )
     search_engine.initialize()
 
@@ -70,6 +101,8 @@ def create_api_server(config_path: str = "config/config.yml") -> APIServer:
         task_manager=task_manager,
         search_engine=search_engine,
         file_indexer=file_indexer,
+        multi_vector_store=multi_vector_store,
+        audio_vector_store=audio_vector_store,
     )
 
     return api_server
@@ -7,7 +7,6 @@ msearch CLI工具 - 用于测试和调试msearch系统
 import sys
 import os
 import argparse
-import asyncio
 import json
 from pathlib import Path
 from typing import Optional
@@ -16,8 +15,6 @@ from typing import Optional
 project_root = Path(__file__).parent.parent
 sys.path.insert(0, str(project_root))
 
-import requests
-
 
 class MSearchCLI:
     """msearch CLI工具类"""
@@ -30,7 +27,43 @@ class MSearchCLI:
             base_url: API服务器基础URL
         """
         self.base_url = base_url
-        self.session = requests.Session()
+        # requests在第一次需要时才导入，health等只读命令使用标准库，启动更快
+        self._session = None
+
+    @property
+    def session(self):
+        """HTTP会话（首次使用时创建）"""
+        if self._session is None:
+            import requests
+
+            self._session = requests.Session()
+        return self._session
+
+    def _get_json(self, endpoint: str, timeout: float = 5.0) -> dict:
+        """
+        用标准库发送GET请求（不导入requests）
+
+        Args:
+            endpoint: API端点
+            timeout: 超时时间（秒）
+
+        Returns:
+            响应JSON数据
+        """
+        from urllib import error, request
+
+        url = f"{self.base_url}{endpoint}"
+        try:
+            with request.urlopen(url, timeout=timeout) as response:
+                return json.loads(response.read().decode("utf-8"))
+        except error.HTTPError as e:
+            print(f"错误: HTTP {e.code}")
+            print(f"详情: {e.read().decode('utf-8', errors='replace')}")
+            sys.exit(1)
+        except (error.URLError, OSError):
+            print(f"错误: 无法连接到API服务器 ({self.base_url})")
+            print("请确保API服务器正在运行: python3 src/api_server.py")
+            sys.exit(1)
 
     def _request(
         self,
@@ -53,6 +86,8 @@ class MSearchCLI:
         Returns:
             响应JSON数据
         """
+        import requests
+
         url = f"{self.base_url}{endpoint}"
 
         try:
@@ -87,14 +122,23 @@ class MSearchCLI:
         print("健康检查")
         print("=" * 60)
 
-        result = self._request("GET", "/api/v1/health")
+        result = self._get_json("/api/v1/health")
+        startup = result.get("startup", {})
 
-        print(f"状态: {result.get('success')}")
+        print(f"状态: {result.get('status')}")
         print("\n组件状态:")
-        for component, status in result["components"].items():
-            print(f"  - {component}: {status}")
+        for component, ready in startup.get("components", {}).items():
+            print(f"  - {component}: {'ready' if ready else 'loading'}")
 
-        print("\n✓ 系统运行正常")
+        if startup.get("state") == "failed":
+            print(f"\n✗ 组件创建失败: {startup.get('error')}")
+            sys.exit(1)
+        if result.get("ready"):
+            print("\n✓ 系统运行正常")
+        else:
+            print(
+                f"\nAPI已启动，组件正在后台加载（已用 {startup.get('elapsed_seconds', 0)}秒）"
+            )
 
     def system_info(self):
         """系统信息"""
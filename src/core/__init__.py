@@ -1,11 +1,19 @@
 """核心组件层"""
 
-from .config.config_manager import ConfigManager
-from .database.database_manager import DatabaseManager
-from .vector.vector_store import VectorStore
-from .embedding.embedding_engine import EmbeddingEngine
-from .task.central_task_manager import CentralTaskManager as TaskManager
-from .logging.logging_config import LoggingConfig
+from src.utils.lazy_import import lazy_exports
+
+# 组件在首次访问时导入，导入单个子模块不会加载向量库、模型和任务系统
+__getattr__, __dir__ = lazy_exports(
+    __name__,
+    {
+        "ConfigManager": ".config.config_manager",
+        "DatabaseManager": ".database.database_manager",
+        "VectorStore": ".vector.vector_store",
+        "EmbeddingEngine": ".embedding.embedding_engine",
+        "TaskManager": ".task.central_task_manager:CentralTaskManager",
+        "LoggingConfig": ".logging.logging_config",
+    },
+)
 
 __all__ = [
     "ConfigManager",
@@ -9,6 +9,8 @@ import json
 from typing import Any, Dict, List, Optional
 from pathlib import Path
 import logging
+import threading
+import time
 from datetime import datetime
 import uuid
 
@@ -29,6 +31,11 @@ class DatabaseManager:
         self.db_path = Path(db_path)
         self.enable_wal = enable_wal
         self.connection: Optional[sqlite3.Connection] = None
+
+        # 文件计数缓存 {(file_type, indexed_only): (时间, 数量)}
+        self._count_cache: Dict[tuple, tuple] = {}
+        self._count_cache_lock = threading.Lock()
+
         self._initialize()
 
     def _initialize(self) -> bool:
@@ -161,6 +168,24 @@ class DatabaseManager:
         cursor.execute(
             "CREATE INDEX IF NOT EXISTS idx_file_status ON file_metadata(processing_status)"
         )
+        # 文件列表分页的复合索引（排序字段 + id 作为游标）
+        cursor.execute(
+            "CREATE INDEX IF NOT EXISTS idx_file_created ON file_metadata(created_at, id)"
+        )
+        cursor.execute(
+            "CREATE INDEX IF NOT EXISTS idx_file_type_created "
+            "ON file_metadata(file_type, created_at, id)"
+        )
+        cursor.execute(
+            "CREATE INDEX IF NOT EXISTS idx_file_status_created "
+            "ON file_metadata(processing_status, created_at, id)"
+        )
+        cursor.execute(
+            "CREATE INDEX IF NOT EXISTS idx_file_name ON file_metadata(file_name, id)"
+        )
+        cursor.execute(
+            "CREATE INDEX IF NOT EXISTS idx_file_size ON file_metadata(file_size, id)"
+        )
         cursor.execute(
             "CREATE INDEX IF NOT EXISTS idx_ref_hash ON file_references(file_hash)"
         )
@@ -942,6 +967,61 @@ class DatabaseManager:
             logger.error(f"获取视频元数据失败: {e}")
             return None
 
+    # SQLite单条语句的参数上限为999，批量查询按此分块
+    BATCH_QUERY_SIZE = 900
+
+    def get_video_metadata_batch(self, file_ids: List[str]) -> Dict[str, Dict[str, Any]]:
+        """
+        批量获取视频元数据
+
+        一次查询同时取出文件信息（名称、路径、缩略图、预览）和视频信息，
+        ID数量超过BATCH_QUERY_SIZE时分块查询。
+
+        Args:
+            file_ids: 文件ID列表
+
+        Returns:
+            {文件ID: 视频元数据}，不存在的文件不包含在结果中
+        """
+        metadata_map: Dict[str, Dict[str, Any]] = {}
+        unique_ids = list(dict.fromkeys(file_ids))
+
+        try:
+            cursor = self.connection.cursor()
+            for start in range(0, len(unique_ids), self.BATCH_QUERY_SIZE):
+                chunk = unique_ids[start : start + self.BATCH_QUERY_SIZE]
+                cursor.execute(
+                    f"""
+                    SELECT f.id, f.file_name, f.file_path, f.thumbnail_path, f.preview_path,
+                           v.id, v.duration, v.width, v.height, v.fps, v.codec,
+                           v.is_short_video, v.total_segments
+                    FROM file_metadata f
+                    LEFT JOIN video_metadata v ON v.file_id = f.id
+                    WHERE f.id IN ({", ".join("?" * len(chunk))})
+                """,
+                    chunk,
+                )
+                for row in cursor.fetchall():
+                    metadata_map[row[0]] = {
+                        "video_uuid": row[0],
+                        "video_name": row[1],
+                        "video_path": row[2],
+                        "thumbnail_path": row[3],
+                        "preview_path": row[4],
+                        "video_id": row[5],
+                        "duration": row[6],
+                        "width": row[7],
+                        "height": row[8],
+                        "fps": row[9],
+                        "codec": row[10],
+                        "is_short_video": bool(row[11]),
+                        "total_segments": row[12],
+                    }
+            return metadata_map
+        except Exception as e:
+            logger.error(f"批量获取视频元数据失败: {e}")
+            return metadata_map
+
     def insert_video_segment(self, video_id: str, segment_info: Dict[str, Any]) -> str:
         """
         插入视频片段
@@ -1347,6 +1427,135 @@ class DatabaseManager:
             logger.error(f"获取总文件数失败: {e}")
             return 0
 
+    # 文件列表支持的排序字段（均有 (字段, id) 复合索引）
+    FILE_SORT_COLUMNS = ("created_at", "file_name", "file_size")
+
+    # 文件计数缓存有效期（秒）
+    COUNT_CACHE_TTL = 30.0
+
+    def list_files(
+        self,
+        file_type: Optional[str] = None,
+        indexed_only: bool = False,
+        limit: int = 100,
+        sort_by: str = "created_at",
+        descending: bool = True,
+        after: Optional[tuple] = None,
+        offset: int = 0,
+    ) -> List[Dict[str, Any]]:
+        """
+        分页获取文件列表
+
+        使用键集分页：传入上一页最后一行的 (排序值, id) 作为after，
+        查询直接在复合索引上定位，不随页码变深而变慢。只读取列表展示需要的列。
+
+        Args:
+            file_type: 文件类型过滤
+            indexed_only: 仅返回已索引的文件
+            limit: 返回数量限制
+            sort_by: 排序字段（created_at/file_name/file_size）
+            descending: 是否降序
+            after: 上一页最后一行的 (排序值, id)
+            offset: 偏移量（未提供after时使用，兼容旧接口）
+
+        Returns:
+            文件列表
+        """
+        if sort_by not in self.FILE_SORT_COLUMNS:
+            raise ValueError(f"不支持的排序字段: {sort_by}")
+
+        conditions, params = [], []
+        if file_type:
+            conditions.append("file_type = ?")
+            params.append(file_type)
+        if indexed_only:
+            conditions.append("processing_status = 'completed'")
+        if after is not None:
+            conditions.append(f"({sort_by}, id) {'<' if descending else '>'} (?, ?)")
+            params.extend(after)
+
+        direction = "DESC" if descending else "ASC"
+        sql = (
+            "SELECT id, file_path, file_name, file_type, file_size, created_at, "
+            "updated_at, processing_status, thumbnail_path, preview_path "
+            "FROM file_metadata"
+        )
+        if conditions:
+            sql += " WHERE " + " AND ".join(conditions)
+        sql += f" ORDER BY {sort_by} {direction}, id {direction} LIMIT ?"
+        params.append(limit)
+        if after is None and offset:
+            sql += " OFFSET ?"
+            params.append(offset)
+
+        try:
+            cursor = self.connection.cursor()
+            cursor.execute(sql, params)
+            return [
+                {
+                    "id": row[0],
+                    "file_uuid": row[0],
+                    "file_path": row[1],
+                    "file_name": row[2],
+                    "file_type": row[3],
+                    "file_size": row[4],
+                    "created_at": row[5],
+                    "updated_at": row[6],
+                    "processing_status": row[7],
+                    "indexed": row[7] == "completed",
+                    "has_thumbnail": bool(row[8]),
+                    "has_preview": bool(row[9]),
+                }
+                for row in cursor.fetchall()
+            ]
+        except Exception as e:
+            logger.error(f"获取文件列表失败: {e}")
+            return []
+
+    def count_files(
+        self, file_type: Optional[str] = None, indexed_only: bool = False
+    ) -> int:
+        """
+        获取文件数量（带缓存的近似值）
+
+        计数结果缓存 COUNT_CACHE_TTL 秒，翻页时不再反复执行 COUNT(*)
+
+        Args:
+            file_type: 文件类型过滤
+            indexed_only: 仅统计已索引的文件
+
+        Returns:
+            文件数量
+        """
+        key = (file_type, indexed_only)
+        now = time.monotonic()
+        with self._count_cache_lock:
+            cached = self._count_cache.get(key)
+            if cached and now - cached[0] < self.COUNT_CACHE_TTL:
+                return cached[1]
+
+        conditions, params = [], []
+        if file_type:
+            conditions.append("file_type = ?")
+            params.append(file_type)
+        if indexed_only:
+            conditions.append("processing_status = 'completed'")
+        sql = "SELECT COUNT(*) FROM file_metadata"
+        if conditions:
+            sql += " WHERE " + " AND ".join(conditions)
+
+        try:
+            cursor = self.connection.cursor()
+            cursor.execute(sql, params)
+            count = cursor.fetchone()[0]
+        except Exception as e:
+            logger.error(f"获取文件数量失败: {e}")
+            return 0
+
+        with self._count_cache_lock:
+            self._count_cache[key] = (now, count)
+        return count
+
     def get_indexed_files(self) -> int:
         """
         获取已索引文件数
@@ -1,5 +1,9 @@
 """向量化引擎模块"""
 
-from .embedding_engine import EmbeddingEngine
+from src.utils.lazy_import import lazy_exports
+
+__getattr__, __dir__ = lazy_exports(
+    __name__, {"EmbeddingEngine": ".embedding_engine"}
+)
 
 __all__ = ["EmbeddingEngine"]
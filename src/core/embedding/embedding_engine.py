@@ -35,7 +35,6 @@ os.environ["HUGGINGFACE_HUB_CACHE"] = hf_home
 os.environ["INFINITY_ANONYMOUS_USAGE_STATS"] = "0"
 
 import numpy as np
-import torch
 from typing import Any, Dict, List, Optional, Union
 import logging
 from PIL import Image
@@ -43,11 +42,16 @@ import asyncio
 import base64
 import io
 import time
-import psutil
-from dataclasses import dataclass, field
 from concurrent.futures import ThreadPoolExecutor
 from contextlib import contextmanager
 
+from src.core.utils.metrics import (
+    LatencyHistogram,
+    MetricsRegistry,
+    get_metrics_registry,
+)
+from src.core.utils.model_memory_manager import ModelMemoryManager
+from src.core.utils.resource_monitor import get_resource_sampler
 from src.core.models.model_manager import (
     ModelManager,
     ModelConfig,
@@ -56,6 +60,7 @@ from src.core.models.model_manager import (
     get_embedding_service,
     get_model_manager,
 )
+from src.core.models.weight_cache import WeightCache
 
 logger = logging.getLogger(__name__)
 
@@ -65,32 +70,23 @@ logger = logging.getLogger(__name__)
 # ============================================================================
 
 
-@dataclass
-class PerformanceMetrics:
-    """性能指标"""
-
-    operation: str
-    duration_ms: float
-    timestamp: float = field(default_factory=time.time)
-    memory_used_mb: float = 0.0
-    success: bool = True
-    error_message: str = ""
-
-
 class MemoryManager:
-    """内存管理器 - 限制内存使用，自动管理内存"""
+    """内存管理器 - 限制内存使用，自动管理内存
+
+    内存数据读取资源采样器的快照，不在推理路径上调用psutil。
+    """
 
     def __init__(self, max_memory_mb: int = 4096):
         self.max_memory_mb = max_memory_mb
-        self.process = psutil.Process()
+        self.sampler = get_resource_sampler()
 
     def get_memory_usage(self) -> float:
         """获取当前内存使用（MB）"""
-        return self.process.memory_info().rss / (1024 * 1024)
+        return self.sampler.snapshot().process_rss_mb
 
     def get_memory_percent(self) -> float:
         """获取内存使用百分比"""
-        return self.process.memory_percent()
+        return self.sampler.snapshot().process_memory_percent
 
     def check_memory_limit(self) -> bool:
         """检查是否超过内存限制"""
@@ -206,70 +202,93 @@ class DeviceManager:
 
 
 class PerformanceMonitor:
-    """性能监控器 - 收集和统计性能指标"""
+    """性能监控器 - 按操作、模型和模态记录延迟直方图
 
-    def __init__(self):
-        self.metrics: List[PerformanceMetrics] = []
-        self.memory_manager = MemoryManager()
+    延迟记录在固定内存的对数分桶直方图中（见metrics模块），内存占用不随调用次数
+    增长，统计时也无需遍历历史记录；指标同时通过/metrics导出。
+    """
 
-    @contextmanager
-    def measure(self, operation: str):
-        """测量操作耗时"""
-        start_time = time.time()
-        memory_before = self.memory_manager.get_memory_usage()
+    DURATION_METRIC = "msearch_embedding_duration_seconds"
+    ITEMS_METRIC = "msearch_embedding_items_total"
+    ERRORS_METRIC = "msearch_embedding_errors_total"
 
-        success = False
-        error_msg = ""
+    def __init__(self, registry: Optional[MetricsRegistry] = None):
+        self.registry = registry or get_metrics_registry()
+        self.memory_manager = MemoryManager()
 
+    @contextmanager
+    def measure(
+        self,
+        operation: str,
+        model: Optional[str] = None,
+        modality: Optional[str] = None,
+        items: int = 1,
+    ):
+        """测量操作耗时，成功时按items累计处理条数"""
+        labels = {"operation": operation, "model": model, "modality": modality}
+        start_time = time.perf_counter()
         try:
             yield
-            success = True
-            error_msg = ""
-        except Exception as e:
-            success = False
-            error_msg = str(e)
+        except Exception:
+            self.registry.counter(
+                self.ERRORS_METRIC, "向量化失败次数", **labels
+            ).inc()
             raise
+        else:
+            self.registry.counter(
+                self.ITEMS_METRIC, "向量化处理条数", **labels
+            ).inc(items)
         finally:
-            duration = (time.time() - start_time) * 1000
-            memory_after = self.memory_manager.get_memory_usage()
-
-            self.metrics.append(
-                PerformanceMetrics(
-                    operation=operation,
-                    duration_ms=duration,
-                    memory_used_mb=memory_after - memory_before,
-                    success=success,
-                    error_message=error_msg,
-                )
-            )
+            self.registry.histogram(
+                self.DURATION_METRIC, "向量化耗时（秒）", **labels
+            ).observe(time.perf_counter() - start_time)
 
     def get_stats(self, operation: str = None) -> Dict[str, Any]:
         """获取性能统计"""
-        if operation:
-            ops = [m for m in self.metrics if m.operation == operation]
-        else:
-            ops = self.metrics
 
-        if not ops:
-            return {"count": 0}
+        def selected(series):
+            return [
+                metric
+                for labels, metric in series.items()
+                if operation is None or ("operation", operation) in labels
+            ]
 
-        durations = [m.duration_ms for m in ops]
-        successful = [m for m in ops if m.success]
+        histogram = LatencyHistogram.merged(
+            selected(self.registry.get_histograms(self.DURATION_METRIC))
+        )
+        if not histogram.count:
+            return {"count": 0}
 
+        errors = sum(
+            counter.value
+            for counter in selected(self.registry.get_counters(self.ERRORS_METRIC))
+        )
+        summary = histogram.snapshot()
         return {
-            "count": len(ops),
-            "avg_ms": sum(durations) / len(durations),
-            "min_ms": min(durations),
-            "max_ms": max(durations),
-            "success_rate": len(successful) / len(ops) * 100 if ops else 0,
+            "count": histogram.count,
+            "avg_ms": summary["sum"] / histogram.count * 1000,
+            "min_ms": summary["min"] * 1000,
+            "max_ms": summary["max"] * 1000,
+            "p50_ms": summary["p50"] * 1000,
+            "p95_ms": summary["p95"] * 1000,
+            "p99_ms": summary["p99"] * 1000,
+            "success_rate": (histogram.count - errors) / histogram.count * 100,
         }
 
     def get_summary(self) -> Dict[str, Any]:
         """获取性能摘要"""
+        operations = sorted(
+            {
+                dict(labels)["operation"]
+                for labels in self.registry.get_histograms(self.DURATION_METRIC)
+            }
+        )
+        overall = self.get_stats()
         return {
-            "total_operations": len(self.metrics),
+            "total_operations": overall["count"],
             "memory_status": self.memory_manager.get_memory_status(),
-            "operation_stats": self.get_stats(),
+            "operation_stats": overall,
+            "by_operation": {op: self.get_stats(op) for op in operations},
         }
 
 
@@ -367,10 +386,11 @@ class EmbeddingEngine:
         )
         self._batch_optimizer = BatchOptimizer(config, base_batch_size=batch_size)
 
-        # 模型最后使用时间（用于自动卸载）
-        self._model_last_used: Dict[str, float] = {}
+        # 模型常驻策略：空闲超时卸载和内存预算（由ModelMemoryManager执行）
         self._auto_unload_enabled = self.models_config.get("auto_unload_enabled", False)
         self._unload_after_seconds = self.models_config.get("unload_after_seconds", 300)
+        self._memory_budget_gb = self.models_config.get("memory_budget_gb")
+        self._max_resident_models = self.models_config.get("max_resident_models")
 
         # 初始化模型配置（从配置文件读取）
         self._init_model_configs()
@@ -420,6 +440,10 @@ class EmbeddingEngine:
             return active_models[0]
         return "chinese_clip_base"
 
+    def get_default_audio_model_id(self) -> str:
+        """获取默认音频模型ID"""
+        return self._default_audio_model
+
     # ================================================================
     # 性能优化：懒加载机制
     # ================================================================
@@ -444,9 +468,9 @@ class EmbeddingEngine:
             logger.info("开始加载模型...")
 
             # 同步加载模型
-            self._model_manager = ModelManager()
+            self._model_manager = self._create_model_manager()
             await self._model_manager.initialize(self._model_configs)
-            self._embedding_service = EmbeddingService(self._model_manager)
+            self._embedding_service = EmbeddingService(self._model_manager, self.config)
 
             self._models_loaded = True
             logger.info("模型加载完成")
@@ -509,29 +533,39 @@ class EmbeddingEngine:
     # 性能优化：自动卸载机制
     # ================================================================
 
-    def _mark_model_used(self, model_id: str):
-        """标记模型已被使用"""
-        self._model_last_used[model_id] = time.time()
+    def _create_model_manager(self) -> ModelManager:
+        """创建模型管理器（常驻策略、并行加载、预热和权重缓存均由配置决定）"""
+        memory_manager = ModelMemoryManager(
+            max_models_in_memory=self._max_resident_models,
+            inactive_timeout=(
+                self._unload_after_seconds if self._auto_unload_enabled else None
+            ),
+            memory_budget_gb=self._memory_budget_gb,
+        )
+        performance = self.models_config.get("performance", {})
+        weight_cache_dir = performance.get("weight_cache_dir")
+        return ModelManager(
+            memory_manager=memory_manager,
+            parallel_loading=performance.get("parallel_model_loading", True),
+            warmup=performance.get(
+                "enable_model_warmup",
+                self.models_config.get("enable_model_warmup", False),
+            ),
+            weight_cache=WeightCache(weight_cache_dir) if weight_cache_dir else None,
+        )
 
-    def _check_and_unload_idle_models(self):
-        """检查并卸载空闲模型"""
-        if not self._auto_unload_enabled:
+    async def _check_and_unload_idle_models(self):
+        """检查并卸载空闲模型（停止Infinity引擎，下次使用时重新加载）"""
+        if not self._auto_unload_enabled or self._model_manager is None:
             return
 
-        current_time = time.time()
-        models_to_unload = []
-
-        for model_id, last_used in self._model_last_used.items():
-            idle_time = current_time - last_used
+        await self._model_manager.memory_manager.cleanup_inactive_models()
 
-            if idle_time > self._unload_after_seconds:
-                models_to_unload.append(model_id)
-
-        for model_id in models_to_unload:
-            logger.info(f"自动卸载空闲模型: {model_id}")
-            if self._model_manager:
-                # 移除模型引用
-                self._model_last_used.pop(model_id, None)
+    def get_model_residency(self) -> Dict[str, Any]:
+        """获取模型常驻状态和内存占用"""
+        if self._model_manager is None:
+            return {"loaded_models": 0, "models": {}}
+        return self._model_manager.memory_manager.get_memory_stats()
 
     # ================================================================
     # 性能优化：内存管理
@@ -566,9 +600,15 @@ class EmbeddingEngine:
         return self._perf_monitor.get_summary()
 
     @contextmanager
-    def monitor_operation(self, operation: str):
-        """监控操作性能"""
-        with self._perf_monitor.measure(operation):
+    def monitor_operation(
+        self,
+        operation: str,
+        model: Optional[str] = None,
+        modality: Optional[str] = None,
+        items: int = 1,
+    ):
+        """监控操作性能（按操作、模型和模态分别统计）"""
+        with self._perf_monitor.measure(operation, model, modality, items):
             yield
 
     # ================================================================
@@ -614,13 +654,13 @@ class EmbeddingEngine:
                 logger.info("初始化统一模型管理器...")
 
                 # 创建模型管理器
-                self._model_manager = ModelManager()
+                self._model_manager = self._create_model_manager()
 
                 # 初始化模型管理器（加载所有配置的模型）
                 await self._model_manager.initialize(self._model_configs)
 
                 # 创建向量化服务
-                self._embedding_service = EmbeddingService(self._model_manager)
+                self._embedding_service = EmbeddingService(self._model_manager, self.config)
 
                 logger.info("统一模型管理器初始化完成")
                 logger.info(f"已加载的模型: {self._model_manager.get_loaded_models()}")
@@ -631,10 +671,10 @@ class EmbeddingEngine:
                 logger.error(f"详细错误: {traceback.format_exc()}")
                 raise RuntimeError(f"初始化模型管理器失败: {e}") from e
 
-        # 获取指定类型的模型
-        if model_type not in self._model_manager.get_loaded_models():
+        # 获取指定类型的模型（被驱逐的模型会重新加载）
+        if model_type not in self._model_manager.get_registered_models():
             raise ValueError(
-                f"未找到模型: {model_type}。已加载的模型: {self._model_manager.get_loaded_models()}"
+                f"未找到模型: {model_type}。已注册的模型: {self._model_manager.get_registered_models()}"
             )
 
         return await self._model_manager.get_model(model_type)
@@ -745,6 +785,8 @@ class EmbeddingEngine:
             if self._model_manager:
                 await self._model_manager.shutdown()
                 self._model_manager = None
+                if self._embedding_service:
+                    self._embedding_service.close()
                 self._embedding_service = None
                 logger.info("统一模型管理器已关闭")
 
@@ -799,7 +841,7 @@ class EmbeddingEngine:
 
                 model_type = self._default_image_model
 
-            with self.monitor_operation(f"embed_text_{model_type}"):
+            with self.monitor_operation("embed_text", model_type, "text"):
 
                 try:
 
@@ -807,10 +849,6 @@ class EmbeddingEngine:
 
                     await self._ensure_models_loaded()
 
-                    # 标记模型使用时间
-
-                    self._mark_model_used(model_type)
-
                     # 检查内存状态
 
                     self.check_memory_and_adapt()
@@ -864,14 +902,13 @@ class EmbeddingEngine:
         if model_type is None:
             model_type = self._default_image_model
 
-        with self.monitor_operation(f"embed_texts_{model_type}"):
+        with self.monitor_operation(
+            "embed_texts", model_type, "text", items=len(texts)
+        ):
             try:
                 # 懒加载：确保模型已加载
                 await self._ensure_models_loaded()
 
-                # 标记模型使用时间
-                self._mark_model_used(model_type)
-
                 # 动态调整批处理大小
                 optimal_batch_size = self.get_optimal_batch_size()
 
@@ -920,6 +957,21 @@ class EmbeddingEngine:
         embeddings = await self.embed_images([image_path], model_type)
         return embeddings[0]
 
+    @staticmethod
+    async def _find_missing_files(paths: List[str]) -> List[str]:
+        """
+        在线程中检查文件是否存在，避免慢速磁盘或网络存储阻塞事件循环
+
+        Args:
+            paths: 文件路径列表
+
+        Returns:
+            不存在的文件路径
+        """
+        return await asyncio.to_thread(
+            lambda: [path for path in paths if not os.path.exists(path)]
+        )
+
     async def embed_images(
         self, image_paths: Union[str, List[str]], model_type: str = None
     ) -> List[List[float]]:
@@ -949,19 +1001,18 @@ class EmbeddingEngine:
         if model_type is None:
             model_type = self._default_image_model
 
-        with self.monitor_operation(f"embed_images_{model_type}"):
+        with self.monitor_operation(
+            "embed_images", model_type, "image", items=len(image_paths)
+        ):
             try:
                 # 验证图像文件存在
-                for image_path in image_paths:
-                    if not os.path.exists(image_path):
-                        raise FileNotFoundError(f"图像文件不存在: {image_path}")
+                missing = await self._find_missing_files(image_paths)
+                if missing:
+                    raise FileNotFoundError(f"图像文件不存在: {missing[0]}")
 
                 # 懒加载：确保模型已加载
                 await self._ensure_models_loaded()
 
-                # 标记模型使用时间
-                self._mark_model_used(model_type)
-
                 # 使用EmbeddingService统一向量化接口（按照设计文档要求）
                 # 预处理在ImagePreprocessor中完成，这里直接传递文件路径
                 embeddings = await self._embedding_service.embed(
@@ -991,6 +1042,7 @@ class EmbeddingEngine:
         start_time: float = 0.0,
         end_time: Optional[float] = None,
         aggregation: str = "mean",
+        model_type: str = None,
     ) -> List[float]:
         """
         视频片段向量化（使用统一的EmbeddingService，基于Infinity框架）
@@ -1003,6 +1055,7 @@ class EmbeddingEngine:
             start_time: 开始时间（秒）
             end_time: 结束时间（秒）
             aggregation: 特征聚合策略（mean/max/weighted）
+            model_type: 模型类型，默认为图像/视频模型
 
         Returns:
             向量嵌入
@@ -1012,24 +1065,24 @@ class EmbeddingEngine:
             ValueError: 无效的视频片段时长
             RuntimeError: 模型未初始化
         """
-        with self.monitor_operation(f"embed_video_segment"):
+        if model_type is None:
+            model_type = self._default_image_model
+
+        with self.monitor_operation("embed_video_segment", model_type, "video"):
             try:
-                if not os.path.exists(video_path):
+                if await self._find_missing_files([video_path]):
                     raise FileNotFoundError(f"视频文件不存在: {video_path}")
 
                 # 懒加载：确保模型已加载
                 await self._ensure_models_loaded()
 
-                # 标记模型使用时间
-                self._mark_model_used(self._default_image_model)
-
                 # 检查内存状态
                 self.check_memory_and_adapt()
 
                 # 使用统一的EmbeddingService进行视频向量化
                 # model_manager的embed方法会使用VideoPreprocessor进行预处理
                 embedding = await self._embedding_service.embed(
-                    self._default_image_model, [video_path], input_type="video"
+                    model_type, [video_path], input_type="video"
                 )
                 result = embedding[0]
 
@@ -1063,9 +1116,9 @@ class EmbeddingEngine:
             FileNotFoundError: 视频文件不存在
             RuntimeError: 模型未初始化
         """
-        with self.monitor_operation("embed_video"):
+        with self.monitor_operation("embed_video", modality="video"):
             try:
-                if not os.path.exists(video_path):
+                if await self._find_missing_files([video_path]):
                     raise FileNotFoundError(f"视频文件不存在: {video_path}")
 
                 # 直接调用embed_video_segment，由它调用model_manager进行预处理和向量化
@@ -1106,15 +1159,15 @@ class EmbeddingEngine:
         if model_type is None:
             model_type = self._default_audio_model
 
-        with self.monitor_operation(f"embed_audio_{model_type}"):
+        with self.monitor_operation(
+            "embed_audio", model_type, "text" if is_text_query else "audio"
+        ):
             try:
-                if not is_text_query and not os.path.exists(audio_path):
+                if not is_text_query and await self._find_missing_files([audio_path]):
                     raise FileNotFoundError(f"音频文件不存在: {audio_path}")
 
                 await self._ensure_models_loaded()
 
-                self._mark_model_used(model_type)
-
                 self.check_memory_and_adapt()
 
                 if is_text_query:
@@ -1143,6 +1196,95 @@ class EmbeddingEngine:
                 logger.error(f"音频向量化失败: {e}")
                 raise RuntimeError(f"音频向量化失败: {e}") from e
 
+    async def embed_multi_vector(
+        self,
+        inputs: Union[str, List[str]],
+        input_type: str = "image",
+        model_type: str = None,
+    ) -> List[np.ndarray]:
+        """
+        多向量化（ColQwen等后期交互模型，用于MultiVectorStore）
+
+        Args:
+            inputs: 文本，或图像/视频/音频文件路径
+            input_type: 输入类型（'text', 'image', 'audio', 'video'）
+            model_type: 模型类型，默认为图片模型
+
+        Returns:
+            每个输入一个float32矩阵（token数 x 维度）
+
+        Raises:
+            FileNotFoundError: 媒体文件不存在
+            RuntimeError: 模型未初始化
+        """
+        if isinstance(inputs, str):
+            inputs = [inputs]
+        if model_type is None:
+            model_type = self._default_image_model
+
+        with self.monitor_operation(
+            "embed_multi_vector", model_type, input_type, items=len(inputs)
+        ):
+            if input_type != "text":
+                missing = await self._find_missing_files(inputs)
+                if missing:
+                    raise FileNotFoundError(f"文件不存在: {missing[0]}")
+
+            await self._ensure_models_loaded()
+
+            if not self._model_manager.is_multi_vector(model_type):
+                logger.warning(f"模型不是多向量模型，每个输入只有一个向量: {model_type}")
+
+            return await self._embedding_service.embed_multi_vector(
+                model_type, inputs, input_type=input_type
+            )
+
+    def _add_model_config(self, model_id: str) -> None:
+        """从available_models补充不在active_models中的模型配置"""
+        if model_id in self._model_configs:
+            return
+        configs = ModelManager.load_configs_from_yaml(
+            {
+                "available_models": self.models_config.get("available_models", {}),
+                "active_models": [model_id],
+            }
+        )
+        if model_id not in configs:
+            raise ValueError(f"未找到模型: {model_id}")
+        self._model_configs[model_id] = configs[model_id]
+
+    async def ensure_model_registered(self, model_id: str) -> None:
+        """
+        注册并加载一个未在active_models中的模型（用于向量迁移）
+
+        Args:
+            model_id: available_models中的模型ID
+
+        Raises:
+            ValueError: 模型不在可用模型列表中
+        """
+        self._add_model_config(model_id)
+        await self._ensure_models_loaded()
+        if model_id not in self._model_manager.get_registered_models():
+            await self._model_manager.register_model(
+                model_id, self._model_configs[model_id]
+            )
+
+    def set_default_visual_model(self, model_id: str) -> None:
+        """
+        切换默认的图像/视频/文本模型（向量表切换时同步调用）
+
+        Args:
+            model_id: 模型ID
+
+        Raises:
+            ValueError: 模型不在可用模型列表中
+        """
+        self._add_model_config(model_id)
+        self._default_image_model = model_id
+        self._default_text_model = model_id
+        logger.info(f"默认图像/视频/文本模型已切换: {model_id}")
+
     def get_embedding_dim(self, model_type: str = None) -> int:
         """
         获取嵌入维度（基于Infinity框架）
@@ -1161,6 +1303,22 @@ class EmbeddingEngine:
         else:
             return 512
 
+    def is_multi_vector(self, model_type: str = None) -> bool:
+        """
+        判断模型是否输出多向量（池化方式为none，如ColQwen）
+
+        Args:
+            model_type: 模型类型，默认为图片模型
+
+        Returns:
+            是否为多向量模型
+        """
+        if model_type is None:
+            model_type = self._default_image_model
+
+        config = self._model_configs.get(model_type)
+        return config is not None and config.pooling_method == "none"
+
     async def embed_text(self, text: str, model_type: str = None) -> List[float]:
         """
         文本向量化（使用统一的EmbeddingService，基于Infinity框架）
@@ -1184,14 +1342,11 @@ class EmbeddingEngine:
         if model_type is None:
             model_type = self._default_text_model  # 使用文本模型进行文本向量化
 
-        with self.monitor_operation(f"embed_text_{model_type}"):
+        with self.monitor_operation("embed_text", model_type, "text"):
             try:
                 # 懒加载：确保模型已加载
                 await self._ensure_models_loaded()
 
-                # 标记模型使用时间
-                self._mark_model_used(model_type)
-
                 # 检查内存状态
                 self.check_memory_and_adapt()
 
@@ -1224,6 +1379,7 @@ class EmbeddingEngine:
                 "embedding_dim": model_config.embedding_dim,
                 "batch_size": model_config.batch_size,
                 "dtype": model_config.dtype,
+                "quantization": model_config.quantization,
             }
 
         model_info["total_models"] = len(self._model_configs)
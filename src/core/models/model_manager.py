@@ -9,15 +9,36 @@
 """
 
 from typing import Dict, Optional, List, Union, Any
+from contextlib import asynccontextmanager
 from dataclasses import dataclass
 from pathlib import Path
 import asyncio
+import io
+import json
 import logging
 import os
+import sys
 import tempfile
+import time
+import wave
+
+import numpy as np
+
+from src.core.models.quantization import SUPPORTED_QUANTIZATION, quantize_engine
+from src.core.models.weight_cache import WeightCache
+from src.core.utils.metrics import get_metrics_registry
+from src.core.utils.model_memory_manager import ModelMemoryManager
 
 logger = logging.getLogger(__name__)
 
+# 预热输入：与实际预处理输出一致（图像由处理器缩放，音频为48kHz单声道WAV）
+WARMUP_IMAGE_SIZE = (224, 224)
+WARMUP_AUDIO_SAMPLE_RATE = 48000
+WARMUP_AUDIO_SECONDS = 1.0
+
+# 池化方式：none表示保留后期交互模型（ColQwen等）每个token/patch的向量
+SUPPORTED_POOLING_METHODS = ("mean", "cls", "auto", "none")
+
 
 @dataclass
 class ModelConfig:
@@ -33,6 +54,7 @@ class ModelConfig:
     compile: bool = False
     batch_size: int = 16
     local_path: Optional[str] = None
+    quantization: Optional[str] = None
 
     def __post_init__(self):
         """验证配置"""
@@ -64,6 +86,13 @@ class ModelConfig:
                 f"支持的类型: {', '.join(valid_dtypes)}"
             )
 
+        # 验证池化方式
+        if self.pooling_method not in SUPPORTED_POOLING_METHODS:
+            raise ValueError(
+                f"不支持的池化方式: {self.pooling_method}。"
+                f"支持的池化方式: {', '.join(SUPPORTED_POOLING_METHODS)}"
+            )
+
         # 验证向量维度
         if self.embedding_dim <= 0:
             raise ValueError("向量维度必须大于0")
@@ -72,6 +101,18 @@ class ModelConfig:
         if self.batch_size <= 0:
             raise ValueError("批处理大小必须大于0")
 
+        # 验证量化方式：动态int8量化只用于CPU上的float32模型
+        if self.quantization is not None:
+            if self.quantization not in SUPPORTED_QUANTIZATION:
+                raise ValueError(
+                    f"不支持的量化方式: {self.quantization}。"
+                    f"支持的量化方式: {', '.join(SUPPORTED_QUANTIZATION)}"
+                )
+            if self.engine != "torch" or "cpu" not in self.device.lower():
+                raise ValueError("量化推理只支持torch引擎和cpu设备")
+            if self.dtype != "float32":
+                raise ValueError("量化推理要求模型数据类型为float32")
+
 
 class ModelManager:
     """
@@ -79,18 +120,56 @@ class ModelManager:
 
     负责管理所有模型的加载、卸载、切换等操作。
     支持配置驱动的模型管理和热切换功能。
+
+    已注册的模型不一定常驻内存：超出内存预算或空闲超时的模型会被停止，
+    下次请求时透明地重新加载，同一模型的并发请求共享一次加载。
     """
 
     # Infinity 客户端类型（延迟导入）
     _AsyncEmbeddingEngine = None
     _EngineArgs = None
 
-    def __init__(self):
+    # 估算模型大小时计入的权重文件
+    _WEIGHT_SUFFIXES = (".safetensors", ".bin", ".pt", ".pth", ".onnx")
+
+    def __init__(
+        self,
+        memory_manager: Optional[ModelMemoryManager] = None,
+        parallel_loading: bool = True,
+        warmup: bool = False,
+        weight_cache: Optional[WeightCache] = None,
+    ):
+        """
+        初始化模型管理器
+
+        Args:
+            memory_manager: 模型内存管理器，None表示不限制常驻模型
+            parallel_loading: 初始化时是否并发加载模型
+            warmup: 模型加载后是否用典型批大小预热
+            weight_cache: 转换后权重的磁盘缓存，None表示直接加载源权重
+        """
+        self.parallel_loading = parallel_loading
+        self.warmup = warmup
+        self.weight_cache = weight_cache
+
         self._models: Dict[str, "AsyncEmbeddingEngine"] = {}
+        # 已注册模型的配置，模型被驱逐后保留，用于重新加载
         self._configs: Dict[str, ModelConfig] = {}
         self._lock = asyncio.Lock()
         self._initialized = False
 
+        # 正在加载的模型（同一模型的并发请求等待同一个加载任务）
+        self._loading: Dict[str, asyncio.Future] = {}
+        # 正在使用的模型引用计数，使用中的模型不会被驱逐
+        self._in_use: Dict[str, int] = {}
+        # 模型图像输入分辨率（从模型预处理配置读取）
+        self._input_resolutions: Dict[str, Optional[int]] = {}
+
+        self.memory_manager = memory_manager or ModelMemoryManager(
+            max_models_in_memory=None, inactive_timeout=None
+        )
+        self.memory_manager.unload_callback = self.evict_model
+
     @staticmethod
     def load_configs_from_yaml(models_config: Dict[str, Any]) -> Dict[str, ModelConfig]:
         """
@@ -124,6 +203,7 @@ class ModelManager:
                 compile=model_data.get("compile", False),
                 batch_size=model_data.get("batch_size", 16),
                 local_path=model_data.get("local_path"),
+                quantization=model_data.get("quantization"),
             )
             configs[model_id] = config
             logger.info(f"加载模型配置: {model_id} -> {config.name}")
@@ -159,17 +239,43 @@ class ModelManager:
 
         logger.info(f"正在初始化模型管理器，将加载 {len(configs)} 个模型...")
 
-        # 加载所有模型
-        for model_type, config in configs.items():
-            try:
-                await self.register_model(model_type, config)
-                logger.info(f"模型 {model_type} 加载成功: {config.name}")
-            except Exception as e:
-                logger.error(f"模型 {model_type} 加载失败: {e}")
-                raise
+        start_time = time.perf_counter()
+        self._configs.update(configs)
+
+        # 没有常驻限制时并发加载；有限制时逐个加载，
+        # 以便每个模型的内存占用测量准确，超出预算时较早加载的模型被驱逐
+        limited = (
+            self.memory_manager.memory_budget_gb is not None
+            or self.memory_manager.max_models_in_memory is not None
+        )
+        if self.parallel_loading and not limited:
+            results = await asyncio.gather(
+                *(self._ensure_resident(model_type) for model_type in configs),
+                return_exceptions=True,
+            )
+        else:
+            results = []
+            for model_type in configs:
+                try:
+                    results.append(await self._ensure_resident(model_type))
+                except Exception as e:
+                    results.append(e)
+                    break
+
+        for (model_type, config), result in zip(configs.items(), results):
+            if isinstance(result, BaseException):
+                logger.error(f"模型 {model_type} 加载失败: {result}")
+                raise result
+            logger.info(f"模型 {model_type} 加载成功: {config.name}")
+
+        if self.memory_manager.inactive_timeout is not None:
+            await self.memory_manager.start_cleanup_task()
 
         self._initialized = True
-        logger.info(f"模型管理器初始化完成，已加载 {len(self._models)} 个模型")
+        logger.info(
+            f"模型管理器初始化完成，已加载 {len(self._models)} 个模型，"
+            f"耗时 {time.perf_counter() - start_time:.2f}s"
+        )
 
     async def register_model(
         self, model_type: str, config: ModelConfig
@@ -188,42 +294,44 @@ class ModelManager:
             ValueError: 如果模型配置无效
             RuntimeError: 如果模型加载失败
         """
-        async with self._lock:
-            # 如果模型已存在，直接返回
-            if model_type in self._models:
-                logger.info(f"模型 {model_type} 已加载，跳过重复加载")
-                return self._models[model_type]
+        # 如果模型已存在，直接返回
+        if model_type in self._models:
+            logger.info(f"模型 {model_type} 已加载，跳过重复加载")
+            return self._models[model_type]
 
-            logger.info(f"正在加载模型: {config.name} (type={model_type})")
+        # 不持有全局锁加载，不同模型可以并行加载；同一模型的并发注册共享一次加载
+        self._configs[model_type] = config
+        return await self._ensure_resident(model_type)
 
-            self._ensure_imports()
+    @staticmethod
+    def _resolve_model_path(config: ModelConfig) -> str:
+        """
+        确定模型路径：相对路径优先解析到项目根目录下的本地模型
 
-            # 确定模型路径
-            model_path = config.local_path or config.name
+        Args:
+            config: 模型配置
 
-            # 检查本地模型是否存在
-            if model_path and not os.path.isabs(model_path):
-                # 尝试相对于项目根目录
-                project_root = os.environ.get("PROJECT_ROOT", os.getcwd())
-                absolute_path = os.path.join(project_root, model_path)
-                if os.path.exists(absolute_path):
-                    logger.info(f"本地模型存在: {absolute_path}")
-                    model_path = absolute_path
-                else:
-                    logger.info(f"使用HuggingFace模型: {model_path}")
+        Returns:
+            模型路径或HuggingFace模型名
+        """
+        model_path = config.local_path or config.name
+
+        # 检查本地模型是否存在
+        if model_path and not os.path.isabs(model_path):
+            # 尝试相对于项目根目录
+            project_root = os.environ.get("PROJECT_ROOT", os.getcwd())
+            absolute_path = os.path.join(project_root, model_path)
+            if os.path.exists(absolute_path):
+                logger.info(f"本地模型存在: {absolute_path}")
+                model_path = absolute_path
+            else:
+                logger.info(f"使用HuggingFace模型: {model_path}")
 
-            logger.info(f"使用模型路径: {model_path}")
-
-            # 所有模型都通过Infinity统一调用
-            try:
-                return await self._load_model(model_type, config, model_path)
-            except Exception as e:
-                logger.error(f"使用Infinity加载模型失败: {e}")
-                raise RuntimeError(f"模型加载失败: {e}") from e
+        return model_path
 
     async def get_model(self, model_type: str) -> "AsyncEmbeddingEngine":
         """
-        获取已加载的模型
+        获取模型，已被驱逐的模型会重新加载
 
         Args:
             model_type: 模型类型
@@ -232,13 +340,201 @@ class ModelManager:
             Infinity 客户端实例
 
         Raises:
-            ValueError: 如果模型未加载
+            ValueError: 如果模型未注册
         """
-        if model_type not in self._models:
-            raise ValueError(
-                f"未找到模型: {model_type}。已加载的模型: {list(self._models.keys())}"
-            )
-        return self._models[model_type]
+        client = self._models.get(model_type)
+        if client is None:
+            if model_type not in self._configs:
+                raise ValueError(
+                    f"未找到模型: {model_type}。已注册的模型: {list(self._configs.keys())}"
+                )
+            client = await self._ensure_resident(model_type)
+        self.memory_manager.mark_model_used(model_type)
+        return client
+
+    @asynccontextmanager
+    async def use_model(self, model_type: str):
+        """
+        在使用期间持有模型，防止模型在推理过程中被驱逐
+
+        Args:
+            model_type: 模型类型
+
+        Yields:
+            Infinity 客户端实例
+        """
+        self._in_use[model_type] = self._in_use.get(model_type, 0) + 1
+        try:
+            yield await self.get_model(model_type)
+        finally:
+            self._in_use[model_type] -= 1
+            if not self._in_use[model_type]:
+                del self._in_use[model_type]
+
+    async def _ensure_resident(self, model_type: str) -> "AsyncEmbeddingEngine":
+        """
+        确保模型常驻内存，并发调用共享同一个加载任务
+
+        Args:
+            model_type: 模型类型
+
+        Returns:
+            Infinity 客户端实例
+        """
+        client = self._models.get(model_type)
+        if client is not None:
+            return client
+
+        future = self._loading.get(model_type)
+        if future is None:
+            future = asyncio.ensure_future(self._load_resident(model_type))
+            self._loading[model_type] = future
+
+            def _done(_, model_type=model_type, future=future):
+                if self._loading.get(model_type) is future:
+                    del self._loading[model_type]
+
+            future.add_done_callback(_done)
+        else:
+            logger.debug(f"等待正在进行的模型加载: {model_type}")
+
+        # shield：单个请求被取消时不影响其他等待同一加载的请求
+        return await asyncio.shield(future)
+
+    async def _load_resident(self, model_type: str) -> "AsyncEmbeddingEngine":
+        """
+        按内存预算腾出空间后加载模型
+
+        Args:
+            model_type: 模型类型
+
+        Returns:
+            Infinity 客户端实例
+        """
+        config = self._configs[model_type]
+        size_gb = self.memory_manager.get_model_size(model_type)
+        if size_gb is None:
+            size_gb = self._estimate_model_size_gb(config)
+
+        candidates = await self.memory_manager.get_unload_candidates(
+            incoming_size_gb=size_gb,
+            exclude={model_type, *self._in_use, *self._loading},
+        )
+        for candidate in candidates:
+            await self.evict_model(candidate)
+
+        if self.memory_manager.get_model_size(model_type) is not None:
+            logger.info(f"重新加载已驱逐的模型: {model_type}")
+
+        logger.info(f"正在加载模型: {config.name} (type={model_type})")
+
+        self._ensure_imports()
+
+        model_path = self._resolve_model_path(config)
+        logger.info(f"使用模型路径: {model_path}")
+
+        # 所有模型都通过Infinity统一调用
+        try:
+            return await self._load_model(model_type, config, model_path)
+        except Exception as e:
+            logger.error(f"使用Infinity加载模型失败: {e}")
+            raise RuntimeError(f"模型加载失败: {e}") from e
+
+    @classmethod
+    def _estimate_model_size_gb(cls, config: ModelConfig) -> float:
+        """
+        按本地权重文件大小估算模型内存占用（首次加载前使用）
+
+        Args:
+            config: 模型配置
+
+        Returns:
+            估算的大小（GB），模型不在本地时返回0
+        """
+        model_path = Path(cls._resolve_model_path(config))
+        if not model_path.is_dir():
+            return 0.0
+        total_bytes = sum(
+            path.stat().st_size
+            for path in model_path.rglob("*")
+            if path.suffix in cls._WEIGHT_SUFFIXES and path.is_file()
+        )
+        return total_bytes / 1024**3
+
+    @staticmethod
+    def _measure_memory_gb() -> Optional[float]:
+        """
+        读取进程当前的内存占用（常驻内存加已分配的显存）
+
+        Returns:
+            内存占用（GB），无法读取时返回None
+        """
+        try:
+            import psutil
+
+            used_bytes = psutil.Process().memory_info().rss
+        except Exception:
+            return None
+
+        # 只有torch已被导入时才读取显存，避免为测量而导入torch
+        torch = sys.modules.get("torch")
+        if torch is not None:
+            try:
+                if torch.cuda.is_available():
+                    used_bytes += torch.cuda.memory_allocated()
+            except Exception:
+                pass
+        return used_bytes / 1024**3
+
+    def is_multi_vector(self, model_type: str) -> bool:
+        """
+        判断模型是否输出多向量（每个token/patch一个向量）
+
+        Args:
+            model_type: 模型类型
+
+        Returns:
+            模型池化方式为none时返回True
+        """
+        config = self._configs.get(model_type)
+        return config is not None and config.pooling_method == "none"
+
+    def get_input_resolution(self, model_type: str) -> Optional[int]:
+        """
+        读取模型图像处理器的输入分辨率（preprocessor_config.json中的短边尺寸）
+
+        Args:
+            model_type: 模型类型
+
+        Returns:
+            输入分辨率，模型不在本地或未配置时返回None
+        """
+        if model_type in self._input_resolutions:
+            return self._input_resolutions[model_type]
+
+        config = self._configs.get(model_type)
+        if config is None:
+            return None
+        path = Path(self._resolve_model_path(config)) / "preprocessor_config.json"
+        try:
+            with open(path, "r", encoding="utf-8") as f:
+                size = json.load(f).get("size")
+        except (OSError, ValueError):
+            size = None
+        if isinstance(size, dict):
+            size = size.get("shortest_edge") or size.get("height")
+
+        self._input_resolutions[model_type] = int(size) if size else None
+        return self._input_resolutions[model_type]
+
+    def get_registered_models(self) -> List[str]:
+        """
+        获取已注册的模型列表（包括被驱逐、使用时才加载的模型）
+
+        Returns:
+            模型类型列表
+        """
+        return list(self._configs.keys())
 
     async def get_config(self, model_type: str) -> ModelConfig:
         """
@@ -269,7 +565,19 @@ class ModelManager:
         Returns:
             Infinity客户端对象
         """
+        memory_before = self._measure_memory_gb()
+        start_time = time.perf_counter()
         try:
+            # 优先使用已转换为目标精度的safetensors权重
+            if self.weight_cache is not None:
+                model_path = await asyncio.to_thread(
+                    self.weight_cache.resolve,
+                    model_path,
+                    config.engine,
+                    config.dtype,
+                    config.trust_remote_code,
+                )
+
             # 创建引擎参数
             engine_args = self._EngineArgs(
                 model_name_or_path=model_path,
@@ -279,19 +587,50 @@ class ModelManager:
                 trust_remote_code=config.trust_remote_code,
                 compile=config.compile,
                 embedding_dtype="float32",
-                pooling_method=config.pooling_method,
+                # 多向量模型由Infinity按模型类型输出，不做池化
+                pooling_method=(
+                    "auto" if config.pooling_method == "none" else config.pooling_method
+                ),
                 batch_size=config.batch_size,
             )
 
             # 创建并启动 Infinity 客户端
-            client = self._AsyncEmbeddingEngine.from_args(engine_args)
+            # from_args在构造时同步读取权重，放到线程中执行，
+            # 多个模型可以并行加载，也不会阻塞事件循环
+            client = await asyncio.to_thread(
+                self._AsyncEmbeddingEngine.from_args, engine_args
+            )
+            if config.quantization:
+                await asyncio.to_thread(quantize_engine, client, config.quantization)
             await client.astart()
 
+            if self.warmup:
+                await self._warmup_model(model_type, client, config)
+
             # 存储模型和配置
             self._models[model_type] = client
             self._configs[model_type] = config
 
-            logger.info(f"✓ 模型加载成功: {config.name} (type={model_type})")
+            # 记录实际内存占用，测量不可用时按权重文件估算
+            memory_after = self._measure_memory_gb()
+            size_gb = 0.0
+            if memory_before is not None and memory_after is not None:
+                size_gb = max(memory_after - memory_before, 0.0)
+            if size_gb <= 0.0:
+                size_gb = self._estimate_model_size_gb(config)
+            await self.memory_manager.track_model(model_type, size_gb)
+
+            load_seconds = time.perf_counter() - start_time
+            get_metrics_registry().histogram(
+                "msearch_model_load_duration_seconds",
+                "Model load time including weight conversion and warm-up",
+                model=model_type,
+            ).observe(load_seconds)
+
+            logger.info(
+                f"✓ 模型加载成功: {config.name} (type={model_type}), "
+                f"耗时 {load_seconds:.2f}s"
+            )
             return client
 
         except Exception as e:
@@ -301,6 +640,79 @@ class ModelManager:
             logger.error(f"详细错误: {traceback.format_exc()}")
             raise RuntimeError(f"模型加载失败: {e}") from e
 
+    @staticmethod
+    def _warmup_image():
+        """生成预热用的图像"""
+        from PIL import Image
+
+        return Image.new("RGB", WARMUP_IMAGE_SIZE, (127, 127, 127))
+
+    @staticmethod
+    def _warmup_audio() -> bytes:
+        """生成预热用的静音WAV"""
+        buffer = io.BytesIO()
+        with wave.open(buffer, "wb") as wav_file:
+            wav_file.setnchannels(1)
+            wav_file.setsampwidth(2)
+            wav_file.setframerate(WARMUP_AUDIO_SAMPLE_RATE)
+            wav_file.writeframes(
+                b"\x00\x00" * int(WARMUP_AUDIO_SAMPLE_RATE * WARMUP_AUDIO_SECONDS)
+            )
+        return buffer.getvalue()
+
+    async def _warmup_model(self, model_type: str, client, config: ModelConfig):
+        """
+        用单条查询和满批两种形状预热模型支持的每种输入
+
+        首次推理的内核选择、内存分配和处理器初始化在这里完成，
+        而不是落在第一个搜索或索引请求上。预热失败不影响模型加载。
+
+        Args:
+            model_type: 模型类型
+            client: Infinity 客户端实例
+            config: 模型配置
+        """
+        capabilities = getattr(client, "capabilities", None) or {"embed"}
+        start_time = time.perf_counter()
+        try:
+            for batch_size in sorted({1, config.batch_size}):
+                if "embed" in capabilities:
+                    await client.embed(["warmup"] * batch_size)
+                if "image_embed" in capabilities:
+                    await client.image_embed(images=[self._warmup_image()] * batch_size)
+                if "audio_embed" in capabilities:
+                    await client.audio_embed(audios=[self._warmup_audio()] * batch_size)
+            logger.info(
+                f"模型预热完成: {model_type}, 耗时 {time.perf_counter() - start_time:.2f}s"
+            )
+        except Exception as e:
+            logger.warning(f"模型预热失败: {model_type}, 错误: {e}")
+
+    async def evict_model(self, model_type: str) -> bool:
+        """
+        停止模型的Infinity引擎以释放内存，保留配置以便下次使用时重新加载
+
+        Args:
+            model_type: 模型类型
+
+        Returns:
+            是否已驱逐（正在使用或未加载的模型不会被驱逐）
+        """
+        async with self._lock:
+            if model_type not in self._models or self._in_use.get(model_type):
+                return False
+
+            # 先移除引用，驱逐期间到达的请求会触发重新加载而不是使用正在停止的引擎
+            client = self._models.pop(model_type)
+            try:
+                await client.astop()
+                logger.info(f"模型已驱逐: {model_type} ({self._configs[model_type].name})")
+            except Exception as e:
+                logger.error(f"驱逐模型失败: {model_type}, 错误: {e}")
+
+        await self.memory_manager.unload_model(model_type)
+        return True
+
     async def unload_model(self, model_type: str):
         """
         卸载模型
@@ -320,7 +732,8 @@ class ModelManager:
                     logger.error(f"卸载模型失败: {e}")
 
                 del self._models[model_type]
-                del self._configs[model_type]
+            self._configs.pop(model_type, None)
+            self.memory_manager.forget_model(model_type)
 
     async def switch_model(self, model_type: str, new_config: ModelConfig) -> bool:
         """
@@ -365,6 +778,10 @@ class ModelManager:
             logger.info("步骤4: 切换到新模型")
             self._models[model_type] = new_client
             self._configs[model_type] = new_config
+            await self.memory_manager.track_model(
+                model_type, self.memory_manager.get_model_size(temp_model_type) or 0.0
+            )
+            self.memory_manager.forget_model(temp_model_type)
 
             # 5. 清理临时模型
             if temp_model_type in self._models:
@@ -378,9 +795,8 @@ class ModelManager:
         except Exception as e:
             logger.error(f"模型切换失败: {e}")
 
-            # 清理临时模型
-            if temp_model_type in self._models:
-                await self.unload_model(temp_model_type)
+            # 清理临时模型（加载失败时也要移除已注册的临时配置）
+            await self.unload_model(temp_model_type)
 
             logger.info("模型切换已回滚，继续使用旧模型")
             return False
@@ -389,6 +805,8 @@ class ModelManager:
         """
         关闭所有模型
         """
+        await self.memory_manager.stop_cleanup_task()
+
         async with self._lock:
             logger.info("正在关闭所有模型...")
 
@@ -398,6 +816,7 @@ class ModelManager:
                     logger.info(f"模型已关闭: {model_type}")
                 except Exception as e:
                     logger.error(f"关闭模型失败: {model_type}, 错误: {e}")
+                self.memory_manager.forget_model(model_type)
 
             self._models.clear()
             self._configs.clear()
@@ -431,8 +850,31 @@ class EmbeddingService:
     提供统一的向量化接口，支持文本、图像、音频等多种类型的向量化。
     """
 
-    def __init__(self, model_manager: ModelManager):
+    def __init__(self, model_manager: ModelManager, config: Optional[Dict[str, Any]] = None):
+        """
+        初始化向量化服务
+
+        Args:
+            model_manager: 模型管理器
+            config: 完整配置（用于媒体预处理器）
+        """
         self._model_manager = model_manager
+        self._config = config or {}
+        self._media_decoder = None
+
+    def _get_media_decoder(self):
+        """获取媒体解码调度器（首次使用时创建，持有解码进程池和I/O线程池）"""
+        if self._media_decoder is None:
+            from src.services.media.media_decoder import MediaDecoder
+
+            self._media_decoder = MediaDecoder(self._config)
+        return self._media_decoder
+
+    def close(self):
+        """释放预处理资源（解码进程池和I/O线程池）"""
+        if self._media_decoder is not None:
+            self._media_decoder.shutdown()
+            self._media_decoder = None
 
     async def embed(
         self, model_type: str, inputs: Union[str, List[str]], input_type: str = "text"
@@ -443,13 +885,60 @@ class EmbeddingService:
         Args:
             model_type: 模型类型
             inputs: 输入数据，可以是字符串或字符串列表
-            input_type: 输入类型（'text', 'image', 'audio'）
+            input_type: 输入类型（'text', 'image', 'audio', 'video'）
 
         Returns:
-            向量列表，每个向量是一个 float 列表
+            向量列表，每个向量是一个 float 列表；多向量模型的输出按均值池化
         """
-        client = await self._model_manager.get_model(model_type)
+        embeddings = await self._embed_raw(model_type, inputs, input_type)
+        return [self._to_single_vector(embedding) for embedding in embeddings]
+
+    async def embed_multi_vector(
+        self, model_type: str, inputs: Union[str, List[str]], input_type: str = "image"
+    ) -> List[np.ndarray]:
+        """
+        多向量接口：保留每个token/patch的向量（用于ColQwen等后期交互模型）
+
+        Args:
+            model_type: 模型类型
+            inputs: 输入数据，可以是字符串或字符串列表
+            input_type: 输入类型（'text', 'image', 'audio', 'video'）
+
+        Returns:
+            每个输入一个float32矩阵（token数 x 维度），单向量模型的输出为1行
+        """
+        embeddings = await self._embed_raw(model_type, inputs, input_type)
+        return [
+            np.atleast_2d(np.asarray(embedding, dtype=np.float32))
+            for embedding in embeddings
+        ]
+
+    @staticmethod
+    def _to_single_vector(embedding) -> List[float]:
+        """把模型输出转换为单个向量（多向量输出按token取均值）"""
+        if isinstance(embedding, list) and not (
+            embedding and isinstance(embedding[0], (list, np.ndarray))
+        ):
+            return embedding
+        embedding = np.asarray(embedding, dtype=np.float32)
+        if embedding.ndim == 2:
+            embedding = embedding.mean(axis=0)
+        return embedding.tolist()
+
+    async def _embed_raw(
+        self, model_type: str, inputs: Union[str, List[str]], input_type: str
+    ) -> List[Any]:
+        """
+        向量化并返回模型的原始输出
+
+        Args:
+            model_type: 模型类型
+            inputs: 输入数据，可以是字符串或字符串列表
+            input_type: 输入类型
 
+        Returns:
+            每个输入一个向量（单向量模型）或矩阵（多向量模型）
+        """
         # 确保输入是列表
         if isinstance(inputs, str):
             inputs = [inputs]
@@ -462,96 +951,87 @@ class EmbeddingService:
         if not inputs:
             return []
 
+        # 先解码媒体再占用模型：解码期间模型可以服务其他请求，也可以被驱逐
+        try:
+            payload = await self._prepare_inputs(model_type, inputs, input_type)
+        except Exception as e:
+            logger.error(f"向量化失败: {e}")
+            raise RuntimeError(f"向量化失败: {e}") from e
+
+        # 向量化期间持有模型，被驱逐的模型在这里重新加载
+        async with self._model_manager.use_model(model_type) as client:
+            return await self._embed_with_client(client, payload, input_type)
+
+    async def _prepare_inputs(
+        self, model_type: str, inputs: List[str], input_type: str
+    ) -> List[Any]:
+        """
+        把输入转换为模型可接受的数据
+
+        媒体文件的检查和解码由MediaDecoder在I/O线程池和解码进程池中执行，
+        不阻塞事件循环。
+
+        Args:
+            model_type: 模型类型
+            inputs: 非空输入列表
+            input_type: 输入类型
+
+        Returns:
+            文本列表、PIL Images列表或WAV数据列表
+
+        Raises:
+            FileNotFoundError: 媒体文件不存在
+            RuntimeError: 媒体解码失败
+            ValueError: 不支持的输入类型
+        """
+        if input_type == "text":
+            return inputs
+
+        paths = [path.strip() for path in inputs]
+        decoder = self._get_media_decoder()
+        if input_type == "image":
+            # 按模型输入分辨率解码，只把缩放后的图像交给模型，而不是原始文件字节
+            resolution = await asyncio.to_thread(
+                self._model_manager.get_input_resolution, model_type
+            )
+            return await decoder.decode_images(paths, resolution)
+        if input_type == "audio":
+            # 采样率转换（48kHz）、单声道转换、WAV格式
+            return await decoder.decode_audios(paths)
+        if input_type == "video":
+            # 每个视频抽取若干帧，按图像向量化
+            frames = await decoder.decode_video_frames(paths, max_frames=3)
+            if not frames:
+                raise RuntimeError("未能提取任何视频帧")
+            return frames
+        raise ValueError(f"不支持的输入类型: {input_type}")
+
+    async def _embed_with_client(
+        self, client, payload: List[Any], input_type: str
+    ) -> List[Any]:
+        """
+        使用指定的 Infinity 客户端向量化
+
+        Args:
+            client: Infinity 客户端实例
+            payload: _prepare_inputs返回的模型输入
+            input_type: 输入类型
+
+        Returns:
+            模型的原始输出列表
+        """
         # 使用 Infinity 进行向量化
         try:
             if input_type == "text":
-                embeddings, _ = await client.embed(inputs)
-            elif input_type == "image":
-                # 处理图像输入：Infinity框架的image_embed需要图像数据
-                # 读取本地图像文件为字节数据
-                valid_images = []
-                for image_path in inputs:
-                    image_path = image_path.strip()
-                    if os.path.exists(image_path):
-                        # 读取图像文件为字节数据
-                        try:
-                            with open(image_path, "rb") as f:
-                                image_bytes = f.read()
-                            valid_images.append(image_bytes)
-                            logger.debug(f"图像处理成功: {image_path}")
-                        except Exception as e:
-                            raise RuntimeError(f"读取图像文件失败: {image_path} - {e}")
-                    else:
-                        raise FileNotFoundError(f"图像文件不存在: {image_path}")
-
-                if not valid_images:
-                    raise ValueError("没有有效的图像文件")
-
-                embeddings, _ = await client.image_embed(images=valid_images)
+                embeddings, _ = await client.embed(payload)
+            elif input_type in ("image", "video"):
+                # 视频帧按图像向量化
+                embeddings, _ = await client.image_embed(images=payload)
             elif input_type == "audio":
-                # 使用AudioPreprocessor预处理音频（按照设计文档要求）
-                # 预处理包括：采样率转换（48kHz）、单声道转换、WAV格式
-                from src.services.media.audio_preprocessor import AudioPreprocessor
-
-                audio_preprocessor = AudioPreprocessor()
-
-                audio_data = []
-                for audio_path in inputs:
-                    audio_path = audio_path.strip()
-                    if os.path.exists(audio_path):
-                        # 使用AudioPreprocessor获取预处理后的音频bytes
-                        audio_bytes = audio_preprocessor.get_preprocessed_audio_bytes(
-                            audio_path
-                        )
-                        if audio_bytes:
-                            audio_data.append(audio_bytes)
-                            logger.debug(f"音频预处理成功: {audio_path}")
-                        else:
-                            raise RuntimeError(f"音频预处理失败: {audio_path}")
-                    else:
-                        raise FileNotFoundError(f"音频文件不存在: {audio_path}")
-
-                embeddings, _ = await client.audio_embed(audios=audio_data)
-            elif input_type == "video":
-                # 使用VideoPreprocessor预处理视频（按照设计文档要求）
-                # 预处理包括：视频分段、抽帧、转换为PIL Image
-                from src.services.media.video_preprocessor import VideoPreprocessor
-
-                video_preprocessor = VideoPreprocessor()
-
-                video_frames = []
-                for video_path in inputs:
-                    video_path = video_path.strip()
-                    if os.path.exists(video_path):
-                        # 使用VideoPreprocessor获取视频帧
-                        frames = video_preprocessor.get_video_frames(
-                            video_path, max_frames=3
-                        )
-                        if frames:
-                            video_frames.extend(frames)
-                            logger.debug(
-                                f"视频帧提取成功: {video_path}, {len(frames)}帧"
-                            )
-                        else:
-                            raise RuntimeError(f"视频帧提取失败: {video_path}")
-                    else:
-                        raise FileNotFoundError(f"视频文件不存在: {video_path}")
-
-                if not video_frames:
-                    raise RuntimeError("未能提取任何视频帧")
-
-                # 使用image_embed处理视频帧
-                embeddings, _ = await client.image_embed(images=video_frames)
+                embeddings, _ = await client.audio_embed(audios=payload)
             else:
                 raise ValueError(f"不支持的输入类型: {input_type}")
-
-            # 如果返回的是list，直接返回
-            if isinstance(embeddings, list) and all(
-                isinstance(e, list) for e in embeddings
-            ):
-                return embeddings
-            # 如果返回的是tensor，转换为list
-            return [embedding.tolist() for embedding in embeddings]
+            return list(embeddings)
         except Exception as e:
             logger.error(f"向量化失败: {e}")
             raise RuntimeError(f"向量化失败: {e}") from e
@@ -724,6 +1204,7 @@ async def shutdown_model_manager():
         _model_manager = None
 
     if _embedding_service:
+        _embedding_service.close()
         _embedding_service = None
 
     logger.info("全局模型管理器已关闭")
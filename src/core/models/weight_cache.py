@@ -0,0 +1,202 @@
+"""
+转换后模型权重的磁盘缓存
+
+首次加载时把模型权重转换为目标精度的safetensors并保存到缓存目录，之后的启动
+直接从缓存目录加载：safetensors通过mmap读取，无需反序列化pickle格式的.bin
+权重，也无需在加载后转换精度。源权重或目标精度变化时缓存自动失效并重新转换。
+"""
+
+import json
+import logging
+import shutil
+import tempfile
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+logger = logging.getLogger(__name__)
+
+# 计入缓存键的源权重文件
+WEIGHT_SUFFIXES = (".safetensors", ".bin", ".pt", ".pth")
+
+
+class WeightCache:
+    """
+    转换后模型权重的磁盘缓存
+
+    只处理torch引擎的本地模型；源权重已经是目标精度的safetensors时直接使用源目录。
+    """
+
+    MARKER_FILE = ".msearch_weight_cache.json"
+
+    def __init__(self, cache_dir: str):
+        """
+        初始化权重缓存
+
+        Args:
+            cache_dir: 缓存目录
+        """
+        self.cache_dir = Path(cache_dir)
+
+    @staticmethod
+    def _weight_files(model_dir: Path) -> List[Path]:
+        return sorted(
+            path
+            for path in model_dir.iterdir()
+            if path.is_file() and path.suffix in WEIGHT_SUFFIXES
+        )
+
+    def _cache_key(self, model_dir: Path, dtype: str) -> Dict[str, Any]:
+        """源权重文件（名称、大小、修改时间）和目标精度共同决定缓存是否有效"""
+        return {
+            "source": str(model_dir.resolve()),
+            "dtype": dtype,
+            "weights": [
+                [path.name, path.stat().st_size, int(path.stat().st_mtime)]
+                for path in self._weight_files(model_dir)
+            ],
+        }
+
+    @staticmethod
+    def _source_dtype(model_dir: Path) -> Optional[str]:
+        try:
+            with open(model_dir / "config.json", "r", encoding="utf-8") as f:
+                return json.load(f).get("torch_dtype")
+        except (OSError, ValueError):
+            return None
+
+    def needs_conversion(self, model_dir: Path, dtype: str) -> bool:
+        """
+        判断模型是否需要转换
+
+        Args:
+            model_dir: 本地模型目录
+            dtype: 目标精度
+
+        Returns:
+            源权重不是safetensors，或源精度与目标精度不同时返回True
+        """
+        weight_files = self._weight_files(model_dir)
+        if not weight_files:
+            return False
+        has_safetensors = any(path.suffix == ".safetensors" for path in weight_files)
+        return not has_safetensors or self._source_dtype(model_dir) != dtype
+
+    def cached_path(self, model_dir: Path, dtype: str) -> Path:
+        """
+        获取模型在缓存中的目录
+
+        Args:
+            model_dir: 本地模型目录
+            dtype: 目标精度
+
+        Returns:
+            缓存目录路径（不保证已存在）
+        """
+        return self.cache_dir / f"{model_dir.name}-{dtype}"
+
+    def lookup(self, model_dir: Path, dtype: str) -> Optional[Path]:
+        """
+        查找有效的缓存
+
+        Args:
+            model_dir: 本地模型目录
+            dtype: 目标精度
+
+        Returns:
+            有效的缓存目录，缓存不存在或已失效时返回None
+        """
+        target = self.cached_path(model_dir, dtype)
+        try:
+            with open(target / self.MARKER_FILE, "r", encoding="utf-8") as f:
+                marker = json.load(f)
+        except (OSError, ValueError):
+            return None
+        return target if marker == self._cache_key(model_dir, dtype) else None
+
+    def resolve(
+        self, model_path: str, engine: str, dtype: str, trust_remote_code: bool = False
+    ) -> str:
+        """
+        获取加载模型时使用的路径，必要时先转换并写入缓存
+
+        转换失败时记录警告并返回源路径，不影响模型加载。
+
+        Args:
+            model_path: 模型路径
+            engine: 推理引擎
+            dtype: 目标精度
+            trust_remote_code: 是否信任模型自带代码
+
+        Returns:
+            缓存中转换后的模型目录，或源路径
+        """
+        model_dir = Path(model_path)
+        if engine != "torch" or not model_dir.is_dir():
+            return model_path
+        if not self.needs_conversion(model_dir, dtype):
+            return model_path
+
+        cached = self.lookup(model_dir, dtype)
+        if cached is not None:
+            logger.info(f"使用已转换的模型权重: {cached}")
+            return str(cached)
+
+        try:
+            return str(self._convert(model_dir, dtype, trust_remote_code))
+        except Exception as e:
+            logger.warning(f"模型权重转换失败，使用源权重: {model_path}, 错误: {e}")
+            return model_path
+
+    def _convert(self, model_dir: Path, dtype: str, trust_remote_code: bool) -> Path:
+        """
+        把模型转换为目标精度的safetensors，写入临时目录后原子替换缓存目录
+
+        Args:
+            model_dir: 本地模型目录
+            dtype: 目标精度
+            trust_remote_code: 是否信任模型自带代码
+
+        Returns:
+            缓存目录
+        """
+        import torch
+        from transformers import AutoModel
+
+        logger.info(f"正在转换模型权重: {model_dir} -> {dtype} safetensors")
+        self.cache_dir.mkdir(parents=True, exist_ok=True)
+        target = self.cached_path(model_dir, dtype)
+        staging = Path(tempfile.mkdtemp(prefix=f".{target.name}-", dir=self.cache_dir))
+
+        try:
+            model = AutoModel.from_pretrained(
+                str(model_dir),
+                torch_dtype=getattr(torch, dtype),
+                trust_remote_code=trust_remote_code,
+            )
+            model.save_pretrained(str(staging), safe_serialization=True)
+            del model
+
+            # 分词器、预处理配置和模型代码等非权重文件原样复制
+            for path in model_dir.iterdir():
+                destination = staging / path.name
+                if path.suffix in WEIGHT_SUFFIXES or destination.exists():
+                    continue
+                if path.name.endswith(".index.json") or path.name.startswith("."):
+                    continue
+                if path.is_dir():
+                    shutil.copytree(path, destination)
+                else:
+                    shutil.copy2(path, destination)
+
+            with open(staging / self.MARKER_FILE, "w", encoding="utf-8") as f:
+                json.dump(self._cache_key(model_dir, dtype), f)
+
+            if target.exists():
+                shutil.rmtree(target)
+            staging.rename(target)
+        finally:
+            if staging.exists():
+                shutil.rmtree(staging, ignore_errors=True)
+
+        logger.info(f"模型权重已转换并缓存: {target}")
+        return target
@@ -3,19 +3,30 @@
 包含所有任务管理相关组件
 """
 
-from .task import Task
-from .task_types import TaskType, TaskStatus
-from .task_types import TaskType, TaskStatus
-from .task_queue import TaskQueue
-from .task_executor import OptimizedTaskExecutor
-from .priority_calculator import PriorityCalculator
-from .task_group_manager import TaskGroupManager
-from .resource_manager import OptimizedResourceManager
-from .task_monitor import OptimizedTaskMonitor
-from .pipeline_lock_manager import PipelineLockManager
-from .concurrency_manager import OptimizedConcurrencyManager, ConcurrencyConfig
-from .central_task_manager import CentralTaskManager
-from .video_segment_manager import VideoSegmentManager, VideoSegmentConfig
+from src.utils.lazy_import import lazy_exports
+
+__getattr__, __dir__ = lazy_exports(
+    __name__,
+    {
+        "Task": ".task",
+        "TaskType": ".task_types",
+        "TaskStatus": ".task_types",
+        "TaskQueue": ".task_queue",
+        "OptimizedTaskExecutor": ".task_executor",
+        "PriorityCalculator": ".priority_calculator",
+        "TaskGroupManager": ".task_group_manager",
+        "OptimizedResourceManager": ".resource_manager",
+        "OptimizedTaskMonitor": ".task_monitor",
+        "TaskArchive": ".task_archive",
+        "TaskEventStream": ".task_event_stream",
+        "PipelineLockManager": ".pipeline_lock_manager",
+        "OptimizedConcurrencyManager": ".concurrency_manager",
+        "ConcurrencyConfig": ".concurrency_manager",
+        "CentralTaskManager": ".central_task_manager",
+        "VideoSegmentManager": ".video_segment_manager",
+        "VideoSegmentConfig": ".video_segment_manager",
+    },
+)
 
 __all__ = [
     "Task",
@@ -27,6 +38,8 @@ __all__ = [
     "TaskGroupManager",
     "OptimizedResourceManager",
     "OptimizedMonitor",
+    "TaskArchive",
+    "TaskEventStream",
     "PipelineLockManager",
     "OptimizedConcurrencyManager",
     "ConcurrencyConfig",
@@ -9,7 +9,8 @@ import asyncio
 import uuid
 import threading
 import time
-from typing import Any, Dict, List, Optional, Callable
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Dict, List, Optional, Callable, Set
 from pathlib import Path
 from datetime import datetime
 import logging
@@ -23,6 +24,7 @@ from src.interfaces.task_interface import (
 )
 
 from .task import Task
+from .concurrency_manager import ConcurrencyConfig, OptimizedConcurrencyManager
 
 
 logger = logging.getLogger(__name__)
@@ -55,6 +57,7 @@ class CentralTaskManager(TaskManagerInterface):
         task_monitor: TaskMonitorInterface,
         task_group_manager: TaskGroupManagerInterface,
         device: str = "cpu",
+        concurrency_manager: Optional[OptimizedConcurrencyManager] = None,
     ):
         """
         初始化中央任务管理器
@@ -66,6 +69,7 @@ class CentralTaskManager(TaskManagerInterface):
             task_monitor: 任务监控器
             task_group_manager: 任务组管理器
             device: 设备类型（cuda/cpu）
+            concurrency_manager: 并发管理器，为None时按task_manager配置创建
         """
         self.config = config
         self.device = device
@@ -79,6 +83,13 @@ class CentralTaskManager(TaskManagerInterface):
         self.task_monitor = task_monitor
         self.group_manager = task_group_manager
 
+        # 并发控制：按任务类型分配槽位，槽位已满的任务留在调度器队列中等待
+        self.concurrency_manager = concurrency_manager or OptimizedConcurrencyManager(
+            ConcurrencyConfig.from_task_config(self.task_config), device
+        )
+        self._slot_released = threading.Event()
+        self._executor: Optional[ThreadPoolExecutor] = None
+
         # 任务处理器
         self.task_handlers: Dict[str, Callable] = {}
 
@@ -355,6 +366,80 @@ class CentralTaskManager(TaskManagerInterface):
         """
         return self.get_all_tasks(status=status, task_type=task_type)
 
+    def query_tasks(
+        self,
+        statuses: Optional[List[str]] = None,
+        task_types: Optional[List[str]] = None,
+        search: Optional[str] = None,
+        priority_ranges: Optional[List[tuple]] = None,
+        created_after: Optional[float] = None,
+        sort_by: str = "created_at",
+        descending: bool = True,
+        after: Optional[tuple] = None,
+        limit: int = 100,
+        archived: bool = False,
+    ) -> Dict[str, Any]:
+        """
+        过滤、排序并分页查询任务
+
+        Args:
+            statuses: 状态过滤
+            task_types: 任务类型过滤
+            search: 搜索字符串
+            priority_ranges: 优先级范围列表 [(最小值, 最大值), ...]
+            created_after: 只返回该时间戳之后创建的任务
+            sort_by: 排序字段
+            descending: 是否降序
+            after: 上一页返回的游标
+            limit: 返回数量限制
+            archived: 查询已归档的任务（按完成时间倒序，忽略排序和优先级/时间过滤）
+
+        Returns:
+            包含 tasks/next_cursor/total/status_counts 的字典
+        """
+        if archived:
+            archive = self.task_monitor.archive
+            if archive is None:
+                return {"tasks": [], "next_cursor": None, "total": 0, "status_counts": {}}
+            tasks, next_cursor = archive.query_page(
+                statuses=statuses,
+                task_types=task_types,
+                search=search,
+                after=after,
+                limit=limit,
+            )
+            # 与活动任务一致：status_counts不考虑状态过滤，其余过滤条件与返回的任务相同
+            status_counts = archive.count_by_status(task_types=task_types, search=search)
+            total = sum(
+                count
+                for status, count in status_counts.items()
+                if not statuses or status in statuses
+            )
+            return {
+                "tasks": [task.to_dict() for task in tasks],
+                "next_cursor": next_cursor,
+                "total": total,
+                "status_counts": status_counts,
+            }
+
+        tasks, next_cursor, total, status_counts = self.task_monitor.query_tasks(
+            statuses=statuses,
+            task_types=task_types,
+            search=search,
+            priority_ranges=priority_ranges,
+            created_after=created_after,
+            sort_by=sort_by,
+            descending=descending,
+            after=after,
+            limit=limit,
+        )
+        return {
+            "tasks": [task.to_dict() for task in tasks],
+            "next_cursor": next_cursor,
+            "total": total,
+            "status_counts": status_counts,
+        }
+
     def get_statistics(self) -> Dict[str, Any]:
         """
         获取统计信息
@@ -367,6 +452,7 @@ class CentralTaskManager(TaskManagerInterface):
 
         # 添加各组件的统计
         stats["scheduler"] = {"queue_size": self.task_scheduler.get_queue_size()}
+        stats["concurrency"] = self.concurrency_manager.get_statistics()
 
         return stats
 
@@ -378,6 +464,12 @@ class CentralTaskManager(TaskManagerInterface):
 
         self.is_running = True
 
+        self.concurrency_manager.initialize()
+        self._executor = ThreadPoolExecutor(
+            max_workers=self.concurrency_manager.config.max_concurrent,
+            thread_name_prefix="task-worker",
+        )
+
         # 启动工作线程
         self.worker_thread = threading.Thread(target=self._worker_loop, daemon=True)
         self.worker_thread.start()
@@ -392,39 +484,93 @@ class CentralTaskManager(TaskManagerInterface):
         self.is_running = False
 
         # 等待工作线程结束
+        self._slot_released.set()
         if self.worker_thread and self.worker_thread.is_alive():
             self.worker_thread.join(timeout=5.0)
 
+        if self._executor is not None:
+            self._executor.shutdown(wait=False)
+            self._executor = None
+        self.concurrency_manager.shutdown()
+
         logger.info("中央任务管理器已停止")
 
     def _worker_loop(self) -> None:
-        """工作线程主循环"""
+        """工作线程主循环：为任务占用所属类型的并发槽位后提交到执行线程池"""
         logger.info("任务调度工作线程已启动")
 
         import asyncio
 
+        # 本轮槽位已满的任务类型，出队时跳过（这些任务留在调度器中，优先级调整和取消照常生效）
+        blocked: Set[str] = set()
         while self.is_running:
             try:
+                # 有槽位释放时重新检查所有类型
+                if self._slot_released.is_set():
+                    self._slot_released.clear()
+                    blocked.clear()
+
                 # 从调度器获取任务（同步调用异步方法）
-                task = asyncio.run(self.task_scheduler.dequeue_task())
+                task = asyncio.run(self.task_scheduler.dequeue_task(blocked))
 
                 if task:
-                    # 执行任务
-                    self._execute_task(task)
+                    if self.concurrency_manager.try_acquire(task.task_type):
+                        self._submit(task)
+                    else:
+                        # 槽位已满：按原优先级放回调度器
+                        asyncio.run(self.task_scheduler.requeue_task(task))
+                        blocked.add(task.task_type)
                 else:
-                    # 没有任务，短暂休眠
-                    time.sleep(0.1)
+                    # 没有可执行的任务，等待槽位释放或短暂休眠后重新检查所有类型
+                    self._slot_released.wait(0.1)
+                    blocked.clear()
 
             except Exception as e:
                 logger.error(f"工作线程出错: {e}")
                 time.sleep(1)
 
-    def _execute_task(self, task: Task) -> None:
+    def _submit(self, task: Task) -> None:
+        """提交任务到执行线程池（已占用槽位）"""
+        try:
+            self._executor.submit(self._run_task, task)
+        except Exception:
+            self.concurrency_manager.release(task.task_type, success=False)
+            raise
+
+    def _run_task(self, task: Task) -> None:
+        """在执行线程中运行任务并释放槽位"""
+        success = False
+        try:
+            success = self._execute_task(task)
+        finally:
+            self.concurrency_manager.release(
+                task.task_type, items=self._count_items(task), success=success
+            )
+            self._slot_released.set()
+
+    @staticmethod
+    def _count_items(task: Task) -> int:
+        """
+        任务处理的条目数，用于计算条目吞吐量
+
+        处理器返回结果中的items字段（如向量化的片段数），没有时按1计
+        """
+        result = task.result
+        if isinstance(result, dict):
+            items = result.get("items")
+            if isinstance(items, int) and items > 0:
+                return items
+        return 1
+
+    def _execute_task(self, task: Task) -> bool:
         """
         执行任务
 
         Args:
             task: 任务对象
+
+        Returns:
+            是否执行成功
         """
         try:
             logger.debug(f"执行任务: {task.id}, 类型: {task.task_type}")
@@ -443,12 +589,14 @@ class CentralTaskManager(TaskManagerInterface):
                 self.task_monitor.update_task_status(task.id, "failed")
                 with self.lock:
                     self.stats["failed_tasks"] += 1
+            return bool(success)
 
         except Exception as e:
             logger.error(f"执行任务失败 {task.id}: {e}")
             self.task_monitor.update_task_status(task.id, "failed")
             with self.lock:
                 self.stats["failed_tasks"] += 1
+            return False
 
     def register_task_handler(self, task_type: str, handler: Callable) -> bool:
         """
@@ -475,7 +623,9 @@ class CentralTaskManager(TaskManagerInterface):
             取消结果统计
         """
         try:
-            all_tasks = self.task_monitor.get_all_tasks()
+            all_tasks = self.task_monitor.get_all_tasks(status="pending")
+            if cancel_running:
+                all_tasks.update(self.task_monitor.get_all_tasks(status="running"))
 
             cancelled = 0
             failed = 0
@@ -521,7 +671,7 @@ class CentralTaskManager(TaskManagerInterface):
             取消结果统计
         """
         try:
-            all_tasks = self.task_monitor.get_all_tasks()
+            all_tasks = self.task_monitor.get_all_tasks(task_type=task_type)
 
             cancelled = 0
             failed = 0
@@ -907,25 +1057,9 @@ class CentralTaskManager(TaskManagerInterface):
             任务列表
         """
         try:
-            all_tasks = self.task_monitor.get_all_tasks()
-            file_tasks = []
-
-            for task_id, task in all_tasks.items():
-                task_file_id = getattr(task, "file_id", None)
-                if task_file_id == file_id:
-                    if hasattr(task, "to_dict"):
-                        file_tasks.append(task.to_dict())
-                    else:
-                        file_tasks.append(
-                            {
-                                "id": getattr(task, "id", task_id),
-                                "task_type": getattr(task, "task_type", "unknown"),
-                                "status": getattr(task, "status", "unknown"),
-                                "priority": getattr(task, "priority", 5),
-                            }
-                        )
-
-            return file_tasks
+            # 使用监控器的文件索引，包含已归档的任务
+            tasks = self.task_monitor.get_tasks_by_file(file_id, include_archived=True)
+            return [task.to_dict() for task in tasks]
 
         except Exception as e:
             logger.error(f"获取文件任务失败 {file_id}: {e}")
@@ -983,12 +1117,7 @@ class CentralTaskManager(TaskManagerInterface):
             - load_percentage: 负载百分比
         """
         try:
-            all_tasks = self.task_monitor.get_all_tasks()
-
-            active_threads = 0
-            for task_id, task in all_tasks.items():
-                if task.status == "running":
-                    active_threads += 1
+            active_threads = self.task_monitor.get_task_count_by_status().get("running", 0)
 
             # 从配置中获取线程池配置
             thread_pools_config = self.config.get("thread_pools", {})
@@ -1,14 +1,16 @@
 """
 优化后的并发管理器
-基于系统负载和可用资源动态调整并发任务数量
+按任务类型分配并发槽位，根据实测吞吐量动态调整各类型的并发数
 """
 
-import psutil
 import threading
 import time
 import logging
-from typing import Dict, Optional, Any
-from dataclasses import dataclass
+from collections import deque
+from typing import Deque, Dict, Optional, Any
+from dataclasses import dataclass, field
+
+from src.core.utils.resource_monitor import get_resource_sampler
 
 logger = logging.getLogger(__name__)
 
@@ -43,6 +45,74 @@ class ConcurrencyConfig:
     adjustment_step: int = 1
     enable_gpu_monitoring: bool = True
     enable_disk_io_monitoring: bool = True
+    # 各任务类型的并发上限，未配置的类型使用max_concurrent
+    max_concurrent_by_type: Dict[str, int] = field(default_factory=dict)
+    # 吞吐量变化小于该比例时视为没有提升
+    throughput_tolerance: float = 0.05
+    # 乘性减小系数
+    decrease_factor: float = 0.75
+
+    @classmethod
+    def from_task_config(cls, task_config: Dict[str, Any]) -> "ConcurrencyConfig":
+        """
+        从task_manager配置段创建并发配置
+
+        Args:
+            task_config: task_manager配置字典
+
+        Returns:
+            并发配置
+        """
+        return cls(
+            concurrency_mode=task_config.get("concurrency_mode", "dynamic"),
+            min_concurrent=task_config.get("min_concurrent_tasks", 1),
+            max_concurrent=task_config.get("max_concurrent_tasks", 8),
+            base_concurrent_tasks=task_config.get("base_concurrent_tasks", 4),
+            target_cpu_percent=task_config.get("dynamic_concurrency_target_cpu", 70.0),
+            target_memory_percent=task_config.get(
+                "dynamic_concurrency_target_memory", 70.0
+            ),
+            target_gpu_memory_percent=task_config.get(
+                "dynamic_concurrency_target_gpu", 80.0
+            ),
+            adjustment_interval=task_config.get("dynamic_concurrency_interval", 5.0),
+            adjustment_step=task_config.get("dynamic_concurrency_step", 1),
+            max_concurrent_by_type=dict(task_config.get("max_concurrent_by_type") or {}),
+        )
+
+
+class _Lane:
+    """单个任务类型的并发槽位和吞吐量统计"""
+
+    __slots__ = (
+        "task_type",
+        "limit",
+        "max_limit",
+        "running",
+        "completed",
+        "items",
+        "window_start",
+        "window_items",
+        "window_completed",
+        "saturated",
+        "last_rate",
+        "last_action",
+    )
+
+    def __init__(self, task_type: str, limit: int, max_limit: int):
+        self.task_type = task_type
+        self.limit = limit
+        self.max_limit = max_limit
+        self.running = 0
+        self.completed = 0
+        self.items = 0
+        self.window_start = time.monotonic()
+        self.window_items = 0
+        self.window_completed = 0
+        # 本窗口内是否有任务因槽位已满而等待
+        self.saturated = False
+        self.last_rate: Optional[float] = None
+        self.last_action = "hold"
 
 
 class OptimizedConcurrencyManager:
@@ -64,8 +134,14 @@ class OptimizedConcurrencyManager:
             self.current_concurrent = config.base_concurrent_tasks
             self.target_concurrent = config.base_concurrent_tasks
         else:  # dynamic mode
-            self.current_concurrent = config.min_concurrent
-            self.target_concurrent = config.min_concurrent
+            # 全局上限只在内存压力下收缩，任务类型的并发数由吞吐量决定
+            self.current_concurrent = config.max_concurrent
+            self.target_concurrent = config.max_concurrent
+
+        # 任务类型槽位
+        self.lanes: Dict[str, _Lane] = {}
+        self.running_total = 0
+        self.decisions: Deque[Dict[str, Any]] = deque(maxlen=50)
 
         # 资源监控
         self.last_resources: Optional[SystemResources] = None
@@ -147,123 +223,188 @@ class OptimizedConcurrencyManager:
                 time.sleep(1.0)
 
     def _get_current_resources(self) -> SystemResources:
-        """获取当前系统资源信息"""
-        # CPU使用率
-        cpu_percent = psutil.cpu_percent(interval=1.0)
-
-        # 内存使用率和可用内存
-        memory = psutil.virtual_memory()
-        memory_percent = memory.percent
-        memory_available_gb = memory.available / (1024**3)
+        """获取当前系统资源信息（读取资源采样器的最新快照）"""
+        snapshot = get_resource_sampler().snapshot()
 
-        # GPU内存信息（如果可用）
+        # GPU信息只在device为cuda时使用
         gpu_memory_available_gb = 0.0
         gpu_memory_percent = 0.0
+        if self.has_gpu and snapshot.gpu_memory_percent is not None:
+            gpu_memory_available_gb = snapshot.gpu_memory_available_gb or 0.0
+            gpu_memory_percent = snapshot.gpu_memory_percent
 
-        if self.has_gpu:
-            gpu_memory_available_gb, gpu_memory_percent = self._get_gpu_info()
-
-        # 磁盘IO（简化获取）
         disk_io_read_mb_per_sec = 0.0
         disk_io_write_mb_per_sec = 0.0
-
         if self.config.enable_disk_io_monitoring:
-            # 这里可以实现磁盘IO监控，为简化暂时返回0
-            pass
+            disk_io_read_mb_per_sec = snapshot.disk_read_mb_per_sec
+            disk_io_write_mb_per_sec = snapshot.disk_write_mb_per_sec
 
         return SystemResources(
-            cpu_percent=cpu_percent,
-            memory_percent=memory_percent,
-            memory_available_gb=memory_available_gb,
+            cpu_percent=snapshot.cpu_percent,
+            memory_percent=snapshot.memory_percent,
+            memory_available_gb=snapshot.memory_available_gb,
             gpu_memory_available_gb=gpu_memory_available_gb,
             gpu_memory_percent=gpu_memory_percent,
             disk_io_read_mb_per_sec=disk_io_read_mb_per_sec,
             disk_io_write_mb_per_sec=disk_io_write_mb_per_sec,
-            timestamp=time.time(),
+            timestamp=snapshot.timestamp,
         )
 
-    def _get_gpu_info(self) -> tuple[float, float]:
+    def _adjust_concurrent_count(self, resources: SystemResources) -> None:
         """
-        获取GPU信息
+        调整并发数
 
-        Returns:
-            (GPU可用内存GB, GPU内存使用率)
+        全局上限只用于防止内存耗尽：内存超过目标时乘性减小，恢复后加性增大。
+        各任务类型的并发数由实测吞吐量驱动（AIMD）：槽位已满时加性增大，
+        增大后吞吐量没有提升则乘性减小，不再以CPU使用率为目标。
         """
-        # 只有在device为cuda时才获取GPU信息
-        if not self.has_gpu:
-            return 0.0, 0.0
-
-        try:
-            import torch
-
-            # 获取第一个GPU的信息
-            device = torch.cuda.current_device()
-            total_memory = torch.cuda.get_device_properties(device).total_memory / (
-                1024**3
-            )
-            allocated_memory = torch.cuda.memory_allocated(device) / (1024**3)
-            reserved_memory = torch.cuda.memory_reserved(device) / (1024**3)
-
-            available_memory = total_memory - reserved_memory
-            memory_percent = (
-                (allocated_memory / total_memory) * 100 if total_memory > 0 else 0.0
-            )
-
-            return available_memory, memory_percent
-        except ImportError:
-            logger.warning("PyTorch未安装，无法获取GPU信息")
-            return 0.0, 0.0
-        except Exception as e:
-            logger.error(f"获取GPU信息失败: {e}")
-            return 0.0, 0.0
-
-    def _adjust_concurrent_count(self, resources: SystemResources) -> None:
-        """根据资源使用情况调整并发数"""
         with self.lock:
-            # 检查各个资源指标
-            cpu_too_high = resources.cpu_percent > self.config.target_cpu_percent
-            memory_too_high = (
-                resources.memory_percent > self.config.target_memory_percent
-            )
+            memory_too_high = resources.memory_percent > self.config.target_memory_percent
             gpu_too_high = (
                 self.has_gpu
                 and resources.gpu_memory_percent > self.config.target_gpu_memory_percent
             )
+            pressure = memory_too_high or gpu_too_high
 
             current_concurrent = self.current_concurrent
-
-            # 如果资源使用过高，减少并发数
-            if cpu_too_high or memory_too_high or gpu_too_high:
-                if current_concurrent > self.config.min_concurrent:
-                    self.current_concurrent = max(
-                        self.config.min_concurrent,
-                        current_concurrent - self.config.adjustment_step,
-                    )
-                    logger.debug(
-                        f"资源使用过高，减少并发数: {current_concurrent} -> {self.current_concurrent}"
-                    )
-
-            # 如果资源使用适中且有容量，增加并发数
-            else:
-                cpu_ok = resources.cpu_percent < self.config.target_cpu_percent * 0.8
-                memory_ok = (
-                    resources.memory_percent < self.config.target_memory_percent * 0.8
+            if pressure:
+                self.current_concurrent = max(
+                    self.config.min_concurrent,
+                    int(current_concurrent * self.config.decrease_factor),
+                )
+            elif current_concurrent < self.config.max_concurrent:
+                self.current_concurrent = min(
+                    self.config.max_concurrent,
+                    current_concurrent + self.config.adjustment_step,
                 )
-                gpu_ok = (
-                    not self.has_gpu
-                    or resources.gpu_memory_percent
-                    < self.config.target_gpu_memory_percent * 0.8
+            if self.current_concurrent != current_concurrent:
+                self._record_decision(
+                    "*",
+                    current_concurrent,
+                    self.current_concurrent,
+                    "memory_pressure" if pressure else "memory_ok",
                 )
 
-                if cpu_ok and memory_ok and gpu_ok:
-                    if current_concurrent < self.config.max_concurrent:
-                        self.current_concurrent = min(
-                            self.config.max_concurrent,
-                            current_concurrent + self.config.adjustment_step,
-                        )
-                        logger.debug(
-                            f"资源使用正常，增加并发数: {current_concurrent} -> {self.current_concurrent}"
-                        )
+            for lane in self.lanes.values():
+                self._adjust_lane(lane, pressure)
+
+    def _adjust_lane(self, lane: _Lane, pressure: bool) -> None:
+        """根据上一个窗口的吞吐量调整任务类型的并发数（调用方需持有锁）"""
+        now = time.monotonic()
+        elapsed = now - lane.window_start
+        if elapsed <= 0:
+            return
+
+        rate = lane.window_items / elapsed
+        old_limit = lane.limit
+        reason = None
+
+        if pressure:
+            if lane.limit > 1:
+                lane.limit = max(1, int(lane.limit * self.config.decrease_factor))
+                reason = "memory_pressure"
+        elif (
+            lane.last_action == "increase"
+            and lane.last_rate is not None
+            and rate <= lane.last_rate * (1 + self.config.throughput_tolerance)
+        ):
+            # 增大并发后吞吐量没有提升，已越过拐点
+            lane.limit = max(1, min(lane.limit - 1, int(lane.limit * self.config.decrease_factor)))
+            reason = "no_throughput_gain"
+        elif lane.saturated and lane.limit < lane.max_limit:
+            lane.limit = min(lane.max_limit, lane.limit + self.config.adjustment_step)
+            reason = "saturated"
+
+        if reason is not None and lane.limit != old_limit:
+            lane.last_action = "increase" if lane.limit > old_limit else "decrease"
+            self._record_decision(lane.task_type, old_limit, lane.limit, reason, rate)
+        else:
+            lane.last_action = "hold"
+
+        # 没有完成任何任务的窗口不作为比较基准
+        if lane.window_completed or lane.last_action != "hold":
+            lane.last_rate = rate
+        lane.window_start = now
+        lane.window_items = 0
+        lane.window_completed = 0
+        lane.saturated = False
+
+    def _record_decision(
+        self,
+        task_type: str,
+        old_limit: int,
+        new_limit: int,
+        reason: str,
+        rate: Optional[float] = None,
+    ) -> None:
+        """记录并发调整决策（调用方需持有锁）"""
+        self.decisions.append(
+            {
+                "time": time.time(),
+                "task_type": task_type,
+                "old": old_limit,
+                "new": new_limit,
+                "reason": reason,
+                "items_per_sec": round(rate, 3) if rate is not None else None,
+            }
+        )
+        logger.debug(
+            f"调整并发数: {task_type} {old_limit} -> {new_limit} ({reason})"
+        )
+
+    def _get_lane(self, task_type: str) -> _Lane:
+        """获取任务类型的槽位，首次使用时创建（调用方需持有锁）"""
+        lane = self.lanes.get(task_type)
+        if lane is None:
+            max_limit = self.config.max_concurrent_by_type.get(
+                task_type, self.config.max_concurrent
+            )
+            max_limit = max(1, min(max_limit, self.config.max_concurrent))
+            if self.config.concurrency_mode == "static":
+                limit = max_limit
+            else:
+                # 从一半开始探测，由吞吐量决定是否继续增大
+                limit = max(1, max_limit // 2)
+            lane = self.lanes[task_type] = _Lane(task_type, limit, max_limit)
+        return lane
+
+    def try_acquire(self, task_type: str) -> bool:
+        """
+        尝试占用一个任务类型的并发槽位
+
+        Args:
+            task_type: 任务类型
+
+        Returns:
+            是否占用成功（槽位已满或超过全局上限时返回False）
+        """
+        with self.lock:
+            lane = self._get_lane(task_type)
+            if lane.running >= lane.limit or self.running_total >= self.current_concurrent:
+                lane.saturated = True
+                return False
+            lane.running += 1
+            self.running_total += 1
+            return True
+
+    def release(self, task_type: str, items: int = 1, success: bool = True) -> None:
+        """
+        释放并发槽位并记录吞吐量
+
+        Args:
+            task_type: 任务类型
+            items: 任务处理的条目数（如向量化的片段数），用于计算条目吞吐量
+            success: 任务是否成功，失败的任务不计入吞吐量
+        """
+        with self.lock:
+            lane = self._get_lane(task_type)
+            lane.running = max(0, lane.running - 1)
+            self.running_total = max(0, self.running_total - 1)
+            if success:
+                lane.completed += 1
+                lane.items += items
+                lane.window_completed += 1
+                lane.window_items += items
 
     def get_current_concurrent(self) -> int:
         """
@@ -344,24 +485,43 @@ class OptimizedConcurrencyManager:
             统计信息字典
         """
         with self.lock:
+            now = time.monotonic()
+            stats = {
+                "current_concurrent": self.current_concurrent,
+                "target_concurrent": self.target_concurrent,
+                "running": self.running_total,
+                "resource_history_count": len(self.resource_history),
+                "lanes": {
+                    task_type: {
+                        "limit": lane.limit,
+                        "max_limit": lane.max_limit,
+                        "running": lane.running,
+                        "completed": lane.completed,
+                        "items": lane.items,
+                        "items_per_sec": (
+                            round(lane.last_rate, 3) if lane.last_rate is not None else None
+                        ),
+                        "window_items_per_sec": round(
+                            lane.window_items / max(now - lane.window_start, 1e-6), 3
+                        ),
+                        "saturated": lane.saturated,
+                    }
+                    for task_type, lane in self.lanes.items()
+                },
+                "recent_decisions": list(self.decisions),
+            }
             resources = self.last_resources
             if resources:
-                return {
-                    "current_concurrent": self.current_concurrent,
-                    "target_concurrent": self.target_concurrent,
-                    "cpu_percent": resources.cpu_percent,
-                    "memory_percent": resources.memory_percent,
-                    "memory_available_gb": resources.memory_available_gb,
-                    "gpu_memory_percent": resources.gpu_memory_percent,
-                    "gpu_memory_available_gb": resources.gpu_memory_available_gb,
-                    "resource_history_count": len(self.resource_history),
-                }
-            else:
-                return {
-                    "current_concurrent": self.current_concurrent,
-                    "target_concurrent": self.target_concurrent,
-                    "resource_history_count": len(self.resource_history),
-                }
+                stats.update(
+                    {
+                        "cpu_percent": resources.cpu_percent,
+                        "memory_percent": resources.memory_percent,
+                        "memory_available_gb": resources.memory_available_gb,
+                        "gpu_memory_percent": resources.gpu_memory_percent,
+                        "gpu_memory_available_gb": resources.gpu_memory_available_gb,
+                    }
+                )
+            return stats
 
     def force_adjustment(self) -> None:
         """强制进行一次并发数调整"""
@@ -3,12 +3,13 @@
 专门负责资源管理，简化OOM处理为两级
 """
 
-import psutil
 import threading
 import time
 from typing import Dict, Any, Optional
 import logging
 
+from src.core.utils.resource_monitor import get_resource_sampler
+
 
 logger = logging.getLogger(__name__)
 
@@ -81,11 +82,10 @@ class OptimizedResourceManager:
             当前资源状态 ('normal', 'warning', 'pause')
         """
         with self.lock:
-            # 获取内存使用率
-            memory_usage = psutil.virtual_memory().percent
-
-            # 获取GPU内存使用率（如果可用）
-            gpu_memory_usage = self._get_gpu_memory_usage()
+            # 读取资源采样器的最新快照
+            snapshot = get_resource_sampler().snapshot()
+            memory_usage = snapshot.memory_percent
+            gpu_memory_usage = snapshot.gpu_memory_percent
 
             # 确定当前状态
             current_state = "normal"
@@ -124,31 +124,6 @@ class OptimizedResourceManager:
 
             return self.current_state
 
-    def _get_gpu_memory_usage(self) -> Optional[float]:
-        """
-        获取GPU内存使用率
-
-        Returns:
-            GPU内存使用率百分比或None（如果不可用）
-        """
-        try:
-            import torch
-
-            if torch.cuda.is_available():
-                device = torch.cuda.current_device()
-                total_memory = torch.cuda.get_device_properties(device).total_memory
-                allocated_memory = torch.cuda.memory_allocated(device)
-
-                if total_memory > 0:
-                    return (allocated_memory / total_memory) * 100
-        except ImportError:
-            # 如果torch不可用，跳过GPU监控
-            pass
-        except Exception as e:
-            logger.debug(f"获取GPU内存使用率失败: {e}")
-
-        return None
-
     def _record_resource_usage(
         self, memory_usage: float, gpu_memory_usage: Optional[float], state: str
     ) -> None:
@@ -199,14 +174,13 @@ class OptimizedResourceManager:
         Returns:
             资源使用情况字典
         """
-        memory = psutil.virtual_memory()
-        gpu_memory_usage = self._get_gpu_memory_usage()
+        snapshot = get_resource_sampler().snapshot()
 
         return {
-            "memory_percent": memory.percent,
-            "memory_available_gb": memory.available / (1024**3),
-            "memory_total_gb": memory.total / (1024**3),
-            "gpu_memory_percent": gpu_memory_usage,
+            "memory_percent": snapshot.memory_percent,
+            "memory_available_gb": snapshot.memory_available_gb,
+            "memory_total_gb": snapshot.memory_total_gb,
+            "gpu_memory_percent": snapshot.gpu_memory_percent,
             "current_state": self.current_state,
             "state_change_time": self.last_state_change,
         }
@@ -246,8 +220,9 @@ class OptimizedResourceManager:
         Returns:
             内存压力指数
         """
-        memory_usage = psutil.virtual_memory().percent
-        gpu_memory_usage = self._get_gpu_memory_usage() or 0
+        snapshot = get_resource_sampler().snapshot()
+        memory_usage = snapshot.memory_percent
+        gpu_memory_usage = snapshot.gpu_memory_percent or 0
 
         # 使用最大压力作为指标
         pressure = max(memory_usage, gpu_memory_usage) / 100.0
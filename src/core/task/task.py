@@ -11,6 +11,30 @@ import uuid
 class Task:
     """任务模型"""
 
+    # 监控器中可能同时存在大量任务对象，使用__slots__减少内存占用
+    __slots__ = (
+        "id",
+        "task_id",
+        "task_type",
+        "task_data",
+        "priority",
+        "file_id",
+        "file_path",
+        "depends_on",
+        "group_id",
+        "status",
+        "created_at",
+        "started_at",
+        "completed_at",
+        "updated_at",
+        "error",
+        "file_priority",
+        "progress",
+        "result",
+        "retry_count",
+        "max_retries",
+    )
+
     def __init__(
         self,
         id: str = None,
@@ -96,6 +120,9 @@ class Task:
             "completed_at": self.completed_at.isoformat() if self.completed_at else None,
             "task_data": self.task_data,
             "file_id": self.file_id,
+            "file_path": self.file_path,
+            "group_id": self.group_id,
+            "file_priority": self.file_priority,
             "depends_on": self.depends_on,
             "retry_count": self.retry_count,
             "max_retries": self.max_retries,
@@ -0,0 +1,287 @@
+"""
+任务归档
+任务监控器只在内存中保留有限数量的已结束任务，更早的任务归档到SQLite，按需查询
+"""
+
+import json
+import logging
+import sqlite3
+import threading
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+from .task import Task
+
+logger = logging.getLogger(__name__)
+
+
+class TaskArchive:
+    """SQLite任务归档"""
+
+    def __init__(self, db_path: str):
+        """
+        初始化任务归档
+
+        Args:
+            db_path: SQLite数据库文件路径
+        """
+        self.db_path = db_path
+        self._lock = threading.Lock()
+
+        Path(db_path).parent.mkdir(parents=True, exist_ok=True)
+        self._conn = sqlite3.connect(db_path, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute(
+            """
+            CREATE TABLE IF NOT EXISTS task_archive (
+                id TEXT PRIMARY KEY,
+                task_type TEXT NOT NULL,
+                status TEXT NOT NULL,
+                file_id TEXT,
+                error TEXT,
+                completed_at TEXT,
+                data TEXT NOT NULL
+            )
+        """
+        )
+        self._conn.execute(
+            "CREATE INDEX IF NOT EXISTS idx_task_archive_status ON task_archive(status)"
+        )
+        self._conn.execute(
+            "CREATE INDEX IF NOT EXISTS idx_task_archive_file ON task_archive(file_id)"
+        )
+        self._conn.execute(
+            "CREATE INDEX IF NOT EXISTS idx_task_archive_type ON task_archive(task_type)"
+        )
+        self._conn.execute(
+            "CREATE INDEX IF NOT EXISTS idx_task_archive_completed "
+            "ON task_archive(completed_at, id)"
+        )
+        self._conn.execute(
+            "CREATE INDEX IF NOT EXISTS idx_task_archive_status_completed "
+            "ON task_archive(status, completed_at, id)"
+        )
+        self._conn.commit()
+
+    def add_tasks(self, tasks: Iterable[Task]) -> int:
+        """
+        归档任务（已存在的任务ID会被覆盖）
+
+        Args:
+            tasks: 任务列表
+
+        Returns:
+            归档的任务数量
+        """
+        rows = []
+        for task in tasks:
+            data = task.to_dict()
+            rows.append(
+                (
+                    task.id,
+                    task.task_type,
+                    task.status,
+                    task.file_id,
+                    task.error,
+                    data["completed_at"],
+                    json.dumps(data, ensure_ascii=False, default=str),
+                )
+            )
+        if not rows:
+            return 0
+
+        with self._lock:
+            self._conn.executemany(
+                "INSERT OR REPLACE INTO task_archive "
+                "(id, task_type, status, file_id, error, completed_at, data) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?)",
+                rows,
+            )
+            self._conn.commit()
+        return len(rows)
+
+    @staticmethod
+    def _to_task(data: str) -> Task:
+        values = json.loads(data)
+        task = Task.from_dict(values)
+        task.retry_count = values.get("retry_count", 0)
+        task.max_retries = values.get("max_retries", task.max_retries)
+        return task
+
+    def get_task(self, task_id: str) -> Optional[Task]:
+        """
+        获取归档的任务
+
+        Args:
+            task_id: 任务ID
+
+        Returns:
+            任务对象或None
+        """
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT data FROM task_archive WHERE id = ?", (task_id,)
+            ).fetchone()
+        return self._to_task(row[0]) if row else None
+
+    def query(
+        self,
+        status: Optional[str] = None,
+        file_id: Optional[str] = None,
+        task_type: Optional[str] = None,
+        limit: int = 1000,
+        offset: int = 0,
+    ) -> List[Task]:
+        """
+        按条件查询归档的任务（按完成时间倒序）
+
+        Args:
+            status: 状态过滤
+            file_id: 文件ID过滤
+            task_type: 任务类型过滤
+            limit: 返回数量限制
+            offset: 偏移量
+
+        Returns:
+            任务列表
+        """
+        conditions, params = [], []
+        for column, value in (
+            ("status", status),
+            ("file_id", file_id),
+            ("task_type", task_type),
+        ):
+            if value is not None:
+                conditions.append(f"{column} = ?")
+                params.append(value)
+
+        sql = "SELECT data FROM task_archive"
+        if conditions:
+            sql += " WHERE " + " AND ".join(conditions)
+        sql += " ORDER BY completed_at DESC LIMIT ? OFFSET ?"
+
+        with self._lock:
+            rows = self._conn.execute(sql, (*params, limit, offset)).fetchall()
+        return [self._to_task(row[0]) for row in rows]
+
+    def query_page(
+        self,
+        statuses: Optional[List[str]] = None,
+        task_types: Optional[List[str]] = None,
+        search: Optional[str] = None,
+        after: Optional[tuple] = None,
+        limit: int = 100,
+    ) -> Tuple[List[Task], Optional[tuple]]:
+        """
+        分页查询归档的任务（按完成时间倒序，键集分页）
+
+        Args:
+            statuses: 状态过滤
+            task_types: 任务类型过滤
+            search: 按任务ID、类型和错误信息搜索
+            after: 上一页最后一个任务的 (完成时间, 任务ID)
+            limit: 返回数量限制
+
+        Returns:
+            (任务列表, 下一页游标)
+        """
+        conditions, params = self._filter_conditions(statuses, task_types, search)
+        if after is not None:
+            conditions.append("(completed_at, id) < (?, ?)")
+            params.extend(after)
+
+        sql = "SELECT id, completed_at, data FROM task_archive"
+        if conditions:
+            sql += " WHERE " + " AND ".join(conditions)
+        sql += " ORDER BY completed_at DESC, id DESC LIMIT ?"
+
+        with self._lock:
+            rows = self._conn.execute(sql, (*params, limit + 1)).fetchall()
+        next_cursor = (rows[limit - 1][1], rows[limit - 1][0]) if len(rows) > limit else None
+        return [self._to_task(row[2]) for row in rows[:limit]], next_cursor
+
+    @staticmethod
+    def _filter_conditions(
+        statuses: Optional[List[str]],
+        task_types: Optional[List[str]],
+        search: Optional[str],
+    ) -> Tuple[List[str], List[Any]]:
+        """构造状态、类型和搜索过滤的WHERE条件及参数"""
+        conditions, params = [], []
+        for column, values in (("status", statuses), ("task_type", task_types)):
+            if values:
+                conditions.append(f"{column} IN ({', '.join('?' * len(values))})")
+                params.extend(values)
+        if search:
+            pattern = f"%{search}%"
+            conditions.append("(id LIKE ? OR task_type LIKE ? OR error LIKE ?)")
+            params.extend([pattern] * 3)
+        return conditions, params
+
+    def search(self, query: str, limit: int = 1000) -> List[Task]:
+        """
+        按任务ID、类型或错误信息搜索归档的任务
+
+        Args:
+            query: 查询字符串
+            limit: 返回数量限制
+
+        Returns:
+            任务列表
+        """
+        pattern = f"%{query}%"
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT data FROM task_archive "
+                "WHERE id LIKE ? OR task_type LIKE ? OR error LIKE ? "
+                "ORDER BY completed_at DESC LIMIT ?",
+                (pattern, pattern, pattern, limit),
+            ).fetchall()
+        return [self._to_task(row[0]) for row in rows]
+
+    def count_by_status(
+        self,
+        task_types: Optional[List[str]] = None,
+        search: Optional[str] = None,
+    ) -> Dict[str, int]:
+        """
+        获取各状态的归档任务数量
+
+        Args:
+            task_types: 任务类型过滤
+            search: 按任务ID、类型和错误信息搜索（与query_page相同）
+
+        Returns:
+            状态任务数量字典
+        """
+        conditions, params = self._filter_conditions(None, task_types, search)
+        sql = "SELECT status, COUNT(*) FROM task_archive"
+        if conditions:
+            sql += " WHERE " + " AND ".join(conditions)
+        sql += " GROUP BY status"
+
+        with self._lock:
+            rows = self._conn.execute(sql, params).fetchall()
+        return dict(rows)
+
+    def delete_tasks(self, task_ids: Iterable[str]) -> int:
+        """
+        删除归档的任务
+
+        Args:
+            task_ids: 任务ID列表
+
+        Returns:
+            删除的任务数量
+        """
+        with self._lock:
+            cursor = self._conn.executemany(
+                "DELETE FROM task_archive WHERE id = ?", [(i,) for i in task_ids]
+            )
+            self._conn.commit()
+        return cursor.rowcount
+
+    def close(self) -> None:
+        """关闭数据库连接"""
+        with self._lock:
+            self._conn.close()
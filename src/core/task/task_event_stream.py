@@ -0,0 +1,252 @@
+"""
+任务事件流
+将任务监控器的事件转换为带序号的增量事件，供API推送给界面订阅
+"""
+
+import asyncio
+import itertools
+import logging
+import threading
+import time
+import uuid
+from collections import deque
+from functools import partial
+from typing import Any, Deque, Dict, List, Optional, Set, Tuple
+
+logger = logging.getLogger(__name__)
+
+
+# 监控器事件类型 -> 推送事件类型
+EVENT_TYPES = {
+    "task_created": "created",
+    "task_started": "started",
+    "task_progress": "progress",
+    "task_completed": "completed",
+    "task_failed": "failed",
+    "task_cancelled": "cancelled",
+}
+
+
+class TaskEventStream:
+    """
+    任务事件流
+
+    每个事件分配单调递增的序号并保存在有界环形缓冲区中，客户端断线后可以
+    从上次收到的序号继续读取；序号已被挤出缓冲区时返回reset，由客户端重新
+    拉取一次全量列表。同一任务的进度事件在 progress_interval 内合并为一条，
+    只推送最新进度。
+    """
+
+    def __init__(self, buffer_size: int = 10000, progress_interval: float = 0.5):
+        """
+        初始化事件流
+
+        Args:
+            buffer_size: 环形缓冲区保留的事件数
+            progress_interval: 同一任务进度事件的最小推送间隔（秒）
+        """
+        # 服务重启后序号从头开始，客户端通过stream_id识别
+        self.stream_id = uuid.uuid4().hex[:8]
+        self.progress_interval = progress_interval
+
+        self._events: Deque[Dict[str, Any]] = deque(maxlen=buffer_size)
+        self._seq = itertools.count(1)
+        self._last_seq = 0
+        self._lock = threading.Lock()
+
+        self._pending_progress: Dict[str, Dict[str, Any]] = {}
+        self._last_progress_at: Dict[str, float] = {}
+        self._flush_timer: Optional[threading.Timer] = None
+
+        self._waiters: Set[Tuple[asyncio.AbstractEventLoop, asyncio.Event]] = set()
+
+        self.published_count = 0
+        self.coalesced_count = 0
+
+    @property
+    def last_seq(self) -> int:
+        """最新事件序号"""
+        return self._last_seq
+
+    def attach(self, task_monitor: Any) -> None:
+        """
+        订阅任务监控器的事件
+
+        Args:
+            task_monitor: 任务监控器（提供add_event_callback）
+        """
+        for monitor_event in EVENT_TYPES:
+            task_monitor.add_event_callback(
+                monitor_event, partial(self._on_task_event, monitor_event)
+            )
+
+    @staticmethod
+    def _task_delta(task: Any) -> Dict[str, Any]:
+        """提取推送所需的任务字段"""
+        delta = {
+            "task_id": task.id,
+            "task_type": getattr(task, "task_type", None),
+            "status": getattr(task, "status", None),
+            "progress": getattr(task, "progress", None),
+            "priority": getattr(task, "priority", None),
+            "file_path": getattr(task, "file_path", None),
+        }
+        for field in ("created_at", "started_at", "completed_at"):
+            value = getattr(task, field, None)
+            if value is not None:
+                delta[field] = value.isoformat() if hasattr(value, "isoformat") else value
+        error = getattr(task, "error", None)
+        if error:
+            delta["error"] = error
+        return delta
+
+    def _on_task_event(self, monitor_event: str, task: Any) -> None:
+        """任务监控器回调（在监控器锁内调用，只做内存操作）"""
+        self.publish(EVENT_TYPES[monitor_event], self._task_delta(task))
+
+    def publish(self, event_type: str, data: Dict[str, Any]) -> None:
+        """
+        发布事件
+
+        Args:
+            event_type: 事件类型
+            data: 事件数据，需包含task_id
+        """
+        task_id = data.get("task_id")
+        now = time.monotonic()
+
+        with self._lock:
+            if event_type == "progress":
+                pending = task_id in self._pending_progress
+                recent = now - self._last_progress_at.get(task_id, 0.0) < self.progress_interval
+                if pending or recent:
+                    if pending:
+                        self.coalesced_count += 1
+                    self._pending_progress[task_id] = data
+                    self._schedule_flush()
+                    return
+                self._last_progress_at[task_id] = now
+            else:
+                # 状态事件自带最新进度，未推送的进度直接丢弃
+                if self._pending_progress.pop(task_id, None) is not None:
+                    self.coalesced_count += 1
+                if event_type in ("completed", "failed", "cancelled"):
+                    self._last_progress_at.pop(task_id, None)
+
+            self._append(event_type, data)
+
+        self._notify()
+
+    def _append(self, event_type: str, data: Dict[str, Any]) -> None:
+        """追加事件（调用方需持有锁）"""
+        seq = next(self._seq)
+        self._events.append(
+            {"seq": seq, "type": event_type, "ts": time.time(), "data": data}
+        )
+        self._last_seq = seq
+        self.published_count += 1
+
+    def _schedule_flush(self) -> None:
+        """安排一次延迟推送（调用方需持有锁）"""
+        if self._flush_timer is None:
+            self._flush_timer = threading.Timer(self.progress_interval, self._flush_progress)
+            self._flush_timer.daemon = True
+            self._flush_timer.start()
+
+    def _flush_progress(self) -> None:
+        """推送合并后的进度事件"""
+        now = time.monotonic()
+        with self._lock:
+            self._flush_timer = None
+            pending = self._pending_progress
+            self._pending_progress = {}
+            for task_id, data in pending.items():
+                self._last_progress_at[task_id] = now
+                self._append("progress", data)
+        if pending:
+            self._notify()
+
+    def read(self, since: int, limit: int = 1000) -> Tuple[List[Dict[str, Any]], bool]:
+        """
+        读取指定序号之后的事件
+
+        Args:
+            since: 客户端已收到的最后一个序号
+            limit: 最多返回的事件数
+
+        Returns:
+            (事件列表, 是否需要重新同步)
+        """
+        with self._lock:
+            if since > self._last_seq:
+                return [], True
+            if not self._events or since >= self._last_seq:
+                return [], False
+
+            first_seq = self._events[0]["seq"]
+            if since < first_seq - 1:
+                return [], True
+
+            start = since - first_seq + 1
+            end = min(len(self._events), start + limit)
+            return [self._events[i] for i in range(start, end)], False
+
+    async def wait(self, since: int, timeout: float) -> bool:
+        """
+        等待新事件
+
+        Args:
+            since: 客户端已收到的最后一个序号
+            timeout: 超时时间（秒）
+
+        Returns:
+            是否有新事件
+        """
+        loop = asyncio.get_running_loop()
+        event = asyncio.Event()
+        waiter = (loop, event)
+
+        with self._lock:
+            if self._last_seq > since:
+                return True
+            self._waiters.add(waiter)
+
+        try:
+            await asyncio.wait_for(event.wait(), timeout)
+            return True
+        except asyncio.TimeoutError:
+            return False
+        finally:
+            with self._lock:
+                self._waiters.discard(waiter)
+
+    def _notify(self) -> None:
+        """唤醒等待中的订阅者"""
+        with self._lock:
+            waiters = list(self._waiters)
+        for loop, event in waiters:
+            try:
+                loop.call_soon_threadsafe(event.set)
+            except RuntimeError:
+                # 事件循环已关闭
+                pass
+
+    def get_stats(self) -> Dict[str, Any]:
+        """获取事件流统计信息"""
+        with self._lock:
+            return {
+                "stream_id": self.stream_id,
+                "last_seq": self._last_seq,
+                "buffered": len(self._events),
+                "subscribers": len(self._waiters),
+                "published": self.published_count,
+                "coalesced": self.coalesced_count,
+                "pending_progress": len(self._pending_progress),
+            }
+
+    def close(self) -> None:
+        """停止延迟推送"""
+        with self._lock:
+            if self._flush_timer is not None:
+                self._flush_timer.cancel()
+                self._flush_timer = None
@@ -52,30 +52,15 @@ class TaskManager:
                 "gpu_memory_pause_threshold": 95.0,
             }
         )
-        self.task_monitor = OptimizedTaskMonitor()
+        self.task_monitor = OptimizedTaskMonitor(
+            max_terminal_tasks=self.task_config.get("max_terminal_tasks", 5000),
+            archive_path=self.task_config.get("task_archive_path"),
+        )
         self.group_manager = TaskGroupManager(self.task_config)
         self.priority_calculator = PriorityCalculator()
 
         # 并发管理器
-        concurrency_config = ConcurrencyConfig(
-            concurrency_mode=self.task_config.get("concurrency_mode", "dynamic"),
-            min_concurrent=self.task_config.get("min_concurrent_tasks", 1),
-            max_concurrent=self.task_config.get("max_concurrent_tasks", 8),
-            base_concurrent_tasks=self.task_config.get("base_concurrent_tasks", 4),
-            target_cpu_percent=self.task_config.get(
-                "dynamic_concurrency_target_cpu", 70.0
-            ),
-            target_memory_percent=self.task_config.get(
-                "dynamic_concurrency_target_memory", 70.0
-            ),
-            target_gpu_memory_percent=self.task_config.get(
-                "dynamic_concurrency_target_gpu", 80.0
-            ),
-            adjustment_interval=self.task_config.get(
-                "dynamic_concurrency_interval", 5.0
-            ),
-            adjustment_step=self.task_config.get("dynamic_concurrency_step", 1),
-        )
+        concurrency_config = ConcurrencyConfig.from_task_config(self.task_config)
         self.concurrency_manager = OptimizedConcurrencyManager(
             concurrency_config, device
         )
@@ -457,7 +442,7 @@ class TaskManager:
         return {
             "task_stats": self.task_monitor.get_statistics(),
             "resource_usage": self.resource_manager.get_resource_usage(),
-            "concurrency": self.concurrency_manager.current_concurrent,
+            "concurrency": self.concurrency_manager.get_statistics(),
             "queue_size": self.task_queue.size(),
         }
 
@@ -491,11 +476,20 @@ class TaskManager:
                     time.sleep(0.1)
                     continue
 
+                # 检查任务类型的并发槽位
+                if not self.concurrency_manager.try_acquire(task.task_type):
+                    self.task_queue.add_task(task)
+                    import time
+
+                    time.sleep(0.1)
+                    continue
+
                 # 检查任务流水线锁（如果任务属于文件）
                 if task.file_id:
                     # 尝试获取任务流水线锁
                     if not self.group_manager.acquire_pipeline_lock(task):
                         # 无法获取锁，重新入队
+                        self.concurrency_manager.release(task.task_type, success=False)
                         self.task_queue.add_task(task)
                         import time
 
@@ -525,11 +519,8 @@ class TaskManager:
         Returns:
             是否可以执行
         """
-        # 检查并发限制
-        current_concurrent = self.concurrency_manager.current_concurrent
-        max_concurrent = self.concurrency_manager.config.max_concurrent
-
-        if current_concurrent >= max_concurrent:
+        # 检查全局并发限制（任务类型的槽位在取出任务后检查）
+        if self.concurrency_manager.running_total >= self.concurrency_manager.current_concurrent:
             return False
 
         # 检查资源使用情况（使用简化的2级OOM处理）
@@ -562,10 +553,8 @@ class TaskManager:
         Args:
             task: 任务
         """
+        success = False
         try:
-            # 增加并发计数
-            self.concurrency_manager.increment_concurrent()
-
             # 执行任务
             success = self.task_executor.execute_task(task)
 
@@ -588,5 +577,5 @@ class TaskManager:
             logger.error(f"任务执行失败: {task.id}, 错误: {e}")
 
         finally:
-            # 减少并发计数
-            self.concurrency_manager.decrement_concurrent()
+            # 释放并发槽位
+            self.concurrency_manager.release(task.task_type, success=bool(success))
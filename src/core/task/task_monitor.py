@@ -5,14 +5,38 @@
 
 import threading
 import time
-from typing import Dict, List, Optional, Any
+from collections import OrderedDict
+from typing import Dict, List, Optional, Any, Set, Tuple
 from datetime import datetime
 import logging
 
+from src.core.utils.metrics import get_metrics_registry
+
 from .task import Task
+from .task_archive import TaskArchive
 
 logger = logging.getLogger(__name__)
 
+# 已结束的任务状态
+TERMINAL_STATUSES = ("completed", "failed", "cancelled")
+
+
+def _duration(task: Task) -> float:
+    if not task.started_at:
+        return -1.0
+    end = task.completed_at or datetime.now()
+    return (end - task.started_at).total_seconds()
+
+
+# query_tasks 支持的排序字段及取值函数（值需可JSON序列化，用作分页游标）
+TASK_SORT_KEYS = {
+    "created_at": lambda task: task.created_at.timestamp() if task.created_at else 0.0,
+    "priority": lambda task: task.priority,
+    "status": lambda task: task.status,
+    "progress": lambda task: task.progress,
+    "duration": _duration,
+}
+
 
 class OptimizedTaskMonitor:
     """
@@ -23,11 +47,48 @@ class OptimizedTaskMonitor:
     - 任务进度监控（监控任务执行进度）
     - 任务历史记录（维护任务执行历史）
     - 任务查询接口（提供任务信息查询功能）
+
+    按状态、文件ID和任务类型维护二级索引，查询和计数不再遍历全部任务。
+    内存中只保留最近 max_terminal_tasks 个已结束的任务，更早的任务移入
+    SQLite归档（未配置归档时直接丢弃），get_task 和 include_archived 查询会
+    回查归档。
     """
 
-    def __init__(self):
+    def __init__(
+        self, max_terminal_tasks: int = 5000, archive_path: Optional[str] = None
+    ):
+        """
+        初始化任务监控器
+
+        Args:
+            max_terminal_tasks: 内存中保留的已结束任务数
+            archive_path: 任务归档数据库路径，为None时不归档
+        """
         # 任务存储
         self.tasks: Dict[str, Task] = {}
+        self.max_terminal_tasks = max_terminal_tasks
+
+        # 最近一次记录的状态和进度（任务对象会被原地修改，不能用它判断变化）
+        self._last_status: Dict[str, str] = {}
+        self._last_progress: Dict[str, float] = {}
+
+        # 二级索引（按状态索引使用_last_status，与事件保持一致）
+        self._by_status: Dict[str, Dict[str, Task]] = {}
+        self._by_file: Dict[str, Set[str]] = {}
+        self._by_type: Dict[str, Set[str]] = {}
+
+        # 已结束任务，按结束顺序排列
+        self._terminal: "OrderedDict[str, None]" = OrderedDict()
+
+        self.archive: Optional[TaskArchive] = None
+        self._archived_counts: Dict[str, int] = {}
+        if archive_path:
+            try:
+                self.archive = TaskArchive(archive_path)
+                self._archived_counts = self.archive.count_by_status()
+            except Exception as e:
+                logger.warning(f"任务归档不可用，已结束的任务将直接丢弃: {e}")
+                self.archive = None
 
         # 线程锁
         self.lock = threading.Lock()
@@ -39,12 +100,14 @@ class OptimizedTaskMonitor:
             "total_failed": 0,
             "total_cancelled": 0,
             "running_count": 0,
+            "archived_count": 0,
         }
 
         # 事件回调
         self.event_callbacks: Dict[str, List[callable]] = {
             "task_created": [],
             "task_started": [],
+            "task_progress": [],
             "task_completed": [],
             "task_failed": [],
             "task_cancelled": [],
@@ -60,15 +123,23 @@ class OptimizedTaskMonitor:
             task: 任务对象
         """
         with self.lock:
+            if task.id in self.tasks:
+                self._forget(task.id)
             self.tasks[task.id] = task
+            self._last_status[task.id] = task.status
+            self._last_progress[task.id] = task.progress
+            self._index(task)
             self.stats["total_created"] += 1
+            evicted = self._track_terminal(task.id, task.status)
 
             # 触发任务创建事件
             self._trigger_event("task_created", task)
 
+        self._archive_tasks(evicted)
+
     def get_task(self, task_id: str) -> Optional[Task]:
         """
-        获取任务
+        获取任务（内存中不存在时查询归档）
 
         Args:
             task_id: 任务ID
@@ -77,7 +148,10 @@ class OptimizedTaskMonitor:
             任务对象或None
         """
         with self.lock:
-            return self.tasks.get(task_id)
+            task = self.tasks.get(task_id)
+        if task is None and self.archive is not None:
+            task = self.archive.get_task(task_id)
+        return task
 
     def update_task(self, task: Task) -> bool:
         """
@@ -89,49 +163,129 @@ class OptimizedTaskMonitor:
         Returns:
             是否成功
         """
+        evicted: List[Task] = []
         with self.lock:
-            if task.id in self.tasks:
-                # 更新统计
-                old_status = self.tasks[task.id].status
-                new_status = task.status
-
-                # 状态变更统计
-                if old_status != new_status:
-                    if new_status == "completed":
-                        self.stats["total_completed"] += 1
-                    elif new_status == "failed":
-                        self.stats["total_failed"] += 1
-                    elif new_status == "cancelled":
-                        self.stats["total_cancelled"] += 1
-
-                    # 触发相应事件
-                    if new_status == "running":
-                        self.stats["running_count"] += 1
-                        self._trigger_event("task_started", task)
-                    elif old_status == "running" and new_status in [
-                        "completed",
-                        "failed",
-                        "cancelled",
-                    ]:
-                        self.stats["running_count"] -= 1
-
-                    if new_status == "completed":
-                        self._trigger_event("task_completed", task)
-                    elif new_status == "failed":
-                        self._trigger_event("task_failed", task)
-                    elif new_status == "cancelled":
-                        self._trigger_event("task_cancelled", task)
-
-                # 更新任务
-                self.tasks[task.id] = task
-                return True
+            if task.id not in self.tasks:
+                return False
+
+            # 更新统计
+            old_status = self._last_status.get(task.id)
+            new_status = task.status
+
+            # 状态变更统计
+            if old_status != new_status:
+                if new_status == "completed":
+                    self.stats["total_completed"] += 1
+                elif new_status == "failed":
+                    self.stats["total_failed"] += 1
+                elif new_status == "cancelled":
+                    self.stats["total_cancelled"] += 1
+
+                # 触发相应事件
+                if new_status == "running":
+                    self.stats["running_count"] += 1
+                    self._trigger_event("task_started", task)
+                elif old_status == "running" and new_status in TERMINAL_STATUSES:
+                    self.stats["running_count"] -= 1
+
+                if new_status == "completed":
+                    self._trigger_event("task_completed", task)
+                elif new_status == "failed":
+                    self._trigger_event("task_failed", task)
+                elif new_status == "cancelled":
+                    self._trigger_event("task_cancelled", task)
+
+                self._move_status(task, old_status, new_status)
+                evicted = self._track_terminal(task.id, new_status)
+            elif task.progress != self._last_progress.get(task.id):
+                self._trigger_event("task_progress", task)
+
+            self._last_status[task.id] = new_status
+            self._last_progress[task.id] = task.progress
+
+            # 更新任务
+            self.tasks[task.id] = task
+
+        self._archive_tasks(evicted)
+        return True
+
+    def update_task_status(
+        self, task_id: str, status: str, progress: Optional[float] = None, **kwargs
+    ) -> bool:
+        """
+        更新任务状态
+
+        Args:
+            task_id: 任务ID
+            status: 新状态
+            progress: 进度(0-1)，为None时保持不变
+            kwargs: 其他需要更新的任务属性（如error、result）
+
+        Returns:
+            是否成功
+        """
+        with self.lock:
+            task = self.tasks.get(task_id)
+        if task is None:
             return False
 
+        now = datetime.now()
+        if status == "running" and task.status != "running":
+            task.started_at = now
+        elif status in TERMINAL_STATUSES:
+            task.completed_at = now
+            if task.status not in TERMINAL_STATUSES:
+                self._record_finished(task, status, now)
+        task.status = status
+        task.updated_at = now
+        if progress is not None:
+            task.progress = progress
+        for key, value in kwargs.items():
+            setattr(task, key, value)
+
+        return self.update_task(task)
+
+    @staticmethod
+    def _record_finished(task: Task, status: str, now: datetime) -> None:
+        """记录任务结束的计数和执行耗时"""
+        registry = get_metrics_registry()
+        registry.counter(
+            "msearch_tasks_finished_total",
+            "结束的任务数",
+            task_type=task.task_type,
+            status=status,
+        ).inc()
+        if task.started_at:
+            registry.histogram(
+                "msearch_task_duration_seconds",
+                "任务执行耗时（秒）",
+                task_type=task.task_type,
+            ).observe((now - task.started_at).total_seconds())
+
+    def update_task_progress(self, task_id: str, progress: float) -> bool:
+        """
+        更新任务进度
+
+        Args:
+            task_id: 任务ID
+            progress: 进度(0-1)
+
+        Returns:
+            是否成功
+        """
+        with self.lock:
+            task = self.tasks.get(task_id)
+        if task is None:
+            return False
+        task.progress = progress
+        task.updated_at = datetime.now()
+        return self.update_task(task)
+
     def get_all_tasks(
         self, status: str = None, task_type: str = None
     ) -> Dict[str, Task]:
         """
-        获取所有任务
+        获取所有任务（不含已归档的任务）
 
         Args:
             status: 状态过滤
@@ -141,29 +295,42 @@ class OptimizedTaskMonitor:
             任务字典
         """
         with self.lock:
-            result = {}
-            for task_id, task in self.tasks.items():
-                # 状态过滤
-                if status and task.status != status:
-                    continue
-                # 类型过滤
-                if task_type and task.task_type != task_type:
-                    continue
-                result[task_id] = task
-            return result
+            if status:
+                candidates = self._by_status.get(status, {})
+                if task_type:
+                    type_ids = self._by_type.get(task_type, ())
+                    return {
+                        task_id: task
+                        for task_id, task in candidates.items()
+                        if task_id in type_ids
+                    }
+                return dict(candidates)
+            if task_type:
+                return {
+                    task_id: self.tasks[task_id]
+                    for task_id in self._by_type.get(task_type, ())
+                }
+            return dict(self.tasks)
 
-    def get_tasks_by_status(self, status: str) -> List[Task]:
+    def get_tasks_by_status(
+        self, status: str, include_archived: bool = False, limit: int = 1000
+    ) -> List[Task]:
         """
         按状态获取任务
 
         Args:
             status: 状态
+            include_archived: 是否包含已归档的任务
+            limit: 最多返回的归档任务数
 
         Returns:
             任务列表
         """
         with self.lock:
-            return [task for task in self.tasks.values() if task.status == status]
+            tasks = list(self._by_status.get(status, {}).values())
+        if include_archived and self.archive is not None and status in TERMINAL_STATUSES:
+            tasks.extend(self.archive.query(status=status, limit=limit))
+        return tasks
 
     def get_running_tasks(self) -> List[Task]:
         """
@@ -213,10 +380,11 @@ class OptimizedTaskMonitor:
             stats.update(
                 {
                     "total_tasks": len(self.tasks),
-                    "pending_count": len(self.get_pending_tasks()),
-                    "running_count": len(self.get_running_tasks()),
-                    "completed_count": len(self.get_completed_tasks()),
-                    "failed_count": len(self.get_failed_tasks()),
+                    "pending_count": self._count("pending"),
+                    "running_count": self._count("running"),
+                    "completed_count": self._count("completed"),
+                    "failed_count": self._count("failed"),
+                    "terminal_in_memory": len(self._terminal),
                 }
             )
             return stats
@@ -228,16 +396,7 @@ class OptimizedTaskMonitor:
         Returns:
             清除的任务数量
         """
-        with self.lock:
-            completed_tasks = self.get_completed_tasks()
-            removed_count = 0
-
-            for task in completed_tasks:
-                if task.id in self.tasks:
-                    del self.tasks[task.id]
-                    removed_count += 1
-
-            return removed_count
+        return self._clear_status("completed")
 
     def clear_failed_tasks(self) -> int:
         """
@@ -246,16 +405,14 @@ class OptimizedTaskMonitor:
         Returns:
             清除的任务数量
         """
-        with self.lock:
-            failed_tasks = self.get_failed_tasks()
-            removed_count = 0
+        return self._clear_status("failed")
 
-            for task in failed_tasks:
-                if task.id in self.tasks:
-                    del self.tasks[task.id]
-                    removed_count += 1
-
-            return removed_count
+    def _clear_status(self, status: str) -> int:
+        with self.lock:
+            task_ids = list(self._by_status.get(status, {}))
+            for task_id in task_ids:
+                self._forget(task_id)
+            return len(task_ids)
 
     def clear_old_tasks(self, hours: int = 24) -> int:
         """
@@ -271,30 +428,100 @@ class OptimizedTaskMonitor:
             cutoff_time = time.time() - (hours * 3600)
             removed_count = 0
 
-            for task_id, task in list(self.tasks.items()):
-                # 只清除已完成或失败的任务
-                if task.status in ["completed", "failed", "cancelled"]:
-                    task_time = getattr(
-                        task, "completed_at", getattr(task, "updated_at", None)
-                    )
-                    if task_time:
-                        task_timestamp = (
-                            task_time.timestamp()
-                            if hasattr(task_time, "timestamp")
-                            else task_time
-                        )
-                        if task_timestamp < cutoff_time:
-                            del self.tasks[task_id]
-                            removed_count += 1
-                    else:
-                        # 如果没有时间戳，使用创建时间
-                        created_time = getattr(task, "created_at", time.time())
-                        if created_time < cutoff_time:
-                            del self.tasks[task_id]
-                            removed_count += 1
+            # 只清除已完成或失败的任务
+            for task_id in list(self._terminal):
+                task = self.tasks[task_id]
+                task_time = task.completed_at or task.updated_at or task.created_at
+                if task_time is None:
+                    continue
+                task_timestamp = (
+                    task_time.timestamp()
+                    if hasattr(task_time, "timestamp")
+                    else task_time
+                )
+                if task_timestamp < cutoff_time:
+                    self._forget(task_id)
+                    removed_count += 1
 
             return removed_count
 
+    def _index(self, task: Task) -> None:
+        """将任务加入二级索引（调用方需持有锁）"""
+        self._by_status.setdefault(task.status, {})[task.id] = task
+        if task.file_id:
+            self._by_file.setdefault(task.file_id, set()).add(task.id)
+        self._by_type.setdefault(task.task_type, set()).add(task.id)
+
+    def _move_status(self, task: Task, old_status: Optional[str], new_status: str) -> None:
+        """更新状态索引（调用方需持有锁）"""
+        bucket = self._by_status.get(old_status)
+        if bucket is not None:
+            bucket.pop(task.id, None)
+        self._by_status.setdefault(new_status, {})[task.id] = task
+
+    def _track_terminal(self, task_id: str, status: str) -> List[Task]:
+        """
+        记录已结束的任务，超出内存窗口时移出最早结束的任务（调用方需持有锁）
+
+        Returns:
+            需要归档的任务列表
+        """
+        if status not in TERMINAL_STATUSES:
+            # 重试等情况下任务重新变为未结束状态
+            self._terminal.pop(task_id, None)
+            return []
+
+        self._terminal[task_id] = None
+        self._terminal.move_to_end(task_id)
+
+        evicted = []
+        while len(self._terminal) > self.max_terminal_tasks:
+            old_id, _ = self._terminal.popitem(last=False)
+            task = self.tasks.get(old_id)
+            if task is not None:
+                evicted.append(task)
+                self._forget(old_id)
+        return evicted
+
+    def _archive_tasks(self, tasks: List[Task]) -> None:
+        """将移出内存的任务写入归档（在锁外调用）"""
+        if not tasks or self.archive is None:
+            return
+        try:
+            self.archive.add_tasks(tasks)
+        except Exception as e:
+            logger.error(f"归档任务失败: {e}")
+            return
+        with self.lock:
+            self.stats["archived_count"] += len(tasks)
+            for task in tasks:
+                self._archived_counts[task.status] = (
+                    self._archived_counts.get(task.status, 0) + 1
+                )
+
+    def _count(self, status: str) -> int:
+        """内存中指定状态的任务数（调用方需持有锁）"""
+        return len(self._by_status.get(status, ()))
+
+    def _forget(self, task_id: str) -> None:
+        """移除任务及其状态记录和索引（调用方需持有锁）"""
+        task = self.tasks.pop(task_id, None)
+        status = self._last_status.pop(task_id, None)
+        self._last_progress.pop(task_id, None)
+        self._terminal.pop(task_id, None)
+        if task is None:
+            return
+
+        bucket = self._by_status.get(status)
+        if bucket is not None:
+            bucket.pop(task_id, None)
+        for index, key in ((self._by_file, task.file_id), (self._by_type, task.task_type)):
+            ids = index.get(key)
+            if ids is not None:
+                ids.discard(task_id)
+                if not ids:
+                    del index[key]
+
     def add_event_callback(self, event_type: str, callback: callable) -> None:
         """
         添加事件回调
@@ -356,53 +583,171 @@ class OptimizedTaskMonitor:
             return [task.to_dict()]  # 假设有to_dict方法
         return []
 
-    def search_tasks(self, query: str) -> List[Task]:
+    def search_tasks(
+        self, query: str, include_archived: bool = False, limit: int = 1000
+    ) -> List[Task]:
         """
         搜索任务
 
         Args:
             query: 查询字符串
+            include_archived: 是否包含已归档的任务
+            limit: 最多返回的归档任务数
 
         Returns:
             匹配的任务列表
         """
+        query_lower = query.lower()
         with self.lock:
-            results = []
-
-            for task in self.tasks.values():
+            results = [
+                task
+                for task in self.tasks.values()
                 # 搜索任务ID、类型、错误信息等
-                if (
-                    query.lower() in task.id.lower()
-                    or query.lower() in task.task_type.lower()
-                    or (task.error and query.lower() in task.error.lower())
-                ):
-                    results.append(task)
-
-            return results
-
-    def get_tasks_by_file(self, file_id: str) -> List[Task]:
+                if query_lower in task.id.lower()
+                or query_lower in task.task_type.lower()
+                or (task.error and query_lower in task.error.lower())
+            ]
+        if include_archived and self.archive is not None:
+            results.extend(self.archive.search(query, limit=limit))
+        return results
+
+    def get_tasks_by_file(
+        self, file_id: str, include_archived: bool = False, limit: int = 1000
+    ) -> List[Task]:
         """
         按文件ID获取任务
 
         Args:
             file_id: 文件ID
+            include_archived: 是否包含已归档的任务
+            limit: 最多返回的归档任务数
 
         Returns:
             任务列表
         """
         with self.lock:
-            return [task for task in self.tasks.values() if task.file_id == file_id]
+            tasks = [self.tasks[task_id] for task_id in self._by_file.get(file_id, ())]
+        if include_archived and self.archive is not None:
+            tasks.extend(self.archive.query(file_id=file_id, limit=limit))
+        return tasks
 
-    def get_task_count_by_status(self) -> Dict[str, int]:
+    def get_task_count_by_status(self, include_archived: bool = False) -> Dict[str, int]:
         """
         获取各状态的任务数量
 
+        Args:
+            include_archived: 是否包含已归档的任务
+
         Returns:
             状态任务数量字典
         """
         with self.lock:
-            counts = {}
-            for task in self.tasks.values():
-                status = task.status
-                counts[status] = counts.get(status, 0) + 1
+            counts = {
+                status: len(bucket) for status, bucket in self._by_status.items() if bucket
+            }
+            if include_archived:
+                for status, count in self._archived_counts.items():
+                    counts[status] = counts.get(status, 0) + count
             return counts
+
+    def query_tasks(
+        self,
+        statuses: Optional[List[str]] = None,
+        task_types: Optional[List[str]] = None,
+        search: Optional[str] = None,
+        priority_ranges: Optional[List[Tuple[int, int]]] = None,
+        created_after: Optional[float] = None,
+        sort_by: str = "created_at",
+        descending: bool = True,
+        after: Optional[tuple] = None,
+        limit: int = 100,
+    ) -> Tuple[List[Task], Optional[tuple], int, Dict[str, int]]:
+        """
+        过滤、排序并分页查询任务（不含已归档的任务）
+
+        候选集合由状态和类型索引得出，其余条件逐个判断。分页使用
+        (排序值, 任务ID) 作为游标，翻页期间有任务增减也不会重复或遗漏。
+        未结束任务的耗时随时间变化，不能作为游标，按耗时排序时只返回已结束的任务。
+
+        Args:
+            statuses: 状态过滤
+            task_types: 任务类型过滤
+            search: 按任务ID、类型、文件路径和错误信息搜索
+            priority_ranges: 优先级范围列表 [(最小值, 最大值), ...]
+            created_after: 只返回该时间戳之后创建的任务
+            sort_by: 排序字段（created_at/priority/status/progress/duration，
+                duration只对已结束的任务排序）
+            descending: 是否降序
+            after: 上一页最后一个任务的 (排序值, 任务ID)
+            limit: 返回数量限制
+
+        Returns:
+            (任务列表, 下一页游标, 匹配总数, 不考虑状态过滤时各状态的数量)
+        """
+        key_func = TASK_SORT_KEYS.get(sort_by)
+        if key_func is None:
+            raise ValueError(f"不支持的排序字段: {sort_by}")
+        search_lower = search.lower() if search else None
+        allowed_statuses = set(statuses) if statuses else None
+        if sort_by == "duration":
+            allowed_statuses = (allowed_statuses or set(TERMINAL_STATUSES)) & set(
+                TERMINAL_STATUSES
+            )
+
+        def matches(task: Task) -> bool:
+            if priority_ranges and not any(
+                low <= task.priority <= high for low, high in priority_ranges
+            ):
+                return False
+            if created_after is not None and (
+                not task.created_at or task.created_at.timestamp() < created_after
+            ):
+                return False
+            if search_lower and not (
+                search_lower in task.id.lower()
+                or search_lower in task.task_type.lower()
+                or (task.file_path and search_lower in task.file_path.lower())
+                or (task.error and search_lower in task.error.lower())
+            ):
+                return False
+            return True
+
+        with self.lock:
+            if task_types:
+                candidates = [
+                    self.tasks[task_id]
+                    for task_type in set(task_types)
+                    for task_id in self._by_type.get(task_type, ())
+                ]
+            else:
+                candidates = list(self.tasks.values())
+
+            status_counts: Dict[str, int] = {}
+            selected = []
+            for task in candidates:
+                if not matches(task):
+                    continue
+                status = self._last_status.get(task.id, task.status)
+                status_counts[status] = status_counts.get(status, 0) + 1
+                if allowed_statuses is None or status in allowed_statuses:
+                    selected.append((key_func(task), task.id, task))
+
+        selected.sort(key=lambda item: (item[0], item[1]), reverse=descending)
+        total = len(selected)
+
+        if after is not None:
+            cursor = tuple(after)
+            selected = [
+                item
+                for item in selected
+                if ((item[0], item[1]) < cursor if descending else (item[0], item[1]) > cursor)
+            ]
+
+        page = selected[:limit]
+        next_cursor = (page[-1][0], page[-1][1]) if len(selected) > limit else None
+        return [item[2] for item in page], next_cursor, total, status_counts
+
+    def close(self) -> None:
+        """关闭任务归档"""
+        if self.archive is not None:
+            self.archive.close()
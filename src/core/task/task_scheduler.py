@@ -23,10 +23,12 @@ import heapq
 import logging
 import time
 from datetime import datetime
-from typing import Dict, List, Optional, Any, Tuple
+from typing import Dict, List, Optional, Any, Set, Tuple
 from dataclasses import dataclass, field
 from enum import Enum
 
+from src.core.utils.metrics import get_metrics_registry
+
 from .task import Task
 from .task_types import TaskType, TaskStatus
 from .priority_calculator import PriorityCalculator
@@ -98,6 +100,11 @@ class TaskScheduler:
         # 运行状态
         self.is_running = False
 
+        # 队列长度在导出/metrics时读取
+        get_metrics_registry().register_collector(
+            "task_scheduler", self._collect_metrics
+        )
+
         logger.info("TaskScheduler initialized")
 
     async def start(self):
@@ -183,10 +190,15 @@ class TaskScheduler:
             logger.debug(f"Task enqueued: {task.id}, priority: {task.priority}")
             return True
 
-    async def dequeue_task(self) -> Optional[Task]:
+    async def dequeue_task(
+        self, exclude_types: Optional[Set[str]] = None
+    ) -> Optional[Task]:
         """
         从队列中取出优先级最高的任务
 
+        Args:
+            exclude_types: 跳过的任务类型（如并发槽位已满的类型），这些任务留在队列中
+
         Returns:
             优先级最高的任务，如果队列为空则返回None
         """
@@ -197,13 +209,15 @@ class TaskScheduler:
             # 检查OOM状态
             if self.oom_state == "critical":
                 # 临界状态，只允许关键任务出队
-                return await self._dequeue_critical_task_only()
+                return await self._dequeue_critical_task_only(exclude_types)
 
             # 动态优先级调整：重新计算队列中任务的优先级
             if self.dynamic_priority_enabled:
                 await self._adjust_priorities()
 
             # 取出优先级最高的任务
+            skipped = []
+            result = None
             while self._queue:
                 prioritized_task = heapq.heappop(self._queue)
                 task = prioritized_task.task
@@ -215,16 +229,53 @@ class TaskScheduler:
                         del self._task_index[task.id]
                     continue
 
+                if exclude_types and task.task_type in exclude_types:
+                    skipped.append(prioritized_task)
+                    continue
+
                 # 从索引中移除
                 if task.id in self._task_index:
                     del self._task_index[task.id]
 
+                get_metrics_registry().counter(
+                    "msearch_tasks_dequeued_total",
+                    "出队的任务数",
+                    task_type=task.task_type,
+                ).inc()
                 logger.debug(f"Task dequeued: {task.id}, priority: {task.priority}")
-                return task
+                result = task
+                break
 
-            return None
+            # 跳过的任务放回队列
+            for pt in skipped:
+                heapq.heappush(self._queue, pt)
+
+            return result
+
+    async def requeue_task(self, task: Task) -> bool:
+        """
+        把已出队但暂时无法执行的任务放回队列（保持原优先级，不重新计算）
+
+        Args:
+            task: 要放回的任务
+
+        Returns:
+            是否成功放回
+        """
+        async with self._queue_lock:
+            if task.id in self._task_index:
+                return False
+
+            prioritized_task = PrioritizedTask(task)
+            heapq.heappush(self._queue, prioritized_task)
+            self._task_index[task.id] = prioritized_task
 
-    async def _dequeue_critical_task_only(self) -> Optional[Task]:
+            logger.debug(f"Task requeued: {task.id}, priority: {task.priority}")
+            return True
+
+    async def _dequeue_critical_task_only(
+        self, exclude_types: Optional[Set[str]] = None
+    ) -> Optional[Task]:
         """OOM临界状态下，只出队关键任务"""
         critical_types = {
             TaskType.IMAGE_PREPROCESS.value,
@@ -246,7 +297,9 @@ class TaskScheduler:
             if task.status != "pending":
                 continue
 
-            if task.task_type in critical_types:
+            if task.task_type in critical_types and not (
+                exclude_types and task.task_type in exclude_types
+            ):
                 result = task
                 if task.id in self._task_index:
                     del self._task_index[task.id]
@@ -326,6 +379,31 @@ class TaskScheduler:
             # 返回堆顶元素
             return self._queue[0].task
 
+    def get_queue_depths(self) -> Dict[str, int]:
+        """
+        按任务类型统计队列长度（不加锁，读取队列的瞬时副本）
+
+        Returns:
+            {任务类型: 排队任务数}
+        """
+        depths: Dict[str, int] = {}
+        for prioritized_task in list(self._queue):
+            task = prioritized_task.task
+            if task.status == "pending":
+                depths[task.task_type] = depths.get(task.task_type, 0) + 1
+        return depths
+
+    def _collect_metrics(self):
+        """导出各任务类型的队列长度"""
+        for task_type, depth in self.get_queue_depths().items():
+            yield (
+                "msearch_task_queue_depth",
+                "gauge",
+                "排队中的任务数",
+                {"task_type": task_type},
+                depth,
+            )
+
     async def get_queue_size(self) -> int:
         """获取队列大小"""
         async with self._queue_lock:
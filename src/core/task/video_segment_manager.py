@@ -114,38 +114,24 @@ class VideoSegmentManager:
 
     def _get_video_duration(self, video_path: str) -> float:
         """Get video duration"""
+        from src.services.media.media_probe import get_media_probe
+
+        duration = get_media_probe().get_duration(video_path)
+        if duration is not None:
+            return duration
+
+        # If ffprobe fails, try alternative method to get duration
         try:
-            result = subprocess.run(
-                [
-                    "ffprobe",
-                    "-v",
-                    "quiet",
-                    "-show_entries",
-                    "format=duration",
-                    "-of",
-                    "csv=p=0",
-                    video_path,
-                ],
-                capture_output=True,
-                text=True,
-                check=True,
-            )
+            import cv2
 
-            duration = float(result.stdout.strip())
+            cap = cv2.VideoCapture(video_path)
+            fps = cap.get(cv2.CAP_PROP_FPS)
+            frame_count = cap.get(cv2.CAP_PROP_FRAME_COUNT)
+            duration = frame_count / fps if fps > 0 else 0
+            cap.release()
             return duration
-        except subprocess.CalledProcessError:
-            # If ffprobe fails, try alternative method to get duration
-            try:
-                import cv2
-
-                cap = cv2.VideoCapture(video_path)
-                fps = cap.get(cv2.CAP_PROP_FPS)
-                frame_count = cap.get(cv2.CAP_PROP_FRAME_COUNT)
-                duration = frame_count / fps if fps > 0 else 0
-                cap.release()
-                return duration
-            except:
-                raise ValueError(f"Cannot get video duration: {video_path}")
+        except:
+            raise ValueError(f"Cannot get video duration: {video_path}")
 
     def _generate_timestamp_map(
         self, start_time: float, end_time: float
@@ -0,0 +1,349 @@
+"""
+运行指标
+固定内存的对数分桶延迟直方图、计数器和按需采集的指标，输出Prometheus文本格式
+"""
+
+import math
+import threading
+import weakref
+from typing import Any, Callable, Dict, Iterable, List, Optional, Tuple
+
+# 直方图分桶：从1微秒到约1000秒，每个2倍区间分为BUCKETS_PER_DOUBLING个桶（相对误差约9%）
+HISTOGRAM_MIN_VALUE = 1e-6
+HISTOGRAM_MAX_VALUE = 1e3
+BUCKETS_PER_DOUBLING = 4
+
+# /metrics中输出的分位数
+EXPORTED_QUANTILES = (0.5, 0.95, 0.99)
+
+# 采集函数返回的样本：(指标名, 类型, 说明, 标签, 值)
+MetricSample = Tuple[str, str, str, Dict[str, str], float]
+
+LabelKey = Tuple[Tuple[str, str], ...]
+
+
+class LatencyHistogram:
+    """
+    对数分桶直方图
+
+    桶边界按几何级数分布，内存大小固定，与观测次数无关；
+    记录一次观测只需一次对数运算和一次计数。
+    """
+
+    _log_factor = math.log(2.0) / BUCKETS_PER_DOUBLING
+    _num_buckets = (
+        int(math.ceil(math.log(HISTOGRAM_MAX_VALUE / HISTOGRAM_MIN_VALUE) / _log_factor))
+        + 1
+    )
+
+    def __init__(self):
+        self._counts = [0] * self._num_buckets
+        self._lock = threading.Lock()
+        self.count = 0
+        self.sum = 0.0
+        self.min = math.inf
+        self.max = 0.0
+
+    def observe(self, value: float) -> None:
+        """
+        记录一次观测值
+
+        Args:
+            value: 观测值（秒）
+        """
+        if value <= HISTOGRAM_MIN_VALUE:
+            index = 0
+        else:
+            index = min(
+                self._num_buckets - 1,
+                int(math.ceil(math.log(value / HISTOGRAM_MIN_VALUE) / self._log_factor)),
+            )
+        with self._lock:
+            self._counts[index] += 1
+            self.count += 1
+            self.sum += value
+            if value < self.min:
+                self.min = value
+            if value > self.max:
+                self.max = value
+
+    @classmethod
+    def _bucket_upper_bound(cls, index: int) -> float:
+        return HISTOGRAM_MIN_VALUE * math.exp(index * cls._log_factor)
+
+    def quantile(self, q: float) -> float:
+        """
+        估算分位数
+
+        Args:
+            q: 分位数（0-1）
+
+        Returns:
+            分位数所在桶的上边界（不超过实际最大值），无观测时返回0
+        """
+        with self._lock:
+            counts = list(self._counts)
+            total = self.count
+            maximum = self.max
+        if total == 0:
+            return 0.0
+
+        rank = q * total
+        cumulative = 0
+        for index, count in enumerate(counts):
+            cumulative += count
+            if count and cumulative >= rank:
+                return min(self._bucket_upper_bound(index), maximum)
+        return maximum
+
+    @classmethod
+    def merged(cls, histograms: Iterable["LatencyHistogram"]) -> "LatencyHistogram":
+        """
+        合并多个直方图（例如同一操作在不同模型下的延迟）
+
+        Args:
+            histograms: 直方图列表
+
+        Returns:
+            合并后的新直方图
+        """
+        result = cls()
+        for histogram in histograms:
+            with histogram._lock:
+                for index, count in enumerate(histogram._counts):
+                    result._counts[index] += count
+                result.count += histogram.count
+                result.sum += histogram.sum
+                result.min = min(result.min, histogram.min)
+                result.max = max(result.max, histogram.max)
+        return result
+
+    def snapshot(self) -> Dict[str, float]:
+        """
+        获取统计摘要
+
+        Returns:
+            {count, sum, min, max, p50, p95, p99}
+        """
+        summary = {
+            "count": self.count,
+            "sum": self.sum,
+            "min": self.min if self.count else 0.0,
+            "max": self.max,
+        }
+        for q in EXPORTED_QUANTILES:
+            summary[f"p{int(q * 100)}"] = self.quantile(q)
+        return summary
+
+
+class Counter:
+    """单调递增计数器"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.value = 0.0
+
+    def inc(self, amount: float = 1.0) -> None:
+        """增加计数"""
+        with self._lock:
+            self.value += amount
+
+
+def _label_key(labels: Dict[str, Any]) -> LabelKey:
+    return tuple(sorted((k, str(v)) for k, v in labels.items() if v is not None))
+
+
+def _format_labels(labels: Iterable[Tuple[str, str]]) -> str:
+    parts = []
+    for key, value in labels:
+        value = value.replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+        parts.append(f'{key}="{value}"')
+    return "{" + ",".join(parts) + "}" if parts else ""
+
+
+def _format_value(value: float) -> str:
+    if value == math.inf:
+        return "+Inf"
+    return repr(float(value))
+
+
+class MetricsRegistry:
+    """
+    指标注册表
+
+    直方图和计数器按（指标名，标签）创建一次后复用，热路径上只有一次字典查找和计数。
+    队列长度、缓存命中等已有统计通过采集函数在导出时读取，不增加调用开销。
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._help: Dict[str, Tuple[str, str]] = {}
+        self._histograms: Dict[str, Dict[LabelKey, LatencyHistogram]] = {}
+        self._counters: Dict[str, Dict[LabelKey, Counter]] = {}
+        self._collectors: Dict[str, Callable[[], Optional[Callable]]] = {}
+
+    def histogram(self, name: str, help_text: str = "", **labels) -> LatencyHistogram:
+        """
+        获取（或创建）直方图
+
+        Args:
+            name: 指标名
+            help_text: 指标说明
+            labels: 标签，值为None的标签被忽略
+
+        Returns:
+            直方图
+        """
+        key = _label_key(labels)
+        series = self._histograms.get(name)
+        if series is not None and key in series:
+            return series[key]
+        with self._lock:
+            self._help.setdefault(name, ("summary", help_text))
+            return self._histograms.setdefault(name, {}).setdefault(
+                key, LatencyHistogram()
+            )
+
+    def counter(self, name: str, help_text: str = "", **labels) -> Counter:
+        """
+        获取（或创建）计数器
+
+        Args:
+            name: 指标名
+            help_text: 指标说明
+            labels: 标签，值为None的标签被忽略
+
+        Returns:
+            计数器
+        """
+        key = _label_key(labels)
+        series = self._counters.get(name)
+        if series is not None and key in series:
+            return series[key]
+        with self._lock:
+            self._help.setdefault(name, ("counter", help_text))
+            return self._counters.setdefault(name, {}).setdefault(key, Counter())
+
+    def get_histograms(self, name: str) -> Dict[LabelKey, LatencyHistogram]:
+        """
+        获取某个指标的全部直方图
+
+        Args:
+            name: 指标名
+
+        Returns:
+            {标签: 直方图}
+        """
+        with self._lock:
+            return dict(self._histograms.get(name, {}))
+
+    def get_counters(self, name: str) -> Dict[LabelKey, Counter]:
+        """
+        获取某个指标的全部计数器
+
+        Args:
+            name: 指标名
+
+        Returns:
+            {标签: 计数器}
+        """
+        with self._lock:
+            return dict(self._counters.get(name, {}))
+
+    def register_collector(
+        self, key: str, collector: Callable[[], Iterable[MetricSample]]
+    ) -> None:
+        """
+        注册导出时调用的采集函数
+
+        同一key重复注册时替换旧的采集函数。绑定方法以弱引用保存，
+        对象被回收后自动失效。
+
+        Args:
+            key: 采集函数标识
+            collector: 返回MetricSample序列的函数
+        """
+        if hasattr(collector, "__self__"):
+            ref = weakref.WeakMethod(collector)
+        else:
+            ref = lambda: collector  # noqa: E731
+        with self._lock:
+            self._collectors[key] = ref
+
+    def render(self) -> str:
+        """
+        导出为Prometheus文本格式
+
+        Returns:
+            指标文本
+        """
+        families: Dict[str, Tuple[str, str, List[str]]] = {}
+
+        def family(name: str, metric_type: str, help_text: str) -> List[str]:
+            if name not in families:
+                families[name] = (metric_type, help_text, [])
+            return families[name][2]
+
+        with self._lock:
+            histograms = {name: dict(s) for name, s in self._histograms.items()}
+            counters = {name: dict(s) for name, s in self._counters.items()}
+            collectors = dict(self._collectors)
+            help_texts = dict(self._help)
+
+        for name, series in histograms.items():
+            lines = family(name, *help_texts[name])
+            for key, histogram in sorted(series.items()):
+                for q in EXPORTED_QUANTILES:
+                    lines.append(
+                        f"{name}{_format_labels(key + (('quantile', str(q)),))} "
+                        f"{_format_value(histogram.quantile(q))}"
+                    )
+                lines.append(f"{name}_sum{_format_labels(key)} {_format_value(histogram.sum)}")
+                lines.append(f"{name}_count{_format_labels(key)} {histogram.count}")
+
+        for name, series in counters.items():
+            lines = family(name, *help_texts[name])
+            for key, counter in sorted(series.items()):
+                lines.append(f"{name}{_format_labels(key)} {_format_value(counter.value)}")
+
+        for key, ref in collectors.items():
+            collector = ref()
+            if collector is None:
+                with self._lock:
+                    self._collectors.pop(key, None)
+                continue
+            try:
+                samples = list(collector())
+            except Exception:
+                continue
+            for name, metric_type, help_text, labels, value in samples:
+                family(name, metric_type, help_text).append(
+                    f"{name}{_format_labels(_label_key(labels))} {_format_value(value)}"
+                )
+
+        output = []
+        for name, (metric_type, help_text, lines) in families.items():
+            if help_text:
+                output.append(f"# HELP {name} {help_text}")
+            output.append(f"# TYPE {name} {metric_type}")
+            output.extend(lines)
+        return "\n".join(output) + "\n"
+
+
+_metrics_registry: Optional[MetricsRegistry] = None
+_metrics_registry_lock = threading.Lock()
+
+
+def get_metrics_registry() -> MetricsRegistry:
+    """
+    获取全局指标注册表
+
+    Returns:
+        指标注册表实例
+    """
+    global _metrics_registry
+    if _metrics_registry is None:
+        with _metrics_registry_lock:
+            if _metrics_registry is None:
+                _metrics_registry = MetricsRegistry()
+    return _metrics_registry
@@ -1,7 +1,9 @@
 import asyncio
 import logging
-from typing import Optional, Dict, Any, List
-from datetime import datetime, timedelta
+from typing import Optional, Dict, Any, List, Iterable, Callable, Awaitable
+from datetime import datetime
+
+from src.core.utils.metrics import get_metrics_registry
 
 logger = logging.getLogger(__name__)
 
@@ -10,21 +12,31 @@ class ModelMemoryManager:
     """
     模型内存管理器
 
-    负责管理模型的加载、卸载和缓存，优化内存使用。
+    跟踪每个常驻模型的内存占用和最后使用时间，按LRU顺序选出需要卸载的模型，
+    使常驻模型满足数量上限和内存预算。实际卸载由unload_callback（通常是
+    ModelManager.evict_model）完成，被卸载的模型在下次使用时重新加载。
     """
 
     def __init__(
-        self, max_models_in_memory: int = 3, inactive_timeout: int = 300
-    ):  # 5分钟不活跃超时
+        self,
+        max_models_in_memory: Optional[int] = 3,
+        inactive_timeout: Optional[float] = 300,  # 5分钟不活跃超时
+        memory_budget_gb: Optional[float] = None,
+        unload_callback: Optional[Callable[[str], Awaitable[bool]]] = None,
+    ):
         """
         初始化模型内存管理器
 
         Args:
-            max_models_in_memory: 内存中最大模型数量
-            inactive_timeout: 不活跃模型超时时间（秒）
+            max_models_in_memory: 内存中最大模型数量，None表示不限制
+            inactive_timeout: 不活跃模型超时时间（秒），None表示不按空闲时间卸载
+            memory_budget_gb: 常驻模型的内存预算（GB），None表示不限制
+            unload_callback: 实际卸载模型的协程函数，返回是否卸载成功
         """
         self.max_models_in_memory = max_models_in_memory
         self.inactive_timeout = inactive_timeout
+        self.memory_budget_gb = memory_budget_gb
+        self.unload_callback = unload_callback
 
         # 模型状态
         self._model_states: Dict[str, Dict[str, Any]] = {}
@@ -34,76 +46,145 @@ class ModelMemoryManager:
         self._cleanup_task: Optional[asyncio.Task] = None
         self._is_running = False
 
+        # 常驻状态在导出/metrics时读取
+        get_metrics_registry().register_collector(
+            f"model_memory_manager:{id(self)}", self._collect_metrics
+        )
+
     async def track_model(self, model_type: str, model_size_gb: float):
         """
         跟踪已加载的模型
 
+        重新加载的模型保留之前的使用次数。
+
         Args:
             model_type: 模型类型
             model_size_gb: 模型大小（GB）
         """
         async with self._lock:
+            previous = self._model_states.get(model_type, {})
             self._model_states[model_type] = {
                 "size_gb": model_size_gb,
                 "last_used": datetime.now(),
-                "usage_count": 0,
+                "usage_count": previous.get("usage_count", 0),
+                "load_count": previous.get("load_count", 0) + 1,
                 "is_loaded": True,
             }
 
         logger.info(f"模型已跟踪: {model_type} ({model_size_gb:.2f}GB)")
 
-    async def mark_model_used(self, model_type: str):
+    def forget_model(self, model_type: str):
+        """
+        停止跟踪模型（模型被显式移除时调用）
+
+        Args:
+            model_type: 模型类型
+        """
+        self._model_states.pop(model_type, None)
+
+    def mark_model_used(self, model_type: str):
         """
         标记模型已使用
 
         Args:
             model_type: 模型类型
         """
-        if model_type in self._model_states:
-            self._model_states[model_type]["last_used"] = datetime.now()
-            self._model_states[model_type]["usage_count"] += 1
+        state = self._model_states.get(model_type)
+        if state is not None:
+            state["last_used"] = datetime.now()
+            state["usage_count"] += 1
+
+    def get_model_size(self, model_type: str) -> Optional[float]:
+        """
+        获取上次加载时测得的模型大小
 
-    async def get_unload_candidates(self) -> List[str]:
+        Args:
+            model_type: 模型类型
+
+        Returns:
+            模型大小（GB），从未加载过时返回None
+        """
+        state = self._model_states.get(model_type)
+        return state["size_gb"] if state else None
+
+    async def get_unload_candidates(
+        self,
+        incoming_size_gb: Optional[float] = None,
+        exclude: Iterable[str] = (),
+    ) -> List[str]:
         """
         获取可卸载的候选模型
 
+        先选出超过空闲超时的模型，再按最近最少使用顺序补充，
+        直到常驻模型（加上即将加载的模型）满足数量上限和内存预算。
+
+        Args:
+            incoming_size_gb: 即将加载的模型大小（GB），None表示没有模型要加载
+            exclude: 不能卸载的模型（正在使用或正在加载）
+
         Returns:
             可卸载的模型类型列表
         """
+        exclude = set(exclude)
         async with self._lock:
-            # 1. 找出不活跃的模型（超过超时时间）
-            inactive_models = []
             now = datetime.now()
+            loaded = {
+                model_type: state
+                for model_type, state in self._model_states.items()
+                if state["is_loaded"]
+            }
 
-            for model_type, state in self._model_states.items():
-                if state["is_loaded"]:
+            # 1. 找出不活跃的模型（超过超时时间）
+            candidates = []
+            if self.inactive_timeout is not None:
+                for model_type, state in loaded.items():
                     inactive_time = (now - state["last_used"]).total_seconds()
-                    if inactive_time > self.inactive_timeout:
-                        inactive_models.append(model_type)
-
-            # 2. 如果没有不活跃模型，按使用频率排序
-            if (
-                not inactive_models
-                and len(self._model_states) > self.max_models_in_memory
-            ):
-                # 按使用频率排序，优先卸载使用最少的
-                sorted_models = sorted(
-                    self._model_states.items(), key=lambda x: x[1]["usage_count"]
+                    if model_type not in exclude and inactive_time > self.inactive_timeout:
+                        candidates.append(model_type)
+
+            # 2. 按LRU顺序卸载，直到满足数量上限和内存预算
+            incoming_count = 0 if incoming_size_gb is None else 1
+            resident_count = len(loaded) - len(candidates) + incoming_count
+            resident_gb = (incoming_size_gb or 0.0) + sum(
+                state["size_gb"]
+                for model_type, state in loaded.items()
+                if model_type not in candidates
+            )
+            lru_order = sorted(
+                (
+                    model_type
+                    for model_type in loaded
+                    if model_type not in exclude and model_type not in candidates
+                ),
+                key=lambda model_type: loaded[model_type]["last_used"],
+            )
+
+            for model_type in lru_order:
+                over_count = (
+                    self.max_models_in_memory is not None
+                    and resident_count > self.max_models_in_memory
+                )
+                over_budget = (
+                    self.memory_budget_gb is not None
+                    and resident_gb > self.memory_budget_gb
                 )
-                for model_type, _ in sorted_models:
-                    if self._model_states[model_type]["is_loaded"]:
-                        inactive_models.append(model_type)
-                        if (
-                            len(inactive_models)
-                            >= len(self._model_states) - self.max_models_in_memory
-                        ):
-                            break
+                if not over_count and not over_budget:
+                    break
+                candidates.append(model_type)
+                resident_count -= 1
+                resident_gb -= loaded[model_type]["size_gb"]
 
-            return inactive_models
+            if self.memory_budget_gb is not None and resident_gb > self.memory_budget_gb:
+                logger.warning(
+                    f"常驻模型超出内存预算: {resident_gb:.2f}GB > "
+                    f"{self.memory_budget_gb:.2f}GB（其余模型正在使用中）"
+                )
+
+            return candidates
 
     async def unload_model(self, model_type: str) -> bool:
         """
-        卸载指定模型
+        标记模型已卸载
 
         Args:
             model_type: 模型类型
@@ -122,11 +203,15 @@ class ModelMemoryManager:
         """清理不活跃模型"""
         candidates = await self.get_unload_candidates()
 
+        unloaded = 0
         for model_type in candidates:
-            await self.unload_model(model_type)
+            if self.unload_callback is not None:
+                unloaded += bool(await self.unload_callback(model_type))
+            else:
+                unloaded += await self.unload_model(model_type)
 
-        if candidates:
-            logger.info(f"已卸载 {len(candidates)} 个不活跃模型")
+        if unloaded:
+            logger.info(f"已卸载 {unloaded} 个不活跃模型")
 
     async def start_cleanup_task(self):
         """启动定期清理任务"""
@@ -140,15 +225,16 @@ class ModelMemoryManager:
 
     async def _cleanup_loop(self):
         """清理循环"""
+        # 每分钟清理一次，超时较短时按超时时间检查
+        interval = min(60.0, self.inactive_timeout or 60.0)
         while self._is_running:
             try:
+                await asyncio.sleep(interval)
                 await self.cleanup_inactive_models()
-                await asyncio.sleep(60)  # 每分钟清理一次
             except asyncio.CancelledError:
                 break
             except Exception as e:
                 logger.error(f"清理循环错误: {e}")
-                await asyncio.sleep(60)
 
     async def stop_cleanup_task(self):
         """停止清理任务"""
@@ -159,6 +245,7 @@ class ModelMemoryManager:
                 await self._cleanup_task
             except asyncio.CancelledError:
                 pass
+            self._cleanup_task = None
         logger.info("模型清理任务已停止")
 
     def get_memory_stats(self) -> Dict[str, Any]:
@@ -176,4 +263,41 @@ class ModelMemoryManager:
             "loaded_models": loaded_count,
             "total_memory_gb": round(total_size, 2),
             "max_models": self.max_models_in_memory,
+            "memory_budget_gb": self.memory_budget_gb,
+            "models": {
+                model_type: {
+                    "is_loaded": state["is_loaded"],
+                    "size_gb": round(state["size_gb"], 3),
+                    "usage_count": state["usage_count"],
+                    "load_count": state["load_count"],
+                    "last_used": state["last_used"].isoformat(),
+                }
+                for model_type, state in self._model_states.items()
+            },
         }
+
+    def _collect_metrics(self):
+        """导出每个模型的常驻状态和内存占用"""
+        for model_type, state in list(self._model_states.items()):
+            labels = {"model": model_type}
+            yield (
+                "msearch_model_resident",
+                "gauge",
+                "Whether the model is currently loaded",
+                labels,
+                1.0 if state["is_loaded"] else 0.0,
+            )
+            yield (
+                "msearch_model_memory_bytes",
+                "gauge",
+                "Measured memory footprint of the model when loaded",
+                labels,
+                state["size_gb"] * 1024**3 if state["is_loaded"] else 0.0,
+            )
+            yield (
+                "msearch_model_loads_total",
+                "counter",
+                "Number of times the model has been loaded",
+                labels,
+                state["load_count"],
+            )
@@ -1,12 +1,246 @@
+"""
+资源监控
+后台采样线程按固定周期发布系统资源快照，各模块读取快照而不是在热路径上调用psutil
+"""
+
 import psutil
 import asyncio
 import logging
-from typing import Optional, Dict, Any
+import sys
+import threading
+import time
+from collections import deque
+from typing import Deque, List, Optional, Dict, Any
 from dataclasses import dataclass
 
+from src.core.utils.metrics import get_metrics_registry
+
 logger = logging.getLogger(__name__)
 
 
+@dataclass(frozen=True)
+class ResourceSnapshot:
+    """资源快照（不可变，采样线程每次发布一个新对象）"""
+
+    timestamp: float
+    cpu_percent: float  # 系统CPU使用率（0-100）
+    memory_percent: float  # 系统内存使用率（0-100）
+    memory_used_gb: float
+    memory_total_gb: float
+    memory_available_gb: float
+    process_rss_mb: float  # 当前进程常驻内存（MB）
+    process_memory_percent: float  # 当前进程内存占比（0-100）
+    gpu_percent: Optional[float] = None  # GPU使用率，GPU或NVML不可用时为None
+    gpu_memory_percent: Optional[float] = None  # GPU显存使用率，GPU不可用时为None
+    gpu_memory_available_gb: Optional[float] = None
+    disk_read_mb_per_sec: float = 0.0
+    disk_write_mb_per_sec: float = 0.0
+
+
+class ResourceSampler:
+    """
+    资源采样器
+
+    后台线程按固定周期采样CPU、内存、进程RSS、GPU使用率和显存、磁盘IO，发布为不可变的
+    ResourceSnapshot。读取方直接获取最新快照的引用，无需加锁；最近的快照保存在
+    环形缓冲区中用于趋势分析。
+    """
+
+    def __init__(self, interval: float = 1.0, history_size: int = 300):
+        """
+        初始化资源采样器
+
+        Args:
+            interval: 采样间隔（秒）
+            history_size: 保留的历史快照数量
+        """
+        self.interval = interval
+        self._history: Deque[ResourceSnapshot] = deque(maxlen=history_size)
+        self._process = psutil.Process()
+        self._last_disk_io = None
+        self._last_disk_time = 0.0
+        self._stop_event = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+        self._start_lock = threading.Lock()
+
+        # 首次调用cpu_percent(interval=None)只建立基准，之后返回两次调用之间的使用率
+        psutil.cpu_percent(interval=None)
+        self._snapshot = self._sample()
+
+    def start(self) -> None:
+        """启动采样线程（重复调用无副作用）"""
+        with self._start_lock:
+            if self._thread and self._thread.is_alive():
+                return
+            self._stop_event.clear()
+            self._thread = threading.Thread(
+                target=self._run, name="ResourceSampler", daemon=True
+            )
+            self._thread.start()
+        logger.info(f"资源采样线程已启动: interval={self.interval}s")
+
+    def stop(self) -> None:
+        """停止采样线程"""
+        self._stop_event.set()
+        if self._thread:
+            self._thread.join(timeout=self.interval + 1.0)
+            self._thread = None
+
+    def snapshot(self) -> ResourceSnapshot:
+        """
+        获取最新的资源快照
+
+        Returns:
+            最新快照（最多滞后一个采样间隔）
+        """
+        return self._snapshot
+
+    def history(self, seconds: Optional[float] = None) -> List[ResourceSnapshot]:
+        """
+        获取历史快照
+
+        Args:
+            seconds: 只返回最近多少秒内的快照，None表示全部
+
+        Returns:
+            按时间排序的快照列表
+        """
+        snapshots = list(self._history)
+        if seconds is not None:
+            cutoff = time.time() - seconds
+            snapshots = [s for s in snapshots if s.timestamp >= cutoff]
+        return snapshots
+
+    def collect_metrics(self):
+        """导出最新快照中的资源使用情况"""
+        snapshot = self._snapshot
+        for metric, help_text, value in (
+            ("msearch_cpu_percent", "系统CPU使用率", snapshot.cpu_percent),
+            ("msearch_memory_percent", "系统内存使用率", snapshot.memory_percent),
+            ("msearch_process_rss_mb", "进程常驻内存（MB）", snapshot.process_rss_mb),
+            ("msearch_gpu_percent", "GPU使用率", snapshot.gpu_percent),
+            ("msearch_gpu_memory_percent", "GPU显存使用率", snapshot.gpu_memory_percent),
+            ("msearch_disk_read_mb_per_sec", "磁盘读取速率（MB/s）", snapshot.disk_read_mb_per_sec),
+            ("msearch_disk_write_mb_per_sec", "磁盘写入速率（MB/s）", snapshot.disk_write_mb_per_sec),
+        ):
+            if value is not None:
+                yield metric, "gauge", help_text, {}, value
+
+    def _run(self) -> None:
+        """采样循环"""
+        while not self._stop_event.wait(self.interval):
+            try:
+                self._snapshot = self._sample()
+            except Exception as e:
+                logger.error(f"资源采样失败: {e}")
+
+    def _sample(self) -> ResourceSnapshot:
+        """采样一次并记录到历史"""
+        now = time.time()
+        memory = psutil.virtual_memory()
+        memory_info = self._process.memory_info()
+
+        read_rate = write_rate = 0.0
+        disk_io = psutil.disk_io_counters()
+        if disk_io is not None:
+            if self._last_disk_io is not None and now > self._last_disk_time:
+                elapsed = now - self._last_disk_time
+                read_rate = (
+                    (disk_io.read_bytes - self._last_disk_io.read_bytes)
+                    / elapsed
+                    / (1024**2)
+                )
+                write_rate = (
+                    (disk_io.write_bytes - self._last_disk_io.write_bytes)
+                    / elapsed
+                    / (1024**2)
+                )
+            self._last_disk_io = disk_io
+            self._last_disk_time = now
+
+        gpu_percent, gpu_memory_percent, gpu_memory_available_gb = self._sample_gpu()
+
+        snapshot = ResourceSnapshot(
+            timestamp=now,
+            cpu_percent=psutil.cpu_percent(interval=None),
+            memory_percent=memory.percent,
+            memory_used_gb=memory.used / (1024**3),
+            memory_total_gb=memory.total / (1024**3),
+            memory_available_gb=memory.available / (1024**3),
+            process_rss_mb=memory_info.rss / (1024**2),
+            process_memory_percent=memory_info.rss / memory.total * 100,
+            gpu_percent=gpu_percent,
+            gpu_memory_percent=gpu_memory_percent,
+            gpu_memory_available_gb=gpu_memory_available_gb,
+            disk_read_mb_per_sec=max(0.0, read_rate),
+            disk_write_mb_per_sec=max(0.0, write_rate),
+        )
+        self._history.append(snapshot)
+        return snapshot
+
+    @staticmethod
+    def _sample_gpu():
+        """
+        采样GPU使用率和显存
+
+        只在torch已被其他模块加载时采样，避免为了监控而导入torch。
+        GPU使用率通过torch.cuda.utilization读取（依赖pynvml），不可用时为None。
+
+        Returns:
+            (GPU使用率, 显存使用率, 可用显存GB)，不可用时为 (None, None, None)
+        """
+        torch = sys.modules.get("torch")
+        if torch is None:
+            return None, None, None
+        try:
+            if not torch.cuda.is_available():
+                return None, None, None
+            device = torch.cuda.current_device()
+            total_memory = torch.cuda.get_device_properties(device).total_memory
+            allocated = torch.cuda.memory_allocated(device)
+            reserved = torch.cuda.memory_reserved(device)
+            if total_memory <= 0:
+                return None, None, None
+        except Exception as e:
+            logger.debug(f"GPU监控不可用: {e}")
+            return None, None, None
+
+        try:
+            gpu_percent = float(torch.cuda.utilization(device))
+        except Exception as e:
+            logger.debug(f"GPU使用率不可用: {e}")
+            gpu_percent = None
+        return (
+            gpu_percent,
+            allocated / total_memory * 100,
+            (total_memory - reserved) / (1024**3),
+        )
+
+
+_resource_sampler: Optional[ResourceSampler] = None
+_resource_sampler_lock = threading.Lock()
+
+
+def get_resource_sampler() -> ResourceSampler:
+    """
+    获取全局资源采样器（首次调用时创建并启动）
+
+    Returns:
+        资源采样器实例
+    """
+    global _resource_sampler
+    if _resource_sampler is None:
+        with _resource_sampler_lock:
+            if _resource_sampler is None:
+                sampler = ResourceSampler()
+                sampler.start()
+                get_metrics_registry().register_collector(
+                    "resource_sampler", sampler.collect_metrics
+                )
+                _resource_sampler = sampler
+    return _resource_sampler
+
+
 @dataclass
 class ResourceUsage:
     """资源使用情况"""
@@ -89,43 +323,19 @@ class ResourceMonitor:
 
     def get_resource_usage(self) -> ResourceUsage:
         """
-        获取当前资源使用情况
+        获取当前资源使用情况（读取资源采样器的最新快照，不阻塞）
 
         Returns:
             ResourceUsage对象
         """
-        # CPU使用率
-        cpu_percent = psutil.cpu_percent(interval=0.1)
-
-        # 内存使用情况
-        memory = psutil.virtual_memory()
-        memory_percent = memory.percent
-        memory_used_gb = memory.used / (1024**3)
-        memory_total_gb = memory.total / (1024**3)
-
-        # GPU使用情况（可选）
-        gpu_percent = None
-        gpu_memory_percent = None
-
-        try:
-            import torch
-
-            if torch.cuda.is_available():
-                gpu_percent = torch.cuda.utilization()
-                gpu_memory = (
-                    torch.cuda.memory_allocated() / torch.cuda.max_memory_allocated()
-                )
-                gpu_memory_percent = gpu_memory * 100
-        except Exception as e:
-            logger.debug(f"GPU监控不可用: {e}")
-
+        snapshot = get_resource_sampler().snapshot()
         return ResourceUsage(
-            cpu_percent=cpu_percent,
-            memory_percent=memory_percent,
-            memory_used_gb=memory_used_gb,
-            memory_total_gb=memory_total_gb,
-            gpu_percent=gpu_percent,
-            gpu_memory_percent=gpu_memory_percent,
+            cpu_percent=snapshot.cpu_percent,
+            memory_percent=snapshot.memory_percent,
+            memory_used_gb=snapshot.memory_used_gb,
+            memory_total_gb=snapshot.memory_total_gb,
+            gpu_percent=snapshot.gpu_percent,
+            gpu_memory_percent=snapshot.gpu_memory_percent,
         )
 
     async def _monitor_loop(self):
@@ -1,5 +1,13 @@
 """向量存储模块"""
 
-from .vector_store import VectorStore
+from src.utils.lazy_import import lazy_exports
 
-__all__ = ["VectorStore"]
+__getattr__, __dir__ = lazy_exports(
+    __name__,
+    {
+        "VectorStore": ".vector_store",
+        "MultiVectorStore": ".multi_vector_store",
+    },
+)
+
+__all__ = ["VectorStore", "MultiVectorStore"]
@@ -0,0 +1,540 @@
+"""
+多向量存储管理器
+为ColQwen等后期交互（late-interaction）模型存储每个条目的token/patch向量，
+并按MaxSim打分检索
+"""
+
+import json
+import logging
+import time
+import uuid
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+import lancedb
+import numpy as np
+import pyarrow as pa
+
+from src.core.utils.metrics import get_metrics_registry
+from src.core.vector.vector_codec import arrow_value_type, validate_precision
+from src.core.vector.vector_store import VectorStore
+
+logger = logging.getLogger(__name__)
+
+# 多向量表支持的存储精度（token表需要LanceDB近似检索，int8列不能做余弦检索）
+MULTI_VECTOR_PRECISIONS = ("float32", "float16")
+
+
+def normalize_rows(vectors: np.ndarray) -> np.ndarray:
+    """
+    把向量矩阵按行归一化
+
+    Args:
+        vectors: 向量矩阵（n x d）或单个向量
+
+    Returns:
+        归一化后的float32矩阵（n x d）
+    """
+    vectors = np.asarray(vectors, dtype=np.float32)
+    if vectors.ndim == 1:
+        vectors = vectors.reshape(1, -1)
+    norms = np.linalg.norm(vectors, axis=1, keepdims=True)
+    norms[norms == 0] = 1.0
+    return vectors / norms
+
+
+def maxsim_scores(
+    query_vectors: np.ndarray, doc_vectors: np.ndarray, offsets: np.ndarray
+) -> np.ndarray:
+    """
+    计算MaxSim分数：每个查询token取与条目所有token的最大相似度，再对查询token求和
+
+    Args:
+        query_vectors: 归一化的查询token向量（m x d）
+        doc_vectors: 归一化的条目token向量，同一条目的token连续排列（N x d）
+        offsets: 每个条目第一个token在doc_vectors中的位置（升序，长度为条目数）
+
+    Returns:
+        每个条目的MaxSim分数
+    """
+    if len(offsets) == 0:
+        return np.zeros(0, dtype=np.float32)
+    similarities = query_vectors @ doc_vectors.T
+    return np.maximum.reduceat(similarities, offsets, axis=1).sum(axis=0)
+
+
+class MultiVectorStore:
+    """
+    多向量存储管理器
+
+    条目表保存每个条目的元数据，token表每行保存一个token/patch向量。检索分两阶段：
+    1. token级近似检索：每个查询token在token表中取prefilter_k个最近邻，
+       按命中的相似度之和选出candidate_limit个候选条目
+    2. MaxSim重排：读取候选条目的全部token向量，向量化计算精确的MaxSim分数
+
+    只有候选条目的token参与精确计算，不需要扫描全部patch向量。
+    """
+
+    def __init__(self, config: Dict[str, Any]):
+        """
+        初始化多向量存储
+
+        Args:
+            config: 配置字典
+                data_dir: LanceDB目录（或database.vector_db_path）
+                collection_name: 表名前缀
+                vector_precision: token向量存储精度（float32/float16）
+                prefilter_k: 每个查询token近似检索的token数
+                candidate_limit: 进入MaxSim重排的候选条目数
+                nprobes: IVF索引的探测分区数
+                refine_factor: token级近似检索的精确重算倍数
+                num_partitions: IVF索引分区数
+        """
+        self.config = config
+
+        database_config = config.get("database", {})
+        if "vector_db_path" in database_config:
+            self.data_dir = Path(database_config["vector_db_path"])
+        else:
+            self.data_dir = Path(config.get("data_dir", "data/database/lancedb"))
+
+        self.collection_name = config.get("collection_name", "multi_vectors")
+        self.items_table_name = f"{self.collection_name}_items"
+        self.tokens_table_name = f"{self.collection_name}_tokens"
+
+        self.vector_precision = validate_precision(
+            config.get("vector_precision", "float32")
+        )
+        if self.vector_precision not in MULTI_VECTOR_PRECISIONS:
+            raise ValueError(
+                f"多向量存储不支持的精度: {self.vector_precision}。"
+                f"支持的精度: {', '.join(MULTI_VECTOR_PRECISIONS)}"
+            )
+
+        self.prefilter_k = config.get("prefilter_k", 64)
+        self.candidate_limit = config.get("candidate_limit", 100)
+        self.nprobes = config.get("nprobes", 20)
+        # PQ距离是估计值，近似检索多取refine_factor倍并用原始向量重算距离
+        self.refine_factor = config.get("refine_factor", 4)
+        self.index_type = config.get("index_type", "ivf_pq")
+        self.num_partitions = config.get("num_partitions", 256)
+
+        self.db: Optional[lancedb.DBConnection] = None
+        self.items_table = None
+        self.tokens_table = None
+        self._dimension: Optional[int] = None
+
+        self._initialize()
+
+    def _initialize(self) -> bool:
+        """连接LanceDB并打开已有的条目表和token表（首次插入时创建）"""
+        try:
+            self.data_dir.mkdir(parents=True, exist_ok=True)
+            self.db = lancedb.connect(str(self.data_dir))
+
+            list_response = self.db.list_tables()
+            existing_tables = (
+                list_response.tables if hasattr(list_response, "tables") else []
+            )
+            if (
+                self.items_table_name in existing_tables
+                and self.tokens_table_name in existing_tables
+            ):
+                self.items_table = self.db.open_table(self.items_table_name)
+                self.tokens_table = self.db.open_table(self.tokens_table_name)
+                vector_type = self.tokens_table.schema.field("vector").type
+                self._dimension = vector_type.list_size
+                logger.info(
+                    f"打开现有多向量表: {self.collection_name}, 维度: {self._dimension}"
+                )
+            else:
+                logger.info(f"多向量表将在第一次插入时创建: {self.collection_name}")
+            return True
+        except Exception as e:
+            logger.error(f"多向量存储初始化失败: {e}")
+            self.items_table = None
+            self.tokens_table = None
+            return False
+
+    @staticmethod
+    def _items_schema() -> pa.Schema:
+        return pa.schema(
+            [
+                pa.field("id", pa.string()),
+                pa.field("modality", pa.string()),
+                pa.field("file_id", pa.string()),
+                pa.field("file_path", pa.string()),
+                pa.field("file_type", pa.string()),
+                pa.field("file_name", pa.string()),
+                pa.field("segment_id", pa.string()),
+                pa.field("start_time", pa.float64()),
+                pa.field("end_time", pa.float64()),
+                pa.field("num_tokens", pa.int32()),
+                pa.field("metadata", pa.string()),
+                pa.field("created_at", pa.float64()),
+            ]
+        )
+
+    def _tokens_schema(self, dimension: int) -> pa.Schema:
+        return pa.schema(
+            [
+                pa.field("item_id", pa.string()),
+                pa.field("token_index", pa.int32()),
+                # 过滤条件直接作用在token级近似检索上
+                pa.field("modality", pa.string()),
+                pa.field("file_id", pa.string()),
+                pa.field(
+                    "vector",
+                    pa.list_(arrow_value_type(self.vector_precision), dimension),
+                ),
+            ]
+        )
+
+    def _create_tables(self, dimension: int) -> None:
+        self.items_table = self.db.create_table(
+            self.items_table_name, schema=self._items_schema(), mode="overwrite"
+        )
+        self.tokens_table = self.db.create_table(
+            self.tokens_table_name, schema=self._tokens_schema(dimension), mode="overwrite"
+        )
+        self._dimension = dimension
+        logger.info(f"多向量表创建成功: {self.collection_name}, 维度: {dimension}")
+
+    def insert_items(self, items: List[Dict[str, Any]]) -> None:
+        """
+        插入条目及其token向量
+
+        Args:
+            items: 条目列表，每个条目的vectors为token向量矩阵（n x d），
+                其他字段与VectorStore.insert_vectors相同
+        """
+        if not items:
+            return
+
+        item_rows = []
+        token_batches = []
+        for item in items:
+            vectors = normalize_rows(item["vectors"])
+            if len(vectors) == 0:
+                raise ValueError("条目没有token向量")
+            if self._dimension is None:
+                self._create_tables(vectors.shape[1])
+            if vectors.shape[1] != self._dimension:
+                raise ValueError(
+                    f"向量维度不匹配: 期望 {self._dimension}, 实际 {vectors.shape[1]}"
+                )
+
+            item_id = item.get("id", str(uuid.uuid4()))
+            metadata = item.get("metadata", {})
+            if not isinstance(metadata, dict):
+                metadata = {}
+            modality = item.get("modality", "unknown")
+            file_id = item.get("file_id", "")
+
+            item_rows.append(
+                {
+                    "id": item_id,
+                    "modality": modality,
+                    "file_id": file_id,
+                    "file_path": item.get("file_path", metadata.get("file_path", "")),
+                    "file_type": item.get("file_type", metadata.get("file_type", "")),
+                    "file_name": item.get("file_name", metadata.get("file_name", "")),
+                    "segment_id": item.get("segment_id", ""),
+                    "start_time": float(item.get("start_time", 0.0)),
+                    "end_time": float(item.get("end_time", 0.0)),
+                    "num_tokens": len(vectors),
+                    "metadata": json.dumps(metadata),
+                    "created_at": item.get("created_at", datetime.now().timestamp()),
+                }
+            )
+            token_batches.append((item_id, modality, file_id, vectors))
+
+        self.items_table.add(pa.Table.from_pylist(item_rows, schema=self._items_schema()))
+        self.tokens_table.add(self._token_table(token_batches))
+        logger.info(
+            f"插入多向量条目: {len(item_rows)}个, token向量: "
+            f"{sum(len(batch[3]) for batch in token_batches)}个"
+        )
+
+    def _token_table(self, token_batches) -> pa.Table:
+        """把条目的token向量组装为Arrow表（向量列直接从numpy构建，不经过Python列表）"""
+        item_ids, token_indexes, modalities, file_ids = [], [], [], []
+        for item_id, modality, file_id, vectors in token_batches:
+            count = len(vectors)
+            item_ids.extend([item_id] * count)
+            token_indexes.append(np.arange(count, dtype=np.int32))
+            modalities.extend([modality] * count)
+            file_ids.extend([file_id] * count)
+
+        value_type = arrow_value_type(self.vector_precision)
+        values = np.concatenate([batch[3] for batch in token_batches]).astype(
+            value_type.to_pandas_dtype()
+        )
+        vector_array = pa.FixedSizeListArray.from_arrays(
+            pa.array(values.reshape(-1), type=value_type), self._dimension
+        )
+        return pa.Table.from_arrays(
+            [
+                pa.array(item_ids, type=pa.string()),
+                pa.array(np.concatenate(token_indexes)),
+                pa.array(modalities, type=pa.string()),
+                pa.array(file_ids, type=pa.string()),
+                vector_array,
+            ],
+            schema=self._tokens_schema(self._dimension),
+        )
+
+    def search(
+        self,
+        query_vectors: np.ndarray,
+        limit: int = 20,
+        filter: Optional[Dict] = None,
+    ) -> List[Dict[str, Any]]:
+        """
+        按MaxSim检索条目
+
+        Args:
+            query_vectors: 查询token向量矩阵（m x d）
+            limit: 返回数量
+            filter: 过滤条件（modality或file_id）
+
+        Returns:
+            搜索结果列表，similarity为查询token最大相似度的平均值
+        """
+        start_time = time.perf_counter()
+        try:
+            if self.tokens_table is None:
+                return []
+
+            query_vectors = normalize_rows(query_vectors)
+            where_clause = VectorStore._build_where_clause(filter)
+
+            candidates = self._prefilter(query_vectors, where_clause)
+            if not candidates:
+                return []
+
+            results = self._maxsim_rerank(query_vectors, candidates)[:limit]
+
+            get_metrics_registry().histogram(
+                "msearch_multi_vector_search_duration_seconds",
+                "多向量检索耗时（秒）",
+            ).observe(time.perf_counter() - start_time)
+            return results
+        except Exception as e:
+            logger.error(f"多向量检索失败: {e}")
+            return []
+
+    def _prefilter(
+        self, query_vectors: np.ndarray, where_clause: Optional[str]
+    ) -> List[str]:
+        """
+        token级近似检索，选出候选条目
+
+        Args:
+            query_vectors: 归一化的查询token向量
+            where_clause: where子句
+
+        Returns:
+            候选条目ID，按近似分数降序
+        """
+        approximate_scores: Dict[str, float] = {}
+        for query_vector in query_vectors:
+            query = (
+                self.tokens_table.search(
+                    query_vector.astype(arrow_value_type(self.vector_precision).to_pandas_dtype()),
+                    vector_column_name="vector",
+                )
+                .metric("cosine")
+                .limit(self.prefilter_k)
+                .nprobes(self.nprobes)
+                .refine_factor(self.refine_factor)
+                .select(["item_id"])
+            )
+            if where_clause:
+                query = query.where(where_clause, prefilter=True)
+            hits = query.to_arrow()
+
+            # 同一查询token只取每个条目命中的最大相似度（MaxSim的下界）
+            best: Dict[str, float] = {}
+            for item_id, distance in zip(
+                hits["item_id"].to_pylist(), hits["_distance"].to_pylist()
+            ):
+                similarity = 1.0 - distance
+                if similarity > best.get(item_id, -1.0):
+                    best[item_id] = similarity
+            for item_id, similarity in best.items():
+                approximate_scores[item_id] = (
+                    approximate_scores.get(item_id, 0.0) + similarity
+                )
+
+        ranked = sorted(approximate_scores, key=approximate_scores.get, reverse=True)
+        return ranked[: self.candidate_limit]
+
+    def _maxsim_rerank(
+        self, query_vectors: np.ndarray, candidate_ids: List[str]
+    ) -> List[Dict[str, Any]]:
+        """
+        读取候选条目的全部token向量并按精确MaxSim分数排序
+
+        Args:
+            query_vectors: 归一化的查询token向量
+            candidate_ids: 候选条目ID
+
+        Returns:
+            按分数降序排列的结果列表
+        """
+        id_list = ", ".join("'" + item_id.replace("'", "''") + "'" for item_id in candidate_ids)
+        items = (
+            self.items_table.search()
+            .where(f"id IN ({id_list})")
+            .limit(len(candidate_ids))
+            .to_pandas()
+        )
+        tokens = (
+            self.tokens_table.search()
+            .where(f"item_id IN ({id_list})")
+            .select(["item_id", "vector"])
+            .limit(max(int(items["num_tokens"].sum()), 1))
+            .to_arrow()
+        )
+
+        # 同一条目的token连续排列，offsets为每个条目的起始位置
+        token_item_ids = np.asarray(tokens["item_id"].to_pylist(), dtype=object)
+        order = np.argsort(token_item_ids, kind="stable")
+        token_item_ids = token_item_ids[order]
+        vectors = tokens["vector"].combine_chunks()
+        doc_vectors = (
+            vectors.flatten()
+            .to_numpy()
+            .reshape(len(order), vectors.type.list_size)[order]
+            .astype(np.float32)
+        )
+        item_order, offsets = np.unique(token_item_ids, return_index=True)
+
+        scores = maxsim_scores(query_vectors, doc_vectors, offsets)
+        score_by_id = dict(zip(item_order, scores))
+
+        results = []
+        num_query_tokens = len(query_vectors)
+        for row in items.to_dict("records"):
+            score = float(score_by_id.get(row["id"], 0.0))
+            similarity = max(0.0, min(1.0, score / num_query_tokens))
+            metadata = json.loads(row["metadata"]) if row["metadata"] else {}
+            results.append(
+                {
+                    "id": row["id"],
+                    "modality": row["modality"],
+                    "file_id": row["file_id"],
+                    "file_path": row["file_path"],
+                    "file_type": row["file_type"],
+                    "file_name": row["file_name"],
+                    "segment_id": row["segment_id"],
+                    "start_time": float(row["start_time"]),
+                    "end_time": float(row["end_time"]),
+                    "num_tokens": int(row["num_tokens"]),
+                    "metadata": metadata,
+                    "created_at": float(row["created_at"]),
+                    "maxsim": score,
+                    "similarity": similarity,
+                    "score": similarity,
+                    "distance": 1.0 - similarity,
+                }
+            )
+        return sorted(results, key=lambda r: r["maxsim"], reverse=True)
+
+    def delete_by_file_id(self, file_id: str) -> None:
+        """
+        删除文件的所有条目和token向量
+
+        Args:
+            file_id: 文件ID
+        """
+        if self.items_table is None:
+            return
+        escaped_id = file_id.replace("'", "''")
+        self.tokens_table.delete(f"file_id = '{escaped_id}'")
+        self.items_table.delete(f"file_id = '{escaped_id}'")
+        logger.info(f"删除多向量条目: file_id={file_id}")
+
+    def create_index(self) -> bool:
+        """
+        为token表建立IVF近似索引
+
+        Returns:
+            是否成功
+        """
+        try:
+            if self.tokens_table is None:
+                return False
+
+            row_count = self.tokens_table.count_rows()
+            if row_count < max(256, self.num_partitions):
+                logger.info(f"token向量数量不足({row_count})，暂不创建索引")
+                return False
+
+            index_type = self.index_type.upper()
+            index_params = {
+                "metric": "cosine",
+                "num_partitions": self.num_partitions,
+                "vector_column_name": "vector",
+                "index_type": index_type,
+                "replace": True,
+            }
+            if index_type == "IVF_PQ" and self._dimension % 8 == 0:
+                # 每个子向量8维
+                index_params["num_sub_vectors"] = self._dimension // 8
+
+            self.tokens_table.create_index(**index_params)
+            logger.info(f"token向量索引创建成功: {index_type}, token数: {row_count}")
+            return True
+        except Exception as e:
+            logger.error(f"创建token向量索引失败: {e}")
+            return False
+
+    def get_stats(self) -> Dict[str, Any]:
+        """
+        获取多向量存储统计信息
+
+        Returns:
+            统计信息字典
+        """
+        stats = {
+            "data_dir": str(self.data_dir),
+            "collection_name": self.collection_name,
+            "vector_dimension": self._dimension,
+            "vector_precision": self.vector_precision,
+            "item_count": 0,
+            "token_count": 0,
+        }
+        try:
+            if self.items_table is not None:
+                stats["item_count"] = self.items_table.count_rows()
+                stats["token_count"] = self.tokens_table.count_rows()
+        except Exception as e:
+            logger.error(f"获取多向量统计信息失败: {e}")
+        return stats
+
+    def close(self) -> None:
+        """关闭数据库连接"""
+        self.db = None
+        self.items_table = None
+        self.tokens_table = None
+
+
+def create_multi_vector_store(config: Dict[str, Any]) -> MultiVectorStore:
+    """
+    创建多向量存储实例
+
+    Args:
+        config: 完整配置，读取database.vector_db_path和database.multi_vector
+
+    Returns:
+        MultiVectorStore实例
+    """
+    database_config = config.get("database", {})
+    multi_vector_config = dict(database_config.get("multi_vector", {}))
+    multi_vector_config.setdefault(
+        "data_dir", database_config.get("vector_db_path", "data/database/lancedb")
+    )
+    return MultiVectorStore(multi_vector_config)
@@ -0,0 +1,123 @@
+"""
+向量表注册表
+记录每个基础表名当前提供检索的模型专用向量表，以及进行中的迁移状态
+"""
+
+import json
+import logging
+import os
+import tempfile
+import threading
+import time
+from pathlib import Path
+from typing import Any, Dict, Optional
+
+logger = logging.getLogger(__name__)
+
+
+class VectorTableRegistry:
+    """
+    向量表注册表
+
+    保存在LanceDB目录下的JSON文件中；每次写入先写临时文件再原子替换，
+    进程在任意时刻退出都不会留下写了一半的注册表。
+    """
+
+    FILE_NAME = "vector_tables.json"
+
+    def __init__(self, data_dir: str):
+        """
+        初始化注册表
+
+        Args:
+            data_dir: LanceDB目录
+        """
+        self.path = Path(data_dir) / self.FILE_NAME
+        self._lock = threading.Lock()
+
+    def _load(self) -> Dict[str, Any]:
+        try:
+            with open(self.path, "r", encoding="utf-8") as f:
+                return json.load(f)
+        except FileNotFoundError:
+            return {}
+        except (OSError, ValueError) as e:
+            logger.warning(f"向量表注册表读取失败: {self.path}, 错误: {e}")
+            return {}
+
+    def _save(self, data: Dict[str, Any]) -> None:
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        fd, temp_path = tempfile.mkstemp(
+            prefix=f".{self.FILE_NAME}-", dir=str(self.path.parent)
+        )
+        try:
+            with os.fdopen(fd, "w", encoding="utf-8") as f:
+                json.dump(data, f, indent=2, ensure_ascii=False)
+            os.replace(temp_path, self.path)
+        finally:
+            if os.path.exists(temp_path):
+                os.remove(temp_path)
+
+    def _update(self, section: str, collection_name: str, value: Optional[Dict]) -> None:
+        with self._lock:
+            data = self._load()
+            entries = data.setdefault(section, {})
+            if value is None:
+                entries.pop(collection_name, None)
+            else:
+                entries[collection_name] = {**value, "updated_at": time.time()}
+            self._save(data)
+
+    def get_active(self, collection_name: str) -> Optional[Dict[str, Any]]:
+        """
+        获取提供检索的向量表
+
+        Args:
+            collection_name: 基础表名
+
+        Returns:
+            {model_id, dimension, table}，未记录时返回None
+        """
+        return self._load().get("active", {}).get(collection_name)
+
+    def set_active(
+        self, collection_name: str, model_id: str, dimension: int, table: str
+    ) -> None:
+        """
+        记录提供检索的向量表
+
+        Args:
+            collection_name: 基础表名
+            model_id: 模型ID
+            dimension: 向量维度
+            table: 模型专用表名
+        """
+        self._update(
+            "active",
+            collection_name,
+            {"model_id": model_id, "dimension": dimension, "table": table},
+        )
+
+    def get_migration(self, collection_name: str) -> Optional[Dict[str, Any]]:
+        """
+        获取迁移状态
+
+        Args:
+            collection_name: 基础表名
+
+        Returns:
+            迁移状态，没有迁移时返回None
+        """
+        return self._load().get("migrations", {}).get(collection_name)
+
+    def set_migration(
+        self, collection_name: str, state: Optional[Dict[str, Any]]
+    ) -> None:
+        """
+        记录迁移状态
+
+        Args:
+            collection_name: 基础表名
+            state: 迁移状态，None表示清除
+        """
+        self._update("migrations", collection_name, state)
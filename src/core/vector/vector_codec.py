@@ -0,0 +1,143 @@
+"""
+向量存储精度
+
+向量列可以按float32、float16或int8存储：
+- float16：直接转换，LanceDB可直接检索和建索引，占用减半
+- int8：对称标量量化，每个向量保存一个缩放系数（max|v| / 127），占用约为1/4；
+  LanceDB不能对int8列做余弦检索，由VectorStore在内存中扫描量化码
+
+重排和返回结果时使用反量化后的float32向量（或可选的全精度副本）。
+"""
+
+from typing import Optional, Tuple
+
+import numpy as np
+import pyarrow as pa
+
+# 支持的存储精度
+SUPPORTED_PRECISIONS = ("float32", "float16", "int8")
+
+# 各精度每个分量占用的字节数
+_COMPONENT_BYTES = {"float32": 4, "float16": 2, "int8": 1}
+
+_ARROW_TYPES = {
+    "float32": pa.float32(),
+    "float16": pa.float16(),
+    "int8": pa.int8(),
+}
+
+
+def validate_precision(precision: str) -> str:
+    """
+    检查存储精度
+
+    Args:
+        precision: 存储精度
+
+    Returns:
+        存储精度
+
+    Raises:
+        ValueError: 不支持的存储精度
+    """
+    if precision not in SUPPORTED_PRECISIONS:
+        raise ValueError(
+            f"不支持的向量存储精度: {precision}。支持的精度: {', '.join(SUPPORTED_PRECISIONS)}"
+        )
+    return precision
+
+
+def arrow_value_type(precision: str) -> pa.DataType:
+    """
+    获取向量列元素的Arrow类型
+
+    Args:
+        precision: 存储精度
+
+    Returns:
+        Arrow数据类型
+    """
+    return _ARROW_TYPES[validate_precision(precision)]
+
+
+def precision_of(value_type: pa.DataType) -> Optional[str]:
+    """
+    根据向量列元素的Arrow类型判断存储精度
+
+    Args:
+        value_type: Arrow数据类型
+
+    Returns:
+        存储精度，无法识别时返回None
+    """
+    for precision, arrow_type in _ARROW_TYPES.items():
+        if value_type == arrow_type:
+            return precision
+    return None
+
+
+def encode_vector(
+    vector: np.ndarray, precision: str
+) -> Tuple[np.ndarray, Optional[float]]:
+    """
+    把float32向量编码为存储精度
+
+    Args:
+        vector: float32向量
+        precision: 存储精度
+
+    Returns:
+        (编码后的向量, 缩放系数)，只有int8有缩放系数
+    """
+    vector = np.asarray(vector, dtype=np.float32)
+    if validate_precision(precision) == "float32":
+        return vector, None
+    if precision == "float16":
+        return vector.astype(np.float16), None
+
+    max_abs = float(np.max(np.abs(vector))) if vector.size else 0.0
+    scale = max_abs / 127.0 if max_abs > 0 else 1.0
+    codes = np.clip(np.rint(vector / scale), -127, 127).astype(np.int8)
+    return codes, scale
+
+
+def decode_vectors(
+    stored: np.ndarray, scales: Optional[np.ndarray] = None
+) -> np.ndarray:
+    """
+    把存储的向量还原为float32
+
+    Args:
+        stored: 存储的向量矩阵（n x d）或单个向量
+        scales: int8缩放系数（长度为n，或单个向量时的标量）
+
+    Returns:
+        float32向量矩阵或向量
+    """
+    decoded = np.asarray(stored).astype(np.float32)
+    if scales is None:
+        return decoded
+    scales = np.asarray(scales, dtype=np.float32)
+    if decoded.ndim == 2:
+        scales = scales.reshape(-1, 1)
+    return decoded * scales
+
+
+def bytes_per_vector(dimension: int, precision: str, keep_full_precision: bool = False) -> int:
+    """
+    计算每个向量的存储字节数（不含元数据）
+
+    Args:
+        dimension: 向量维度
+        precision: 存储精度
+        keep_full_precision: 是否另存float32全精度副本
+
+    Returns:
+        字节数
+    """
+    size = dimension * _COMPONENT_BYTES[validate_precision(precision)]
+    if precision == "int8":
+        size += 4
+    if keep_full_precision and precision != "float32":
+        size += dimension * 4
+    return size
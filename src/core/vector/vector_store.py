@@ -5,19 +5,36 @@
 
 import lancedb
 import json
-from typing import Any, Dict, List, Optional
+import re
+from typing import Any, Dict, List, Optional, Tuple
 from pathlib import Path
 import logging
+import time
 import numpy as np
+import pyarrow as pa
 from datetime import datetime
 import uuid
 
+from src.core.utils.metrics import get_metrics_registry
+from src.core.vector.table_registry import VectorTableRegistry
+from src.core.vector.vector_codec import (
+    arrow_value_type,
+    bytes_per_vector,
+    decode_vectors,
+    encode_vector,
+    precision_of,
+    validate_precision,
+)
+
 logger = logging.getLogger(__name__)
 
 
 class VectorStore:
     """向量存储管理器"""
 
+    # int8检索时与量化码一起缓存的列，这些列上的过滤在内存中完成
+    QUANTIZED_FILTER_COLUMNS = ("modality", "file_id")
+
     def __init__(self, config: Dict[str, Any]):
         """
         初始化向量存储
@@ -37,6 +54,13 @@ class VectorStore:
             self.data_dir = Path(config.get("data_dir", "data/database/lancedb"))
 
         self.collection_name = config.get("collection_name", "unified_vectors")
+        self.base_collection_name = self.collection_name
+        # 按模型分表：表名包含模型ID和向量维度，切换模型不会混用不同向量空间
+        self.model_id = config.get("model_id")
+        if self.model_id and config.get("vector_dimension"):
+            self.collection_name = self.table_name_for(
+                self.collection_name, self.model_id, config["vector_dimension"]
+            )
         self.index_type = config.get("index_type", "ivf_pq")
         self.num_partitions = config.get("num_partitions", 128)
         # 向量维度不再固定为512，而是从配置或模型获取
@@ -44,6 +68,28 @@ class VectorStore:
             "vector_dimension", None
         )  # None表示使用模型默认维度
 
+        # 向量列存储精度（float32/float16/int8），非float32时可另存全精度副本用于重排
+        self.vector_precision = validate_precision(
+            database_config.get(
+                "vector_precision", config.get("vector_precision", "float32")
+            )
+        )
+        self.keep_full_precision = self.vector_precision != "float32" and bool(
+            database_config.get(
+                "keep_full_precision", config.get("keep_full_precision", False)
+            )
+        )
+        # int8量化码的内存副本：(表版本, id数组, 量化码矩阵, 量化码范数, 过滤列)
+        self._quantized_cache = None
+
+        # 两阶段检索：近似检索取re_rank_top_k个候选，再用float32精确余弦距离重排
+        search_config = config.get("search", {})
+        self.re_rank = search_config.get("re_rank", False)
+        self.re_rank_top_k = search_config.get("re_rank_top_k", 50)
+        self.max_distance = search_config.get("max_distance")
+        # IVF索引的探测分区数（没有索引时不生效）
+        self.nprobes = search_config.get("nprobes", 20)
+
         self.db: Optional[lancedb.DBConnection] = None
         self.table: Optional[lancedb.table.Table] = None
         self._actual_dimension = None  # 实际向量维度（从第一次插入时推断）
@@ -55,10 +101,94 @@ class VectorStore:
 
         self._initialize()
 
+    @staticmethod
+    def table_name_for(collection_name: str, model_id: str, dimension: int) -> str:
+        """
+        获取模型专用向量表的表名
+
+        Args:
+            collection_name: 基础表名
+            model_id: 模型ID
+            dimension: 向量维度
+
+        Returns:
+            表名，例如unified_vectors__chinese_clip_base_512
+        """
+        safe_model_id = re.sub(r"[^0-9A-Za-z_]+", "_", model_id)
+        return f"{collection_name}__{safe_model_id}_{dimension}"
+
+    @classmethod
+    def for_model(
+        cls, config: Dict[str, Any], model_id: str, dimension: int
+    ) -> "VectorStore":
+        """
+        创建模型专用的向量存储
+
+        Args:
+            config: 配置字典（与构造函数相同）
+            model_id: 模型ID
+            dimension: 向量维度
+
+        Returns:
+            VectorStore实例
+        """
+        return cls({**config, "model_id": model_id, "vector_dimension": dimension})
+
     def initialize(self) -> bool:
         """初始化向量数据库"""
         return self._initialize()
 
+    def switch_table(
+        self, collection_name: str, model_id: Optional[str] = None
+    ) -> None:
+        """
+        切换到另一张已存在的向量表（模型迁移完成后的切换）
+
+        先打开新表，再一次性替换表引用，切换前后的检索各自使用完整的表。
+
+        Args:
+            collection_name: 新表名
+            model_id: 新表对应的模型ID
+        """
+        table = self.db.open_table(collection_name)
+        dimension = table.schema.field("vector").type.list_size
+        self.table, self.collection_name = table, collection_name
+        self.model_id = model_id
+        self._actual_dimension = dimension
+        self.vector_dimension = dimension
+        self._quantized_cache = None
+        self._sync_precision_with_table()
+        logger.info(f"向量表已切换: {collection_name}, 维度: {dimension}")
+
+    def scan_rows(self, columns: Optional[List[str]] = None):
+        """
+        读取所有条目的指定列（默认不含向量列），用于迁移等批量操作
+
+        Args:
+            columns: 列名列表，None时读取除向量外的全部列
+
+        Returns:
+            DataFrame（不含临时初始化向量）
+        """
+        if self.table is None:
+            import pandas as pd
+
+            return pd.DataFrame(columns=columns or ["id"])
+
+        if columns is None:
+            columns = [
+                name
+                for name in self.table.schema.names
+                if name not in ("vector", "vector_scale", "vector_full")
+            ]
+        rows = (
+            self.table.search()
+            .select(columns)
+            .limit(max(self.table.count_rows(), 1))
+            .to_pandas()
+        )
+        return rows[rows["id"] != "temp_init_vector"].reset_index(drop=True)
+
     def _initialize(self) -> bool:
         """初始化向量数据库"""
         try:
@@ -80,6 +210,7 @@ class VectorStore:
             if self.collection_name in existing_tables:
                 self.table = self.db.open_table(self.collection_name)
                 logger.info(f"打开现有向量表: {self.collection_name}")
+                self._sync_precision_with_table()
                 # 从现有表推断向量维度
                 if self._actual_dimension is None:
                     try:
@@ -99,27 +230,8 @@ class VectorStore:
                 # 否则延迟创建表，直到第一次插入向量时根据实际维度创建
                 if self.vector_dimension is not None:
                     # 创建表，使用示例向量确保正确的表结构
-                    self.table = self.db.create_table(
-                        self.collection_name,
-                        data=[
-                            {
-                                "id": "temp_init_vector",
-                                "vector": np.zeros(
-                                    self.vector_dimension, dtype=np.float32
-                                ),
-                                "modality": "temp",
-                                "file_id": "",
-                                "file_path": "",
-                                "file_type": "",
-                                "file_name": "",
-                                "segment_id": "",
-                                "start_time": 0.0,
-                                "end_time": 0.0,
-                                "is_full_video": False,
-                                "metadata": "",
-                                "created_at": 0.0,
-                            }
-                        ],
+                    self.table = self._create_table_with_init_row(
+                        self.vector_dimension
                     )
                     self._actual_dimension = self.vector_dimension
                     logger.info(
@@ -157,6 +269,116 @@ class VectorStore:
             self.table = None
             return False
 
+    def _schema(self, dimension: int) -> pa.Schema:
+        """
+        构建向量表结构
+
+        显式指定向量列类型：LanceDB自动推断时会把float16和有符号整数向量转换为float32
+
+        Args:
+            dimension: 向量维度
+
+        Returns:
+            Arrow表结构
+        """
+        fields = [
+            pa.field("id", pa.string()),
+            pa.field(
+                "vector", pa.list_(arrow_value_type(self.vector_precision), dimension)
+            ),
+        ]
+        if self.vector_precision == "int8":
+            fields.append(pa.field("vector_scale", pa.float32()))
+        if self.keep_full_precision:
+            fields.append(pa.field("vector_full", pa.list_(pa.float32(), dimension)))
+        fields.extend(
+            [
+                pa.field("modality", pa.string()),
+                pa.field("file_id", pa.string()),
+                pa.field("file_path", pa.string()),
+                pa.field("file_type", pa.string()),
+                pa.field("file_name", pa.string()),
+                pa.field("segment_id", pa.string()),
+                pa.field("start_time", pa.float64()),
+                pa.field("end_time", pa.float64()),
+                pa.field("is_full_video", pa.bool_()),
+                pa.field("metadata", pa.string()),
+                pa.field("created_at", pa.float64()),
+            ]
+        )
+        return pa.schema(fields)
+
+    def _vector_columns(self, vector_array: np.ndarray) -> Dict[str, Any]:
+        """
+        按存储精度编码向量
+
+        Args:
+            vector_array: float32向量
+
+        Returns:
+            向量相关列（vector，以及vector_scale、vector_full）
+        """
+        stored, scale = encode_vector(vector_array, self.vector_precision)
+        columns = {"vector": stored}
+        if self.vector_precision == "int8":
+            columns["vector_scale"] = scale
+        if self.keep_full_precision:
+            columns["vector_full"] = vector_array
+        return columns
+
+    def _create_table_with_init_row(self, dimension: int):
+        """
+        创建带临时初始化向量的向量表
+
+        Args:
+            dimension: 向量维度
+
+        Returns:
+            LanceDB表
+        """
+        return self.db.create_table(
+            self.collection_name,
+            data=[
+                {
+                    "id": "temp_init_vector",
+                    **self._vector_columns(np.zeros(dimension, dtype=np.float32)),
+                    "modality": "temp",
+                    "file_id": "",
+                    "file_path": "",
+                    "file_type": "",
+                    "file_name": "",
+                    "segment_id": "",
+                    "start_time": 0.0,
+                    "end_time": 0.0,
+                    "is_full_video": False,
+                    "metadata": "",
+                    "created_at": 0.0,
+                }
+            ],
+            schema=self._schema(dimension),
+        )
+
+    def _sync_precision_with_table(self) -> None:
+        """现有表的向量列精度优先于配置（转换已有数据需要重新建表）"""
+        try:
+            schema = self.table.schema
+            stored = precision_of(schema.field("vector").type.value_type)
+        except Exception as e:
+            logger.warning(f"无法读取向量表结构: {e}")
+            return
+
+        if self._actual_dimension is None:
+            self._actual_dimension = getattr(
+                schema.field("vector").type, "list_size", None
+            )
+        if stored is not None and stored != self.vector_precision:
+            logger.warning(
+                f"向量表存储精度({stored})与配置({self.vector_precision})不一致，"
+                f"使用现有表的精度"
+            )
+            self.vector_precision = stored
+        self.keep_full_precision = "vector_full" in schema.names
+
     def add_vector(self, vector: Dict[str, Any]) -> None:
         """
         添加单个向量
@@ -193,27 +415,8 @@ class VectorStore:
                         logger.info(f"从第一个向量推断维度: {self._actual_dimension}")
 
                         # 创建表
-                        self.table = self.db.create_table(
-                            self.collection_name,
-                            data=[
-                                {
-                                    "id": "temp_init_vector",
-                                    "vector": np.zeros(
-                                        self._actual_dimension, dtype=np.float32
-                                    ),
-                                    "modality": "temp",
-                                    "file_id": "",
-                                    "file_path": "",
-                                    "file_type": "",
-                                    "file_name": "",
-                                    "segment_id": "",
-                                    "start_time": 0.0,
-                                    "end_time": 0.0,
-                                    "is_full_video": False,
-                                    "metadata": "",
-                                    "created_at": 0.0,
-                                }
-                            ],
+                        self.table = self._create_table_with_init_row(
+                            self._actual_dimension
                         )
                         logger.info(
                             f"延迟创建向量表成功: {self.collection_name}, 维度: {self._actual_dimension}"
@@ -223,10 +426,8 @@ class VectorStore:
                 else:
                     raise ValueError("没有向量数据，无法推断维度")
 
-            # 检查是否存在临时初始化向量
-            # 如果存在，先获取所有向量，过滤掉临时向量
-            all_vectors = self.table.to_pandas()
-            has_temp_vector = "temp_init_vector" in all_vectors["id"].values
+            # 检查是否存在临时初始化向量（只计数，不读取整张表）
+            has_temp_vector = self.table.count_rows("id = 'temp_init_vector'") > 0
 
             # 准备数据
             data = []
@@ -258,7 +459,7 @@ class VectorStore:
                 data.append(
                     {
                         "id": vec.get("id", str(uuid.uuid4())),
-                        "vector": vector_array,
+                        **self._vector_columns(vector_array),
                         "modality": vec.get("modality", "unknown"),
                         "file_id": vec.get("file_id", ""),
                         "file_path": file_path,
@@ -277,6 +478,7 @@ class VectorStore:
             if data:
                 if has_temp_vector:
                     # 过滤掉临时向量
+                    all_vectors = self.table.to_pandas()
                     vectors_to_keep = all_vectors[
                         all_vectors["id"] != "temp_init_vector"
                     ]
@@ -285,9 +487,10 @@ class VectorStore:
                     for d in data:
                         new_vectors.append(d)
                     # 替换旧表
+                    schema = self.table.schema
                     self.db.drop_table(self.collection_name)
                     self.table = self.db.create_table(
-                        self.collection_name, data=new_vectors
+                        self.collection_name, data=new_vectors, schema=schema
                     )
                     logger.info(f"删除临时初始化向量并插入新向量: {len(data)}个")
                 else:
@@ -304,6 +507,7 @@ class VectorStore:
         limit: int = 20,
         filter: Optional[Dict] = None,
         similarity_threshold: Optional[float] = None,
+        dedupe_files: bool = True,
     ) -> List[Dict[str, Any]]:
         """
         搜索向量
@@ -313,11 +517,14 @@ class VectorStore:
             limit: 返回数量限制（当使用similarity_threshold时，此参数作为最大返回数量）
             filter: 过滤条件
             similarity_threshold: 相似度阈值，高于此值的结果才会返回
+            dedupe_files: 是否按文件去重（片段级检索时传False，保留同一视频的多个片段）
 
         Returns:
             搜索结果列表
         """
-        return self.search_vectors(query_vector, limit, filter, similarity_threshold)
+        return self.search_vectors(
+            query_vector, limit, filter, similarity_threshold, dedupe_files
+        )
 
     def search_vectors(
         self,
@@ -325,6 +532,7 @@ class VectorStore:
         limit: int = 20,
         filter: Optional[Dict] = None,
         similarity_threshold: Optional[float] = None,
+        dedupe_files: bool = True,
     ) -> List[Dict[str, Any]]:
         """
         搜索向量
@@ -334,42 +542,61 @@ class VectorStore:
             limit: 返回数量限制（当使用similarity_threshold时，此参数作为最大返回数量）
             filter: 过滤条件
             similarity_threshold: 相似度阈值，高于此值的结果才会返回
+            dedupe_files: 是否按文件去重（片段级检索时传False，保留同一视频的多个片段）
 
         Returns:
             搜索结果列表
         """
+        start_time = time.perf_counter()
         try:
             # 转换为numpy数组
             query_vector = np.array(query_vector, dtype=np.float32)
 
-            # 如果设置了相似度阈值，我们需要先获取足够多的结果，然后过滤
-            actual_limit = (
-                limit if similarity_threshold is None else max(limit * 2, 100)
-            )  # 获取更多结果用于过滤
-
-            # 构建LanceDB查询
-            query = (
-                self.table.search(query_vector, vector_column_name="vector")
-                .metric("cosine")
-                .limit(actual_limit)
-            )
+            if self.re_rank:
+                # 候选数量由re_rank_top_k决定，至少覆盖本次返回数量
+                actual_limit = max(self.re_rank_top_k, limit)
+            else:
+                # 如果设置了相似度阈值，我们需要先获取足够多的结果，然后过滤
+                actual_limit = (
+                    limit if similarity_threshold is None else max(limit * 2, 100)
+                )  # 获取更多结果用于过滤
 
-            # 应用过滤条件（使用LanceDB的where子句）
-            if filter:
-                for key, value in filter.items():
-                    if isinstance(value, list):
-                        # 如果值是列表，构建in子句
-                        value_str = ", ".join([f"'{v}'" for v in value])
-                        query = query.where(f"{key} in ({value_str})")
-                    else:
-                        # 如果值是单个值，构建等式子句
-                        if isinstance(value, str):
-                            query = query.where(f"{key} = '{value}'")
-                        else:
-                            query = query.where(f"{key} = {value}")
+            where_clause = self._build_where_clause(filter)
 
-            # 执行搜索
-            results = query.to_pandas()
+            if self.vector_precision == "int8":
+                # LanceDB不能对int8列做余弦检索，在内存中扫描量化码
+                results = self._search_quantized(query_vector, actual_limit, filter)
+            else:
+                # 构建LanceDB查询（float16列使用同精度的查询向量）
+                query = (
+                    self.table.search(
+                        query_vector.astype(np.float16)
+                        if self.vector_precision == "float16"
+                        else query_vector,
+                        vector_column_name="vector",
+                    )
+                    .metric("cosine")
+                    .limit(actual_limit)
+                )
+                if self.re_rank:
+                    query = query.nprobes(self.nprobes)
+
+                # 应用过滤条件（使用LanceDB的where子句）
+                if where_clause:
+                    query = query.where(where_clause)
+
+                # 执行搜索
+                results = query.to_pandas()
+
+            if self.re_rank:
+                # 调用方给出相似度阈值时由阈值决定截断位置，否则使用配置的
+                # max_distance（默认不截断，交给上层的相似度阈值过滤）
+                max_distance = (
+                    self.max_distance
+                    if similarity_threshold is None
+                    else 1.0 - similarity_threshold
+                )
+                results = self._exact_rerank(results, query_vector, max_distance)
 
             # 转换为字典列表（带有相似度计算）
             result_dicts = self._results_to_dicts(results)
@@ -386,17 +613,18 @@ class VectorStore:
 
             # 去重：根据file_path去重，保留相似度最高的
             # 只有当file_path存在时才去重，否则保留所有结果
-            seen_files = set()
-            unique_results = []
-            for r in result_dicts:
-                file_path = r.get("file_path", "")
-                if file_path:  # 如果有file_path，则进行去重
-                    if file_path not in seen_files:
-                        seen_files.add(file_path)
+            if dedupe_files:
+                seen_files = set()
+                unique_results = []
+                for r in result_dicts:
+                    file_path = r.get("file_path", "")
+                    if file_path:  # 如果有file_path，则进行去重
+                        if file_path not in seen_files:
+                            seen_files.add(file_path)
+                            unique_results.append(r)
+                    else:  # 如果没有file_path，保留所有结果
                         unique_results.append(r)
-                else:  # 如果没有file_path，保留所有结果
-                    unique_results.append(r)
-            result_dicts = unique_results
+                result_dicts = unique_results
 
             # 如果设置了相似度阈值，过滤结果
             if similarity_threshold is not None:
@@ -404,12 +632,168 @@ class VectorStore:
                     r for r in result_dicts if r["similarity"] >= similarity_threshold
                 ]
 
+            get_metrics_registry().histogram(
+                "msearch_vector_search_duration_seconds",
+                "向量检索耗时（秒）",
+                re_rank=str(self.re_rank).lower(),
+            ).observe(time.perf_counter() - start_time)
+
             # 限制最终返回数量
             return result_dicts[:limit]
         except Exception as e:
             logger.error(f"搜索向量失败: {e}")
             return []
 
+    @staticmethod
+    def _build_where_clause(filter: Optional[Dict]) -> Optional[str]:
+        """
+        把过滤条件转换为LanceDB的where子句，多个条件之间为AND关系
+
+        Args:
+            filter: 过滤条件，值为列表时使用in子句
+
+        Returns:
+            where子句，没有过滤条件时返回None
+        """
+        if not filter:
+            return None
+
+        clauses = []
+        for key, value in filter.items():
+            if isinstance(value, list):
+                # 如果值是列表，构建in子句
+                value_str = ", ".join([f"'{v}'" for v in value])
+                clauses.append(f"{key} in ({value_str})")
+            elif isinstance(value, str):
+                clauses.append(f"{key} = '{value}'")
+            else:
+                clauses.append(f"{key} = {value}")
+        return " AND ".join(clauses)
+
+    def _load_quantized(
+        self,
+    ) -> Tuple[np.ndarray, np.ndarray, np.ndarray, Dict[str, np.ndarray]]:
+        """
+        读取int8量化码和常用过滤列（不读取全精度副本）
+
+        整张表按版本缓存，写入后自动失效；过滤条件在内存中以掩码应用，
+        带模态过滤的检索也能命中缓存。
+
+        Returns:
+            (id数组, 量化码矩阵, 量化码范数, 过滤列名 -> 值数组)
+        """
+        version = self.table.version
+        if self._quantized_cache is not None and self._quantized_cache[0] == version:
+            return self._quantized_cache[1:]
+
+        arrow_table = (
+            self.table.search()
+            .select(["id", "vector", *self.QUANTIZED_FILTER_COLUMNS])
+            .limit(max(self.table.count_rows(), 1))
+            .to_arrow()
+        )
+
+        ids = np.asarray(arrow_table["id"].to_pylist(), dtype=object)
+        vectors = arrow_table["vector"].combine_chunks()
+        codes = vectors.flatten().to_numpy().reshape(len(ids), vectors.type.list_size)
+        columns = {
+            name: np.asarray(arrow_table[name].to_pylist(), dtype=object)
+            for name in self.QUANTIZED_FILTER_COLUMNS
+        }
+
+        keep = ids != "temp_init_vector"
+        ids, codes = ids[keep], codes[keep]
+        columns = {name: values[keep] for name, values in columns.items()}
+        norms = np.linalg.norm(codes.astype(np.float32), axis=1)
+        norms[norms == 0] = 1.0
+
+        self._quantized_cache = (version, ids, codes, norms, columns)
+        return ids, codes, norms, columns
+
+    def _quantized_filter_mask(
+        self, ids: np.ndarray, columns: Dict[str, np.ndarray], filter: Optional[Dict]
+    ) -> Optional[np.ndarray]:
+        """
+        把过滤条件转换为量化码缓存上的布尔掩码
+
+        缓存中的列直接比较；其他列用where子句查询匹配的id。
+
+        Args:
+            ids: 缓存的id数组
+            columns: 缓存的过滤列
+            filter: 过滤条件，值为列表时表示取值之一
+
+        Returns:
+            布尔掩码，没有过滤条件时返回None
+        """
+        if not filter:
+            return None
+
+        mask = np.ones(len(ids), dtype=bool)
+        uncached = {}
+        for key, value in filter.items():
+            if key not in columns:
+                uncached[key] = value
+                continue
+            values = value if isinstance(value, list) else [value]
+            mask &= np.isin(columns[key], np.asarray(values, dtype=object))
+
+        if uncached:
+            matched = (
+                self.table.search()
+                .where(self._build_where_clause(uncached))
+                .select(["id"])
+                .limit(max(self.table.count_rows(), 1))
+                .to_arrow()["id"]
+                .to_pylist()
+            )
+            mask &= np.isin(ids, np.asarray(matched, dtype=object))
+        return mask
+
+    def _search_quantized(
+        self, query_vector: np.ndarray, limit: int, filter: Optional[Dict] = None
+    ):
+        """
+        在int8量化码上做余弦检索
+
+        余弦相似度与每个向量的缩放系数无关，直接用量化码计算；分块计算避免
+        一次性把整个量化码矩阵转换为float32。
+
+        Args:
+            query_vector: 查询向量
+            limit: 返回数量
+            filter: 过滤条件
+
+        Returns:
+            按距离升序排列的DataFrame（_distance列为量化码上的余弦距离）
+        """
+        ids, codes, norms, columns = self._load_quantized()
+        mask = self._quantized_filter_mask(ids, columns, filter)
+        if mask is not None:
+            ids, codes, norms = ids[mask], codes[mask], norms[mask]
+        if len(ids) == 0:
+            return None
+
+        query_norm = float(np.linalg.norm(query_vector)) or 1.0
+        scores = np.empty(len(ids), dtype=np.float32)
+        chunk_size = 65536
+        for start in range(0, len(ids), chunk_size):
+            chunk = codes[start : start + chunk_size].astype(np.float32)
+            scores[start : start + chunk_size] = chunk @ query_vector
+        distances = 1.0 - scores / (norms * query_norm)
+
+        limit = min(limit, len(ids))
+        top = np.argpartition(distances, limit - 1)[:limit]
+        top = top[np.argsort(distances[top], kind="stable")]
+
+        id_list = ", ".join("'" + str(i).replace("'", "''") + "'" for i in ids[top])
+        rows = (
+            self.table.search().where(f"id IN ({id_list})").limit(limit).to_pandas()
+        )
+        distance_by_id = dict(zip(ids[top], distances[top]))
+        rows["_distance"] = rows["id"].map(distance_by_id).astype(np.float32)
+        return rows.sort_values("_distance", kind="stable").reset_index(drop=True)
+
     def get_stats(self) -> Dict[str, Any]:
         """
         获取向量存储统计信息
@@ -424,7 +808,14 @@ class VectorStore:
                 "vector_dimension": self.vector_dimension,
                 "index_type": self.index_type,
                 "num_partitions": self.num_partitions,
+                "vector_precision": self.vector_precision,
+                "keep_full_precision": self.keep_full_precision,
             }
+            dimension = self._actual_dimension or self.vector_dimension
+            if dimension:
+                stats["bytes_per_vector"] = bytes_per_vector(
+                    dimension, self.vector_precision, self.keep_full_precision
+                )
 
             # 获取向量数量
             if self.table is not None:
@@ -466,29 +857,14 @@ class VectorStore:
             # 获取所有不在要删除列表中的向量
             all_vectors = self.table.to_pandas()
             vectors_to_keep = all_vectors[~all_vectors["id"].isin(vector_ids)]
+            # 沿用原表结构，保持向量列的存储精度
+            schema = self.table.schema
 
             # 如果所有向量都被删除了
             if vectors_to_keep.empty:
-                # 删除旧表并创建新的空表
+                # 删除旧表并创建新的空表，确保正确的表结构但不添加任何向量
                 self.db.drop_table(self.collection_name)
-                # 使用空数据创建表，确保正确的表结构但不添加任何向量
-                import pandas as pd
-
-                empty_df = pd.DataFrame(
-                    {
-                        "id": pd.Series([], dtype="string"),
-                        "vector": pd.Series([], dtype="object"),
-                        "modality": pd.Series([], dtype="string"),
-                        "file_id": pd.Series([], dtype="string"),
-                        "segment_id": pd.Series([], dtype="string"),
-                        "start_time": pd.Series([], dtype="float64"),
-                        "end_time": pd.Series([], dtype="float64"),
-                        "is_full_video": pd.Series([], dtype="boolean"),
-                        "metadata": pd.Series([], dtype="string"),
-                        "created_at": pd.Series([], dtype="float64"),
-                    }
-                )
-                self.table = self.db.create_table(self.collection_name, data=empty_df)
+                self.table = self.db.create_table(self.collection_name, schema=schema)
                 logger.info(f"所有向量都已删除，创建了空向量表")
                 return
 
@@ -497,7 +873,9 @@ class VectorStore:
 
             # 创建新表并重新插入保留的数据
             self.table = self.db.create_table(
-                self.collection_name, data=vectors_to_keep.to_dict("records")
+                self.collection_name,
+                data=vectors_to_keep.to_dict("records"),
+                schema=schema,
             )
 
             logger.info(
@@ -545,11 +923,12 @@ class VectorStore:
             all_vectors.iloc[vector_index] = vector_to_update
 
             # 替换旧表
+            schema = self.table.schema
             self.db.drop_table(self.collection_name)
 
             # 创建新表并重新插入数据
             self.table = self.db.create_table(
-                self.collection_name, data=all_vectors.to_dict("records")
+                self.collection_name, data=all_vectors.to_dict("records"), schema=schema
             )
 
             logger.info(f"成功更新向量: {vector_id}")
@@ -569,12 +948,10 @@ class VectorStore:
             向量数据
         """
         try:
-            results = (
-                self.table.search(np.zeros(self.vector_dimension))
-                .limit(1000)
-                .to_pandas()
+            escaped_id = vector_id.replace("'", "''")
+            result = (
+                self.table.search().where(f"id = '{escaped_id}'").limit(1).to_pandas()
             )
-            result = results[results["id"] == vector_id]
 
             if not result.empty:
                 return self._results_to_dicts(result)[0]
@@ -626,6 +1003,78 @@ class VectorStore:
             self.db = None
             self.table = None
 
+    @staticmethod
+    def _exact_rerank(
+        candidates, query_vector: np.ndarray, max_distance: Optional[float] = None
+    ):
+        """
+        用float32精确余弦距离重排候选结果
+
+        近似检索（IVF/PQ）返回的距离是量化后的估计值，这里对全部候选做一次
+        向量化的精确计算后重新排序，并在第一个超过max_distance的位置截断。
+        有全精度副本时使用副本，否则使用反量化后的向量。
+
+        Args:
+            candidates: 近似检索返回的DataFrame（包含vector列）
+            query_vector: 查询向量
+            max_distance: 最大余弦距离，超过的候选被丢弃
+
+        Returns:
+            按精确距离升序排列的DataFrame（_distance列为精确距离）
+        """
+        if candidates is None or len(candidates) == 0:
+            return candidates
+
+        matrix = VectorStore._candidate_vectors(candidates)
+        norms = np.linalg.norm(matrix, axis=1)
+        norms[norms == 0] = 1.0
+        query_norm = float(np.linalg.norm(query_vector)) or 1.0
+        distances = 1.0 - (matrix @ query_vector) / (norms * query_norm)
+
+        order = np.argsort(distances, kind="stable")
+        distances = distances[order]
+        if max_distance is not None:
+            # 距离已升序，第一个超出阈值的位置之后全部丢弃
+            order = order[: np.searchsorted(distances, max_distance, side="right")]
+            distances = distances[: len(order)]
+
+        reranked = candidates.iloc[order].copy()
+        reranked["_distance"] = distances
+        return reranked
+
+    @staticmethod
+    def _candidate_vectors(candidates) -> np.ndarray:
+        """
+        取出候选结果的float32向量矩阵
+
+        Args:
+            candidates: 查询结果DataFrame
+
+        Returns:
+            float32向量矩阵
+        """
+        if "vector_full" in candidates.columns:
+            return np.stack(candidates["vector_full"].to_numpy()).astype(
+                np.float32, copy=False
+            )
+        matrix = np.stack(candidates["vector"].to_numpy())
+        scales = (
+            candidates["vector_scale"].to_numpy()
+            if "vector_scale" in candidates.columns
+            else None
+        )
+        return decode_vectors(matrix, scales)
+
+    @staticmethod
+    def _row_vector(row) -> List[float]:
+        """取出单条结果的float32向量（全精度副本或反量化后的向量）"""
+        if "vector_full" in row and row["vector_full"] is not None:
+            return np.asarray(row["vector_full"], dtype=np.float32).tolist()
+        if "vector" not in row:
+            return []
+        scale = row["vector_scale"] if "vector_scale" in row else None
+        return decode_vectors(row["vector"], scale).tolist()
+
     def _results_to_dicts(self, results) -> List[Dict[str, Any]]:
         """
         将查询结果转换为字典列表
@@ -677,7 +1126,7 @@ class VectorStore:
 
             result = {
                 "id": row["id"],
-                "vector": row["vector"].tolist() if "vector" in row else [],
+                "vector": self._row_vector(row),
                 "modality": row["modality"],
                 "file_id": row["file_id"],
                 "segment_id": row["segment_id"],
@@ -778,7 +1227,9 @@ class VectorStore:
         """
         创建向量索引
 
-        注意：LanceDB 0.26.1版本自动管理索引，无需手动创建
+        为向量列建立IVF近似索引，作为两阶段检索的候选生成阶段。int8存储、
+        BRUTE索引类型以及向量数量不足以训练分区和量化码本时保持暴力检索，
+        这些情况不需要索引，同样视为成功。
 
         Args:
             index_type: 索引类型（可选，默认使用配置的值）
@@ -791,8 +1242,38 @@ class VectorStore:
             if not self.table:
                 return False
 
-            # LanceDB 0.26.1版本自动管理索引，无需手动创建
-            logger.info("LanceDB自动管理索引，无需手动创建")
+            if self.vector_precision == "int8":
+                logger.info("int8向量在内存中扫描量化码，不创建LanceDB索引")
+                return True
+
+            index_type = (index_type or self.index_type).upper()
+            num_partitions = num_partitions or self.num_partitions
+            if index_type == "BRUTE":
+                logger.info("索引类型为BRUTE，使用暴力检索")
+                return True
+
+            # PQ码本训练至少需要256个向量，IVF每个分区至少需要一个向量
+            row_count = self.table.count_rows()
+            if row_count < max(256, num_partitions):
+                logger.info(f"向量数量不足({row_count})，暂不创建索引，使用暴力检索")
+                return True
+
+            index_params = {
+                "metric": "cosine",
+                "num_partitions": num_partitions,
+                "vector_column_name": "vector",
+                "index_type": index_type,
+                "replace": True,
+            }
+            dimension = self._actual_dimension or self.vector_dimension
+            if index_type == "IVF_PQ" and dimension and dimension % 8 == 0:
+                # 每个子向量8维
+                index_params["num_sub_vectors"] = dimension // 8
+
+            self.table.create_index(**index_params)
+            logger.info(
+                f"向量索引创建成功: {index_type}, 分区数: {num_partitions}, 向量数: {row_count}"
+            )
             return True
         except Exception as e:
             logger.error(f"创建向量索引失败: {e}")
@@ -808,10 +1289,18 @@ class VectorStore:
             # 删除旧表
             self.db.drop_table(self.collection_name)
 
+            # 维度已知时按存储精度显式建表
+            dimension = self._actual_dimension or self.vector_dimension
+            if dimension:
+                self.table = self.db.create_table(
+                    self.collection_name, schema=self._schema(dimension), mode="overwrite"
+                )
+                logger.info(f"成功清空向量库: {self.collection_name}")
+                return
+
             # 创建一个新的空表，使用LanceDB自动创建schema的方式
             # 先创建一个临时的空DataFrame来初始化表结构
             import pandas as pd
-            import pyarrow as pa
 
             # 创建空的DataFrame，包含所有需要的字段
             empty_df = pd.DataFrame(
@@ -859,6 +1348,15 @@ def create_vector_store(config: Dict[str, Any]) -> VectorStore:
     if "data_dir" not in lancedb_config:
         lancedb_config["data_dir"] = config.get("data_dir", "data/database/lancedb")
 
+    # 检索重排配置
+    lancedb_config.setdefault("search", config.get("search", {}))
+
+    # 向量存储精度
+    database_config = config.get("database", {})
+    for key in ("vector_precision", "keep_full_precision"):
+        if key in database_config:
+            lancedb_config.setdefault(key, database_config[key])
+
     # 创建VectorStore实例
     vector_store = VectorStore(lancedb_config)
 
@@ -867,3 +1365,75 @@ def create_vector_store(config: Dict[str, Any]) -> VectorStore:
         vector_store.create_index()
 
     return vector_store
+
+
+def open_active_vector_store(
+    config: Dict[str, Any], default_model_id: str, default_dimension: int
+) -> VectorStore:
+    """
+    按模型分表时打开当前提供检索的向量表
+
+    使用向量表注册表记录的表（模型迁移切换后的表）。没有记录时，如果存在未分表时的旧表，
+    继续使用旧表（视为默认模型的表，可以通过迁移切换到模型专用表）；否则使用默认模型的表并登记。
+
+    Args:
+        config: 配置字典（与VectorStore构造函数相同）
+        default_model_id: 默认图像/视频模型ID
+        default_dimension: 默认模型的向量维度
+
+    Returns:
+        VectorStore实例，model_id为该表对应的模型
+    """
+    data_dir = config.get("database", {}).get(
+        "vector_db_path", config.get("data_dir", "data/database/lancedb")
+    )
+    collection_name = config.get("collection_name", "unified_vectors")
+    registry = VectorTableRegistry(data_dir)
+
+    active = registry.get_active(collection_name)
+    if active:
+        return VectorStore.for_model(config, active["model_id"], active["dimension"])
+
+    if collection_name in lancedb.connect(str(data_dir)).table_names():
+        return VectorStore(
+            {**config, "model_id": default_model_id, "vector_dimension": None}
+        )
+
+    vector_store = VectorStore.for_model(config, default_model_id, default_dimension)
+    registry.set_active(
+        collection_name,
+        default_model_id,
+        default_dimension,
+        vector_store.collection_name,
+    )
+    return vector_store
+
+
+def open_audio_vector_store(
+    config: Dict[str, Any], audio_model_id: str, dimension: int
+) -> VectorStore:
+    """
+    按模型分表时打开音频模型（CLAP）专用的向量表
+
+    音频向量与图像/视频向量不在同一个向量空间，维度也可能不同，保存在单独的基础表
+    （{collection_name}_audio）下按音频模型ID和维度命名的表中，切换图像/视频模型时不受影响。
+
+    Args:
+        config: 配置字典（与VectorStore构造函数相同）
+        audio_model_id: 音频模型ID
+        dimension: 音频模型的向量维度
+
+    Returns:
+        VectorStore实例
+    """
+    collection_name = f"{config.get('collection_name', 'unified_vectors')}_audio"
+    vector_store = VectorStore.for_model(
+        {**config, "collection_name": collection_name}, audio_model_id, dimension
+    )
+    registry = VectorTableRegistry(str(vector_store.data_dir))
+    active = registry.get_active(collection_name)
+    if not active or active.get("table") != vector_store.collection_name:
+        registry.set_active(
+            collection_name, audio_model_id, dimension, vector_store.collection_name
+        )
+    return vector_store
@@ -4,13 +4,20 @@
 职责：负责数据的提取、生成、验证和存储，不包含业务逻辑
 """
 
-from .extractors.metadata_extractor import MetadataExtractor
-from .extractors.frame_extractor import FrameExtractor
-from .extractors.audio_extractor import AudioExtractor
-from .extractors.scene_detector import SceneDetector
-from .generators.thumbnail_generator import ThumbnailGenerator
-from .generators.preview_generator import PreviewGenerator
-from .validators.data_validator import DataValidator
+from src.utils.lazy_import import lazy_exports
+
+__getattr__, __dir__ = lazy_exports(
+    __name__,
+    {
+        'MetadataExtractor': '.extractors.metadata_extractor',
+        'FrameExtractor': '.extractors.frame_extractor',
+        'AudioExtractor': '.extractors.audio_extractor',
+        'SceneDetector': '.extractors.scene_detector',
+        'ThumbnailGenerator': '.generators.thumbnail_generator',
+        'PreviewGenerator': '.generators.preview_generator',
+        'DataValidator': '.validators.data_validator',
+    },
+)
 
 __all__ = [
     'MetadataExtractor',
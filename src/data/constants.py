@@ -0,0 +1,17 @@
+"""
+数据层常量定义
+"""
+
+from enum import Enum
+
+
+class PreviewType(str, Enum):
+    """预览类型枚举（值同时作为预览子目录名）"""
+
+    THUMBNAIL = "thumbnail"
+    SMALL_PREVIEW = "small"
+    MEDIUM_PREVIEW = "medium"
+    LARGE_PREVIEW = "large"
+    GIF_PREVIEW = "gif"
+    VIDEO_PREVIEW = "video"
+    AUDIO_WAVEFORM = "waveform"
@@ -4,10 +4,21 @@
 职责：负责生成数据（缩略图、预览等），不包含业务逻辑
 """
 
-from .thumbnail_generator import ThumbnailGenerator
-from .preview_generator import PreviewGenerator
+from src.utils.lazy_import import lazy_exports
+
+__getattr__, __dir__ = lazy_exports(
+    __name__,
+    {
+        'ThumbnailGenerator': '.thumbnail_generator',
+        'PreviewGenerator': '.preview_generator',
+        'FFmpegWorkerPool': '.ffmpeg_pool',
+        'get_ffmpeg_pool': '.ffmpeg_pool',
+    },
+)
 
 __all__ = [
     'ThumbnailGenerator',
     'PreviewGenerator',
+    'FFmpegWorkerPool',
+    'get_ffmpeg_pool',
 ]
@@ -0,0 +1,268 @@
+"""
+FFmpeg工作池
+
+职责：以有界并发执行ffmpeg/ffprobe子进程，按优先级调度
+不包含业务逻辑，只负责命令执行
+"""
+
+import heapq
+import itertools
+import logging
+import os
+import subprocess
+import threading
+from concurrent.futures import Future
+from typing import Any, Dict, List, Optional
+
+logger = logging.getLogger(__name__)
+
+
+# 优先级（数值越小优先级越高）
+PRIORITY_VISIBLE = 0  # 正在展示的检索结果
+PRIORITY_DEFAULT = 5
+PRIORITY_BACKGROUND = 9  # 索引阶段的批量生成
+
+
+class FFmpegWorkerPool:
+    """
+    FFmpeg工作池
+
+    常驻的工作线程从优先级队列中取命令执行，同一时刻最多运行 max_workers 个
+    子进程，避免批量生成时一次性拉起上千个ffmpeg。提交时可以指定 key，
+    之后通过 reprioritize 调整尚未开始执行的任务优先级（例如检索结果出现在
+    可见区域时提前生成其缩略图）。
+
+    进程内的缩略图服务和预览生成器通过 get_ffmpeg_pool 共用同一个工作池，
+    按需渲染的可见结果与索引阶段的后台批量生成在同一个队列中按优先级排队。
+    """
+
+    def __init__(self, max_workers: Optional[int] = None, timeout: Optional[float] = 300):
+        """
+        初始化工作池
+
+        Args:
+            max_workers: 最大并发子进程数，默认min(4, CPU核数)
+            timeout: 单个命令的超时时间（秒）
+        """
+        self.max_workers = max_workers or min(4, os.cpu_count() or 1)
+        self.timeout = timeout
+
+        self._heap: List[list] = []
+        self._pending: Dict[str, list] = {}
+        self._counter = itertools.count()
+        self._cond = threading.Condition()
+        self._workers: List[threading.Thread] = []
+        self._shutdown = False
+
+        self.running_count = 0
+        self.completed_count = 0
+        self.failed_count = 0
+
+    def submit(self, cmd: List[str], priority: int = PRIORITY_DEFAULT,
+               key: Optional[str] = None, text: bool = True,
+               timeout: Optional[float] = None) -> Future:
+        """
+        提交命令
+
+        Args:
+            cmd: 命令参数列表
+            priority: 优先级（数值越小越先执行）
+            key: 任务标识，同一key未执行的任务会被合并，
+                因此key必须能区分命令的输出（相同key的命令应产生相同的结果）
+            text: 是否以文本方式读取输出（输出图像数据到管道时为False）
+            timeout: 命令超时时间（秒），默认使用工作池的超时时间
+
+        Returns:
+            Future，结果为 subprocess.CompletedProcess
+        """
+        with self._cond:
+            if self._shutdown:
+                raise RuntimeError("FFmpeg工作池已关闭")
+
+            if key is not None and key in self._pending:
+                item = self._pending[key]
+                if priority < item[0]:
+                    self._reprioritize_locked(key, priority)
+                return self._pending[key][3]
+
+            future: Future = Future()
+            options = {'text': text, 'timeout': timeout or self.timeout}
+            item = [priority, next(self._counter), key, future, cmd, options]
+            heapq.heappush(self._heap, item)
+            if key is not None:
+                self._pending[key] = item
+
+            self._ensure_workers()
+            self._cond.notify()
+            return future
+
+    def reprioritize(self, key: str, priority: int) -> bool:
+        """
+        调整尚未执行任务的优先级
+
+        Args:
+            key: 任务标识
+            priority: 新优先级
+
+        Returns:
+            任务是否仍在队列中
+        """
+        with self._cond:
+            if key not in self._pending:
+                return False
+            self._reprioritize_locked(key, priority)
+            self._cond.notify()
+            return True
+
+    def _reprioritize_locked(self, key: str, priority: int) -> None:
+        old_item = self._pending[key]
+        cmd = old_item[4]
+        # 惰性删除：旧条目标记为失效（命令置空），出队时跳过
+        old_item[4] = None
+        new_item = [priority, next(self._counter), key, old_item[3], cmd, old_item[5]]
+        heapq.heappush(self._heap, new_item)
+        self._pending[key] = new_item
+
+    def _ensure_workers(self) -> None:
+        """按需启动工作线程（调用方需持有锁）"""
+        alive = [t for t in self._workers if t.is_alive()]
+        self._workers = alive
+        while len(self._workers) < self.max_workers and len(self._workers) < len(self._heap):
+            worker = threading.Thread(target=self._worker_loop, daemon=True,
+                                      name=f"ffmpeg-worker-{len(self._workers)}")
+            worker.start()
+            self._workers.append(worker)
+
+    def _worker_loop(self) -> None:
+        while True:
+            with self._cond:
+                item = None
+                while not self._shutdown:
+                    while self._heap and self._heap[0][4] is None:
+                        heapq.heappop(self._heap)
+                    if self._heap:
+                        item = heapq.heappop(self._heap)
+                        break
+                    self._cond.wait()
+                if item is None:
+                    return
+
+                _, _, key, future, cmd, options = item
+                if key is not None and self._pending.get(key) is item:
+                    del self._pending[key]
+                self.running_count += 1
+
+            if not future.set_running_or_notify_cancel():
+                with self._cond:
+                    self.running_count -= 1
+                continue
+
+            try:
+                result = subprocess.run(cmd, capture_output=True, text=options['text'],
+                                        timeout=options['timeout'])
+                future.set_result(result)
+                succeeded = result.returncode == 0
+            except Exception as e:
+                future.set_exception(e)
+                succeeded = False
+
+            with self._cond:
+                self.running_count -= 1
+                if succeeded:
+                    self.completed_count += 1
+                else:
+                    self.failed_count += 1
+
+    def run(self, cmd: List[str], priority: int = PRIORITY_DEFAULT,
+            key: Optional[str] = None, text: bool = True,
+            timeout: Optional[float] = None) -> subprocess.CompletedProcess:
+        """
+        提交命令并等待完成
+
+        Args:
+            cmd: 命令参数列表
+            priority: 优先级
+            key: 任务标识
+            text: 是否以文本方式读取输出
+            timeout: 命令超时时间（秒）
+
+        Returns:
+            命令执行结果
+        """
+        return self.submit(cmd, priority, key, text, timeout).result()
+
+    def get_stats(self) -> Dict[str, Any]:
+        """
+        获取工作池统计信息
+
+        Returns:
+            统计信息字典
+        """
+        with self._cond:
+            return {
+                'max_workers': self.max_workers,
+                'workers': len(self._workers),
+                'pending': sum(1 for item in self._heap if item[4] is not None),
+                'running': self.running_count,
+                'completed': self.completed_count,
+                'failed': self.failed_count,
+            }
+
+    def shutdown(self, wait: bool = True) -> None:
+        """
+        关闭工作池，未开始执行的任务会被取消
+
+        Args:
+            wait: 是否等待正在执行的命令结束
+        """
+        with self._cond:
+            self._shutdown = True
+            for item in self._heap:
+                if item[4] is not None:
+                    item[3].cancel()
+            self._heap.clear()
+            self._pending.clear()
+            self._cond.notify_all()
+            workers = list(self._workers)
+
+        if wait:
+            for worker in workers:
+                worker.join()
+
+
+# 进程内共享的工作池
+_ffmpeg_pool: Optional[FFmpegWorkerPool] = None
+_ffmpeg_pool_lock = threading.Lock()
+
+
+def initialize_ffmpeg_pool(max_workers: Optional[int] = None) -> FFmpegWorkerPool:
+    """
+    初始化共享的FFmpeg工作池
+
+    Args:
+        max_workers: 最大并发子进程数
+
+    Returns:
+        工作池实例
+    """
+    global _ffmpeg_pool
+    with _ffmpeg_pool_lock:
+        if _ffmpeg_pool is not None:
+            _ffmpeg_pool.shutdown(wait=False)
+        _ffmpeg_pool = FFmpegWorkerPool(max_workers=max_workers)
+        return _ffmpeg_pool
+
+
+def get_ffmpeg_pool() -> FFmpegWorkerPool:
+    """
+    获取共享的FFmpeg工作池，未初始化时按默认并发数创建
+
+    Returns:
+        工作池实例
+    """
+    global _ffmpeg_pool
+    if _ffmpeg_pool is None:
+        with _ffmpeg_pool_lock:
+            if _ffmpeg_pool is None:
+                _ffmpeg_pool = FFmpegWorkerPool()
+    return _ffmpeg_pool
@@ -5,13 +5,18 @@
 不包含业务逻辑，只负责数据生成
 """
 
+import hashlib
 import logging
 import os
 import tempfile
+import threading
+from concurrent.futures import Future, ThreadPoolExecutor
 from pathlib import Path
-from typing import Optional, Tuple, Any, List, Dict
+from typing import Optional, Tuple, Any, List, Dict, Iterable
 
 from ..constants import PreviewType
+from .ffmpeg_pool import (FFmpegWorkerPool, get_ffmpeg_pool, PRIORITY_BACKGROUND,
+                          PRIORITY_DEFAULT, PRIORITY_VISIBLE)
 
 logger = logging.getLogger(__name__)
 
@@ -26,9 +31,15 @@ class PreviewGenerator:
     - 从视频生成预览（快速播放）
     - 从图像序列生成预览
     - 从音频生成可视化预览
+
+    所有ffmpeg调用都经过有界的 FFmpegWorkerPool；generate_assets 用一次
+    解码同时输出缩略图和预览。媒体信息来自共享的 MediaProbe（与其他媒体组件
+    共用按文件版本缓存的ffprobe结果），并随结果返回供后续的向量化阶段复用。
     """
-    
-    def __init__(self, config: Optional[Dict[str, Any]] = None):
+
+    def __init__(self, config: Optional[Dict[str, Any]] = None,
+                 pool: Optional[FFmpegWorkerPool] = None,
+                 media_probe: Optional[Any] = None):
         """
         初始化预览生成器
         
@@ -39,6 +50,12 @@ class PreviewGenerator:
                 - height: 预览高度（默认240）
                 - duration: 预览时长（秒，默认10）
                 - fps: 预览帧率（默认10）
+                - thumbnail_size: 缩略图最大边长（默认256）
+                - max_workers: 最大并发ffmpeg进程数（设置时使用独立的工作池，
+                  否则使用进程内共享的工作池）
+            pool: FFmpeg工作池（可选）
+            media_probe: 媒体探测服务（可选，提供probe(path)方法），
+                默认使用全局共享实例
         """
         if config is None:
             config = {}
@@ -54,7 +71,30 @@ class PreviewGenerator:
         self.height = config.get('height', config.get('preview_height', 240))
         self.duration = config.get('duration', config.get('preview_duration', 10))
         self.fps = config.get('fps', config.get('preview_fps', 10))
+        self.thumbnail_size = config.get('thumbnail_size', 256)
         self.temp_dir = None
+
+        # 有界ffmpeg工作池，默认与缩略图服务共享
+        if pool is None:
+            max_workers = config.get('max_workers')
+            pool = FFmpegWorkerPool(max_workers=max_workers) if max_workers else get_ffmpeg_pool()
+        self.pool = pool
+
+        if media_probe is None:
+            from src.services.media.media_probe import get_media_probe
+
+            media_probe = get_media_probe()
+        self.media_probe = media_probe
+
+        # 批量提交时在后台线程中获取媒体信息，提交方不必等待ffprobe
+        self._probe_executor: Optional[ThreadPoolExecutor] = None
+
+        # 未完成文件的当前优先级、未完成的提交数和工作池任务key，
+        # 用于两阶段任务（probe -> 生成）之间传递优先级调整；工作线程的回调也会修改
+        self._priorities: Dict[str, int] = {}
+        self._inflight: Dict[str, int] = {}
+        self._asset_keys: Dict[str, set] = {}
+        self._priority_lock = threading.Lock()
         
         if self.output_dir is None:
             self.temp_dir = tempfile.TemporaryDirectory()
@@ -160,8 +200,6 @@ class PreviewGenerator:
             preview_path = os.path.join(self.output_dir, preview_filename)
             
             # 使用ffmpeg生成预览
-            import subprocess
-            
             cmd = [
                 'ffmpeg',
                 '-v', 'error',
@@ -174,7 +212,7 @@ class PreviewGenerator:
                 preview_path
             ]
             
-            result = subprocess.run(cmd, capture_output=True, text=True)
+            result = self.pool.run(cmd)
             
             if result.returncode != 0:
                 raise RuntimeError(f"ffmpeg生成预览失败: {result.stderr}")
@@ -214,8 +252,6 @@ class PreviewGenerator:
             preview_path = os.path.join(self.output_dir, preview_filename)
             
             # 使用ffmpeg生成预览
-            import subprocess
-            
             cmd = [
                 'ffmpeg',
                 '-v', 'error',
@@ -227,7 +263,7 @@ class PreviewGenerator:
                 preview_path
             ]
             
-            result = subprocess.run(cmd, capture_output=True, text=True)
+            result = self.pool.run(cmd)
             
             if result.returncode != 0:
                 raise RuntimeError(f"ffmpeg生成预览失败: {result.stderr}")
@@ -258,8 +294,6 @@ class PreviewGenerator:
             preview_path = os.path.join(self.output_dir, preview_filename)
             
             # 使用ffmpeg生成预览（音频可视化）
-            import subprocess
-            
             cmd = [
                 'ffmpeg',
                 '-v', 'error',
@@ -272,7 +306,7 @@ class PreviewGenerator:
                 preview_path
             ]
             
-            result = subprocess.run(cmd, capture_output=True, text=True)
+            result = self.pool.run(cmd)
             
             if result.returncode != 0:
                 raise RuntimeError(f"ffmpeg生成预览失败: {result.stderr}")
@@ -296,26 +330,334 @@ class PreviewGenerator:
             视频时长（秒）
         """
         try:
-            import subprocess
-            
-            result = subprocess.run(
-                ['ffprobe', '-v', 'error', '-show_entries',
-                 'format=duration', '-of', 'default=noprint_wrappers=1:nokey=1',
-                 video_path],
-                capture_output=True, text=True
-            )
-            
-            if result.returncode != 0:
-                raise RuntimeError(f"无法获取视频时长: {result.stderr}")
-            
-            duration = float(result.stdout.strip())
-            
+            duration = self.probe(video_path).get('duration')
+            if duration is None:
+                raise RuntimeError("无法获取视频时长")
             return duration
             
         except Exception as e:
             logger.error(f"获取视频时长失败: {video_path}, 错误: {e}")
             raise
     
+    def probe(self, media_path: str) -> Dict[str, Any]:
+        """
+        获取媒体信息（每个文件版本只执行一次ffprobe，结果由MediaProbe缓存）
+
+        Args:
+            media_path: 媒体文件路径
+
+        Returns:
+            媒体信息字典：duration, width, height, fps, video_codec, has_video, has_audio
+        """
+        info = self.media_probe.probe(media_path)
+        if info is None:
+            raise RuntimeError(f"ffprobe失败: {media_path}")
+        return info
+
+    def _get_probe_executor(self) -> ThreadPoolExecutor:
+        if self._probe_executor is None:
+            self._probe_executor = ThreadPoolExecutor(
+                max_workers=self.pool.max_workers, thread_name_prefix="preview-probe")
+        return self._probe_executor
+
+    def _asset_paths(self, media_path: str, file_type: str,
+                     output_format: str) -> Tuple[str, str]:
+        """生成缩略图和预览的输出路径（按完整路径哈希区分同名文件）"""
+        name = os.path.splitext(os.path.basename(media_path))[0]
+        path_hash = hashlib.md5(os.path.abspath(media_path).encode()).hexdigest()[:8]
+        thumb_ext = 'png' if file_type == 'audio' else 'jpg'
+        return (os.path.join(self.output_dir, f"{name}_{path_hash}_thumb.{thumb_ext}"),
+                os.path.join(self.output_dir, f"{name}_{path_hash}_preview.{output_format}"))
+
+    def get_asset_paths(self, media_path: str, output_format: str = 'mp4') -> Tuple[str, str]:
+        """
+        获取submit_assets生成的缩略图和预览的输出路径
+
+        Args:
+            media_path: 媒体文件路径
+            output_format: 预览输出格式
+
+        Returns:
+            (缩略图路径, 预览路径)
+        """
+        return self._asset_paths(media_path, self._get_file_type(media_path), output_format)
+
+    def _build_assets_cmd(self, media_path: str, file_type: str, probe: Dict[str, Any],
+                          thumbnail_path: Optional[str], preview_path: Optional[str]) -> List[str]:
+        """
+        构建一次解码、多路输出的ffmpeg命令
+
+        Args:
+            media_path: 媒体文件路径
+            file_type: 文件类型（image/video/audio）
+            probe: 媒体信息
+            thumbnail_path: 缩略图输出路径（None表示不生成）
+            preview_path: 预览输出路径（None表示不生成）
+
+        Returns:
+            命令参数列表
+        """
+        size = self.thumbnail_size
+        thumb_scale = f"scale={size}:{size}:force_original_aspect_ratio=decrease"
+        preview_scale = f"scale={self.width}:{self.height}"
+        duration = probe.get('duration') or 0
+        cmd = ['ffmpeg', '-v', 'error', '-y']
+
+        if file_type == 'video':
+            # 缩略图取10%处的帧（最多第5秒），避开片头黑场
+            thumb_time = min(duration * 0.1, 5.0) if duration else 0.0
+            if preview_path is None:
+                # 只要缩略图时直接在输入端seek，无需完整解码
+                return cmd + ['-ss', f"{thumb_time:.3f}", '-i', media_path,
+                              '-vf', thumb_scale, '-frames:v', '1', '-q:v', '3',
+                              thumbnail_path]
+
+            speed = max(duration / self.duration, 1) if self.duration > 0 and duration else 1
+            preview_filter = f"{preview_scale},setpts={1/speed}*PTS"
+            if thumbnail_path is None:
+                return cmd + ['-i', media_path, '-vf', preview_filter,
+                              '-an', '-r', str(self.fps), '-t', str(self.duration),
+                              preview_path]
+
+            graph = (f"[0:v]split=2[t][p];"
+                     f"[t]trim=start={thumb_time:.3f},setpts=PTS-STARTPTS,{thumb_scale}[tout];"
+                     f"[p]{preview_filter}[pout]")
+            return cmd + ['-i', media_path, '-filter_complex', graph,
+                          '-map', '[tout]', '-frames:v', '1', '-q:v', '3', thumbnail_path,
+                          '-map', '[pout]', '-an', '-r', str(self.fps),
+                          '-t', str(self.duration), preview_path]
+
+        if file_type == 'image':
+            if preview_path is None:
+                return cmd + ['-i', media_path, '-vf', thumb_scale,
+                              '-frames:v', '1', '-q:v', '3', thumbnail_path]
+            graph = f"[0:v]split=2[t][p];[t]{thumb_scale}[tout];[p]{preview_scale}[pout]"
+            outputs = ['-map', '[pout]', '-t', str(self.duration), '-r', str(self.fps),
+                       preview_path]
+            if thumbnail_path is None:
+                graph = f"[0:v]{preview_scale}[pout]"
+            else:
+                outputs = ['-map', '[tout]', '-frames:v', '1', '-q:v', '3',
+                           thumbnail_path] + outputs
+            return cmd + ['-loop', '1', '-i', media_path, '-filter_complex', graph] + outputs
+
+        if file_type == 'audio':
+            wave = f"showwavespic=s={self.width}x{self.height}:colors=blue"
+            if thumbnail_path is None or preview_path is None:
+                target = thumbnail_path or preview_path
+                return cmd + ['-i', media_path, '-t', str(self.duration),
+                              '-filter_complex', f"[0:a]{wave}[w]", '-map', '[w]',
+                              '-frames:v', '1', target]
+            graph = f"[0:a]{wave},split=2[w1][w2]"
+            return cmd + ['-i', media_path, '-t', str(self.duration),
+                          '-filter_complex', graph,
+                          '-map', '[w1]', '-frames:v', '1', thumbnail_path,
+                          '-map', '[w2]', '-r', str(self.fps), preview_path]
+
+        raise ValueError(f"不支持的文件类型: {file_type}")
+
+    def submit_assets(self, media_path: str, thumbnail: bool = True, preview: bool = True,
+                      probe: Optional[Dict[str, Any]] = None, output_format: str = 'mp4',
+                      priority: int = PRIORITY_BACKGROUND) -> Future:
+        """
+        异步生成缩略图和预览（一次解码，多路输出）
+
+        未提供媒体信息时先在后台线程中获取（MediaProbe缓存命中时不执行ffprobe），
+        再把生成命令按优先级提交到工作池；排队期间可以通过 prioritize 提升优先级。
+
+        Args:
+            media_path: 媒体文件路径
+            thumbnail: 是否生成缩略图
+            preview: 是否生成预览
+            probe: 已有的媒体信息（例如索引阶段的probe结果）
+            output_format: 预览输出格式
+            priority: 优先级（数值越小越先执行）
+
+        Returns:
+            Future，结果为字典：thumbnail_path, preview_path, width, height, duration, probe
+        """
+        if not media_path:
+            raise ValueError("媒体路径不能为空")
+        if not os.path.exists(media_path):
+            raise FileNotFoundError(f"媒体文件不存在: {media_path}")
+        if output_format not in ['mp4', 'webm', 'avi']:
+            raise ValueError(f"不支持的输出格式: {output_format}")
+
+        file_type = self._get_file_type(media_path)
+        if file_type == 'unknown':
+            raise ValueError(f"不支持的文件类型: {file_type}")
+
+        abs_path = os.path.abspath(media_path)
+        self._track(abs_path, priority)
+        outer: Future = Future()
+
+        def _generate(media_info: Dict[str, Any]) -> None:
+            thumbnail_path, preview_path = self._asset_paths(media_path, file_type, output_format)
+            thumbnail_path = thumbnail_path if thumbnail else None
+            preview_path = preview_path if preview else None
+            cmd = self._build_assets_cmd(media_path, file_type, media_info,
+                                         thumbnail_path, preview_path)
+            # key包含输出路径：只要缩略图的任务不能被合并给同时要预览的请求
+            key = self._assets_key(thumbnail_path, preview_path)
+            with self._priority_lock:
+                self._asset_keys.setdefault(abs_path, set()).add(key)
+                current = self._priorities.get(abs_path, priority)
+            inner = self.pool.submit(cmd, current, key=key)
+
+            def _done(f: Future) -> None:
+                self._untrack(abs_path, key)
+                try:
+                    result = f.result()
+                    if result.returncode != 0:
+                        raise RuntimeError(f"ffmpeg生成失败: {result.stderr}")
+                    outer.set_result({
+                        'thumbnail_path': thumbnail_path,
+                        'preview_path': preview_path,
+                        'width': self.width,
+                        'height': self.height,
+                        'duration': self.duration,
+                        'probe': media_info,
+                    })
+                except Exception as e:
+                    logger.error(f"生成缩略图/预览失败: {media_path}, 错误: {e}")
+                    outer.set_exception(e)
+
+            inner.add_done_callback(_done)
+
+        if probe is not None or file_type == 'image':
+            _generate(probe or {})
+            return outer
+
+        probe_future = self._get_probe_executor().submit(self.probe, media_path)
+
+        def _probed(f: Future) -> None:
+            try:
+                _generate(f.result())
+            except Exception as e:
+                self._untrack(abs_path)
+                logger.error(f"获取媒体信息失败: {media_path}, 错误: {e}")
+                outer.set_exception(e)
+
+        probe_future.add_done_callback(_probed)
+        return outer
+
+    def generate_assets(self, media_path: str, thumbnail: bool = True, preview: bool = True,
+                        probe: Optional[Dict[str, Any]] = None, output_format: str = 'mp4',
+                        priority: int = PRIORITY_DEFAULT) -> Optional[Dict[str, Any]]:
+        """
+        同步生成缩略图和预览（一次解码，多路输出）
+
+        Args:
+            media_path: 媒体文件路径
+            thumbnail: 是否生成缩略图
+            preview: 是否生成预览
+            probe: 已有的媒体信息
+            output_format: 预览输出格式
+            priority: 优先级
+
+        Returns:
+            生成结果字典，失败时返回None
+        """
+        try:
+            return self.submit_assets(media_path, thumbnail, preview, probe,
+                                      output_format, priority).result()
+        except (ValueError, FileNotFoundError):
+            raise
+        except Exception:
+            return None
+
+    def generate_batch(self, media_paths: Iterable[str], thumbnail: bool = True,
+                       preview: bool = True, probes: Optional[Dict[str, Dict[str, Any]]] = None,
+                       output_format: str = 'mp4',
+                       priority: int = PRIORITY_BACKGROUND) -> Dict[str, Optional[Dict[str, Any]]]:
+        """
+        批量生成缩略图和预览
+
+        所有文件一次性提交到工作池，由工作池控制并发；处理过程中可通过
+        prioritize 让可见的检索结果先完成。
+
+        Args:
+            media_paths: 媒体文件路径列表
+            thumbnail: 是否生成缩略图
+            preview: 是否生成预览
+            probes: 已有的媒体信息，键为文件路径
+            output_format: 预览输出格式
+            priority: 优先级
+
+        Returns:
+            文件路径 -> 生成结果（失败为None）
+        """
+        probes = probes or {}
+        futures: Dict[str, Future] = {}
+        results: Dict[str, Optional[Dict[str, Any]]] = {}
+
+        for media_path in media_paths:
+            try:
+                futures[media_path] = self.submit_assets(
+                    media_path, thumbnail, preview, probes.get(media_path),
+                    output_format, priority)
+            except Exception as e:
+                logger.warning(f"跳过无法生成的文件: {media_path}, {e}")
+                results[media_path] = None
+
+        for media_path, future in futures.items():
+            try:
+                results[media_path] = future.result()
+            except Exception:
+                results[media_path] = None
+
+        succeeded = sum(1 for r in results.values() if r)
+        logger.info(f"批量生成完成: {succeeded}/{len(results)} 个文件成功")
+        return results
+
+    def prioritize(self, media_paths: Iterable[str], priority: int = PRIORITY_VISIBLE) -> int:
+        """
+        提升尚未完成文件的生成优先级（例如检索结果进入可见区域时）
+
+        Args:
+            media_paths: 媒体文件路径列表
+            priority: 新优先级
+
+        Returns:
+            被调整的任务数量
+        """
+        adjusted = 0
+        for media_path in media_paths:
+            abs_path = os.path.abspath(media_path)
+            with self._priority_lock:
+                if abs_path not in self._priorities:
+                    continue
+                self._priorities[abs_path] = priority
+                keys = list(self._asset_keys.get(abs_path, ()))
+            for key in keys:
+                if self.pool.reprioritize(key, priority):
+                    adjusted += 1
+        return adjusted
+
+    @staticmethod
+    def _assets_key(thumbnail_path: Optional[str], preview_path: Optional[str]) -> str:
+        """工作池任务key：同一组输出的生成请求才会被合并"""
+        return f"assets:{thumbnail_path or ''}|{preview_path or ''}"
+
+    def _track(self, abs_path: str, priority: int) -> None:
+        """登记一次未完成的提交，同一文件取最高的优先级"""
+        with self._priority_lock:
+            self._priorities[abs_path] = min(priority, self._priorities.get(abs_path, priority))
+            self._inflight[abs_path] = self._inflight.get(abs_path, 0) + 1
+
+    def _untrack(self, abs_path: str, key: Optional[str] = None) -> None:
+        """一次提交结束，文件没有其他未完成的提交时清除优先级记录"""
+        with self._priority_lock:
+            remaining = self._inflight.get(abs_path, 1) - 1
+            if remaining > 0:
+                self._inflight[abs_path] = remaining
+                if key is not None:
+                    self._asset_keys.get(abs_path, set()).discard(key)
+                return
+            self._inflight.pop(abs_path, None)
+            self._priorities.pop(abs_path, None)
+            self._asset_keys.pop(abs_path, None)
+
     def generate_from_frames(self, frames: List[str],
                            output_format: str = 'mp4') -> Optional[Tuple[str, int, int, int]]:
         """
@@ -351,8 +693,6 @@ class PreviewGenerator:
             preview_path = os.path.join(self.output_dir, preview_filename)
             
             # 使用ffmpeg生成预览
-            import subprocess
-            
             cmd = [
                 'ffmpeg',
                 '-v', 'error',
@@ -365,7 +705,7 @@ class PreviewGenerator:
                 preview_path
             ]
             
-            result = subprocess.run(cmd, capture_output=True, text=True)
+            result = self.pool.run(cmd)
             
             # 清理临时文件
             os.unlink(filelist_path)
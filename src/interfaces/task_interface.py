@@ -6,7 +6,7 @@
 """
 
 from abc import ABC, abstractmethod
-from typing import Any, Dict, List, Optional, Callable
+from typing import Any, Dict, List, Optional, Callable, Set
 
 
 class TaskManagerInterface(ABC):
@@ -128,15 +128,30 @@ class TaskSchedulerInterface(ABC):
         pass
 
     @abstractmethod
-    def dequeue_task(self) -> Optional[Any]:
+    def dequeue_task(self, exclude_types: Optional[Set[str]] = None) -> Optional[Any]:
         """
         从队列取出任务
 
+        Args:
+            exclude_types: 跳过的任务类型，这些任务留在队列中
+
         Returns:
             任务对象，如果队列为空返回None
         """
         pass
 
+    def requeue_task(self, task: Any) -> bool:
+        """
+        把已出队但暂时无法执行的任务放回队列（默认按入队处理）
+
+        Args:
+            task: 任务对象
+
+        Returns:
+            是否成功放回
+        """
+        return self.enqueue_task(task)
+
     @abstractmethod
     def get_queue_size(self) -> int:
         """
@@ -127,10 +127,13 @@ class MSearchApplication:
             # 5. 初始化API服务器
             logger.info("初始化API服务器...")
             # 使用create_api_server工厂函数创建API服务器（async函数）
+            # 向量库和模型在端口绑定后于后台加载，/health可以立即响应
             import asyncio
 
             async def _create_server():
-                return await create_api_server("config/config.yml")
+                return await create_api_server(
+                    "config/config.yml", warm_up_in_background=True
+                )
 
             loop = asyncio.new_event_loop()
             asyncio.set_event_loop(loop)
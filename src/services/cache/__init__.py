@@ -4,5 +4,13 @@
 """
 
 from .cache_manager import CacheManager, CacheConfig, get_cache_key
+from .content_store import ContentAddressedStore
+from .admission import TinyLFUAdmission
 
-__all__ = ["CacheManager", "CacheConfig", "get_cache_key"]
+__all__ = [
+    "CacheManager",
+    "CacheConfig",
+    "get_cache_key",
+    "ContentAddressedStore",
+    "TinyLFUAdmission",
+]
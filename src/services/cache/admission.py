@@ -0,0 +1,114 @@
+"""
+缓存准入策略
+基于TinyLFU的频率估计，避免一次性访问的数据挤掉高频数据
+"""
+
+import threading
+from typing import List
+
+# 计数器上限（4位计数器）
+_MAX_COUNT = 15
+
+# 计数器减半查找表，用于bytes.translate批量衰减
+_HALVE_TABLE = bytes(i >> 1 for i in range(256))
+
+
+class TinyLFUAdmission:
+    """
+    TinyLFU准入策略
+
+    使用Count-Min Sketch近似统计每个键的访问频率，并用doorkeeper过滤只出现
+    一次的键。每记录sample_size次访问后所有计数减半，使频率随时间衰减。
+    新数据只有在估计频率不低于被淘汰数据时才会被接纳。
+    """
+
+    def __init__(self, sample_size: int = 100000, depth: int = 4):
+        """
+        初始化准入策略
+
+        Args:
+            sample_size: 衰减周期（访问次数），同时决定sketch宽度
+            depth: sketch的哈希行数
+        """
+        width = 1
+        while width < max(sample_size, 16):
+            width <<= 1
+
+        self.sample_size = sample_size
+        self._mask = width - 1
+        self._depth = depth
+        self._table: List[bytearray] = [bytearray(width) for _ in range(depth)]
+        self._doorkeeper: set = set()
+        self._additions = 0
+        self._lock = threading.Lock()
+
+        self.admitted_count = 0
+        self.rejected_count = 0
+
+    def _indexes(self, key: str) -> List[int]:
+        h = hash(key)
+        h1 = h & 0xFFFFFFFF
+        h2 = ((h >> 32) & 0xFFFFFFFF) | 1
+        return [(h1 + i * h2) & self._mask for i in range(self._depth)]
+
+    def record(self, key: str) -> None:
+        """
+        记录一次访问
+
+        Args:
+            key: 缓存键
+        """
+        with self._lock:
+            if key not in self._doorkeeper:
+                self._doorkeeper.add(key)
+            else:
+                # 保守更新：只增加当前最小的计数器
+                indexes = self._indexes(key)
+                counts = [row[i] for row, i in zip(self._table, indexes)]
+                current = min(counts)
+                if current < _MAX_COUNT:
+                    for row, i, count in zip(self._table, indexes, counts):
+                        if count == current:
+                            row[i] = current + 1
+
+            self._additions += 1
+            if self._additions >= self.sample_size:
+                self._reset()
+
+    def _reset(self) -> None:
+        """衰减所有计数器（调用方需持有锁）"""
+        self._table = [bytearray(row.translate(_HALVE_TABLE)) for row in self._table]
+        self._doorkeeper.clear()
+        self._additions //= 2
+
+    def estimate(self, key: str) -> int:
+        """
+        估计键的访问频率
+
+        Args:
+            key: 缓存键
+
+        Returns:
+            估计频率
+        """
+        with self._lock:
+            count = min(row[i] for row, i in zip(self._table, self._indexes(key)))
+            return count + (1 if key in self._doorkeeper else 0)
+
+    def admit(self, candidate: str, victim: str) -> bool:
+        """
+        判断候选键是否可以替换被淘汰键
+
+        Args:
+            candidate: 候选缓存键
+            victim: 将被淘汰的缓存键
+
+        Returns:
+            是否接纳候选键
+        """
+        admitted = self.estimate(candidate) >= self.estimate(victim)
+        if admitted:
+            self.admitted_count += 1
+        else:
+            self.rejected_count += 1
+        return admitted
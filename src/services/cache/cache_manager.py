@@ -1,11 +1,17 @@
 """
 缓存管理器
 提供可配置的缓存策略，支持热冷数据分离和自动清理
+
+缓存分两层：L1为进程内对象缓存，L2为磁盘上的内容寻址存储。
+所有缓存类型共享一个全局字节预算，并受各自的类型配额约束；
+新数据是否准入由TinyLFU频率估计决定。
 """
 
 import os
 import json
+import pickle
 import time
+import shutil
 import hashlib
 import threading
 import logging
@@ -14,8 +20,24 @@ from pathlib import Path
 from dataclasses import dataclass, field
 from collections import OrderedDict
 
+from src.core.utils.metrics import get_metrics_registry
+
+from .admission import TinyLFUAdmission
+from .content_store import ContentAddressedStore
+
 logger = logging.getLogger(__name__)
 
+# 支持的缓存类型
+CACHE_TYPES = (
+    "vectors",
+    "thumbnails",
+    "previews",
+    "metadata",
+    "search_results",
+    "models",
+    "preprocessing",
+)
+
 
 @dataclass
 class CacheTypeConfig:
@@ -27,6 +49,7 @@ class CacheTypeConfig:
     hot_data_threshold: int = 10  # 热数据访问次数阈值
     hot_data_ttl: int = 86400  # 热数据有效期（秒）
     cold_data_ttl: int = 604800  # 冷数据有效期（秒）
+    persist: bool = True  # 是否写入L2磁盘存储
 
     # 扩展配置字段
     image_quality: int = 85  # 缩略图质量
@@ -46,6 +69,11 @@ class CacheConfig:
     min_free_space_gb: float = 2.0  # 系统最小可用空间（GB）
     hot_data_threshold: int = 10  # 全局热数据访问次数阈值
     enable_protection: bool = True  # 全局缓存保护开关
+    disk_check_interval: float = 30.0  # 磁盘剩余空间采样间隔（秒）
+    l1_max_size_mb: float = 512.0  # L1进程内缓存大小限制（MB）
+    enable_l2: bool = True  # 启用L2磁盘内容寻址存储
+    admission_policy: str = "tinylfu"  # 准入策略：tinylfu, none
+    admission_sample_size: int = 100000  # TinyLFU频率衰减周期（访问次数）
 
     # 各缓存类型配置
     vectors: CacheTypeConfig = field(default_factory=CacheTypeConfig)
@@ -94,10 +122,14 @@ class CacheConfig:
             enable_protection=False,
             hot_data_ttl=3600,  # 1小时
             cold_data_ttl=1800,  # 30分钟
+            persist=False,
         )
 
         self.models = CacheTypeConfig(
-            max_size_gb=0.0, retention_policy="none", enable_protection=True
+            max_size_gb=0.0,
+            retention_policy="none",
+            enable_protection=True,
+            persist=False,
         )
 
         self.preprocessing = CacheTypeConfig(
@@ -119,6 +151,8 @@ class CacheEntry:
     last_accessed_at: float
     access_count: int = 0
     is_hot: bool = False
+    digest: Optional[str] = None  # L2数据块摘要，None表示仅存在于L1
+    encoding: str = "pickle"  # L2数据块编码：raw（bytes原样保存）, pickle
 
     def to_dict(self) -> Dict[str, Any]:
         """转换为字典"""
@@ -129,11 +163,329 @@ class CacheEntry:
             "last_accessed_at": self.last_accessed_at,
             "access_count": self.access_count,
             "is_hot": self.is_hot,
+            "digest": self.digest,
+            "encoding": self.encoding,
+        }
+
+
+class _InstrumentedLock:
+    """
+    带竞争统计的可重入锁
+
+    先尝试非阻塞获取，失败时才计为一次竞争并统计等待时间，
+    无竞争路径上的额外开销只有一次 acquire 调用。
+    """
+
+    __slots__ = ("_lock", "acquisitions", "contentions", "wait_time")
+
+    def __init__(self):
+        self._lock = threading.RLock()
+        self.acquisitions = 0
+        self.contentions = 0
+        self.wait_time = 0.0
+
+    def __enter__(self) -> "_InstrumentedLock":
+        if not self._lock.acquire(blocking=False):
+            start = time.perf_counter()
+            self._lock.acquire()
+            self.contentions += 1
+            self.wait_time += time.perf_counter() - start
+        self.acquisitions += 1
+        return self
+
+    def __exit__(self, exc_type, exc, tb) -> None:
+        self._lock.release()
+
+    def get_stats(self) -> Dict[str, Any]:
+        """获取锁竞争统计"""
+        return {
+            "acquisitions": self.acquisitions,
+            "contentions": self.contentions,
+            "contention_rate": (
+                self.contentions / self.acquisitions if self.acquisitions else 0.0
+            ),
+            "wait_time_ms": self.wait_time * 1000,
         }
 
 
+class _OrderIndex:
+    """
+    按顺序淘汰的索引（LRU/FIFO/TTL）
+
+    基于 OrderedDict，插入、访问、删除和选取淘汰项均为 O(1)。
+    """
+
+    def __init__(self, move_on_access: bool):
+        self._order: "OrderedDict[str, None]" = OrderedDict()
+        self._move_on_access = move_on_access
+
+    def __len__(self) -> int:
+        return len(self._order)
+
+    def add(self, key: str, entry: CacheEntry) -> None:
+        self._order[key] = None
+
+    def touch(self, key: str, entry: CacheEntry) -> None:
+        if self._move_on_access and key in self._order:
+            self._order.move_to_end(key)
+
+    def remove(self, key: str, entry: CacheEntry) -> None:
+        self._order.pop(key, None)
+
+    def victim(self) -> Optional[str]:
+        return next(iter(self._order), None)
+
+
+class _LFUIndex:
+    """
+    按访问频率淘汰的索引（LFU）
+
+    每个访问次数对应一个有序桶，桶内按 LRU 排序；
+    访问时把键移动到下一个桶，选取淘汰项时直接取最小频率桶的队首。
+    """
+
+    def __init__(self):
+        self._buckets: Dict[int, "OrderedDict[str, None]"] = {}
+        self._min_count = 0
+        self._size = 0
+
+    def __len__(self) -> int:
+        return self._size
+
+    def add(self, key: str, entry: CacheEntry) -> None:
+        self._buckets.setdefault(entry.access_count, OrderedDict())[key] = None
+        if self._size == 0 or entry.access_count < self._min_count:
+            self._min_count = entry.access_count
+        self._size += 1
+
+    def touch(self, key: str, entry: CacheEntry) -> None:
+        # entry.access_count 已经递增，旧桶为 access_count - 1
+        old_count = entry.access_count - 1
+        bucket = self._buckets.get(old_count)
+        if bucket is None or key not in bucket:
+            return
+        del bucket[key]
+        if not bucket:
+            del self._buckets[old_count]
+            if self._min_count == old_count:
+                self._min_count = entry.access_count
+        self._buckets.setdefault(entry.access_count, OrderedDict())[key] = None
+
+    def remove(self, key: str, entry: CacheEntry) -> None:
+        bucket = self._buckets.get(entry.access_count)
+        if bucket is None or key not in bucket:
+            return
+        del bucket[key]
+        self._size -= 1
+        if not bucket:
+            del self._buckets[entry.access_count]
+            if self._min_count == entry.access_count and self._buckets:
+                # 只有删除最小频率桶的最后一个键时才需要重新定位
+                self._min_count = min(self._buckets)
+
+    def victim(self) -> Optional[str]:
+        if not self._size:
+            return None
+        bucket = self._buckets.get(self._min_count)
+        if bucket is None:
+            self._min_count = min(self._buckets)
+            bucket = self._buckets[self._min_count]
+        return next(iter(bucket))
+
+
+class _CacheSegment:
+    """
+    单一缓存类型的存储分片
+
+    每个分片拥有独立的锁、条目表和淘汰索引。受保护的键从淘汰索引中移出，
+    单独放在 protected 有序表中，因此选取淘汰项时无需跳过受保护条目。
+    值驻留在L1的条目另外记录在 resident 有序表中（按最近访问排序），
+    用于L1内存不足时把值降级到L2。
+    """
+
+    def __init__(self, name: str, retention_policy: str):
+        self.name = name
+        self.retention_policy = retention_policy
+        self.lock = _InstrumentedLock()
+        self.entries: Dict[str, CacheEntry] = {}
+        self.protected: "OrderedDict[str, None]" = OrderedDict()
+        self.resident: "OrderedDict[str, None]" = OrderedDict()
+        if retention_policy == "lfu":
+            self.index = _LFUIndex()
+        else:
+            self.index = _OrderIndex(move_on_access=retention_policy == "lru")
+
+        self.size_bytes = 0
+        self.resident_bytes = 0
+        self.hit_count = 0
+        self.l2_hit_count = 0
+        self.miss_count = 0
+        self.eviction_count = 0
+
+    def __len__(self) -> int:
+        return len(self.entries)
+
+    def add(self, entry: CacheEntry) -> None:
+        self.entries[entry.key] = entry
+        self.index.add(entry.key, entry)
+        self.size_bytes += entry.size_bytes
+        if entry.value is not None:
+            self.resident[entry.key] = None
+            self.resident_bytes += entry.size_bytes
+
+    def remove(self, key: str) -> Optional[CacheEntry]:
+        entry = self.entries.pop(key, None)
+        if entry is None:
+            return None
+        if key in self.protected:
+            del self.protected[key]
+        else:
+            self.index.remove(key, entry)
+        if key in self.resident:
+            del self.resident[key]
+            self.resident_bytes -= entry.size_bytes
+        self.size_bytes -= entry.size_bytes
+        return entry
+
+    def touch(self, key: str, entry: CacheEntry) -> None:
+        entry.last_accessed_at = time.time()
+        entry.access_count += 1
+        if key in self.resident:
+            self.resident.move_to_end(key)
+        if key in self.protected:
+            return
+        self.index.touch(key, entry)
+
+    def load_value(self, key: str, value: Any) -> None:
+        """把从L2读取的值放回L1"""
+        entry = self.entries[key]
+        entry.value = value
+        if key not in self.resident:
+            self.resident[key] = None
+            self.resident_bytes += entry.size_bytes
+
+    def drop_value(self, key: str) -> None:
+        """从L1释放值，条目仍保留在L2"""
+        entry = self.entries[key]
+        entry.value = None
+        if key in self.resident:
+            del self.resident[key]
+            self.resident_bytes -= entry.size_bytes
+
+    def l1_victim(self) -> Optional[str]:
+        """L1中最久未访问的条目"""
+        return next(iter(self.resident), None)
+
+    def protect(self, key: str) -> bool:
+        entry = self.entries.get(key)
+        if entry is None:
+            return False
+        entry.is_hot = True
+        if key not in self.protected:
+            self.index.remove(key, entry)
+            self.protected[key] = None
+        return True
+
+    def unprotect(self, key: str) -> bool:
+        entry = self.entries.get(key)
+        if entry is None:
+            return False
+        entry.is_hot = False
+        if key in self.protected:
+            del self.protected[key]
+            self.index.add(key, entry)
+        return True
+
+    def victim(self, allow_protected: bool = False) -> Optional[str]:
+        key = self.index.victim()
+        if key is None and allow_protected:
+            key = next(iter(self.protected), None)
+        return key
+
+    def clear(self) -> List[CacheEntry]:
+        removed = list(self.entries.values())
+        self.entries.clear()
+        self.protected.clear()
+        self.resident.clear()
+        if self.retention_policy == "lfu":
+            self.index = _LFUIndex()
+        else:
+            self.index = _OrderIndex(move_on_access=self.retention_policy == "lru")
+        self.size_bytes = 0
+        self.resident_bytes = 0
+        return removed
+
+
+class _ByteBudget:
+    """
+    全局字节预算
+
+    以计数器维护所有分片的总占用；磁盘剩余空间按时间间隔或累计写入量
+    才重新采样一次，避免在每次 set 时调用 statvfs。
+    """
+
+    def __init__(
+        self,
+        max_bytes: float,
+        cache_dir: Path,
+        min_free_bytes: float,
+        disk_check_interval: float,
+    ):
+        self.max_bytes = max_bytes
+        self.cache_dir = cache_dir
+        self.min_free_bytes = min_free_bytes
+        self.disk_check_interval = disk_check_interval
+        self._lock = threading.Lock()
+        self.used_bytes = 0
+
+        self._free_bytes: Optional[int] = None
+        self._last_disk_check = 0.0
+        self._bytes_since_check = 0
+        self.disk_check_count = 0
+
+    def add(self, delta: int) -> None:
+        with self._lock:
+            self.used_bytes += delta
+            if delta > 0:
+                self._bytes_since_check += delta
+
+    def over_by(self, extra: int = 0) -> float:
+        return self.used_bytes + extra - self.max_bytes
+
+    def disk_low(self) -> bool:
+        """磁盘剩余空间是否低于阈值（使用缓存的采样结果）"""
+        now = time.monotonic()
+        with self._lock:
+            stale = (
+                self._free_bytes is None
+                or now - self._last_disk_check >= self.disk_check_interval
+                # 自上次采样以来写入量已经可能吃掉剩余余量
+                or self._bytes_since_check
+                >= max(self._free_bytes - self.min_free_bytes, 0)
+            )
+            if stale:
+                try:
+                    self._free_bytes = shutil.disk_usage(self.cache_dir).free
+                except OSError:
+                    self._free_bytes = None
+                self._last_disk_check = now
+                self._bytes_since_check = 0
+                self.disk_check_count += 1
+            free_bytes = self._free_bytes
+        return free_bytes is not None and free_bytes < self.min_free_bytes
+
+
 class CacheManager:
-    """缓存管理器"""
+    """
+    缓存管理器
+
+    每种缓存类型是一个独立加锁的分片，互不阻塞；淘汰项选取为 O(1)，
+    全局大小由字节预算统一核算。跨分片淘汰时每次只持有一把分片锁，
+    不会出现嵌套加锁。
+
+    全局预算和类型配额按逻辑条目计算（无论值位于L1还是L2）；L1只是其中
+    的热数据子集，受 l1_max_size_mb 限制，超出时把值降级到L2。
+    """
 
     def __init__(self, config: CacheConfig, cache_dir: Optional[str] = None):
         """
@@ -147,47 +499,39 @@ class CacheManager:
         self.cache_dir = Path(cache_dir) if cache_dir else Path("data/cache")
         self.cache_dir.mkdir(parents=True, exist_ok=True)
 
-        # 缓存存储 - 按类型分类
-        self.caches: Dict[str, OrderedDict[str, CacheEntry]] = {
-            "vectors": OrderedDict(),
-            "thumbnails": OrderedDict(),
-            "previews": OrderedDict(),
-            "metadata": OrderedDict(),
-            "search_results": OrderedDict(),
-            "models": OrderedDict(),
-            "preprocessing": OrderedDict(),
+        # 缓存存储 - 按类型分片
+        self.segments: Dict[str, _CacheSegment] = {
+            cache_type: _CacheSegment(
+                cache_type, self._get_retention_policy(cache_type)
+            )
+            for cache_type in CACHE_TYPES
         }
-        self.cache_lock = threading.RLock()
 
-        # 统计信息 - 按类型分类
-        self.total_size_bytes = 0
-        self.hit_count = 0
-        self.miss_count = 0
-        self.eviction_count = 0
-        self.type_size_bytes: Dict[str, int] = {
-            "vectors": 0,
-            "thumbnails": 0,
-            "previews": 0,
-            "metadata": 0,
-            "search_results": 0,
-            "models": 0,
-            "preprocessing": 0,
-        }
+        # 全局字节预算
+        self.budget = _ByteBudget(
+            max_bytes=config.max_size_gb * 1024**3,
+            cache_dir=self.cache_dir,
+            min_free_bytes=config.min_free_space_gb * 1024**3,
+            disk_check_interval=config.disk_check_interval,
+        )
+        self.l1_max_bytes = config.l1_max_size_mb * 1024**2
+
+        # L2内容寻址存储
+        self.store: Optional[ContentAddressedStore] = (
+            ContentAddressedStore(self.cache_dir) if config.enable_l2 else None
+        )
+
+        # 准入策略
+        self.admission: Optional[TinyLFUAdmission] = (
+            TinyLFUAdmission(sample_size=config.admission_sample_size)
+            if config.admission_policy == "tinylfu"
+            else None
+        )
 
         # 控制线程
         self.is_running = False
         self.cleanup_thread: Optional[threading.Thread] = None
-
-        # 缓存保护
-        self.protected_keys: Dict[str, set[str]] = {
-            "vectors": set(),
-            "thumbnails": set(),
-            "previews": set(),
-            "metadata": set(),
-            "search_results": set(),
-            "models": set(),
-            "preprocessing": set(),
-        }
+        self._stop_event = threading.Event()
 
         # 缓存保护优先级（值越高，优先级越高）
         self.protection_priority: Dict[str, int] = {
@@ -199,11 +543,32 @@ class CacheManager:
             "thumbnails": 3,
             "preprocessing": 2,
         }
+        # 跨类型淘汰顺序（优先级从低到高），只需排序一次
+        self._eviction_order: List[str] = sorted(
+            self.segments, key=lambda t: self.protection_priority.get(t, 0)
+        )
+
+        # 命中统计在导出/metrics时读取
+        get_metrics_registry().register_collector(
+            f"cache_manager:{self.cache_dir}", self._collect_metrics
+        )
 
         logger.info(
-            f"缓存管理器初始化完成: max_size={config.max_size_gb}GB, policy={config.retention_policy}"
+            f"缓存管理器初始化完成: max_size={config.max_size_gb}GB, "
+            f"l1={config.l1_max_size_mb}MB, l2={config.enable_l2}, "
+            f"policy={config.retention_policy}, admission={config.admission_policy}"
         )
 
+    @property
+    def total_size_bytes(self) -> int:
+        """所有缓存类型的总大小（字节）"""
+        return self.budget.used_bytes
+
+    @property
+    def l1_size_bytes(self) -> int:
+        """L1中驻留值的总大小（字节）"""
+        return sum(segment.resident_bytes for segment in self.segments.values())
+
     def initialize(self) -> bool:
         """
         初始化缓存管理器
@@ -215,8 +580,13 @@ class CacheManager:
             # 加载现有缓存
             self._load_cache_index()
 
+            # 清理索引中不再引用的L2数据块
+            if self.store:
+                self.store.collect_garbage()
+
             # 启动清理线程
             self.is_running = True
+            self._stop_event.clear()
             self.cleanup_thread = threading.Thread(
                 target=self._cleanup_loop, daemon=True
             )
@@ -231,6 +601,7 @@ class CacheManager:
     def shutdown(self) -> None:
         """关闭缓存管理器"""
         self.is_running = False
+        self._stop_event.set()
 
         if self.cleanup_thread:
             self.cleanup_thread.join(timeout=5.0)
@@ -240,10 +611,47 @@ class CacheManager:
 
         logger.info("缓存管理器已关闭")
 
+    def _get_segment(self, cache_type: str) -> _CacheSegment:
+        """获取缓存类型对应的分片，未知类型回退到vectors"""
+        segment = self.segments.get(cache_type)
+        return segment if segment is not None else self.segments["vectors"]
+
+    def _get_type_config(self, cache_type: str) -> CacheTypeConfig:
+        """获取缓存类型配置"""
+        return getattr(self.config, cache_type, None) or self.config.vectors
+
+    def _get_retention_policy(self, cache_type: str) -> str:
+        """获取缓存类型的淘汰策略"""
+        type_config = self._get_type_config(cache_type)
+        return type_config.retention_policy or self.config.retention_policy
+
+    def _persists(self, cache_type: str) -> bool:
+        """缓存类型是否写入L2"""
+        return self.store is not None and self._get_type_config(cache_type).persist
+
+    @staticmethod
+    def _admission_key(cache_type: str, key: str) -> str:
+        return f"{cache_type}:{key}"
+
+    @staticmethod
+    def _encode(value: Any) -> tuple:
+        """把值编码为L2数据块，bytes原样保存以便直接作为文件提供"""
+        if isinstance(value, (bytes, bytearray)):
+            return bytes(value), "raw"
+        return pickle.dumps(value, protocol=pickle.HIGHEST_PROTOCOL), "pickle"
+
+    @staticmethod
+    def _decode(data: bytes, encoding: str) -> Any:
+        if encoding == "raw":
+            return data
+        return pickle.loads(data)
+
     def get(self, key: str, cache_type: str = "vectors") -> Optional[Any]:
         """
         获取缓存值
 
+        先查L1，未命中时从L2读取并按准入策略提升回L1。
+
         Args:
             key: 缓存键
             cache_type: 缓存类型
@@ -251,20 +659,21 @@ class CacheManager:
         Returns:
             缓存值，如果不存在则返回None
         """
-        with self.cache_lock:
-            cache = self.caches.get(cache_type, self.caches["vectors"])
-            entry = cache.get(key)
+        segment = self._get_segment(cache_type)
+        type_config = self._get_type_config(segment.name)
+        admission_key = self._admission_key(segment.name, key)
+        if self.admission:
+            self.admission.record(admission_key)
+
+        with segment.lock:
+            entry = segment.entries.get(key)
 
             if entry is None:
-                self.miss_count += 1
+                segment.miss_count += 1
                 return None
 
-            # 获取缓存类型配置
-            type_config = getattr(self.config, cache_type, None) or self.config.vectors
-
-            # 更新访问信息
-            entry.last_accessed_at = time.time()
-            entry.access_count += 1
+            # 更新访问信息（同时维护淘汰索引）
+            segment.touch(key, entry)
 
             # 更新热数据状态
             if self.config.enable_protection and type_config.enable_protection:
@@ -272,18 +681,43 @@ class CacheManager:
                     type_config.hot_data_threshold or self.config.hot_data_threshold
                 )
                 if entry.access_count >= threshold:
-                    entry.is_hot = True
-                    self.protected_keys[cache_type].add(key)
+                    segment.protect(key)
 
-            # 移动到末尾（LRU）
-            retention_policy = (
-                type_config.retention_policy or self.config.retention_policy
-            )
-            if retention_policy == "lru":
-                cache.move_to_end(key)
+            if entry.value is not None or entry.digest is None:
+                segment.hit_count += 1
+                return entry.value
+
+            digest, encoding = entry.digest, entry.encoding
+
+        # L1未命中，在分片锁之外读取L2
+        data = self.store.get(digest) if self.store else None
+        if data is None:
+            logger.warning(f"L2缓存数据块丢失: {key} ({segment.name})")
+            self.delete(key, segment.name)
+            with segment.lock:
+                segment.miss_count += 1
+            return None
 
-            self.hit_count += 1
-            return entry.value
+        try:
+            value = self._decode(data, encoding)
+        except Exception as e:
+            logger.warning(f"L2缓存数据解码失败: {key} ({segment.name}), {e}")
+            self.delete(key, segment.name)
+            with segment.lock:
+                segment.miss_count += 1
+            return None
+
+        promote = self._admit_to_l1(admission_key, entry.size_bytes)
+        with segment.lock:
+            segment.hit_count += 1
+            segment.l2_hit_count += 1
+            # 读取期间条目可能已被替换或淘汰
+            if promote and segment.entries.get(key) is entry and entry.value is None:
+                segment.load_value(key, value)
+
+        if promote:
+            self._ensure_l1_space()
+        return value
 
     def set(
         self,
@@ -302,67 +736,134 @@ class CacheManager:
             size_bytes: 缓存大小（字节），如果为None则自动计算
 
         Returns:
-            是否成功
+            是否成功（被准入策略拒绝时返回False）
         """
         if not self.config.enable:
             return False
 
         try:
-            # 计算大小
-            if size_bytes is None:
-                size_bytes = self._calculate_size(value)
+            segment = self._get_segment(cache_type)
+            type_config = self._get_type_config(segment.name)
+            persist = self._persists(segment.name)
 
-            with self.cache_lock:
-                cache = self.caches.get(cache_type, self.caches["vectors"])
+            payload = encoding = None
+            if persist:
+                payload, encoding = self._encode(value)
 
-                # 获取缓存类型配置
-                type_config = (
-                    getattr(self.config, cache_type, None) or self.config.vectors
+            # 计算大小
+            if size_bytes is None:
+                size_bytes = (
+                    len(payload) if payload is not None else self._calculate_size(value)
                 )
 
-                # 检查是否超过单个缓存项限制
-                max_single_size = (
-                    self.config.max_size_gb * 1024 * 1024 * 1024 / 10
-                )  # 单个缓存项不超过总大小的10%
-                if size_bytes > max_single_size:
-                    logger.warning(
-                        f"缓存项过大，跳过缓存: {key} ({size_bytes} bytes > {max_single_size} bytes)"
-                    )
-                    return False
-
-                # 检查是否已存在
-                if key in cache:
-                    # 更新现有缓存项
-                    old_entry = cache[key]
-                    self.total_size_bytes -= old_entry.size_bytes
-                    self.type_size_bytes[cache_type] -= old_entry.size_bytes
-                    del cache[key]
-
-                # 检查是否需要清理
-                self._ensure_space(size_bytes, cache_type)
+            # 检查是否超过单个缓存项限制
+            max_single_size = self.budget.max_bytes / 10  # 单个缓存项不超过总大小的10%
+            if size_bytes > max_single_size:
+                logger.warning(
+                    f"缓存项过大，跳过缓存: {key} ({size_bytes} bytes > {max_single_size} bytes)"
+                )
+                return False
+
+            # 准入检查：预算已满时，新数据频率不低于被淘汰数据才接纳
+            admission_key = self._admission_key(segment.name, key)
+            if self.admission:
+                self.admission.record(admission_key)
+                if self.budget.over_by(size_bytes) > 0:
+                    victim = self._peek_victim(segment.name)
+                    if victim and victim != (segment.name, key):
+                        if not self.admission.admit(
+                            admission_key, self._admission_key(*victim)
+                        ):
+                            logger.debug(
+                                f"准入策略拒绝缓存项: {key} ({segment.name})"
+                            )
+                            return False
+
+            # 更新现有缓存项
+            with segment.lock:
+                old_entry = segment.remove(key)
+            if old_entry:
+                self._release_entry(old_entry)
+
+            # 在分片锁之外满足全局预算，跨分片淘汰不会嵌套加锁
+            self._ensure_space(size_bytes, segment.name)
+
+            # 写入L2
+            digest = self.store.put(payload) if persist else None
+
+            with segment.lock:
+                # 在本分片内满足类型配额
+                freed = []
+                if type_config.max_size_gb > 0:
+                    max_type_size_bytes = type_config.max_size_gb * 1024**3
+                    while (segment.size_bytes + size_bytes) > max_type_size_bytes:
+                        evicted = self._evict_from_segment(segment)
+                        if evicted is None:
+                            break
+                        freed.append(evicted)
+
+                # 并发写入同一个键时，以最后一次为准
+                replaced = segment.remove(key)
+                if replaced:
+                    freed.append(replaced)
 
                 # 创建新缓存项
                 now = time.time()
-                entry = CacheEntry(
-                    key=key,
-                    value=value,
-                    size_bytes=size_bytes,
-                    created_at=now,
-                    last_accessed_at=now,
-                    access_count=0,
-                    is_hot=False,
+                segment.add(
+                    CacheEntry(
+                        key=key,
+                        value=value,
+                        size_bytes=size_bytes,
+                        created_at=now,
+                        last_accessed_at=now,
+                        access_count=0,
+                        is_hot=False,
+                        digest=digest,
+                        encoding=encoding or "pickle",
+                    )
                 )
 
-                cache[key] = entry
-                self.total_size_bytes += size_bytes
-                self.type_size_bytes[cache_type] += size_bytes
+            self.budget.add(size_bytes)
+            for evicted in freed:
+                self._release_entry(evicted)
 
-                return True
+            self._ensure_l1_space()
+            return True
 
         except Exception as e:
             logger.error(f"设置缓存失败: {e}")
             return False
 
+    def get_path(self, key: str, cache_type: str = "thumbnails") -> Optional[Path]:
+        """
+        获取bytes类型缓存值在L2中的文件路径
+
+        适合直接以文件形式提供的数据（如缩略图），无需读入内存。
+
+        Args:
+            key: 缓存键
+            cache_type: 缓存类型
+
+        Returns:
+            数据块文件路径，不存在或不是bytes类型时返回None
+        """
+        if self.store is None:
+            return None
+
+        segment = self._get_segment(cache_type)
+        if self.admission:
+            self.admission.record(self._admission_key(segment.name, key))
+
+        with segment.lock:
+            entry = segment.entries.get(key)
+            if entry is None or entry.digest is None or entry.encoding != "raw":
+                segment.miss_count += 1
+                return None
+            segment.touch(key, entry)
+            segment.hit_count += 1
+            segment.l2_hit_count += 1
+            return self.store.path_for(entry.digest)
+
     def delete(self, key: str, cache_type: str = "vectors") -> bool:
         """
         删除缓存项
@@ -374,15 +875,13 @@ class CacheManager:
         Returns:
             是否成功
         """
-        with self.cache_lock:
-            cache = self.caches.get(cache_type, self.caches["vectors"])
-            entry = cache.pop(key, None)
-            if entry:
-                self.total_size_bytes -= entry.size_bytes
-                self.type_size_bytes[cache_type] -= entry.size_bytes
-                self.protected_keys[cache_type].discard(key)
-                return True
-            return False
+        segment = self._get_segment(cache_type)
+        with segment.lock:
+            entry = segment.remove(key)
+        if entry:
+            self._release_entry(entry)
+            return True
+        return False
 
     def clear(self, cache_type: Optional[str] = None) -> None:
         """
@@ -391,24 +890,23 @@ class CacheManager:
         Args:
             cache_type: 缓存类型，如果为None则清空所有缓存
         """
-        with self.cache_lock:
-            if cache_type:
-                # 清空指定类型的缓存
-                cache = self.caches.get(cache_type, None)
-                if cache:
-                    cache.clear()
-                    self.total_size_bytes -= self.type_size_bytes[cache_type]
-                    self.type_size_bytes[cache_type] = 0
-                    self.protected_keys[cache_type].clear()
-                    logger.info(f"{cache_type}类型缓存已清空")
-            else:
-                # 清空所有缓存
-                for cache_name in self.caches:
-                    self.caches[cache_name].clear()
-                    self.type_size_bytes[cache_name] = 0
-                    self.protected_keys[cache_name].clear()
-                self.total_size_bytes = 0
-                logger.info("所有缓存已清空")
+        if cache_type:
+            # 清空指定类型的缓存
+            segment = self.segments.get(cache_type, None)
+            if segment:
+                with segment.lock:
+                    removed = segment.clear()
+                for entry in removed:
+                    self._release_entry(entry)
+                logger.info(f"{cache_type}类型缓存已清空")
+        else:
+            # 清空所有缓存
+            for segment in self.segments.values():
+                with segment.lock:
+                    removed = segment.clear()
+                for entry in removed:
+                    self._release_entry(entry)
+            logger.info("所有缓存已清空")
 
     def protect(self, key: str, cache_type: str = "vectors") -> bool:
         """
@@ -421,11 +919,11 @@ class CacheManager:
         Returns:
             是否成功保护
         """
-        with self.cache_lock:
-            cache = self.caches.get(cache_type, None)
-            if cache and key in cache:
-                self.protected_keys[cache_type].add(key)
-                cache[key].is_hot = True
+        segment = self.segments.get(cache_type, None)
+        if segment is None:
+            return False
+        with segment.lock:
+            if segment.protect(key):
                 logger.debug(f"手动保护缓存项: {key} ({cache_type})")
                 return True
             return False
@@ -441,11 +939,11 @@ class CacheManager:
         Returns:
             是否成功取消保护
         """
-        with self.cache_lock:
-            cache = self.caches.get(cache_type, None)
-            if cache and key in cache:
-                self.protected_keys[cache_type].discard(key)
-                cache[key].is_hot = False
+        segment = self.segments.get(cache_type, None)
+        if segment is None:
+            return False
+        with segment.lock:
+            if segment.unprotect(key):
                 logger.debug(f"取消保护缓存项: {key} ({cache_type})")
                 return True
             return False
@@ -461,8 +959,11 @@ class CacheManager:
         Returns:
             是否受保护
         """
-        with self.cache_lock:
-            return key in self.protected_keys.get(cache_type, set())
+        segment = self.segments.get(cache_type, None)
+        if segment is None:
+            return False
+        with segment.lock:
+            return key in segment.protected
 
     def _calculate_size(self, value: Any) -> int:
         """
@@ -485,6 +986,12 @@ class CacheManager:
         else:
             return len(str(value))
 
+    def _release_entry(self, entry: CacheEntry) -> None:
+        """归还已移出分片的条目所占用的预算和L2数据块"""
+        self.budget.add(-entry.size_bytes)
+        if entry.digest and self.store:
+            self.store.release(entry.digest)
+
     def _ensure_space(self, required_bytes: int, cache_type: str = "vectors") -> None:
         """
         确保有足够的空间
@@ -493,148 +1000,138 @@ class CacheManager:
             required_bytes: 需要的空间（字节）
             cache_type: 缓存类型
         """
-        max_size_bytes = self.config.max_size_gb * 1024 * 1024 * 1024
-
-        # 获取缓存类型配置
-        type_config = getattr(self.config, cache_type, None) or self.config.vectors
-
-        # 检查磁盘空间
-        disk_usage = (
-            self.cache_dir.statvfs() if hasattr(self.cache_dir, "statvfs") else None
-        )
-        if disk_usage:
-            free_space_gb = disk_usage.f_frsize * disk_usage.f_bavail / (1024**3)
-            if free_space_gb < self.config.min_free_space_gb:
-                logger.warning(
-                    f"磁盘空间不足，清理缓存: {free_space_gb}GB < {self.config.min_free_space_gb}GB"
-                )
-                self._cleanup_cache(required_bytes, cache_type)
+        # 检查磁盘空间（采样结果有缓存，不会每次都调用statvfs）
+        if self.budget.disk_low():
+            logger.warning(
+                f"磁盘空间不足，清理缓存: < {self.config.min_free_space_gb}GB"
+            )
+            self._cleanup_cache(None, cache_type)
 
         # 检查全局缓存大小
-        while (self.total_size_bytes + required_bytes) > max_size_bytes:
-            self._evict_one(cache_type)
+        while self.budget.over_by(required_bytes) > 0:
+            if not self._evict_one(cache_type):
+                break
+
+    def _ensure_l1_space(self) -> None:
+        """L1超出限制时，按保护优先级从低到高把最久未访问的值降级到L2"""
+        while self.l1_size_bytes > self.l1_max_bytes:
+            for cache_type in self._eviction_order:
+                segment = self.segments[cache_type]
+                with segment.lock:
+                    key = segment.l1_victim()
+                    if key is None:
+                        continue
+                    entry = segment.entries[key]
+                    if entry.digest is not None:
+                        segment.drop_value(key)
+                        break
+                    # 没有L2副本的条目只能直接淘汰
+                    segment.remove(key)
+                    segment.eviction_count += 1
+                self._release_entry(entry)
+                break
+            else:
+                return
 
-        # 检查类型缓存大小
-        if type_config.max_size_gb > 0:
-            max_type_size_bytes = type_config.max_size_gb * 1024 * 1024 * 1024
-            while (
-                self.type_size_bytes[cache_type] + required_bytes
-            ) > max_type_size_bytes:
-                self._evict_one(cache_type)
+    def _admit_to_l1(self, admission_key: str, size_bytes: int) -> bool:
+        """L2命中的值是否可以提升到L1"""
+        if self.l1_size_bytes + size_bytes <= self.l1_max_bytes:
+            return True
+        if size_bytes > self.l1_max_bytes:
+            return False
+        if not self.admission:
+            return True
+
+        for cache_type in self._eviction_order:
+            segment = self.segments[cache_type]
+            with segment.lock:
+                key = segment.l1_victim()
+            if key is not None:
+                return self.admission.admit(
+                    admission_key, self._admission_key(cache_type, key)
+                )
+        return True
 
-    def _evict_one(self, cache_type: str = "vectors") -> None:
+    def _peek_victim(self, cache_type: str) -> Optional[tuple]:
         """
-        淘汰一个缓存项
+        查看下一次淘汰会选中的缓存项（不执行淘汰）
 
         Args:
             cache_type: 缓存类型
-        """
-        # 获取指定类型的缓存
-        cache = self.caches.get(cache_type, None)
 
-        # 如果指定类型的缓存为空，尝试其他类型的缓存
-        if not cache:
-            # 按保护优先级从低到高排序缓存类型
-            sorted_cache_types = sorted(
-                self.caches.items(), key=lambda x: self.protection_priority.get(x[0], 0)
-            )
-            for ctype, ccache in sorted_cache_types:
-                if ccache:
-                    cache_type = ctype
-                    cache = ccache
-                    break
-            else:
-                return
+        Returns:
+            (缓存类型, 缓存键)，没有可淘汰项时返回None
+        """
+        candidates = [cache_type] + [t for t in self._eviction_order if t != cache_type]
+        for allow_protected in (False, True):
+            if allow_protected:
+                candidates = self._eviction_order
+            for ctype in candidates:
+                segment = self.segments.get(ctype)
+                if segment is None:
+                    continue
+                with segment.lock:
+                    key = segment.victim(allow_protected)
+                if key is not None:
+                    return ctype, key
+        return None
+
+    def _evict_from_segment(
+        self, segment: _CacheSegment, allow_protected: bool = False
+    ) -> Optional[CacheEntry]:
+        """
+        从分片中淘汰一个缓存项（调用方需持有分片锁，并在释放锁后调用_release_entry）
 
-        # 获取缓存类型配置
-        type_config = getattr(self.config, cache_type, None) or self.config.vectors
-        retention_policy = type_config.retention_policy or self.config.retention_policy
-
-        # 根据策略选择淘汰项
-        if retention_policy == "lru":
-            # LRU：淘汰最久未使用的
-            key = next(iter(cache))
-        elif retention_policy == "lfu":
-            # LFU：淘汰访问次数最少的
-            key = min(cache.keys(), key=lambda k: cache[k].access_count)
-        else:
-            # TTL：淘汰过期的
-            now = time.time()
-            key = None
-            for k, entry in cache.items():
-                if k not in self.protected_keys[cache_type]:
-                    if entry.is_hot:
-                        ttl = type_config.hot_data_ttl or self.config.hot_data_ttl
-                    else:
-                        ttl = type_config.cold_data_ttl or self.config.cold_data_ttl
-                    if now - entry.last_accessed_at > ttl:
-                        key = k
-                        break
+        Args:
+            segment: 缓存分片
+            allow_protected: 没有非受保护项时是否淘汰受保护项
 
-            # 如果没有过期的，使用LRU
-            if key is None:
-                # 尝试找到一个非受保护的缓存项
-                for k in cache:
-                    if k not in self.protected_keys[cache_type]:
-                        key = k
-                        break
-                else:
-                    # 如果所有缓存项都受保护，尝试其他类型（按优先级从低到高）
-                    sorted_cache_types = sorted(
-                        self.caches.items(),
-                        key=lambda x: self.protection_priority.get(x[0], 0),
-                    )
-                    for ctype, ccache in sorted_cache_types:
-                        if ctype != cache_type and ccache:
-                            # 尝试找到一个非受保护的缓存项
-                            for k in ccache:
-                                if k not in self.protected_keys[ctype]:
-                                    cache_type = ctype
-                                    cache = ccache
-                                    key = k
-                                    break
-                            if key:
-                                break
-                    else:
-                        # 如果所有缓存项都受保护，尝试取消保护优先级最低的缓存类型的一个项
-                        logger.warning(
-                            "所有缓存项都受保护，尝试取消保护优先级最低的缓存项"
-                        )
-                        sorted_cache_types = sorted(
-                            self.caches.items(),
-                            key=lambda x: self.protection_priority.get(x[0], 0),
-                        )
-                        for ctype, ccache in sorted_cache_types:
-                            if ccache:
-                                # 找到优先级最低的缓存类型中的第一个项
-                                for k in ccache:
-                                    cache_type = ctype
-                                    cache = ccache
-                                    key = k
-                                    # 取消保护
-                                    self.protected_keys[cache_type].discard(key)
-                                    cache[key].is_hot = False
-                                    logger.debug(
-                                        f"取消保护缓存项: {key} ({cache_type}) 以进行淘汰"
-                                    )
-                                    break
-                                if key:
-                                    break
-                        else:
-                            # 所有缓存项都受保护，无法淘汰
-                            logger.error("所有缓存项都受保护，无法进行淘汰")
-                            return
-
-        # 删除缓存项
-        entry = cache.pop(key)
-        self.total_size_bytes -= entry.size_bytes
-        self.type_size_bytes[cache_type] -= entry.size_bytes
-        self.protected_keys[cache_type].discard(key)
-        self.eviction_count += 1
+        Returns:
+            被淘汰的缓存项，没有可淘汰项时返回None
+        """
+        key = segment.victim(allow_protected)
+        if key is None:
+            return None
 
+        entry = segment.remove(key)
+        segment.eviction_count += 1
         logger.debug(
-            f"淘汰缓存项: {key} ({entry.size_bytes} bytes), 类型: {cache_type}"
+            f"淘汰缓存项: {key} ({entry.size_bytes} bytes), 类型: {segment.name}"
         )
+        return entry
+
+    def _evict_one(self, cache_type: str = "vectors") -> bool:
+        """
+        淘汰一个缓存项
+
+        优先淘汰指定类型中的非受保护项，其次按保护优先级从低到高尝试其他类型；
+        所有项都受保护时，淘汰优先级最低类型中最早受保护的项。
+
+        Args:
+            cache_type: 缓存类型
+
+        Returns:
+            是否淘汰了缓存项
+        """
+        candidates = [cache_type] + [t for t in self._eviction_order if t != cache_type]
+
+        for allow_protected in (False, True):
+            if allow_protected:
+                logger.warning("所有缓存项都受保护，尝试取消保护优先级最低的缓存项")
+                candidates = self._eviction_order
+            for ctype in candidates:
+                segment = self.segments.get(ctype)
+                if segment is None:
+                    continue
+                with segment.lock:
+                    evicted = self._evict_from_segment(segment, allow_protected)
+                if evicted is None:
+                    continue
+                self._release_entry(evicted)
+                return True
+
+        logger.error("缓存为空，无法进行淘汰")
+        return False
 
     def _cleanup_cache(
         self, required_bytes: Optional[int] = None, cache_type: str = "vectors"
@@ -646,20 +1143,17 @@ class CacheManager:
             required_bytes: 需要释放的空间（字节），如果为None则清理到目标大小
             cache_type: 缓存类型
         """
-        target_size_bytes = (
-            self.config.max_size_gb * 1024 * 1024 * 1024 * 0.8
-        )  # 清理到80%
-
         if required_bytes:
             # 清理到满足需求
-            while (
-                self.total_size_bytes + required_bytes
-            ) > self.config.max_size_gb * 1024 * 1024 * 1024:
-                self._evict_one(cache_type)
+            while self.budget.over_by(required_bytes) > 0:
+                if not self._evict_one(cache_type):
+                    break
         else:
-            # 清理到目标大小
-            while self.total_size_bytes > target_size_bytes:
-                self._evict_one(cache_type)
+            # 清理到目标大小（80%）
+            target_size_bytes = self.budget.max_bytes * 0.8
+            while self.budget.used_bytes > target_size_bytes:
+                if not self._evict_one(cache_type):
+                    break
 
     def _cleanup_loop(self) -> None:
         """清理循环"""
@@ -667,36 +1161,30 @@ class CacheManager:
 
         while self.is_running:
             try:
-                time.sleep(self.config.cleanup_interval)
+                if self._stop_event.wait(self.config.cleanup_interval):
+                    break
 
                 # 定期清理
-                with self.cache_lock:
-                    # 清理所有类型的缓存
-                    for cache_type in self.caches:
-                        self._cleanup_cache(None, cache_type)
-
-                    # 更新热数据状态
-                    now = time.time()
-                    for cache_type, cache in self.caches.items():
-                        type_config = (
-                            getattr(self.config, cache_type, None)
-                            or self.config.vectors
-                        )
-                        for key, entry in cache.items():
-                            threshold = (
-                                type_config.hot_data_threshold
-                                or self.config.hot_data_threshold
-                            )
+                self._cleanup_cache(None)
+
+                # 更新热数据状态（逐个分片加锁）
+                now = time.time()
+                for cache_type, segment in self.segments.items():
+                    type_config = self._get_type_config(cache_type)
+                    threshold = (
+                        type_config.hot_data_threshold
+                        or self.config.hot_data_threshold
+                    )
+                    ttl = type_config.hot_data_ttl or self.config.hot_data_ttl
+                    with segment.lock:
+                        for key, entry in list(segment.entries.items()):
                             if entry.access_count >= threshold:
-                                entry.is_hot = True
-                                self.protected_keys[cache_type].add(key)
-                            elif entry.is_hot:
-                                ttl = (
-                                    type_config.hot_data_ttl or self.config.hot_data_ttl
-                                )
-                                if now - entry.last_accessed_at > ttl:
-                                    entry.is_hot = False
-                                    self.protected_keys[cache_type].discard(key)
+                                segment.protect(key)
+                            elif entry.is_hot and now - entry.last_accessed_at > ttl:
+                                segment.unprotect(key)
+
+                # 持久化索引，异常退出时L2数据仍可复用
+                self._save_cache_index()
 
             except Exception as e:
                 logger.error(f"缓存清理失败: {e}")
@@ -704,56 +1192,74 @@ class CacheManager:
         logger.info("缓存清理线程停止")
 
     def _load_cache_index(self) -> None:
-        """加载缓存索引"""
+        """加载缓存索引（只恢复有L2数据块的条目，值在首次访问时从L2读取）"""
         index_file = self.cache_dir / "cache_index.json"
 
-        if not index_file.exists():
+        if not index_file.exists() or self.store is None:
             return
 
         try:
             with open(index_file, "r") as f:
                 index_data = json.load(f)
 
-            with self.cache_lock:
-                for cache_type, cache_entries in index_data.items():
-                    cache = self.caches.get(cache_type, None)
-                    if not cache:
-                        continue
+            for cache_type, cache_entries in index_data.items():
+                segment = self.segments.get(cache_type, None)
+                if segment is None or not self._persists(cache_type):
+                    continue
 
+                loaded = 0
+                with segment.lock:
                     for key, entry_data in cache_entries.items():
-                        # 只加载元数据，不加载实际值
-                        cache[key] = CacheEntry(
-                            key=key,
-                            value=None,  # 值需要重新加载
-                            size_bytes=entry_data["size_bytes"],
-                            created_at=entry_data["created_at"],
-                            last_accessed_at=entry_data["last_accessed_at"],
-                            access_count=entry_data["access_count"],
-                            is_hot=entry_data.get("is_hot", False),
+                        digest = entry_data.get("digest")
+                        if not digest or not self.store.retain(digest):
+                            continue
+                        replaced = segment.remove(key)
+                        if replaced:
+                            loaded -= replaced.size_bytes
+                            if replaced.digest:
+                                self.store.release(replaced.digest)
+                        segment.add(
+                            CacheEntry(
+                                key=key,
+                                value=None,
+                                size_bytes=entry_data["size_bytes"],
+                                created_at=entry_data["created_at"],
+                                last_accessed_at=entry_data["last_accessed_at"],
+                                access_count=entry_data["access_count"],
+                                is_hot=entry_data.get("is_hot", False),
+                                digest=digest,
+                                encoding=entry_data.get("encoding", "pickle"),
+                            )
                         )
-                        self.total_size_bytes += entry_data["size_bytes"]
-                        self.type_size_bytes[cache_type] += entry_data["size_bytes"]
+                        if entry_data.get("is_hot", False):
+                            segment.protect(key)
+                        loaded += entry_data["size_bytes"]
+                self.budget.add(loaded)
 
             logger.info(f"加载缓存索引完成")
         except Exception as e:
             logger.warning(f"加载缓存索引失败: {e}")
 
     def _save_cache_index(self) -> None:
-        """保存缓存索引"""
+        """保存缓存索引（只保存有L2数据块的条目）"""
         index_file = self.cache_dir / "cache_index.json"
 
         try:
-            with self.cache_lock:
-                index_data = {}
-                for cache_type, cache in self.caches.items():
-                    cache_entries = {}
-                    for key, entry in cache.items():
-                        cache_entries[key] = entry.to_dict()
-                    if cache_entries:
-                        index_data[cache_type] = cache_entries
-
-            with open(index_file, "w") as f:
+            index_data = {}
+            for cache_type, segment in self.segments.items():
+                with segment.lock:
+                    cache_entries = {
+                        key: entry.to_dict()
+                        for key, entry in segment.entries.items()
+                        if entry.digest is not None
+                    }
+                if cache_entries:
+                    index_data[cache_type] = cache_entries
+
+            tmp_file = index_file.with_suffix(".json.tmp")
+            with open(tmp_file, "w") as f:
                 json.dump(index_data, f, indent=2)
+            os.replace(tmp_file, index_file)
 
             logger.debug(
                 f"保存缓存索引: {sum(len(entries) for entries in index_data.values())} 项"
@@ -761,6 +1267,38 @@ class CacheManager:
         except Exception as e:
             logger.warning(f"保存缓存索引失败: {e}")
 
+    def get_lock_stats(self) -> Dict[str, Dict[str, Any]]:
+        """
+        获取各分片锁的竞争统计
+
+        Returns:
+            按缓存类型分类的锁统计信息
+        """
+        return {
+            cache_type: segment.lock.get_stats()
+            for cache_type, segment in self.segments.items()
+        }
+
+    def _collect_metrics(self):
+        """导出各缓存类型的命中、未命中和淘汰计数"""
+        cache_dir = str(self.cache_dir)
+        for name, segment in self.segments.items():
+            labels = {"cache_type": name, "cache_dir": cache_dir}
+            lookups = segment.hit_count + segment.miss_count
+            for metric, metric_type, help_text, value in (
+                ("msearch_cache_hits_total", "counter", "缓存命中次数", segment.hit_count),
+                ("msearch_cache_misses_total", "counter", "缓存未命中次数", segment.miss_count),
+                ("msearch_cache_evictions_total", "counter", "缓存淘汰次数", segment.eviction_count),
+                (
+                    "msearch_cache_hit_ratio",
+                    "gauge",
+                    "缓存命中率",
+                    segment.hit_count / lookups if lookups else 0.0,
+                ),
+                ("msearch_cache_size_bytes", "gauge", "缓存占用字节数", segment.size_bytes),
+            ):
+                yield metric, metric_type, help_text, labels, value
+
     def get_stats(self, cache_type: Optional[str] = None) -> Dict[str, Any]:
         """
         获取缓存统计信息
@@ -771,62 +1309,98 @@ class CacheManager:
         Returns:
             统计信息字典
         """
-        with self.cache_lock:
-            hit_rate = (
-                self.hit_count / (self.hit_count + self.miss_count)
-                if (self.hit_count + self.miss_count) > 0
-                else 0.0
-            )
-
-            if cache_type:
-                # 获取指定类型的统计信息
-                cache = self.caches.get(cache_type, None)
-                if not cache:
-                    return {}
-
-                type_config = (
-                    getattr(self.config, cache_type, None) or self.config.vectors
-                )
+        if cache_type:
+            # 获取指定类型的统计信息
+            segment = self.segments.get(cache_type, None)
+            if segment is None:
+                return {}
+
+            type_config = self._get_type_config(cache_type)
+            with segment.lock:
+                lookups = segment.hit_count + segment.miss_count
                 return {
                     "enabled": self.config.enable,
                     "cache_type": cache_type,
-                    "total_entries": len(cache),
-                    "total_size_bytes": self.type_size_bytes[cache_type],
-                    "total_size_gb": self.type_size_bytes[cache_type] / (1024**3),
+                    "total_entries": len(segment),
+                    "total_size_bytes": segment.size_bytes,
+                    "total_size_gb": segment.size_bytes / (1024**3),
                     "max_size_gb": type_config.max_size_gb,
-                    "hit_count": self.hit_count,
-                    "miss_count": self.miss_count,
-                    "eviction_count": self.eviction_count,
-                    "hit_rate": hit_rate,
-                    "hot_data_count": len(self.protected_keys[cache_type]),
-                    "retention_policy": type_config.retention_policy,
+                    "l1_entries": len(segment.resident),
+                    "l1_size_bytes": segment.resident_bytes,
+                    "hit_count": segment.hit_count,
+                    "l2_hit_count": segment.l2_hit_count,
+                    "miss_count": segment.miss_count,
+                    "eviction_count": segment.eviction_count,
+                    "hit_rate": segment.hit_count / lookups if lookups else 0.0,
+                    "hot_data_count": len(segment.protected),
+                    "retention_policy": segment.retention_policy,
+                    "persist": self._persists(cache_type),
+                    "lock_stats": segment.lock.get_stats(),
                 }
-            else:
-                # 获取所有缓存的统计信息
-                return {
-                    "enabled": self.config.enable,
-                    "total_entries": sum(len(cache) for cache in self.caches.values()),
-                    "total_size_bytes": self.total_size_bytes,
-                    "total_size_gb": self.total_size_bytes / (1024**3),
-                    "max_size_gb": self.config.max_size_gb,
-                    "hit_count": self.hit_count,
-                    "miss_count": self.miss_count,
-                    "eviction_count": self.eviction_count,
-                    "hit_rate": hit_rate,
-                    "hot_data_count": sum(
-                        len(keys) for keys in self.protected_keys.values()
-                    ),
-                    "retention_policy": self.config.retention_policy,
-                    "type_stats": {
-                        cache_type: {
-                            "entries": len(cache),
-                            "size_bytes": self.type_size_bytes[cache_type],
-                            "size_gb": self.type_size_bytes[cache_type] / (1024**3),
-                            "hot_data_count": len(self.protected_keys[cache_type]),
-                        }
-                        for cache_type, cache in self.caches.items()
-                    },
+
+        # 获取所有缓存的统计信息
+        type_stats = {}
+        hit_count = l2_hit_count = miss_count = eviction_count = 0
+        for name, segment in self.segments.items():
+            with segment.lock:
+                type_stats[name] = {
+                    "entries": len(segment),
+                    "size_bytes": segment.size_bytes,
+                    "size_gb": segment.size_bytes / (1024**3),
+                    "l1_entries": len(segment.resident),
+                    "l1_size_bytes": segment.resident_bytes,
+                    "hot_data_count": len(segment.protected),
+                    "hit_count": segment.hit_count,
+                    "l2_hit_count": segment.l2_hit_count,
+                    "miss_count": segment.miss_count,
+                    "eviction_count": segment.eviction_count,
+                    "lock_stats": segment.lock.get_stats(),
                 }
+                hit_count += segment.hit_count
+                l2_hit_count += segment.l2_hit_count
+                miss_count += segment.miss_count
+                eviction_count += segment.eviction_count
+
+        lookups = hit_count + miss_count
+        return {
+            "enabled": self.config.enable,
+            "total_entries": sum(s["entries"] for s in type_stats.values()),
+            "total_size_bytes": self.budget.used_bytes,
+            "total_size_gb": self.budget.used_bytes / (1024**3),
+            "max_size_gb": self.config.max_size_gb,
+            "l1_size_bytes": sum(s["l1_size_bytes"] for s in type_stats.values()),
+            "l1_max_size_mb": self.config.l1_max_size_mb,
+            "l2": self.store.get_stats() if self.store else None,
+            "hit_count": hit_count,
+            "l2_hit_count": l2_hit_count,
+            "miss_count": miss_count,
+            "eviction_count": eviction_count,
+            "hit_rate": hit_count / lookups if lookups else 0.0,
+            "hot_data_count": sum(s["hot_data_count"] for s in type_stats.values()),
+            "retention_policy": self.config.retention_policy,
+            "admission": (
+                {
+                    "policy": self.config.admission_policy,
+                    "admitted": self.admission.admitted_count,
+                    "rejected": self.admission.rejected_count,
+                }
+                if self.admission
+                else {"policy": "none"}
+            ),
+            "disk_check_count": self.budget.disk_check_count,
+            "lock_stats": {
+                "acquisitions": sum(
+                    s["lock_stats"]["acquisitions"] for s in type_stats.values()
+                ),
+                "contentions": sum(
+                    s["lock_stats"]["contentions"] for s in type_stats.values()
+                ),
+                "wait_time_ms": sum(
+                    s["lock_stats"]["wait_time_ms"] for s in type_stats.values()
+                ),
+            },
+            "type_stats": type_stats,
+        }
 
     def get_entries(self, cache_type: Optional[str] = None) -> List[Dict[str, Any]]:
         """
@@ -838,19 +1412,20 @@ class CacheManager:
         Returns:
             缓存项信息列表
         """
-        with self.cache_lock:
-            if cache_type:
-                # 获取指定类型的缓存项信息
-                cache = self.caches.get(cache_type, None)
-                if not cache:
-                    return []
-                return [entry.to_dict() for entry in cache.values()]
-            else:
-                # 获取所有缓存项信息
-                entries = []
-                for cache in self.caches.values():
-                    entries.extend([entry.to_dict() for entry in cache.values()])
-                return entries
+        if cache_type:
+            # 获取指定类型的缓存项信息
+            segment = self.segments.get(cache_type, None)
+            if segment is None:
+                return []
+            with segment.lock:
+                return [entry.to_dict() for entry in segment.entries.values()]
+
+        # 获取所有缓存项信息
+        entries = []
+        for segment in self.segments.values():
+            with segment.lock:
+                entries.extend(entry.to_dict() for entry in segment.entries.values())
+        return entries
 
     def protect_key(self, key: str, cache_type: str = "vectors") -> bool:
         """
@@ -863,13 +1438,7 @@ class CacheManager:
         Returns:
             是否成功
         """
-        with self.cache_lock:
-            cache = self.caches.get(cache_type, None)
-            if cache and key in cache:
-                self.protected_keys[cache_type].add(key)
-                cache[key].is_hot = True
-                return True
-            return False
+        return self.protect(key, cache_type)
 
     def unprotect_key(self, key: str, cache_type: str = "vectors") -> bool:
         """
@@ -882,13 +1451,7 @@ class CacheManager:
         Returns:
             是否成功
         """
-        with self.cache_lock:
-            cache = self.caches.get(cache_type, None)
-            if cache and key in cache:
-                self.protected_keys[cache_type].discard(key)
-                cache[key].is_hot = False
-                return True
-            return False
+        return self.unprotect(key, cache_type)
 
 
 def get_cache_key(*args: Any) -> str:
@@ -0,0 +1,188 @@
+"""
+内容寻址存储
+缓存的二级（磁盘）存储，按内容SHA256存放数据块，相同内容只保存一份
+"""
+
+import os
+import hashlib
+import logging
+import threading
+from typing import Dict, Iterable, Optional
+from pathlib import Path
+
+logger = logging.getLogger(__name__)
+
+
+class ContentAddressedStore:
+    """
+    内容寻址存储
+
+    数据块保存在 objects/<digest[:2]>/<digest[2:]>，以引用计数管理生命周期，
+    最后一个引用释放时删除数据块。写入使用临时文件加原子重命名，
+    进程中断不会留下半写的数据块。
+    """
+
+    def __init__(self, root_dir: Path):
+        """
+        初始化内容寻址存储
+
+        Args:
+            root_dir: 存储根目录
+        """
+        self.objects_dir = Path(root_dir) / "objects"
+        self.objects_dir.mkdir(parents=True, exist_ok=True)
+
+        self._refs: Dict[str, int] = {}
+        self._sizes: Dict[str, int] = {}
+        self._lock = threading.Lock()
+
+        self.total_bytes = 0
+
+    def path_for(self, digest: str) -> Path:
+        """
+        获取数据块路径
+
+        Args:
+            digest: 内容摘要
+
+        Returns:
+            数据块文件路径
+        """
+        return self.objects_dir / digest[:2] / digest[2:]
+
+    def put(self, data: bytes) -> str:
+        """
+        写入数据块并增加引用
+
+        Args:
+            data: 数据内容
+
+        Returns:
+            内容摘要
+        """
+        digest = hashlib.sha256(data).hexdigest()
+        path = self.path_for(digest)
+
+        with self._lock:
+            self._refs[digest] = self._refs.get(digest, 0) + 1
+
+        if not path.exists():
+            path.parent.mkdir(parents=True, exist_ok=True)
+            tmp_path = path.with_name(
+                f"{path.name}.{os.getpid()}.{threading.get_ident()}.tmp"
+            )
+            with open(tmp_path, "wb") as f:
+                f.write(data)
+            os.replace(tmp_path, path)
+
+        with self._lock:
+            if digest not in self._sizes:
+                self._sizes[digest] = len(data)
+                self.total_bytes += len(data)
+
+        return digest
+
+    def get(self, digest: str) -> Optional[bytes]:
+        """
+        读取数据块
+
+        Args:
+            digest: 内容摘要
+
+        Returns:
+            数据内容，不存在时返回None
+        """
+        try:
+            with open(self.path_for(digest), "rb") as f:
+                return f.read()
+        except FileNotFoundError:
+            return None
+        except Exception as e:
+            logger.warning(f"读取缓存数据块失败: {digest}, {e}")
+            return None
+
+    def retain(self, digest: str) -> bool:
+        """
+        为已存在的数据块增加引用（加载索引时使用）
+
+        Args:
+            digest: 内容摘要
+
+        Returns:
+            数据块是否存在
+        """
+        path = self.path_for(digest)
+        with self._lock:
+            if digest not in self._refs:
+                try:
+                    size = path.stat().st_size
+                except OSError:
+                    return False
+                self._sizes[digest] = size
+                self.total_bytes += size
+            self._refs[digest] = self._refs.get(digest, 0) + 1
+        return True
+
+    def release(self, digest: str) -> None:
+        """
+        释放一个引用，引用归零时删除数据块
+
+        Args:
+            digest: 内容摘要
+        """
+        with self._lock:
+            count = self._refs.get(digest, 0) - 1
+            if count > 0:
+                self._refs[digest] = count
+                return
+            self._refs.pop(digest, None)
+            self.total_bytes -= self._sizes.pop(digest, 0)
+
+            # 在锁内删除，避免与同内容的并发写入交错
+            try:
+                self.path_for(digest).unlink()
+            except FileNotFoundError:
+                pass
+            except Exception as e:
+                logger.warning(f"删除缓存数据块失败: {digest}, {e}")
+
+    def collect_garbage(self, referenced: Optional[Iterable[str]] = None) -> int:
+        """
+        删除没有被引用的数据块
+
+        Args:
+            referenced: 额外视为被引用的摘要
+
+        Returns:
+            删除的数据块数量
+        """
+        with self._lock:
+            keep = set(self._refs)
+        if referenced:
+            keep.update(referenced)
+
+        removed = 0
+        for path in self.objects_dir.glob("*/*"):
+            if path.suffix == ".tmp":
+                continue
+            digest = path.parent.name + path.name
+            if digest in keep:
+                continue
+            try:
+                path.unlink()
+                removed += 1
+            except OSError:
+                pass
+
+        if removed:
+            logger.info(f"清理无引用的缓存数据块: {removed} 个")
+        return removed
+
+    def get_stats(self) -> Dict[str, int]:
+        """获取存储统计信息"""
+        with self._lock:
+            return {
+                "objects": len(self._refs),
+                "references": sum(self._refs.values()),
+                "size_bytes": self.total_bytes,
+            }
@@ -7,9 +7,12 @@ import os
 import json
 import time
 import logging
-from typing import Dict, Any, Optional
+from typing import Dict, Any, Optional, TYPE_CHECKING
 from pathlib import Path
 
+if TYPE_CHECKING:
+    from .cache_manager import CacheManager
+
 logger = logging.getLogger(__name__)
 
 
@@ -17,17 +20,31 @@ class PreprocessingCache:
     """
     预处理缓存管理器
 
-    负责管理预处理过程中产生的中间文件和缓存
+    负责管理预处理过程中产生的中间文件和缓存。传入 cache_manager 时，
+    预处理结果存放在统一缓存的 preprocessing 类型中，与其他缓存共享字节预算；
+    否则按原方式写入独立的JSON文件。
     """
 
-    def __init__(self, config: Dict[str, Any]):
+    # 预处理缓存类型（包含图像预处理缓存）
+    _CACHE_TYPES = (
+        "audio_segments",
+        "video_slices",
+        "text_embeddings",
+        "image_preprocessing",
+    )
+
+    def __init__(
+        self, config: Dict[str, Any], cache_manager: Optional["CacheManager"] = None
+    ):
         """
         初始化预处理缓存管理器
 
         Args:
             config: 配置字典
+            cache_manager: 统一缓存管理器（可选）
         """
         self.config = config
+        self.cache_manager = cache_manager
 
         # 缓存目录配置
         cache_dir = config.get("cache_dir", "data/cache")
@@ -55,12 +72,7 @@ class PreprocessingCache:
         """
         # 创建主缓存目录和子目录
         # 注意：由于所有模型都支持直接视频处理，无需抽帧，移除frame_extraction缓存目录
-        cache_subdirs = [
-            self.cache_dir / "audio_segments",
-            self.cache_dir / "video_slices",
-            self.cache_dir / "text_embeddings",
-            self.cache_dir / "image_preprocessing",  # 新增：图像预处理缓存
-        ]
+        cache_subdirs = [self.cache_dir / cache_type for cache_type in self._CACHE_TYPES]
 
         for dir_path in cache_subdirs:
             dir_path.mkdir(parents=True, exist_ok=True)
@@ -83,6 +95,10 @@ class PreprocessingCache:
         cache_subdir.mkdir(parents=True, exist_ok=True)
         return str(cache_subdir / f"{file_id}.json")
 
+    @staticmethod
+    def _unified_key(file_id: str, cache_type: str) -> str:
+        return f"{cache_type}/{file_id}"
+
     def save_cache(self, file_id: str, cache_type: str, data: Any) -> bool:
         """
         保存缓存数据
@@ -98,6 +114,13 @@ class PreprocessingCache:
         if not self.enable_cache:
             return False
 
+        if self.cache_manager is not None:
+            return self.cache_manager.set(
+                self._unified_key(file_id, cache_type),
+                {"saved_at": time.time(), "data": data},
+                "preprocessing",
+            )
+
         try:
             cache_path = self.get_cache_path(file_id, cache_type)
             with open(cache_path, "w") as f:
@@ -121,6 +144,17 @@ class PreprocessingCache:
         if not self.enable_cache:
             return None
 
+        if self.cache_manager is not None:
+            cached = self.cache_manager.get(
+                self._unified_key(file_id, cache_type), "preprocessing"
+            )
+            if cached is None:
+                return None
+            if time.time() - cached["saved_at"] > self.cache_ttl:
+                self.delete_cache(file_id, cache_type)
+                return None
+            return cached["data"]
+
         try:
             cache_path = self.get_cache_path(file_id, cache_type)
             if not os.path.exists(cache_path):
@@ -148,6 +182,14 @@ class PreprocessingCache:
         Returns:
             是否删除成功
         """
+        if self.cache_manager is not None:
+            cache_types = [cache_type] if cache_type else list(self._CACHE_TYPES)
+            for ctype in cache_types:
+                self.cache_manager.delete(
+                    self._unified_key(file_id, ctype), "preprocessing"
+                )
+            return True
+
         try:
             if cache_type:
                 # 删除特定类型的缓存
@@ -5,8 +5,15 @@
 导出文件服务组件。
 """
 
-from .file_monitor import FileMonitor
-from .file_scanner import FileScanner
-from .file_indexer import FileIndexer
+from src.utils.lazy_import import lazy_exports
+
+__getattr__, __dir__ = lazy_exports(
+    __name__,
+    {
+        "FileMonitor": ".file_monitor",
+        "FileScanner": ".file_scanner",
+        "FileIndexer": ".file_indexer",
+    },
+)
 
 __all__ = ["FileMonitor", "FileScanner", "FileIndexer"]
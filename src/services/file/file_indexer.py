@@ -34,6 +34,7 @@ class FileIndexer:
         self,
         config: Optional[Dict[str, Any]] = None,
         task_manager: Optional[Any] = None,
+        thumbnail_service: Optional[Any] = None,
     ):
         """
         初始化文件索引器
@@ -41,6 +42,7 @@ class FileIndexer:
         Args:
             config: 配置字典
             task_manager: 任务管理器实例，用于提交任务
+            thumbnail_service: 缩略图服务（可选），设置后索引时在后台预渲染缩略图
         """
         self.config = config or {}
         self.logger = None
@@ -55,6 +57,9 @@ class FileIndexer:
         # 任务管理器
         self.task_manager = task_manager
 
+        # 缩略图服务（后台优先级，检索结果的按需请求会优先执行）
+        self.thumbnail_service = thumbnail_service
+
         # 初始化统计信息
         self.stats = {
             "total_files": 0,
@@ -148,6 +153,9 @@ class FileIndexer:
             if submit_task and self.task_manager:
                 self._submit_processing_task(metadata)
 
+            if self.thumbnail_service is not None:
+                self.thumbnail_service.prerender([metadata.file_path])
+
             return metadata
 
         except Exception as e:
@@ -1,17 +1,40 @@
 """媒体服务模块"""
 
-from .media_processor import MediaProcessor
-from .image_preprocessor import ImagePreprocessor
-from .video_preprocessor import VideoPreprocessor
-from .audio_preprocessor import AudioPreprocessor
-from .media_utils import MediaInfoHelper, calculate_file_hash, check_duplicate_file
+from src.utils.lazy_import import lazy_exports
+
+__getattr__, __dir__ = lazy_exports(
+    __name__,
+    {
+        "MediaProcessor": ".media_processor",
+        "ImagePreprocessor": ".image_preprocessor",
+        "VideoPreprocessor": ".video_preprocessor",
+        "AudioPreprocessor": ".audio_preprocessor",
+        "MediaDecoder": ".media_decoder",
+        "MediaInfoHelper": ".media_utils",
+        "calculate_file_hash": ".media_utils",
+        "check_duplicate_file": ".media_utils",
+        "MediaProbe": ".media_probe",
+        "get_media_probe": ".media_probe",
+        "initialize_media_probe": ".media_probe",
+        "ThumbnailService": ".thumbnail_service",
+        "Thumbnail": ".thumbnail_service",
+        "get_thumbnail_service": ".thumbnail_service",
+    },
+)
 
 __all__ = [
     "MediaProcessor",
     "ImagePreprocessor",
     "VideoPreprocessor",
     "AudioPreprocessor",
+    "MediaDecoder",
     "MediaInfoHelper",
     "calculate_file_hash",
     "check_duplicate_file",
+    "MediaProbe",
+    "get_media_probe",
+    "initialize_media_probe",
+    "ThumbnailService",
+    "Thumbnail",
+    "get_thumbnail_service",
 ]
@@ -2,8 +2,6 @@ import os
 import sys
 import logging
 import time
-import librosa
-import soundfile as sf
 import numpy as np
 from typing import Dict, Any, Optional, Tuple
 from pathlib import Path
@@ -180,6 +178,10 @@ class AudioPreprocessor:
                     temp_dir, f"{file_name}_processed.{output_ext}"
                 )
 
+            # librosa和soundfile导入较慢，首次处理音频时才导入
+            import librosa
+            import soundfile as sf
+
             # 加载音频（使用librosa）
             audio_data, sr = librosa.load(audio_path, sr=None, mono=False)
 
@@ -218,6 +220,8 @@ class AudioPreprocessor:
             音频类型: 'MUSIC', 'SPEECH', 'MIXED', 'SILENCE', 'UNKNOWN'
         """
         try:
+            import librosa
+
             # 加载音频
             y, sr = librosa.load(audio_path, sr=22050)
 
@@ -316,8 +320,13 @@ class AudioPreprocessor:
         Returns:
             预处理后的音频bytes，失败返回None
         """
+        import tempfile
+
+        # 每次使用独立的临时文件，并发预处理同名文件时互不覆盖
+        fd, output_path = tempfile.mkstemp(suffix=f".{self.target_format}")
+        os.close(fd)
         try:
-            processed_path = self._preprocess_audio(audio_path, None)
+            processed_path = self._preprocess_audio(audio_path, output_path)
             if processed_path:
                 with open(processed_path, "rb") as f:
                     return f.read()
@@ -325,3 +334,29 @@ class AudioPreprocessor:
         except Exception as e:
             logger.error(f"Failed to get preprocessed audio bytes: {e}")
             return None
+        finally:
+            if os.path.exists(output_path):
+                os.remove(output_path)
+
+
+# 解码进程内复用的预处理器
+_worker_preprocessor: Optional[AudioPreprocessor] = None
+
+
+def preprocess_audio_bytes(
+    audio_path: str, config: Optional[Dict[str, Any]] = None
+) -> Optional[bytes]:
+    """
+    预处理音频并返回WAV数据（在解码进程池中执行）
+
+    Args:
+        audio_path: 音频文件路径
+        config: 配置字典
+
+    Returns:
+        预处理后的音频bytes，失败返回None
+    """
+    global _worker_preprocessor
+    if _worker_preprocessor is None:
+        _worker_preprocessor = AudioPreprocessor(config)
+    return _worker_preprocessor.get_preprocessed_audio_bytes(audio_path)
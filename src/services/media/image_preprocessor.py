@@ -1,16 +1,55 @@
+import asyncio
 import os
 import sys
 import logging
 import time
-from typing import Dict, Any
+from concurrent.futures import ProcessPoolExecutor
+from typing import Dict, Any, List, Optional, Tuple
 from pathlib import Path
 
+from PIL import Image, ImageOps
+
 # 设置日志
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
 # 导入媒体处理通用工具
-from src.services.media.media_utils import MediaInfoHelper, calculate_file_hash
+from src.services.media.media_utils import (
+    MediaInfoHelper,
+    calculate_file_hash,
+    create_process_pool,
+)
+
+# 模型输入分辨率未知时的默认值（CLIP系列模型）
+DEFAULT_INPUT_RESOLUTION = 224
+
+
+def decode_image_for_model(image_path: str, target_size: int) -> Tuple[bytes, Tuple[int, int]]:
+    """
+    按模型输入分辨率解码图像（在进程池中执行）
+
+    JPEG使用draft模式在DCT阶段按1/2、1/4、1/8缩放解码，只解码到不小于目标分辨率的尺寸，
+    5000万像素的照片无需完整解码；之后把短边缩放到目标分辨率，模型处理器只需中心裁剪。
+
+    Args:
+        image_path: 图像文件路径
+        target_size: 模型输入分辨率（短边）
+
+    Returns:
+        (RGB像素数据, (宽, 高))，只传回缩放后的小图像
+    """
+    with Image.open(image_path) as image:
+        image.draft("RGB", (target_size, target_size))
+        image = ImageOps.exif_transpose(image).convert("RGB")
+
+    scale = target_size / min(image.size)
+    if scale < 1.0:
+        size = (
+            max(target_size, round(image.width * scale)),
+            max(target_size, round(image.height * scale)),
+        )
+        image = image.resize(size, Image.BICUBIC, reducing_gap=3.0)
+    return image.tobytes(), image.size
 
 
 class ImagePreprocessor:
@@ -22,10 +61,22 @@ class ImagePreprocessor:
 
         Args:
             config: 配置字典
+                processing.image.decode_workers: 解码进程数
+                processing.image.input_resolution: 解码分辨率，设置后优先于模型输入分辨率，
+                    None表示按模型配置
         """
         self.config = config or {}
         self.media_info_helper = MediaInfoHelper()
 
+        image_config = self.config.get("processing", {}).get("image", {})
+        self.decode_workers = image_config.get("decode_workers") or min(
+            4, os.cpu_count() or 1
+        )
+        self.input_resolution: Optional[int] = image_config.get("input_resolution")
+
+        # 解码进程池（首次使用时创建）
+        self._decode_pool: Optional[ProcessPoolExecutor] = None
+
         logger.info("ImagePreprocessor initialized")
 
     def initialize(self) -> bool:
@@ -70,6 +121,74 @@ class ImagePreprocessor:
             logger.error(f"Failed to process image: {e}")
             return {"status": "error", "error": str(e), "file_path": image_path}
 
+    def _get_decode_pool(self) -> ProcessPoolExecutor:
+        """获取解码进程池"""
+        if self._decode_pool is None:
+            self._decode_pool = create_process_pool(self.decode_workers)
+        return self._decode_pool
+
+    async def load_images_for_model(
+        self,
+        image_paths: List[str],
+        target_size: Optional[int] = None,
+        executor: Optional[ProcessPoolExecutor] = None,
+        limiter: Optional[asyncio.Semaphore] = None,
+    ) -> List[Image.Image]:
+        """
+        在进程池中解码图像并缩放到模型输入分辨率
+
+        解码不占用事件循环线程，多张图像并行解码；返回的图像直接包装
+        进程池传回的像素数据，不再复制。
+
+        Args:
+            image_paths: 图像文件路径列表
+            target_size: 模型输入分辨率；配置了processing.image.input_resolution时
+                使用配置值，两者都没有时使用默认值
+            executor: 解码进程池，None时使用自己的进程池
+            limiter: 限制同时解码的图像数
+
+        Returns:
+            缩放后的RGB图像列表，与输入顺序一致
+
+        Raises:
+            FileNotFoundError: 图像文件不存在
+            RuntimeError: 图像解码失败
+        """
+        # 配置的分辨率是显式覆盖，优先于模型的输入分辨率
+        target_size = self.input_resolution or target_size or DEFAULT_INPUT_RESOLUTION
+        loop = asyncio.get_running_loop()
+        pool = executor or self._get_decode_pool()
+
+        async def decode(image_path: str):
+            if limiter is None:
+                return await loop.run_in_executor(
+                    pool, decode_image_for_model, image_path, target_size
+                )
+            async with limiter:
+                return await loop.run_in_executor(
+                    pool, decode_image_for_model, image_path, target_size
+                )
+
+        decoded = await asyncio.gather(
+            *(decode(image_path) for image_path in image_paths), return_exceptions=True
+        )
+
+        images = []
+        for image_path, result in zip(image_paths, decoded):
+            if isinstance(result, FileNotFoundError):
+                raise FileNotFoundError(f"图像文件不存在: {image_path}") from result
+            if isinstance(result, BaseException):
+                raise RuntimeError(f"读取图像文件失败: {image_path} - {result}") from result
+            data, size = result
+            images.append(Image.frombuffer("RGB", size, data, "raw", "RGB", 0, 1))
+        return images
+
+    def shutdown(self):
+        """关闭解码进程池"""
+        if self._decode_pool is not None:
+            self._decode_pool.shutdown(wait=False, cancel_futures=True)
+            self._decode_pool = None
+
     def has_media_value(self, file_path: str) -> bool:
         """
         判断图像文件是否有价值
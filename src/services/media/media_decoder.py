@@ -0,0 +1,194 @@
+"""
+媒体解码调度
+把向量化前的文件读取和解码从事件循环线程移走，并按媒体类型限制并发
+"""
+
+import asyncio
+import logging
+import os
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from typing import Any, Dict, List, Optional
+
+from src.services.media.audio_preprocessor import preprocess_audio_bytes
+from src.services.media.image_preprocessor import ImagePreprocessor
+from src.services.media.media_utils import create_process_pool
+
+logger = logging.getLogger(__name__)
+
+# 每种媒体类型同时解码的文件数
+DEFAULT_DECODE_CONCURRENCY = {"image": 4, "audio": 2, "video": 1}
+
+
+class MediaDecoder:
+    """
+    媒体解码调度器
+
+    文件检查在专用I/O线程池中执行，图像、音频和视频解码在共享的进程池中执行，
+    事件循环只负责调度。每种媒体类型的并发解码数单独限制，
+    大批量索引不会占满所有解码进程，同一进程内的搜索请求不受影响。
+    """
+
+    def __init__(self, config: Optional[Dict[str, Any]] = None):
+        """
+        初始化媒体解码调度器
+
+        Args:
+            config: 完整配置
+                processing.decode.process_workers: 解码进程数
+                processing.decode.io_workers: I/O线程数
+                processing.decode.concurrency: 每种媒体类型同时解码的文件数
+        """
+        self.config = config or {}
+        decode_config = self.config.get("processing", {}).get("decode", {})
+        self.process_workers = decode_config.get("process_workers") or min(
+            4, os.cpu_count() or 1
+        )
+        self.io_workers = decode_config.get("io_workers", 8)
+        self.concurrency = {
+            **DEFAULT_DECODE_CONCURRENCY,
+            **decode_config.get("concurrency", {}),
+        }
+
+        self.image_preprocessor = ImagePreprocessor(self.config)
+
+        # 进程池和线程池在首次使用时创建
+        self._process_pool: Optional[ProcessPoolExecutor] = None
+        self._io_pool: Optional[ThreadPoolExecutor] = None
+        self._limiters: Dict[str, asyncio.Semaphore] = {}
+
+    def _get_process_pool(self) -> ProcessPoolExecutor:
+        if self._process_pool is None:
+            self._process_pool = create_process_pool(self.process_workers)
+        return self._process_pool
+
+    def _get_io_pool(self) -> ThreadPoolExecutor:
+        if self._io_pool is None:
+            self._io_pool = ThreadPoolExecutor(
+                max_workers=self.io_workers, thread_name_prefix="media_io"
+            )
+        return self._io_pool
+
+    def _limiter(self, media_type: str) -> asyncio.Semaphore:
+        if media_type not in self._limiters:
+            self._limiters[media_type] = asyncio.Semaphore(self.concurrency[media_type])
+        return self._limiters[media_type]
+
+    async def _run_decode(self, media_type: str, func, *args):
+        """在进程池中执行一次解码，占用一个该媒体类型的并发名额"""
+        loop = asyncio.get_running_loop()
+        async with self._limiter(media_type):
+            return await loop.run_in_executor(self._get_process_pool(), func, *args)
+
+    async def find_missing(self, paths: List[str]) -> List[str]:
+        """
+        在I/O线程池中检查文件是否存在
+
+        Args:
+            paths: 文件路径列表
+
+        Returns:
+            不存在的文件路径
+        """
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(
+            self._get_io_pool(),
+            lambda: [path for path in paths if not os.path.exists(path)],
+        )
+
+    async def decode_images(
+        self, image_paths: List[str], target_size: Optional[int] = None
+    ) -> List[Any]:
+        """
+        解码图像并缩放到模型输入分辨率
+
+        Args:
+            image_paths: 图像文件路径列表
+            target_size: 模型输入分辨率
+
+        Returns:
+            PIL Images列表
+        """
+        return await self.image_preprocessor.load_images_for_model(
+            image_paths,
+            target_size,
+            executor=self._get_process_pool(),
+            limiter=self._limiter("image"),
+        )
+
+    async def decode_audios(self, audio_paths: List[str]) -> List[bytes]:
+        """
+        预处理音频（48kHz单声道WAV）
+
+        Args:
+            audio_paths: 音频文件路径列表
+
+        Returns:
+            WAV数据列表，与输入顺序一致
+
+        Raises:
+            FileNotFoundError: 音频文件不存在
+            RuntimeError: 音频预处理失败
+        """
+        missing = await self.find_missing(audio_paths)
+        if missing:
+            raise FileNotFoundError(f"音频文件不存在: {missing[0]}")
+
+        results = await asyncio.gather(
+            *(
+                self._run_decode("audio", preprocess_audio_bytes, path, self.config)
+                for path in audio_paths
+            )
+        )
+        for path, audio_bytes in zip(audio_paths, results):
+            if not audio_bytes:
+                raise RuntimeError(f"音频预处理失败: {path}")
+        return results
+
+    async def decode_video_frames(
+        self, video_paths: List[str], max_frames: int = 3
+    ) -> List[Any]:
+        """
+        提取视频帧
+
+        Args:
+            video_paths: 视频文件路径列表
+            max_frames: 每个视频最多提取的帧数
+
+        Returns:
+            所有视频的帧（PIL Images），按视频顺序排列
+
+        Raises:
+            FileNotFoundError: 视频文件不存在
+            RuntimeError: 视频帧提取失败
+        """
+        missing = await self.find_missing(video_paths)
+        if missing:
+            raise FileNotFoundError(f"视频文件不存在: {missing[0]}")
+
+        # 视频预处理依赖帧提取等模块，只在解码视频时导入，图像和音频不受影响
+        from src.services.media.video_preprocessor import extract_video_frames
+
+        results = await asyncio.gather(
+            *(
+                self._run_decode(
+                    "video", extract_video_frames, path, max_frames, self.config
+                )
+                for path in video_paths
+            )
+        )
+        frames = []
+        for path, video_frames in zip(video_paths, results):
+            if not video_frames:
+                raise RuntimeError(f"视频帧提取失败: {path}")
+            frames.extend(video_frames)
+        return frames
+
+    def shutdown(self):
+        """关闭进程池和线程池"""
+        self.image_preprocessor.shutdown()
+        if self._process_pool is not None:
+            self._process_pool.shutdown(wait=False, cancel_futures=True)
+            self._process_pool = None
+        if self._io_pool is not None:
+            self._io_pool.shutdown(wait=False)
+            self._io_pool = None
@@ -0,0 +1,338 @@
+"""
+媒体探测服务
+
+职责：对每个文件版本只执行一次 ffprobe -show_streams -show_format，
+结果在进程内记忆并持久化到SQLite，按 (路径, 大小, 修改时间) 失效
+"""
+
+import json
+import logging
+import os
+import sqlite3
+import subprocess
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import Future
+from pathlib import Path
+from typing import Any, Dict, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+
+def parse_probe_output(output: str) -> Dict[str, Any]:
+    """
+    解析ffprobe的JSON输出
+
+    Args:
+        output: ffprobe标准输出
+
+    Returns:
+        媒体信息字典：duration, width, height, fps, video_codec, audio_codec,
+        sample_rate, has_video, has_audio, format_name, bit_rate
+    """
+    data = json.loads(output or "{}")
+    streams = data.get("streams", [])
+    fmt = data.get("format", {})
+
+    video = next(
+        (
+            s
+            for s in streams
+            if s.get("codec_type") == "video"
+            and not s.get("disposition", {}).get("attached_pic")
+        ),
+        None,
+    )
+    audio = next((s for s in streams if s.get("codec_type") == "audio"), None)
+
+    duration = fmt.get("duration") or (video or audio or {}).get("duration")
+    fps = None
+    if video and video.get("avg_frame_rate", "0/0") != "0/0":
+        num, _, den = video["avg_frame_rate"].partition("/")
+        if float(den or 1):
+            fps = float(num) / float(den or 1)
+
+    return {
+        "duration": float(duration) if duration else None,
+        "width": video.get("width") if video else None,
+        "height": video.get("height") if video else None,
+        "fps": fps,
+        "video_codec": video.get("codec_name") if video else None,
+        "audio_codec": audio.get("codec_name") if audio else None,
+        "sample_rate": (
+            int(audio["sample_rate"]) if audio and audio.get("sample_rate") else None
+        ),
+        "has_video": video is not None,
+        "has_audio": audio is not None,
+        "format_name": fmt.get("format_name"),
+        "bit_rate": int(fmt["bit_rate"]) if fmt.get("bit_rate") else None,
+    }
+
+
+class MediaProbe:
+    """
+    媒体探测服务
+
+    查询顺序：进程内LRU -> SQLite -> ffprobe。同一文件的并发探测只执行一次，
+    探测失败的结果只在进程内记忆（不持久化），避免对非媒体文件反复调用ffprobe。
+    """
+
+    MEMO_SIZE = 4096
+
+    def __init__(self, db_path: Optional[str] = None, timeout: float = 30):
+        """
+        初始化媒体探测服务
+
+        Args:
+            db_path: SQLite数据库路径，为None时只使用进程内缓存
+            timeout: ffprobe超时时间（秒）
+        """
+        self.db_path = db_path
+        self.timeout = timeout
+
+        self._memo: "OrderedDict[Tuple[str, int, int], Optional[Dict[str, Any]]]" = (
+            OrderedDict()
+        )
+        self._inflight: Dict[Tuple[str, int, int], Future] = {}
+        self._lock = threading.Lock()
+        self._db_lock = threading.Lock()
+        self._conn: Optional[sqlite3.Connection] = None
+
+        self.memo_hits = 0
+        self.db_hits = 0
+        self.probe_count = 0
+
+        if db_path:
+            self._init_db()
+
+    def _init_db(self) -> None:
+        """初始化数据库"""
+        try:
+            Path(self.db_path).parent.mkdir(parents=True, exist_ok=True)
+            self._conn = sqlite3.connect(self.db_path, check_same_thread=False)
+            self._conn.execute("PRAGMA journal_mode=WAL")
+            self._conn.execute(
+                """
+                CREATE TABLE IF NOT EXISTS media_probe (
+                    path TEXT PRIMARY KEY,
+                    size INTEGER NOT NULL,
+                    mtime_ns INTEGER NOT NULL,
+                    info TEXT NOT NULL,
+                    probed_at REAL NOT NULL
+                )
+            """
+            )
+            self._conn.commit()
+        except Exception as e:
+            logger.warning(f"媒体探测数据库不可用，仅使用进程内缓存: {e}")
+            self._conn = None
+
+    @staticmethod
+    def _version_key(file_path: str) -> Optional[Tuple[str, int, int]]:
+        try:
+            stat = os.stat(file_path)
+        except OSError:
+            return None
+        return (os.path.abspath(file_path), stat.st_size, stat.st_mtime_ns)
+
+    def probe(self, file_path: str) -> Optional[Dict[str, Any]]:
+        """
+        获取媒体信息
+
+        Args:
+            file_path: 媒体文件路径
+
+        Returns:
+            媒体信息字典（见 parse_probe_output），文件不存在或探测失败时返回None
+        """
+        key = self._version_key(file_path)
+        if key is None:
+            return None
+
+        with self._lock:
+            if key in self._memo:
+                self._memo.move_to_end(key)
+                self.memo_hits += 1
+                return self._memo[key]
+
+            future = self._inflight.get(key)
+            owner = future is None
+            if owner:
+                future = Future()
+                self._inflight[key] = future
+
+        if not owner:
+            return future.result()
+
+        try:
+            info = self._load(key)
+            if info is not None:
+                self.db_hits += 1
+            else:
+                info = self._run_ffprobe(file_path)
+                if info is not None:
+                    self._save(key, info)
+            self._remember(key, info)
+            future.set_result(info)
+            return info
+        except Exception as e:
+            future.set_exception(e)
+            raise
+        finally:
+            with self._lock:
+                self._inflight.pop(key, None)
+
+    def get_duration(self, file_path: str) -> Optional[float]:
+        """
+        获取媒体时长
+
+        Args:
+            file_path: 媒体文件路径
+
+        Returns:
+            时长（秒），无法获取时返回None
+        """
+        info = self.probe(file_path)
+        return info.get("duration") if info else None
+
+    def _remember(self, key: Tuple[str, int, int], info: Optional[Dict[str, Any]]) -> None:
+        with self._lock:
+            self._memo[key] = info
+            self._memo.move_to_end(key)
+            while len(self._memo) > self.MEMO_SIZE:
+                self._memo.popitem(last=False)
+
+    def _run_ffprobe(self, file_path: str) -> Optional[Dict[str, Any]]:
+        cmd = [
+            "ffprobe",
+            "-v",
+            "error",
+            "-print_format",
+            "json",
+            "-show_streams",
+            "-show_format",
+            file_path,
+        ]
+        self.probe_count += 1
+        try:
+            result = subprocess.run(
+                cmd, capture_output=True, text=True, timeout=self.timeout
+            )
+        except (OSError, subprocess.TimeoutExpired) as e:
+            logger.debug(f"ffprobe执行失败: {file_path}, {e}")
+            return None
+
+        if result.returncode != 0:
+            logger.debug(f"ffprobe返回错误: {file_path}, {result.stderr}")
+            return None
+
+        try:
+            return parse_probe_output(result.stdout)
+        except (ValueError, KeyError) as e:
+            logger.debug(f"解析ffprobe输出失败: {file_path}, {e}")
+            return None
+
+    def _load(self, key: Tuple[str, int, int]) -> Optional[Dict[str, Any]]:
+        if self._conn is None:
+            return None
+        try:
+            with self._db_lock:
+                row = self._conn.execute(
+                    "SELECT info FROM media_probe WHERE path = ? AND size = ? AND mtime_ns = ?",
+                    key,
+                ).fetchone()
+            return json.loads(row[0]) if row else None
+        except Exception as e:
+            logger.debug(f"读取媒体探测缓存失败: {key[0]}, {e}")
+            return None
+
+    def _save(self, key: Tuple[str, int, int], info: Dict[str, Any]) -> None:
+        if self._conn is None:
+            return
+        try:
+            with self._db_lock:
+                # 以路径为主键，新版本直接覆盖旧版本
+                self._conn.execute(
+                    "INSERT OR REPLACE INTO media_probe (path, size, mtime_ns, info, probed_at) "
+                    "VALUES (?, ?, ?, ?, ?)",
+                    (*key, json.dumps(info), time.time()),
+                )
+                self._conn.commit()
+        except Exception as e:
+            logger.debug(f"写入媒体探测缓存失败: {key[0]}, {e}")
+
+    def invalidate(self, file_path: str) -> None:
+        """
+        删除文件的探测结果（文件被删除时调用）
+
+        Args:
+            file_path: 媒体文件路径
+        """
+        path = os.path.abspath(file_path)
+        with self._lock:
+            for key in [k for k in self._memo if k[0] == path]:
+                del self._memo[key]
+        if self._conn is not None:
+            with self._db_lock:
+                self._conn.execute("DELETE FROM media_probe WHERE path = ?", (path,))
+                self._conn.commit()
+
+    def get_stats(self) -> Dict[str, int]:
+        """获取探测统计信息"""
+        with self._lock:
+            memo_size = len(self._memo)
+        return {
+            "memo_size": memo_size,
+            "memo_hits": self.memo_hits,
+            "db_hits": self.db_hits,
+            "probe_count": self.probe_count,
+        }
+
+    def close(self) -> None:
+        """关闭数据库连接"""
+        if self._conn is not None:
+            with self._db_lock:
+                self._conn.close()
+                self._conn = None
+
+
+# 全局媒体探测服务实例
+_media_probe: Optional[MediaProbe] = None
+_media_probe_lock = threading.Lock()
+
+
+def initialize_media_probe(db_path: Optional[str] = None) -> MediaProbe:
+    """
+    初始化全局媒体探测服务（服务启动时按配置调用）
+
+    Args:
+        db_path: SQLite数据库路径，为None时只使用进程内缓存
+
+    Returns:
+        媒体探测服务实例
+    """
+    global _media_probe
+    with _media_probe_lock:
+        if _media_probe is not None:
+            _media_probe.close()
+        _media_probe = MediaProbe(db_path)
+        return _media_probe
+
+
+def get_media_probe() -> MediaProbe:
+    """
+    获取全局媒体探测服务实例
+
+    未调用initialize_media_probe时创建只使用进程内缓存的实例，
+    不会在工作目录下创建数据库文件。
+
+    Returns:
+        媒体探测服务实例
+    """
+    global _media_probe
+    if _media_probe is None:
+        with _media_probe_lock:
+            if _media_probe is None:
+                _media_probe = MediaProbe(None)
+    return _media_probe
@@ -3,10 +3,13 @@ import sys
 import logging
 import time
 import hashlib
-import subprocess
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor
 from typing import Dict, Any, List, Optional, Tuple
 from pathlib import Path
 
+from src.services.media.media_probe import MediaProbe, get_media_probe
+
 # 设置日志
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
@@ -66,11 +69,36 @@ def check_duplicate_file(
         return None
 
 
+def create_process_pool(max_workers: int) -> ProcessPoolExecutor:
+    """
+    创建媒体解码进程池
+
+    服务进程中已有模型推理线程，直接fork可能复制持有中的锁导致子进程死锁，
+    因此优先使用forkserver（从干净的服务进程fork），不支持时使用spawn。
+
+    Args:
+        max_workers: 进程数
+
+    Returns:
+        进程池
+    """
+    methods = multiprocessing.get_all_start_methods()
+    method = "forkserver" if "forkserver" in methods else "spawn"
+    return ProcessPoolExecutor(
+        max_workers=max_workers, mp_context=multiprocessing.get_context(method)
+    )
+
+
 class MediaInfoHelper:
     """媒体信息帮助类"""
 
-    def __init__(self, config: Optional[Dict[str, Any]] = None):
+    def __init__(
+        self,
+        config: Optional[Dict[str, Any]] = None,
+        media_probe: Optional[MediaProbe] = None,
+    ):
         self.config = config or {}
+        self.media_probe = media_probe or get_media_probe()
         self.supported_media_types = {
             "image": ["jpg", "jpeg", "png", "gif", "bmp", "webp"],
             "video": ["mp4", "avi", "mkv", "mov", "wmv", "flv"],
@@ -142,6 +170,13 @@ class MediaInfoHelper:
             # 添加媒体特定信息
             if media_type in ["audio", "video"]:
                 media_info["duration"] = self.get_media_duration(file_path)
+                probe_info = self.media_probe.probe(file_path) or {}
+                if media_type == "video":
+                    media_info["width"] = probe_info.get("width")
+                    media_info["height"] = probe_info.get("height")
+                    media_info["fps"] = probe_info.get("fps")
+                else:
+                    media_info["sample_rate"] = probe_info.get("sample_rate")
 
             return media_info
         except Exception as e:
@@ -149,25 +184,9 @@ class MediaInfoHelper:
             return {}
 
     def _get_duration_with_ffprobe(self, file_path: str) -> Optional[float]:
-        """使用ffprobe获取媒体时长"""
+        """使用共享的媒体探测服务获取媒体时长"""
         try:
-            result = subprocess.run(
-                [
-                    "ffprobe",
-                    "-v",
-                    "quiet",
-                    "-show_entries",
-                    "format=duration",
-                    "-of",
-                    "csv=p=0",
-                    file_path,
-                ],
-                capture_output=True,
-                text=True,
-                check=True,
-            )
-            duration_str = result.stdout.strip()
-            return float(duration_str) if duration_str else None
+            return self.media_probe.get_duration(file_path)
         except Exception as e:
             logger.debug(f"ffprobe获取时长失败: {file_path}, {e}")
             return None
@@ -0,0 +1,569 @@
+"""
+缩略图服务
+
+职责：按需渲染指定尺寸的缩略图并写入内容寻址缓存
+首次访问时渲染，之后直接返回缓存的数据块，不查询数据库
+"""
+
+import hashlib
+import io
+import logging
+import os
+import subprocess
+import threading
+from concurrent.futures import Future, ThreadPoolExecutor
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Optional
+
+from src.data.generators.ffmpeg_pool import (
+    PRIORITY_BACKGROUND,
+    PRIORITY_VISIBLE,
+    FFmpegWorkerPool,
+    get_ffmpeg_pool,
+)
+from src.services.cache import CacheConfig, CacheManager
+
+logger = logging.getLogger(__name__)
+
+
+IMAGE_EXTENSIONS = {".jpg", ".jpeg", ".png", ".gif", ".bmp", ".webp", ".tiff"}
+VIDEO_EXTENSIONS = {".mp4", ".avi", ".mov", ".mkv", ".flv", ".wmv", ".webm"}
+AUDIO_EXTENSIONS = {".mp3", ".wav", ".flac", ".aac", ".ogg", ".m4a"}
+
+# 允许的渲染尺寸，请求尺寸向上取整到最近的档位，避免任意尺寸撑爆缓存
+SIZE_BUCKETS = (64, 128, 256, 512, 1024)
+
+
+@dataclass
+class Thumbnail:
+    """渲染完成的缩略图"""
+
+    etag: str  # 内容SHA256，作为强ETag
+    version: str  # 源文件版本令牌，源文件变化后随之变化
+    media_type: str
+    size: int
+    path: Optional[Path] = None  # 缓存数据块路径
+    data: Optional[bytes] = None  # 未进入缓存时直接携带数据
+
+
+class ThumbnailService:
+    """
+    缩略图服务
+
+    缓存键由源文件路径、大小、修改时间和渲染尺寸计算得到，源文件不变时
+    键不变，因此带版本令牌的URL可以被客户端永久缓存。同一缩略图的并发请求
+    只渲染一次。
+
+    视频和音频的ffmpeg命令提交到共享的FFmpeg工作池：按需请求以可见优先级执行，
+    索引阶段的预渲染以后台优先级执行；可见请求遇到正在后台渲染的同一缩略图时，
+    会把排队中的命令提前。
+
+    设置了预览生成器时，视频的预渲染用一次解码同时输出缩略图和预览片段。
+    """
+
+    def __init__(
+        self,
+        config: Dict,
+        cache_manager: Optional[CacheManager] = None,
+        pool: Optional[FFmpegWorkerPool] = None,
+        preview_generator: Optional[Any] = None,
+    ):
+        """
+        初始化缩略图服务
+
+        Args:
+            config: 配置字典（完整配置或只含相关键的字典）
+            cache_manager: 缓存管理器，为None时在cache_dir（或cache.cache_dir）下创建
+            pool: FFmpeg工作池，为None时使用进程内共享的工作池
+            preview_generator: 预览生成器，为None且indexing.video_previews开启时
+                在缓存目录的previews子目录下创建
+        """
+        indexing_config = config.get("indexing", {})
+        self.default_size = self.normalize_size(indexing_config.get("thumbnail_size", 256))
+        self.quality = config.get("thumbnail_quality", 85)
+        self.timeout = config.get("thumbnail_timeout", 30)
+        self.max_workers = config.get("thumbnail_workers") or min(4, os.cpu_count() or 1)
+
+        cache_dir = config.get("cache_dir") or config.get("cache", {}).get(
+            "cache_dir", "data/cache"
+        )
+        if cache_manager is None:
+            cache_manager = CacheManager(CacheConfig(), cache_dir=cache_dir)
+            cache_manager.initialize()
+        self.cache_manager = cache_manager
+        self.pool = pool or get_ffmpeg_pool()
+
+        if preview_generator is None and indexing_config.get("video_previews", False):
+            from src.data.generators.preview_generator import PreviewGenerator
+
+            preview_generator = PreviewGenerator(
+                {
+                    "output_dir": str(Path(cache_dir) / "previews"),
+                    "thumbnail_size": self.default_size,
+                },
+                pool=self.pool,
+            )
+        self.preview_generator = preview_generator
+        # 视频预渲染中的多路输出任务：缓存键 -> 缩略图写入缓存后完成的Future
+        self._asset_jobs: Dict[str, Future] = {}
+
+        self._inflight: Dict[str, Future] = {}
+        # 渲染中的缩略图：版本令牌 -> [优先级, 当前排队的工作池任务key]
+        self._rendering: Dict[str, List[Any]] = {}
+        self._lock = threading.Lock()
+        # 限制同时渲染的数量（单个请求与批量请求共享）
+        self._render_slots = threading.BoundedSemaphore(self.max_workers)
+        self._executor = ThreadPoolExecutor(
+            max_workers=self.max_workers, thread_name_prefix="thumbnail"
+        )
+        # 预渲染逐个执行，不占用按需请求的线程
+        self._background_executor = ThreadPoolExecutor(
+            max_workers=1, thread_name_prefix="thumbnail-prerender"
+        )
+
+        self.render_count = 0
+        self.hit_count = 0
+
+    @staticmethod
+    def normalize_size(size: Optional[int]) -> int:
+        """
+        将请求尺寸归一化到尺寸档位
+
+        Args:
+            size: 请求尺寸
+
+        Returns:
+            渲染尺寸
+        """
+        if not size:
+            return 256
+        for bucket in SIZE_BUCKETS:
+            if size <= bucket:
+                return bucket
+        return SIZE_BUCKETS[-1]
+
+    @staticmethod
+    def media_kind(file_path: str) -> Optional[str]:
+        """
+        根据扩展名判断媒体类型
+
+        Args:
+            file_path: 文件路径
+
+        Returns:
+            image/video/audio，不支持时返回None
+        """
+        suffix = Path(file_path).suffix.lower()
+        if suffix in IMAGE_EXTENSIONS:
+            return "image"
+        if suffix in VIDEO_EXTENSIONS:
+            return "video"
+        if suffix in AUDIO_EXTENSIONS:
+            return "audio"
+        return None
+
+    def get_version(self, file_path: str, size: Optional[int] = None) -> Optional[str]:
+        """
+        计算源文件版本令牌
+
+        Args:
+            file_path: 源文件路径
+            size: 渲染尺寸
+
+        Returns:
+            版本令牌，文件不存在时返回None
+        """
+        try:
+            stat = os.stat(file_path)
+        except OSError:
+            return None
+        size = self.normalize_size(size or self.default_size)
+        token = f"{os.path.abspath(file_path)}|{stat.st_size}|{stat.st_mtime_ns}|{size}"
+        return hashlib.sha1(token.encode("utf-8")).hexdigest()[:16]
+
+    def get_thumbnail(
+        self,
+        file_path: str,
+        size: Optional[int] = None,
+        priority: int = PRIORITY_VISIBLE,
+    ) -> Optional[Thumbnail]:
+        """
+        获取缩略图，缓存未命中时渲染
+
+        Args:
+            file_path: 源文件路径
+            size: 请求尺寸
+            priority: 渲染优先级（数值越小越先执行）
+
+        Returns:
+            缩略图，文件不存在、类型不支持或渲染失败时返回None
+        """
+        kind = self.media_kind(file_path)
+        if kind is None:
+            return None
+
+        size = self.normalize_size(size or self.default_size)
+        version = self.get_version(file_path, size)
+        if version is None:
+            return None
+
+        media_type = "image/png" if kind == "audio" else "image/jpeg"
+        cache_key = f"thumb/{version}"
+
+        cached = self._cached_thumbnail(cache_key, version, media_type, size)
+        if cached is not None:
+            self.hit_count += 1
+            return cached
+
+        with self._lock:
+            job = self._asset_jobs.get(cache_key)
+        if job is not None:
+            # 预渲染正在一次解码生成缩略图和预览，提前该任务并等待其写入缓存
+            self.preview_generator.prioritize([file_path], priority)
+            job.result()
+            cached = self._cached_thumbnail(cache_key, version, media_type, size)
+            if cached is not None:
+                return cached
+
+        # 合并同一缩略图的并发渲染
+        with self._lock:
+            future = self._inflight.get(cache_key)
+            owner = future is None
+            if owner:
+                future = Future()
+                self._inflight[cache_key] = future
+
+        if not owner:
+            self._promote(version, priority)
+            return future.result()
+
+        try:
+            result = self._render_and_store(
+                file_path, kind, size, version, media_type, priority
+            )
+            future.set_result(result)
+            return result
+        except Exception as e:
+            future.set_exception(e)
+            raise
+        finally:
+            with self._lock:
+                self._inflight.pop(cache_key, None)
+
+    def get_thumbnails(
+        self, file_paths: List[str], size: Optional[int] = None
+    ) -> Dict[str, Optional[Thumbnail]]:
+        """
+        批量获取缩略图，未命中的并行渲染
+
+        Args:
+            file_paths: 源文件路径列表
+            size: 请求尺寸
+
+        Returns:
+            {文件路径: 缩略图}
+        """
+        unique_paths = list(dict.fromkeys(file_paths))
+        futures = {
+            path: self._executor.submit(self._get_thumbnail_safe, path, size)
+            for path in unique_paths
+        }
+        return {path: future.result() for path, future in futures.items()}
+
+    def prerender(self, file_paths: Iterable[str], size: Optional[int] = None) -> int:
+        """
+        在后台预先渲染缩略图（索引阶段调用，不等待结果）
+
+        Args:
+            file_paths: 源文件路径列表
+            size: 渲染尺寸
+
+        Returns:
+            提交的文件数量
+        """
+        submitted = 0
+        for path in dict.fromkeys(file_paths):
+            kind = self.media_kind(path)
+            if kind is None:
+                continue
+            if kind == "video" and self._submit_assets(path, size):
+                submitted += 1
+                continue
+            self._background_executor.submit(
+                self._get_thumbnail_safe, path, size, PRIORITY_BACKGROUND
+            )
+            submitted += 1
+        return submitted
+
+    def get_preview(self, file_path: str) -> Optional[Path]:
+        """
+        获取视频预渲染时生成的预览片段
+
+        Args:
+            file_path: 源文件路径
+
+        Returns:
+            预览片段路径，未生成或源文件更新过时返回None
+        """
+        if self.preview_generator is None or self.media_kind(file_path) != "video":
+            return None
+        _, preview_path = self.preview_generator.get_asset_paths(file_path)
+        try:
+            if os.stat(preview_path).st_mtime_ns >= os.stat(file_path).st_mtime_ns:
+                return Path(preview_path)
+        except OSError:
+            pass
+        return None
+
+    def _submit_assets(self, file_path: str, size: Optional[int]) -> bool:
+        """
+        用预览生成器一次解码生成视频的缩略图和预览片段（后台优先级）
+
+        Args:
+            file_path: 视频文件路径
+            size: 渲染尺寸
+
+        Returns:
+            是否已交给预览生成器（或两者都已存在），False时按普通缩略图渲染
+        """
+        generator = self.preview_generator
+        size = self.normalize_size(size or self.default_size)
+        if generator is None or generator.thumbnail_size != size:
+            return False
+        version = self.get_version(file_path, size)
+        if version is None:
+            return False
+
+        cache_key = f"thumb/{version}"
+        need_thumbnail = (
+            self._cached_thumbnail(cache_key, version, "image/jpeg", size) is None
+        )
+        need_preview = self.get_preview(file_path) is None
+        if not need_thumbnail and not need_preview:
+            return True
+
+        stored: Future = Future()
+        with self._lock:
+            if cache_key in self._asset_jobs or cache_key in self._inflight:
+                return True
+            self._asset_jobs[cache_key] = stored
+        try:
+            job = generator.submit_assets(
+                file_path,
+                thumbnail=need_thumbnail,
+                preview=need_preview,
+                priority=PRIORITY_BACKGROUND,
+            )
+        except Exception as e:
+            logger.warning(f"提交缩略图和预览生成失败: {file_path}, {e}")
+            with self._lock:
+                self._asset_jobs.pop(cache_key, None)
+            stored.set_result(None)
+            return False
+
+        job.add_done_callback(lambda f: self._store_assets(cache_key, f, stored))
+        return True
+
+    def _store_assets(self, cache_key: str, job: Future, stored: Future) -> None:
+        """把多路输出生成的缩略图写入缓存（删除生成的中间文件）"""
+        try:
+            thumbnail_path = job.result().get("thumbnail_path")
+            if thumbnail_path:
+                data = Path(thumbnail_path).read_bytes()
+                os.remove(thumbnail_path)
+                if data and self.cache_manager.set(cache_key, data, "thumbnails"):
+                    self.render_count += 1
+        except Exception as e:
+            logger.warning(f"生成缩略图和预览失败: {cache_key}, {e}")
+        finally:
+            with self._lock:
+                self._asset_jobs.pop(cache_key, None)
+            stored.set_result(None)
+
+    def _cached_thumbnail(
+        self, cache_key: str, version: str, media_type: str, size: int
+    ) -> Optional[Thumbnail]:
+        """缓存中已有的缩略图，没有时返回None"""
+        path = self.cache_manager.get_path(cache_key, "thumbnails")
+        if path is None or not path.exists():
+            return None
+        return Thumbnail(
+            etag=path.parent.name + path.name,
+            version=version,
+            media_type=media_type,
+            size=size,
+            path=path,
+        )
+
+    def _get_thumbnail_safe(
+        self, file_path: str, size: Optional[int], priority: int = PRIORITY_VISIBLE
+    ) -> Optional[Thumbnail]:
+        try:
+            return self.get_thumbnail(file_path, size, priority)
+        except Exception as e:
+            logger.warning(f"生成缩略图失败: {file_path}, {e}")
+            return None
+
+    def _promote(self, version: str, priority: int) -> None:
+        """提升渲染中缩略图的优先级，排队中的ffmpeg命令随之提前"""
+        with self._lock:
+            state = self._rendering.get(version)
+            if state is None or priority >= state[0]:
+                return
+            state[0] = priority
+            key = state[1]
+        if key is not None:
+            self.pool.reprioritize(key, priority)
+
+    def _render_and_store(
+        self,
+        file_path: str,
+        kind: str,
+        size: int,
+        version: str,
+        media_type: str,
+        priority: int = PRIORITY_VISIBLE,
+    ) -> Optional[Thumbnail]:
+        with self._lock:
+            self._rendering[version] = [priority, None]
+        try:
+            with self._render_slots:
+                if kind == "image":
+                    data = self._render_image(file_path, size)
+                elif kind == "video":
+                    data = self._render_video(file_path, size, version)
+                else:
+                    data = self._render_audio(file_path, size, version)
+        finally:
+            with self._lock:
+                self._rendering.pop(version, None)
+
+        if not data:
+            return None
+        self.render_count += 1
+
+        cache_key = f"thumb/{version}"
+        if self.cache_manager.set(cache_key, data, "thumbnails"):
+            cached = self._cached_thumbnail(cache_key, version, media_type, size)
+            if cached is not None:
+                return cached
+
+        # 被准入策略拒绝时直接返回渲染结果
+        return Thumbnail(
+            etag=hashlib.sha256(data).hexdigest(),
+            version=version,
+            media_type=media_type,
+            size=size,
+            data=data,
+        )
+
+    def _render_image(self, file_path: str, size: int) -> Optional[bytes]:
+        """渲染图像缩略图，JPEG使用draft模式在解码阶段缩小"""
+        from PIL import Image, ImageOps
+
+        with Image.open(file_path) as img:
+            img.draft("RGB", (size, size))
+            img = ImageOps.exif_transpose(img)
+            img.thumbnail((size, size))
+            if img.mode != "RGB":
+                img = img.convert("RGB")
+
+            buffer = io.BytesIO()
+            img.save(buffer, format="JPEG", quality=self.quality, optimize=True)
+            return buffer.getvalue()
+
+    def _render_video(
+        self, file_path: str, size: int, version: Optional[str] = None
+    ) -> Optional[bytes]:
+        """截取视频单帧，先尝试第1秒，过短的视频退回到首帧"""
+        for seek in ("1", "0"):
+            cmd = [
+                "ffmpeg", "-v", "error",
+                "-ss", seek, "-i", file_path,
+                "-frames:v", "1",
+                "-vf", f"scale={size}:{size}:force_original_aspect_ratio=decrease",
+                "-f", "image2pipe", "-vcodec", "mjpeg", "-q:v", "4",
+                "pipe:1",
+            ]
+            data = self._run_ffmpeg(cmd, version, f"seek{seek}")
+            if data:
+                return data
+        return None
+
+    def _render_audio(
+        self, file_path: str, size: int, version: Optional[str] = None
+    ) -> Optional[bytes]:
+        """渲染音频波形图"""
+        cmd = [
+            "ffmpeg", "-v", "error",
+            "-i", file_path,
+            "-filter_complex", f"showwavespic=s={size}x{max(size // 4, 16)}",
+            "-frames:v", "1",
+            "-f", "image2pipe", "-vcodec", "png",
+            "pipe:1",
+        ]
+        return self._run_ffmpeg(cmd, version, "wave")
+
+    def _run_ffmpeg(
+        self, cmd: List[str], version: Optional[str] = None, step: str = ""
+    ) -> Optional[bytes]:
+        """在共享工作池中执行ffmpeg，输出图像数据到管道"""
+        priority = PRIORITY_VISIBLE
+        key = None
+        if version is not None:
+            key = f"thumb:{version}:{step}"
+            with self._lock:
+                state = self._rendering.get(version)
+                if state is not None:
+                    priority = state[0]
+                    state[1] = key
+        try:
+            result = self.pool.run(
+                cmd, priority, key=key, text=False, timeout=self.timeout
+            )
+        except (OSError, subprocess.TimeoutExpired) as e:
+            logger.warning(f"ffmpeg执行失败: {e}")
+            return None
+        if result.returncode != 0:
+            logger.debug(f"ffmpeg返回错误: {result.stderr.decode(errors='ignore')}")
+            return None
+        return result.stdout or None
+
+    def get_stats(self) -> Dict[str, int]:
+        """获取缩略图服务统计信息"""
+        with self._lock:
+            inflight = len(self._inflight)
+        return {
+            "render_count": self.render_count,
+            "hit_count": self.hit_count,
+            "inflight": inflight,
+        }
+
+    def shutdown(self) -> None:
+        """关闭渲染线程池（共享的FFmpeg工作池不随之关闭）"""
+        self._executor.shutdown(wait=False)
+        self._background_executor.shutdown(wait=False, cancel_futures=True)
+
+
+# 进程内共享的缩略图服务
+_thumbnail_service: Optional[ThumbnailService] = None
+_thumbnail_service_lock = threading.Lock()
+
+
+def get_thumbnail_service(config: Optional[Dict] = None) -> ThumbnailService:
+    """
+    获取进程内共享的缩略图服务，首次调用时按配置创建
+
+    Args:
+        config: 配置字典，只在首次调用时使用
+
+    Returns:
+        缩略图服务实例
+    """
+    global _thumbnail_service
+    if _thumbnail_service is None:
+        with _thumbnail_service_lock:
+            if _thumbnail_service is None:
+                _thumbnail_service = ThumbnailService(config or {})
+    return _thumbnail_service
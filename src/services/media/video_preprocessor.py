@@ -108,7 +108,7 @@ class VideoPreprocessor:
             is_short_video = duration <= self.short_video_threshold
 
             # 处理视频：提取关键帧和分段
-            segments = self._extract_video_segments(video_path, is_short_video)
+            segments = self._extract_video_segments(video_path, is_short_video, duration)
 
             return {
                 "status": "success",
@@ -124,7 +124,7 @@ class VideoPreprocessor:
             return {"status": "error", "error": str(e), "file_path": video_path}
 
     def _extract_video_segments(
-        self, video_path: str, is_short_video: bool
+        self, video_path: str, is_short_video: bool, duration: Optional[float] = None
     ) -> List[Dict[str, Any]]:
         """
         提取视频分段
@@ -132,14 +132,14 @@ class VideoPreprocessor:
         Args:
             video_path: 视频文件路径
             is_short_video: 是否为短视频
+            duration: 视频时长，调用方已获取时传入以避免重复探测
 
         Returns:
             分段结果
         """
         try:
-            # 获取视频信息
-            video_info = self.media_info_helper.get_media_info(video_path)
-            duration = video_info.get("duration", 0.0)
+            if duration is None:
+                duration = self.media_info_helper.get_media_duration(video_path)
 
             segments = []
 
@@ -411,13 +411,12 @@ class VideoPreprocessor:
                 logger.error(f"Video file not found: {video_path}")
                 return frames
 
-            # 获取视频信息
-            video_info = self.media_info_helper.get_media_info(video_path)
-            duration = video_info.get("duration", 0.0)
+            # 获取视频时长（共享探测缓存）
+            duration = self.media_info_helper.get_media_duration(video_path)
 
             # 处理视频获取分段
             is_short_video = duration <= self.short_video_threshold
-            segments = self._extract_video_segments(video_path, is_short_video)
+            segments = self._extract_video_segments(video_path, is_short_video, duration)
 
             cap = cv2.VideoCapture(video_path)
 
@@ -452,3 +451,27 @@ class VideoPreprocessor:
         except Exception as e:
             logger.error(f"Failed to extract frames from video: {e}")
             return frames
+
+
+# 解码进程内复用的预处理器
+_worker_preprocessor: Optional[VideoPreprocessor] = None
+
+
+def extract_video_frames(
+    video_path: str, max_frames: int = 3, config: Optional[Dict[str, Any]] = None
+) -> List[Any]:
+    """
+    提取视频帧（在解码进程池中执行）
+
+    Args:
+        video_path: 视频文件路径
+        max_frames: 最大返回帧数
+        config: 配置字典
+
+    Returns:
+        PIL Images列表
+    """
+    global _worker_preprocessor
+    if _worker_preprocessor is None:
+        _worker_preprocessor = VideoPreprocessor(config)
+    return _worker_preprocessor.get_video_frames(video_path, max_frames=max_frames)
@@ -8,20 +8,26 @@ import re
 from typing import List, Tuple, Optional
 import logging
 
+from src.services.media.media_probe import MediaProbe, get_media_probe
+
 logger = logging.getLogger(__name__)
 
 
 class VideoSceneDetector:
     """视频场景检测器：使用FFmpeg检测视频场景变化"""
 
-    def __init__(self, scene_threshold: float = 0.3):
+    def __init__(
+        self, scene_threshold: float = 0.3, media_probe: Optional[MediaProbe] = None
+    ):
         """
         初始化场景检测器
 
         Args:
             scene_threshold: 场景检测阈值（0-1），值越大检测越严格
+            media_probe: 媒体探测服务，默认使用全局共享实例
         """
         self.scene_threshold = scene_threshold
+        self.media_probe = media_probe or get_media_probe()
 
         logger.info(f"VideoSceneDetector initialized with threshold {scene_threshold}")
 
@@ -139,20 +145,10 @@ class VideoSceneDetector:
         Returns:
             视频时长（秒）
         """
-        cmd = [
-            "ffprobe",
-            "-v",
-            "error",
-            "-show_entries",
-            "format=duration",
-            "-of",
-            "default=noprint_wrappers=1:nokey=1",
-            video_path,
-        ]
-
         try:
-            result = subprocess.run(cmd, capture_output=True, text=True, check=True)
-            duration = float(result.stdout.strip())
+            duration = self.media_probe.get_duration(video_path)
+            if duration is None:
+                raise RuntimeError("无法获取视频时长")
             return duration
         except Exception as e:
             logger.error(f"Error getting video duration for {video_path}: {e}")
@@ -0,0 +1,17 @@
+# -*- coding: utf-8 -*-
+"""
+向量迁移服务模块
+
+提供切换模型后的后台重嵌入迁移。
+"""
+
+from src.utils.lazy_import import lazy_exports
+
+__getattr__, __dir__ = lazy_exports(
+    __name__,
+    {
+        "ReembeddingMigration": ".reembedding_migration",
+    },
+)
+
+__all__ = ["ReembeddingMigration"]
@@ -0,0 +1,486 @@
+# -*- coding: utf-8 -*-
+"""
+向量重嵌入迁移
+
+切换图像/视频模型后，在后台用新模型重新向量化旧表中的条目，写入模型专用的新表：
+- 内容相同的文件（内容哈希相同）只解码和向量化一次
+- 条目ID和元数据原样保留，只替换向量
+- 迁移期间检索仍使用旧表，覆盖率达标后一次性切换检索表和默认模型
+- 旧表中的音频条目（CLAP向量）移入音频模型专用的表，不进入新模型的表
+- 其他模态的条目维度与新模型不一致时无法放入新表，不做切换
+"""
+
+import asyncio
+import json
+import logging
+import os
+import time
+from typing import Any, Dict, List, Optional, Tuple
+
+from src.core.vector.table_registry import VectorTableRegistry
+from src.core.vector.vector_store import VectorStore
+
+logger = logging.getLogger(__name__)
+
+# 需要用新模型重新向量化的模态，其他模态由各自的模型生成：音频条目移入音频专用表，
+# 其余条目维度一致时原样复制，维度不一致时这些条目在新表中无法检索，迁移保持使用旧表
+REEMBED_MODALITIES = ("image", "video")
+
+
+class ReembeddingMigration:
+    """
+    向量重嵌入迁移
+
+    迁移进度保存在向量表注册表中，目标表中已有的条目不会重复处理，
+    中断后再次启动会从未迁移的条目继续。
+    """
+
+    def __init__(
+        self,
+        vector_store: VectorStore,
+        embedding_engine,
+        db_manager=None,
+        config: Optional[Dict[str, Any]] = None,
+        audio_vector_store: Optional[VectorStore] = None,
+    ):
+        """
+        初始化迁移服务
+
+        Args:
+            vector_store: 当前提供检索的向量存储
+            embedding_engine: 向量化引擎
+            db_manager: 数据库管理器（用于查询文件内容哈希）
+            config: 完整配置
+                database.migration.batch_size: 每批处理的条目数
+                database.migration.cutover_coverage: 切换所需的最低覆盖率
+            audio_vector_store: 音频模型专用的向量存储，旧表中的音频条目移入其中
+        """
+        self.vector_store = vector_store
+        self.embedding_engine = embedding_engine
+        self.db_manager = db_manager
+        self.config = config or {}
+
+        migration_config = self.config.get("database", {}).get("migration", {})
+        self.batch_size = migration_config.get("batch_size", 32)
+        self.cutover_coverage = migration_config.get("cutover_coverage", 1.0)
+
+        # 与检索表是同一张表时（未按模型分表）音频条目无处可移
+        self.audio_vector_store = (
+            audio_vector_store if audio_vector_store is not vector_store else None
+        )
+
+        self.registry = VectorTableRegistry(str(vector_store.data_dir))
+        self.target_store: Optional[VectorStore] = None
+        self._task: Optional[asyncio.Task] = None
+        self._status: Dict[str, Any] = {"state": "idle"}
+
+    def is_running(self) -> bool:
+        """是否有迁移正在进行"""
+        return self._task is not None and not self._task.done()
+
+    def get_status(self) -> Dict[str, Any]:
+        """
+        获取迁移状态
+
+        Returns:
+            迁移状态；当前进程没有迁移时返回注册表中保存的上一次状态
+        """
+        if self._status.get("state") == "idle":
+            saved = self.registry.get_migration(self.vector_store.base_collection_name)
+            if saved:
+                return saved
+        return dict(self._status)
+
+    def start(self, target_model_id: str) -> Dict[str, Any]:
+        """
+        在后台启动迁移
+
+        Args:
+            target_model_id: 目标模型ID
+
+        Returns:
+            迁移状态
+
+        Raises:
+            RuntimeError: 已有迁移正在进行
+            ValueError: 目标模型与当前模型相同
+        """
+        if self.is_running():
+            raise RuntimeError(
+                f"已有迁移正在进行: {self._status.get('target_model')}"
+            )
+        # 未分表的旧表也可以迁移到同一模型的专用表
+        if (
+            target_model_id == self.vector_store.model_id
+            and self.vector_store.collection_name
+            != self.vector_store.base_collection_name
+        ):
+            raise ValueError(f"当前已使用模型 {target_model_id}，无需迁移")
+
+        self._status = {
+            "state": "running",
+            "source_table": self.vector_store.collection_name,
+            "target_model": target_model_id,
+            "started_at": time.time(),
+        }
+        self._task = asyncio.create_task(self.run(target_model_id))
+        return dict(self._status)
+
+    async def cancel(self) -> bool:
+        """
+        取消正在进行的迁移（已写入目标表的条目保留，下次启动时继续）
+
+        Returns:
+            是否取消了迁移
+        """
+        if not self.is_running():
+            return False
+        self._task.cancel()
+        try:
+            await self._task
+        except asyncio.CancelledError:
+            pass
+        return True
+
+    async def run(self, target_model_id: str) -> Dict[str, Any]:
+        """
+        执行迁移，覆盖率达标后切换检索表
+
+        Args:
+            target_model_id: 目标模型ID
+
+        Returns:
+            迁移结束时的状态
+        """
+        status = self._status
+        status.update(
+            {
+                "state": "running",
+                "source_table": self.vector_store.collection_name,
+                "target_model": target_model_id,
+                "total": 0,
+                "migrated": 0,
+                "embedded": 0,
+                "reused": 0,
+                "copied": 0,
+                "relocated": 0,
+                "missing": 0,
+                "incompatible": 0,
+                "failed": 0,
+                "coverage": 0.0,
+            }
+        )
+        status.setdefault("started_at", time.time())
+        status.pop("error", None)
+        skipped: Dict[str, str] = {}
+
+        try:
+            await self.embedding_engine.ensure_model_registered(target_model_id)
+            dimension = self.embedding_engine.get_embedding_dim(target_model_id)
+            self.target_store = VectorStore.for_model(
+                self.vector_store.config, target_model_id, dimension
+            )
+            if self.target_store.collection_name == self.vector_store.collection_name:
+                raise ValueError(f"当前已使用模型 {target_model_id}，无需迁移")
+            status.update(
+                {"target_table": self.target_store.collection_name, "dimension": dimension}
+            )
+            logger.info(
+                f"开始向量迁移: {status['source_table']} -> {status['target_table']}"
+            )
+
+            while True:
+                source_rows = self.vector_store.scan_rows()
+                target_ids = set(self.target_store.scan_rows(["id"])["id"])
+                pending = source_rows[
+                    ~source_rows["id"].isin(target_ids)
+                    & ~source_rows["id"].isin(skipped.keys())
+                ]
+                self._update_counts(source_rows, target_ids, skipped)
+
+                if pending.empty:
+                    # 从读取源表到切换之间没有await，切换前写入源表的条目都已迁移
+                    self._remove_stale(source_rows, target_ids)
+                    self._cutover(target_model_id, dimension)
+                    break
+
+                for start in range(0, len(pending), self.batch_size):
+                    batch = pending.iloc[start : start + self.batch_size]
+                    await self._migrate_batch(batch, target_model_id, dimension, skipped)
+                    status["migrated"] += sum(
+                        1 for row_id in batch["id"] if row_id not in skipped
+                    )
+                    self._save_status()
+        except asyncio.CancelledError:
+            status["state"] = "cancelled"
+            raise
+        except Exception as e:
+            logger.error(f"向量迁移失败: {e}")
+            status.update({"state": "failed", "error": str(e)})
+        finally:
+            status["finished_at"] = time.time()
+            self._save_status()
+
+        return dict(status)
+
+    async def _migrate_batch(
+        self,
+        rows,
+        target_model_id: str,
+        dimension: int,
+        skipped: Dict[str, str],
+    ) -> None:
+        """
+        迁移一批条目：按内容哈希分组后每组只向量化一次
+
+        Args:
+            rows: 源表条目（DataFrame）
+            target_model_id: 目标模型ID
+            dimension: 目标向量维度
+            skipped: 跳过的条目ID -> 原因，就地更新
+        """
+        records = rows.to_dict("records")
+        reembed = [r for r in records if r["modality"] in REEMBED_MODALITIES]
+        audio = [r for r in records if r["modality"] == "audio"]
+        if self.audio_vector_store is not None and audio:
+            self._relocate_audio(audio, skipped)
+        others = [
+            r
+            for r in records
+            if r["modality"] not in REEMBED_MODALITIES and r["id"] not in skipped
+        ]
+
+        # 文件检查和哈希查询都是阻塞I/O，放到线程中执行
+        keys, missing = await asyncio.to_thread(self._resolve_contents, reembed)
+        groups: Dict[Tuple, List[Dict[str, Any]]] = {}
+        for record, key in zip(reembed, keys):
+            if record["file_path"] in missing:
+                skipped[record["id"]] = "missing"
+                continue
+            groups.setdefault(key, []).append(record)
+
+        embeddings = await self._embed_groups(groups, target_model_id)
+
+        vectors = []
+        for key, group in groups.items():
+            vector = embeddings.get(key)
+            if vector is None:
+                for record in group:
+                    skipped[record["id"]] = "failed"
+                continue
+            self._status["embedded"] += 1
+            self._status["reused"] += len(group) - 1
+            vectors.extend(self._with_vector(record, vector) for record in group)
+
+        for record in others:
+            source = self.vector_store.get_vector(record["id"])
+            if source is None or len(source["vector"]) != dimension:
+                skipped[record["id"]] = "incompatible"
+                continue
+            self._status["copied"] += 1
+            vectors.append(self._with_vector(record, source["vector"]))
+
+        if vectors:
+            self.target_store.insert_vectors(vectors)
+
+    def _relocate_audio(
+        self, records: List[Dict[str, Any]], skipped: Dict[str, str]
+    ) -> None:
+        """
+        把音频条目移入音频专用表（已在其中的条目不重复写入）
+
+        音频向量由音频模型生成，维度与音频专用表不一致的条目留给后续按维度处理
+
+        Args:
+            records: 源表中的音频条目
+            skipped: 跳过的条目ID -> 原因，就地更新
+        """
+        store = self.audio_vector_store
+        existing = set(store.scan_rows(["id"])["id"])
+        vectors = []
+        for record in records:
+            source = self.vector_store.get_vector(record["id"])
+            if source is None or len(source["vector"]) != store.vector_dimension:
+                continue
+            skipped[record["id"]] = "relocated"
+            self._status["relocated"] += 1
+            if record["id"] not in existing:
+                vectors.append(self._with_vector(record, source["vector"]))
+        if vectors:
+            store.insert_vectors(vectors)
+
+    def _resolve_contents(self, records: List[Dict[str, Any]]):
+        """
+        确定每个条目的内容键，并找出已不存在的文件
+
+        Args:
+            records: 源表条目
+
+        Returns:
+            (内容键列表, 不存在的文件路径集合)
+        """
+        hashes: Dict[str, str] = {}
+        keys = []
+        for record in records:
+            file_id = record.get("file_id")
+            if file_id and file_id not in hashes:
+                metadata = (
+                    self.db_manager.get_file_metadata(file_id)
+                    if self.db_manager is not None
+                    else None
+                )
+                hashes[file_id] = (metadata or {}).get("file_hash") or ""
+            content = hashes.get(file_id) or record["file_path"]
+            keys.append(
+                (
+                    content,
+                    record["modality"],
+                    record.get("start_time", 0.0),
+                    record.get("end_time", 0.0),
+                )
+            )
+        paths = {record["file_path"] for record in records}
+        missing = {path for path in paths if not os.path.exists(path)}
+        return keys, missing
+
+    async def _embed_groups(
+        self, groups: Dict[Tuple, List[Dict[str, Any]]], target_model_id: str
+    ) -> Dict[Tuple, List[float]]:
+        """
+        用目标模型向量化每组内容（每组只解码第一个文件）
+
+        Args:
+            groups: 内容键 -> 条目列表
+            target_model_id: 目标模型ID
+
+        Returns:
+            内容键 -> 向量，失败的组不在结果中
+        """
+        embeddings: Dict[Tuple, List[float]] = {}
+        image_keys = [key for key in groups if key[1] == "image"]
+        if image_keys:
+            paths = [groups[key][0]["file_path"] for key in image_keys]
+            try:
+                vectors = await self.embedding_engine.embed_images(
+                    paths, model_type=target_model_id
+                )
+                embeddings.update(zip(image_keys, vectors))
+            except Exception as e:
+                # 整批失败时逐个重试，只跳过真正无法处理的文件
+                logger.warning(f"批量图像向量化失败，逐个重试: {e}")
+                for key, path in zip(image_keys, paths):
+                    try:
+                        vectors = await self.embedding_engine.embed_images(
+                            [path], model_type=target_model_id
+                        )
+                        embeddings[key] = vectors[0]
+                    except Exception as item_error:
+                        logger.warning(f"图像向量化失败，跳过: {path}, {item_error}")
+
+        for key in groups:
+            if key[1] != "video":
+                continue
+            record = groups[key][0]
+            try:
+                embeddings[key] = await self.embedding_engine.embed_video_segment(
+                    record["file_path"],
+                    start_time=record.get("start_time", 0.0),
+                    end_time=record.get("end_time"),
+                    model_type=target_model_id,
+                )
+            except Exception as e:
+                logger.warning(f"视频向量化失败，跳过: {record['file_path']}, {e}")
+
+        return embeddings
+
+    @staticmethod
+    def _with_vector(record: Dict[str, Any], vector) -> Dict[str, Any]:
+        """复制源条目的ID和元数据，替换为新向量"""
+        metadata = record.get("metadata")
+        if isinstance(metadata, str):
+            try:
+                metadata = json.loads(metadata) if metadata else {}
+            except json.JSONDecodeError:
+                metadata = {}
+        return {**record, "vector": list(vector), "metadata": metadata or {}}
+
+    def _update_counts(self, source_rows, target_ids, skipped: Dict[str, str]) -> None:
+        """
+        更新条目数和覆盖率
+
+        覆盖率 = 已迁移条目 / (源表条目 - 文件已不存在的条目 - 维度不兼容的条目 - 移入音频表的条目)
+        """
+        source_ids = set(source_rows["id"])
+        reasons = [skipped[row_id] for row_id in source_ids if row_id in skipped]
+        missing = reasons.count("missing")
+        incompatible = reasons.count("incompatible")
+        relocated = reasons.count("relocated")
+        migrated = len(source_ids & target_ids)
+        expected = len(source_ids) - missing - incompatible - relocated
+        self._status.update(
+            {
+                "total": len(source_ids),
+                "migrated": migrated,
+                "missing": missing,
+                "incompatible": incompatible,
+                "relocated": relocated,
+                "failed": reasons.count("failed"),
+                "coverage": migrated / expected if expected > 0 else 1.0,
+            }
+        )
+
+    def _remove_stale(self, source_rows, target_ids) -> None:
+        """删除迁移期间已从源表删除的条目"""
+        stale = list(target_ids - set(source_rows["id"]))
+        if stale:
+            self.target_store.delete_vectors(stale)
+            logger.info(f"删除迁移期间已移除的条目: {len(stale)}个")
+
+    def _cutover(self, target_model_id: str, dimension: int) -> None:
+        """
+        覆盖率达标且没有维度不兼容的条目时切换检索表和默认模型
+
+        两次切换之间没有await，检索协程看到的表和查询模型总是一致的
+        """
+        status = self._status
+        if status["incompatible"]:
+            # 切换后这些条目不在检索表中，会变得无法检索
+            status["state"] = "incomplete"
+            status["error"] = (
+                f"{status['incompatible']}个条目的向量维度与目标模型不一致，"
+                f"切换后将无法检索"
+            )
+            logger.warning(f"{status['error']}，保持使用旧表")
+            return
+
+        if status["coverage"] < self.cutover_coverage:
+            status["state"] = "incomplete"
+            logger.warning(
+                f"向量迁移覆盖率不足，保持使用旧表: {status['coverage']:.2%} < "
+                f"{self.cutover_coverage:.2%}"
+            )
+            return
+
+        target_table = self.target_store.collection_name
+        self.vector_store.switch_table(target_table, target_model_id)
+        self.embedding_engine.set_default_visual_model(target_model_id)
+        self.registry.set_active(
+            self.vector_store.base_collection_name,
+            target_model_id,
+            dimension,
+            target_table,
+        )
+        self.target_store.close()
+        status["state"] = "completed"
+        logger.info(
+            f"向量迁移完成并已切换: {target_table}, 覆盖率: {status['coverage']:.2%}"
+        )
+
+    def _save_status(self) -> None:
+        """保存迁移进度"""
+        try:
+            self.registry.set_migration(
+                self.vector_store.base_collection_name, dict(self._status)
+            )
+        except OSError as e:
+            logger.warning(f"保存迁移进度失败: {e}")
@@ -5,9 +5,16 @@
 导出搜索服务组件。
 """
 
-from .search_engine import SearchEngine
-from .timeline import VideoTimelineGenerator
-from .query_processor import QueryProcessor
-from .result_ranker import ResultRanker
+from src.utils.lazy_import import lazy_exports
+
+__getattr__, __dir__ = lazy_exports(
+    __name__,
+    {
+        "SearchEngine": ".search_engine",
+        "VideoTimelineGenerator": ".timeline",
+        "QueryProcessor": ".query_processor",
+        "ResultRanker": ".result_ranker",
+    },
+)
 
 __all__ = ["SearchEngine", "VideoTimelineGenerator", "QueryProcessor", "ResultRanker"]
@@ -1,11 +1,21 @@
 """
 相关性反馈处理
 处理用户对搜索结果的反馈，用于改进搜索质量
+
+反馈持久化在SQLite中。每次搜索的候选向量缓存在内存里，用户标注后按
+Rocchio公式更新查询向量，并在缓存的候选集上用NumPy重新打分，无需再次
+扫描向量库；同一查询文本的历史反馈会在之后的搜索中作为加权提升。
 """
 
 import logging
-from typing import Any, Dict, List, Optional
+import sqlite3
+import threading
+from collections import OrderedDict
 from datetime import datetime
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple
+
+import numpy as np
 
 logger = logging.getLogger(__name__)
 
@@ -19,9 +29,120 @@ class RelevanceFeedback:
 
         Args:
             config: 配置参数
+                feedback_db_path: 反馈数据库路径
+                rocchio_alpha/rocchio_beta/rocchio_gamma: Rocchio公式中原查询、
+                    相关结果和不相关结果的权重
+                candidate_cache_size: 缓存候选集的查询数量
+                history_weight: 历史反馈对分数的提升幅度
         """
         self.config = config or {}
-        self.feedback_store = {}
+        self.db_path = self.config.get(
+            "feedback_db_path", "data/database/sqlite/feedback.db"
+        )
+        self.alpha = self.config.get("rocchio_alpha", 1.0)
+        self.beta = self.config.get("rocchio_beta", 0.75)
+        self.gamma = self.config.get("rocchio_gamma", 0.15)
+        self.candidate_cache_size = self.config.get("candidate_cache_size", 64)
+        self.history_weight = self.config.get("history_weight", 0.1)
+
+        # {query_id: {"query": 查询文本, "spaces": {检索空间: (查询向量, 候选矩阵, 候选结果)}}}
+        self._candidates: "OrderedDict[str, Dict[str, Any]]" = OrderedDict()
+        self._lock = threading.Lock()
+
+        if self.db_path != ":memory:":
+            Path(self.db_path).parent.mkdir(parents=True, exist_ok=True)
+        self._conn = sqlite3.connect(self.db_path, check_same_thread=False)
+        if self.db_path != ":memory:":
+            self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute(
+            """
+            CREATE TABLE IF NOT EXISTS relevance_feedback (
+                id INTEGER PRIMARY KEY AUTOINCREMENT,
+                query_id TEXT NOT NULL,
+                query_text TEXT,
+                result_id TEXT NOT NULL,
+                user_feedback INTEGER NOT NULL,
+                feedback_type TEXT NOT NULL,
+                timestamp TEXT NOT NULL
+            )
+        """
+        )
+        self._conn.execute(
+            "CREATE INDEX IF NOT EXISTS idx_feedback_query_id "
+            "ON relevance_feedback(query_id)"
+        )
+        self._conn.execute(
+            "CREATE INDEX IF NOT EXISTS idx_feedback_query_text "
+            "ON relevance_feedback(query_text, result_id)"
+        )
+        self._conn.commit()
+
+    @staticmethod
+    def _normalize_query(query: Optional[str]) -> Optional[str]:
+        """规范化查询文本，用于匹配历史反馈"""
+        return " ".join(query.lower().split()) if query else None
+
+    @staticmethod
+    def _unit(vectors: np.ndarray) -> np.ndarray:
+        """按最后一维归一化，零向量保持不变"""
+        norms = np.linalg.norm(vectors, axis=-1, keepdims=True)
+        return vectors / np.where(norms == 0, 1.0, norms)
+
+    def cache_candidates(
+        self,
+        query_id: str,
+        query: str,
+        spaces: Dict[str, Tuple[List[float], List[Dict[str, Any]]]],
+    ) -> None:
+        """
+        缓存一次搜索的查询向量和候选集，供之后的反馈精化使用
+
+        Args:
+            query_id: 查询ID
+            query: 查询文本
+            spaces: {检索空间: (查询向量, 候选结果)}，候选结果需包含vector字段。
+                不同空间（如CLIP和CLAP）的向量分别计算，互不混用
+        """
+        cached_spaces = {}
+        for space, (query_vector, candidates) in spaces.items():
+            candidates = [c for c in candidates if len(c.get("vector") or []) > 0]
+            if query_vector is None or not candidates:
+                continue
+            matrix = self._unit(
+                np.asarray([c["vector"] for c in candidates], dtype=np.float32)
+            )
+            rows = [
+                {key: value for key, value in c.items() if key != "vector"}
+                for c in candidates
+            ]
+            cached_spaces[space] = (
+                self._unit(np.asarray(query_vector, dtype=np.float32)),
+                matrix,
+                rows,
+            )
+
+        if not cached_spaces:
+            return
+
+        with self._lock:
+            self._candidates[query_id] = {"query": query, "spaces": cached_spaces}
+            self._candidates.move_to_end(query_id)
+            while len(self._candidates) > self.candidate_cache_size:
+                self._candidates.popitem(last=False)
+
+    def get_cached_query(self, query_id: str) -> Optional[str]:
+        """
+        获取缓存候选集对应的查询文本
+
+        Args:
+            query_id: 查询ID
+
+        Returns:
+            查询文本，候选集不在缓存中时返回None
+        """
+        with self._lock:
+            cached = self._candidates.get(query_id)
+        return cached["query"] if cached else None
 
     async def record_feedback(
         self,
@@ -29,6 +150,7 @@ class RelevanceFeedback:
         result_id: str,
         user_feedback: int,
         feedback_type: str = "explicit",
+        query_text: Optional[str] = None,
     ) -> bool:
         """
         记录用户反馈
@@ -38,22 +160,29 @@ class RelevanceFeedback:
             result_id: 结果ID
             user_feedback: 用户反馈 (-1: 不相关, 0: 中性, 1: 相关)
             feedback_type: 反馈类型 (explicit/implicit)
+            query_text: 查询文本，未提供时从候选缓存中获取
 
         Returns:
             是否成功
         """
-        feedback_entry = {
-            "query_id": query_id,
-            "result_id": result_id,
-            "user_feedback": user_feedback,
-            "feedback_type": feedback_type,
-            "timestamp": datetime.now().isoformat(),
-        }
-
-        if query_id not in self.feedback_store:
-            self.feedback_store[query_id] = []
+        if query_text is None:
+            query_text = self.get_cached_query(query_id)
 
-        self.feedback_store[query_id].append(feedback_entry)
+        with self._lock:
+            self._conn.execute(
+                "INSERT INTO relevance_feedback "
+                "(query_id, query_text, result_id, user_feedback, feedback_type, timestamp) "
+                "VALUES (?, ?, ?, ?, ?, ?)",
+                (
+                    query_id,
+                    self._normalize_query(query_text),
+                    result_id,
+                    int(user_feedback),
+                    feedback_type,
+                    datetime.now().isoformat(),
+                ),
+            )
+            self._conn.commit()
 
         logger.info(
             f"记录反馈: query={query_id}, result={result_id}, feedback={user_feedback}"
@@ -70,7 +199,99 @@ class RelevanceFeedback:
         Returns:
             反馈记录列表
         """
-        return self.feedback_store.get(query_id, [])
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT query_id, result_id, user_feedback, feedback_type, timestamp "
+                "FROM relevance_feedback WHERE query_id = ? ORDER BY id",
+                (query_id,),
+            ).fetchall()
+        return [
+            {
+                "query_id": row[0],
+                "result_id": row[1],
+                "user_feedback": row[2],
+                "feedback_type": row[3],
+                "timestamp": row[4],
+            }
+            for row in rows
+        ]
+
+    def _latest_judgements(self, query_id: str) -> Dict[str, int]:
+        """获取查询中每个结果最新的反馈值"""
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT result_id, user_feedback FROM relevance_feedback "
+                "WHERE query_id = ? ORDER BY id",
+                (query_id,),
+            ).fetchall()
+        return dict(rows)
+
+    def get_history_boosts(self, query: str) -> Dict[str, float]:
+        """
+        获取同一查询文本的历史反馈提升值
+
+        Args:
+            query: 查询文本
+
+        Returns:
+            {结果ID: 分数提升}，每个结果的净反馈裁剪到[-1, 1]后乘以history_weight
+        """
+        normalized = self._normalize_query(query)
+        if not normalized or not self.history_weight:
+            return {}
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT result_id, SUM(user_feedback) FROM relevance_feedback "
+                "WHERE query_text = ? GROUP BY result_id",
+                (normalized,),
+            ).fetchall()
+        return {
+            result_id: max(-1.0, min(1.0, float(total))) * self.history_weight
+            for result_id, total in rows
+            if total
+        }
+
+    def refine(self, query_id: str) -> Optional[List[Dict[str, Any]]]:
+        """
+        根据反馈精化查询并在缓存的候选集上重新打分
+
+        对每个检索空间按Rocchio公式更新查询向量：
+        q' = alpha * q + beta * mean(相关) - gamma * mean(不相关)，
+        然后用候选矩阵与q'的余弦相似度替换候选结果的分数。
+
+        Args:
+            query_id: 查询ID
+
+        Returns:
+            重新打分的候选结果（未排序、未聚合），候选集不在缓存中时返回None
+        """
+        with self._lock:
+            cached = self._candidates.get(query_id)
+            if cached is not None:
+                self._candidates.move_to_end(query_id)
+        if cached is None:
+            return None
+
+        judgements = self._latest_judgements(query_id)
+        refined: List[Dict[str, Any]] = []
+        for query_vector, matrix, rows in cached["spaces"].values():
+            labels = np.array(
+                [
+                    judgements.get(row.get("file_id"), judgements.get(row.get("id"), 0))
+                    for row in rows
+                ]
+            )
+            new_query = self.alpha * query_vector
+            if np.any(labels > 0):
+                new_query = new_query + self.beta * matrix[labels > 0].mean(axis=0)
+            if np.any(labels < 0):
+                new_query = new_query - self.gamma * matrix[labels < 0].mean(axis=0)
+
+            similarities = np.clip(matrix @ self._unit(new_query), 0.0, 1.0)
+            for row, similarity in zip(rows, similarities.tolist()):
+                refined.append(dict(row, similarity=similarity, score=similarity))
+
+        return refined
 
     async def calculate_relevance_scores(
         self, query_id: str, results: List[Dict[str, Any]]
@@ -121,10 +342,18 @@ class RelevanceFeedback:
         Returns:
             是否成功
         """
-        if query_id:
-            if query_id in self.feedback_store:
-                del self.feedback_store[query_id]
-        else:
-            self.feedback_store.clear()
+        with self._lock:
+            if query_id:
+                self._conn.execute(
+                    "DELETE FROM relevance_feedback WHERE query_id = ?", (query_id,)
+                )
+            else:
+                self._conn.execute("DELETE FROM relevance_feedback")
+            self._conn.commit()
 
         return True
+
+    def close(self) -> None:
+        """关闭数据库连接"""
+        with self._lock:
+            self._conn.close()
@@ -5,13 +5,17 @@
 
 import os
 import sys
+import asyncio
 import logging
 import time
+import uuid
 import numpy as np
-from typing import Dict, Any, List, Optional, Tuple
+from typing import Dict, Any, AsyncIterator, List, Optional, Tuple
 from abc import ABC, abstractmethod
 from pathlib import Path
 
+from .relevance_feedback import RelevanceFeedback
+
 # 设置日志
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
@@ -72,6 +76,9 @@ class SearchEngine:
         embedding_engine: EmbeddingEngine,
         vector_store: VectorStore,
         config: Optional[Dict[str, Any]] = None,
+        relevance_feedback: Optional[RelevanceFeedback] = None,
+        multi_vector_store: Optional[Any] = None,
+        audio_vector_store: Optional[VectorStore] = None,
     ):
         """
         初始化搜索引擎（使用依赖注入）
@@ -80,10 +87,18 @@ class SearchEngine:
             embedding_engine: 向量化引擎
             vector_store: 向量存储
             config: 搜索配置
+            relevance_feedback: 相关性反馈处理器，为None时不缓存候选集、不支持精化
+            multi_vector_store: 多向量存储（默认图像模型为多向量模型时传入），
+                设置后文本检索图像时使用MaxSim
+            audio_vector_store: 音频模型专用的向量存储（按模型分表时传入），
+                为None时音频向量与其他模态在同一张表中
         """
         self.embedding_engine = embedding_engine
         self.vector_store = vector_store
         self.config = config or {}
+        self.relevance_feedback = relevance_feedback
+        self.multi_vector_store = multi_vector_store
+        self.audio_vector_store = audio_vector_store or vector_store
 
         self.default_modality_weights = self.config.get(
             "default_modality_weights",
@@ -108,6 +123,9 @@ class SearchEngine:
         ]
         self.audio_weight_multiplier = self.config.get("audio_weight_multiplier", 1.5)
         self.visual_weight_multiplier = self.config.get("visual_weight_multiplier", 0.7)
+        # 片段级结果：每个视频保留的片段数，间隔不超过merge_gap秒的片段合并为连续区间
+        self.segments_per_video = self.config.get("segments_per_video", 3)
+        self.segment_merge_gap = self.config.get("segment_merge_gap", 1.0)
 
         logger.info("SearchEngine initialized (with dependency injection)")
 
@@ -153,33 +171,26 @@ class SearchEngine:
                 f"Searching with query: {query}, k: {k}, modalities: {modalities}"
             )
 
-            all_results = []
+            query_id = uuid.uuid4().hex
             modalities = modalities or ["image", "video", "audio"]
 
-            if "audio" in modalities:
-                audio_results = await self._search_audio_with_text(query, k, filters)
-                all_results.extend(audio_results)
-                logger.debug(f"Audio search returned {len(audio_results)} results")
-
-            image_video_modalities = [m for m in modalities if m in ["image", "video"]]
-            if image_video_modalities:
-                query_vector = await self.embedding_engine.embed_text(query)
-
-                search_filters = {"modality": image_video_modalities}
-                if filters:
-                    search_filters.update(filters)
+            # 各模态的检索并发执行
+            query_vectors: Dict[str, Any] = {}
+            probes = self._text_search_probes(
+                query, k, modalities, filters, query_vectors
+            )
+            probe_results = dict(
+                zip(probes.keys(), await asyncio.gather(*probes.values()))
+            )
+            self._cache_candidates(query_id, query, query_vectors, probe_results)
 
-                image_video_results = self.vector_store.search(
-                    query_vector,
-                    limit=k,
-                    filter=search_filters if search_filters else None
-                )
-                all_results.extend(image_video_results)
-                logger.debug(f"Image/Video search returned {len(image_video_results)} results")
+            all_results = []
+            for results in probe_results.values():
+                all_results.extend(results)
 
             modality_weights = self._get_modality_weights(query)
-            weighted_results = self._apply_modality_weights(
-                all_results, modality_weights
+            weighted_results = self._apply_feedback_boosts(
+                query, self._apply_modality_weights(all_results, modality_weights)
             )
 
             ranked_results = self._rank_results(weighted_results)
@@ -191,6 +202,7 @@ class SearchEngine:
             return {
                 "status": "success",
                 "query": query,
+                "query_id": query_id,
                 "results": formatted_results,
                 "total": len(formatted_results),
                 "search_time": time.time() - start_time,
@@ -209,11 +221,268 @@ class SearchEngine:
                 "total": 0,
             }
 
+    async def search_stream(
+        self,
+        query: str,
+        k: int = 10,
+        modalities: Optional[List[str]] = None,
+        filters: Optional[Dict[str, Any]] = None,
+    ) -> AsyncIterator[Dict[str, Any]]:
+        """
+        流式文本搜索
+
+        各模态的检索并发执行，最快的模态返回后立即推送第一批结果，之后每有
+        一个模态返回就推送一次合并排序后的结果，最后补充缩略图和预览路径。
+
+        事件（event字段）依次为：
+            results: 当前合并后的结果（未填充缩略图），pending为尚未返回的模态
+            hydrated: 结果的缩略图和预览路径 [{file_id, thumbnail_path, preview_path}]
+            done: 搜索结束，包含total、search_time和用于反馈精化的query_id
+        出错时发送error事件后结束。
+
+        Args:
+            query: 查询文本
+            k: 每个模态返回的结果数量
+            modalities: 模态类型列表
+            filters: 过滤条件
+
+        Yields:
+            搜索事件
+        """
+        start_time = time.time()
+        modalities = modalities or ["image", "video", "audio"]
+        logger.info(
+            f"Streaming search with query: {query}, k: {k}, modalities: {modalities}"
+        )
+
+        query_id = uuid.uuid4().hex
+        modality_weights = self._get_modality_weights(query)
+        query_vectors: Dict[str, Any] = {}
+        probes = self._text_search_probes(query, k, modalities, filters, query_vectors)
+        tasks = {asyncio.ensure_future(coro): name for name, coro in probes.items()}
+        pending = set(tasks)
+
+        try:
+            probe_results: Dict[str, List[Dict[str, Any]]] = {}
+            all_results: List[Dict[str, Any]] = []
+            formatted_results: List[Dict[str, Any]] = []
+            while pending:
+                done, pending = await asyncio.wait(
+                    pending, return_when=asyncio.FIRST_COMPLETED
+                )
+                for task in done:
+                    probe_results[tasks[task]] = task.result()
+                    # 权重按批应用，已合并的结果不会被重复加权
+                    all_results.extend(
+                        self._apply_feedback_boosts(
+                            query,
+                            self._apply_modality_weights(
+                                task.result(), modality_weights
+                            ),
+                        )
+                    )
+
+                ranked_results = self._rank_results(all_results)
+                formatted_results = self._format_results(
+                    self._aggregate_results(ranked_results), hydrate=False
+                )
+                yield {
+                    "event": "results",
+                    "results": formatted_results,
+                    "pending": sorted(tasks[task] for task in pending),
+                    "search_time": time.time() - start_time,
+                }
+
+            self._cache_candidates(query_id, query, query_vectors, probe_results)
+
+            # 在副本上填充，已推送的结果保持不变
+            media_paths = await asyncio.to_thread(
+                self._hydrate_media_paths, [dict(r) for r in formatted_results]
+            )
+            yield {"event": "hydrated", "paths": media_paths}
+
+            yield {
+                "event": "done",
+                "query_id": query_id,
+                "total": len(formatted_results),
+                "search_time": time.time() - start_time,
+            }
+        except Exception as e:
+            logger.error(f"Failed to stream search: {e}")
+            yield {"event": "error", "error": str(e)}
+        finally:
+            # 客户端提前断开时取消尚未完成的检索
+            for task in pending:
+                task.cancel()
+
+    def _text_search_probes(
+        self,
+        query: str,
+        k: int,
+        modalities: List[str],
+        filters: Optional[Dict[str, Any]] = None,
+        query_vectors: Optional[Dict[str, Any]] = None,
+    ) -> Dict[str, Any]:
+        """
+        构造文本查询各模态的检索协程
+
+        Args:
+            query_vectors: 可选，检索时按检索名称写入查询向量
+
+        Returns:
+            {检索名称: 协程}，音频使用CLAP，图像和视频共用一次CLIP检索
+        """
+        probes = {}
+        if "audio" in modalities:
+            probes["audio"] = self._search_audio_with_text(
+                query, k, filters, query_vectors
+            )
+
+        image_video_modalities = [m for m in modalities if m in ["image", "video"]]
+        if image_video_modalities:
+            probes["visual"] = self._search_visual_with_text(
+                query, k, image_video_modalities, filters, query_vectors
+            )
+        return probes
+
+    async def _search_visual_with_text(
+        self,
+        query: str,
+        k: int,
+        modalities: List[str],
+        filters: Optional[Dict[str, Any]] = None,
+        query_vectors: Optional[Dict[str, Any]] = None,
+    ) -> List[Dict[str, Any]]:
+        """
+        使用文本查询检索图像和视频
+
+        Args:
+            query: 查询文本
+            k: 返回结果数量
+            modalities: 图像/视频模态列表
+            filters: 过滤条件
+            query_vectors: 可选，写入本次检索的查询向量（键为visual）
+
+        Returns:
+            图像和视频搜索结果列表
+        """
+        if self.multi_vector_store is not None and "image" in modalities:
+            # 多向量模型的图像条目在多向量存储中按MaxSim检索，
+            # 视频片段仍是单向量（token取均值），在向量表中检索
+            searches = [self._search_images_multi_vector(query, k, filters)]
+            other_modalities = [m for m in modalities if m != "image"]
+            if other_modalities:
+                searches.append(
+                    self._search_visual_with_text(
+                        query, k, other_modalities, filters, query_vectors
+                    )
+                )
+            result_lists = await asyncio.gather(*searches)
+            return sorted(
+                (r for results in result_lists for r in results),
+                key=lambda r: r.get("similarity", 0.0),
+                reverse=True,
+            )
+
+        query_vector = await self.embedding_engine.embed_text(query)
+        if query_vectors is not None:
+            query_vectors["visual"] = query_vector
+
+        def run_search(search_modalities: List[str], limit: int, **kwargs):
+            search_filters = {"modality": search_modalities}
+            if filters:
+                search_filters.update(filters)
+            # 向量检索是同步调用，放到线程中执行以便与其他模态并发
+            return asyncio.to_thread(
+                self.vector_store.search,
+                query_vector,
+                limit=limit,
+                filter=search_filters,
+                **kwargs,
+            )
+
+        searches = []
+        file_modalities = [m for m in modalities if m != "video"]
+        if file_modalities:
+            searches.append(run_search(file_modalities, k))
+        if "video" in modalities:
+            # 视频按片段检索：不按文件去重，多取候选以覆盖每个视频的多个片段
+            searches.append(
+                run_search(["video"], k * self.segments_per_video, dedupe_files=False)
+            )
+        result_lists = await asyncio.gather(*searches)
+        if "video" in modalities:
+            result_lists[-1] = self._top_video_segments(result_lists[-1], k)
+        results = sorted(
+            (r for results in result_lists for r in results),
+            key=lambda r: r.get("similarity", 0.0),
+            reverse=True,
+        )
+        logger.debug(f"Image/Video search returned {len(results)} results")
+        return results
+
+    @staticmethod
+    def _top_video_segments(
+        segments: List[Dict[str, Any]], k: int
+    ) -> List[Dict[str, Any]]:
+        """
+        只保留得分最高的k个视频的片段
+
+        Args:
+            segments: 按相似度降序排列的片段结果
+            k: 视频数量
+
+        Returns:
+            前k个视频的全部片段（保持原顺序）
+        """
+        videos = set()
+        kept = []
+        for segment in segments:
+            video = segment.get("file_id") or segment.get("file_path")
+            if video not in videos:
+                if len(videos) >= k:
+                    continue
+                videos.add(video)
+            kept.append(segment)
+        return kept
+
+    async def _search_images_multi_vector(
+        self, query: str, k: int, filters: Optional[Dict[str, Any]] = None
+    ) -> List[Dict[str, Any]]:
+        """
+        使用文本查询在多向量存储中检索图像
+
+        Args:
+            query: 查询文本
+            k: 返回结果数量
+            filters: 过滤条件
+
+        Returns:
+            图像搜索结果列表（不含向量，不参与反馈精化）
+        """
+        query_tokens = await self.embedding_engine.embed_multi_vector(
+            query, input_type="text"
+        )
+
+        search_filters = {"modality": "image"}
+        if filters:
+            search_filters.update(filters)
+
+        results = await asyncio.to_thread(
+            self.multi_vector_store.search,
+            query_tokens[0],
+            limit=k,
+            filter=search_filters,
+        )
+        logger.debug(f"Multi-vector image search returned {len(results)} results")
+        return results
+
     async def _search_audio_with_text(
         self,
         query: str,
         k: int = 10,
         filters: Optional[Dict[str, Any]] = None,
+        query_vectors: Optional[Dict[str, Any]] = None,
     ) -> List[Dict[str, Any]]:
         """
         使用文本查询检索音频（跨模态检索）
@@ -224,6 +493,7 @@ class SearchEngine:
             query: 查询文本
             k: 返回结果数量
             filters: 过滤条件
+            query_vectors: 可选，写入本次检索的查询向量（键为audio）
 
         Returns:
             音频搜索结果列表
@@ -232,15 +502,18 @@ class SearchEngine:
             audio_vector = await self.embedding_engine.embed_audio(
                 query, model_type="audio_model", is_text_query=True
             )
+            if query_vectors is not None:
+                query_vectors["audio"] = audio_vector
 
             search_filters = {"modality": "audio"}
             if filters:
                 search_filters.update(filters)
 
-            audio_results = self.vector_store.search(
+            audio_results = await asyncio.to_thread(
+                self.audio_vector_store.search,
                 audio_vector,
                 limit=k,
-                filter=search_filters if search_filters else None
+                filter=search_filters if search_filters else None,
             )
 
             logger.debug(f"Audio search completed: {len(audio_results)} results for query '{query}'")
@@ -250,6 +523,112 @@ class SearchEngine:
             logger.warning(f"Audio search failed, skipping audio results: {e}")
             return []
 
+    async def refine_search(self, query_id: str, k: int = 10) -> Dict[str, Any]:
+        """
+        根据相关性反馈精化一次文本搜索
+
+        使用search/search_stream缓存的候选集和查询向量，按已记录的反馈更新
+        查询向量后在候选集上重新打分，不重新执行向量检索。
+
+        Args:
+            query_id: search或search_stream返回的查询ID
+            k: 返回结果数量
+
+        Returns:
+            搜索结果，候选集已过期或未启用反馈时status为error
+        """
+        start_time = time.time()
+        refined = (
+            self.relevance_feedback.refine(query_id)
+            if self.relevance_feedback
+            else None
+        )
+        if refined is None:
+            return {
+                "status": "error",
+                "error": f"查询候选集不存在或已过期: {query_id}",
+                "query_id": query_id,
+                "results": [],
+                "total": 0,
+            }
+
+        query = self.relevance_feedback.get_cached_query(query_id)
+        weighted_results = self._apply_modality_weights(
+            refined, self._get_modality_weights(query)
+        )
+        ranked_results = self._rank_results(weighted_results)
+        formatted_results = self._format_results(
+            self._aggregate_results(ranked_results)[:k]
+        )
+
+        return {
+            "status": "success",
+            "query": query,
+            "query_id": query_id,
+            "results": formatted_results,
+            "total": len(formatted_results),
+            "search_time": time.time() - start_time,
+            "k": k,
+        }
+
+    def _cache_candidates(
+        self,
+        query_id: str,
+        query: str,
+        query_vectors: Dict[str, Any],
+        probe_results: Dict[str, List[Dict[str, Any]]],
+    ) -> None:
+        """
+        缓存各检索空间的查询向量和候选结果，供反馈精化使用
+
+        Args:
+            query_id: 查询ID
+            query: 查询文本
+            query_vectors: {检索名称: 查询向量}
+            probe_results: {检索名称: 检索结果}
+        """
+        if not self.relevance_feedback:
+            return
+        try:
+            self.relevance_feedback.cache_candidates(
+                query_id,
+                query,
+                {
+                    name: (query_vectors.get(name), results)
+                    for name, results in probe_results.items()
+                },
+            )
+        except Exception as e:
+            logger.warning(f"缓存反馈候选集失败: {e}")
+
+    def _apply_feedback_boosts(
+        self, query: str, results: List[Dict[str, Any]]
+    ) -> List[Dict[str, Any]]:
+        """
+        按同一查询文本的历史反馈调整结果相似度
+
+        Args:
+            query: 查询文本
+            results: 结果列表（原地更新）
+
+        Returns:
+            调整后的结果
+        """
+        if not self.relevance_feedback or not results:
+            return results
+        try:
+            boosts = self.relevance_feedback.get_history_boosts(query)
+        except Exception as e:
+            logger.warning(f"获取历史反馈失败: {e}")
+            return results
+
+        for result in results:
+            boost = boosts.get(result.get("file_id"))
+            if boost:
+                score = result.get("similarity", result.get("score", 0.0)) + boost
+                result["similarity"] = result["score"] = max(0.0, min(1.0, score))
+        return results
+
     async def image_search(
         self,
         image_path: str,
@@ -275,11 +654,24 @@ class SearchEngine:
                 f"Searching with image: {image_path}, k: {k}, modalities: {modalities}"
             )
 
-            # 1. 图像向量化
-            query_vector = await self.embedding_engine.embed_image(image_path)
+            if self.multi_vector_store is not None:
+                # 1-2. 多向量模型：图像条目按MaxSim检索，其余条目用token均值向量检索
+                query_tokens = (
+                    await self.embedding_engine.embed_multi_vector(
+                        image_path, input_type="image"
+                    )
+                )[0]
+                search_results = self.multi_vector_store.search(
+                    query_tokens, limit=k
+                ) + self.vector_store.search(
+                    query_tokens.mean(axis=0).tolist(), limit=k
+                )
+            else:
+                # 1. 图像向量化
+                query_vector = await self.embedding_engine.embed_image(image_path)
 
-            # 2. 向量搜索
-            search_results = self.vector_store.search(query_vector, limit=k)
+                # 2. 向量搜索
+                search_results = self.vector_store.search(query_vector, limit=k)
 
             # 3. 结果排序和过滤
             ranked_results = self._rank_results(search_results)
@@ -337,8 +729,8 @@ class SearchEngine:
             # 1. 音频向量化
             query_vector = await self.embedding_engine.embed_audio(audio_path)
 
-            # 2. 向量搜索
-            search_results = self.vector_store.search(query_vector, limit=k)
+            # 2. 向量搜索（音频向量只能与音频模型的向量比较）
+            search_results = self.audio_vector_store.search(query_vector, limit=k)
 
             # 3. 结果排序和过滤
             ranked_results = self._rank_results(search_results)
@@ -457,6 +849,7 @@ class SearchEngine:
         """
         # 按文件ID聚合，避免重复
         aggregated = {}
+        timed_hits: Dict[Any, List[Dict[str, Any]]] = {}
         for result in results:
             file_id = result.get("file_id")
             if file_id not in aggregated:
@@ -466,37 +859,132 @@ class SearchEngine:
                 if result.get("score", 0) > aggregated[file_id].get("score", 0):
                     aggregated[file_id] = result
 
+            # 收集视频片段，聚合后仍保留片段级信息
+            if result.get("modality") == "video" and result.get("end_time"):
+                timed_hits.setdefault(file_id, []).append(result)
+
+        for file_id, hits in timed_hits.items():
+            aggregated[file_id] = dict(
+                aggregated[file_id], segments=self._merge_segments(hits)
+            )
+
         return list(aggregated.values())
 
-    def _format_results(self, results: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    def _merge_segments(self, hits: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """
+        合并同一视频的命中片段
+
+        时间上相邻（间隔不超过segment_merge_gap秒）的片段合并为连续区间，
+        区间得分取其中最高分，按得分返回前segments_per_video个区间。
+
+        Args:
+            hits: 同一视频的片段结果
+
+        Returns:
+            [{start_time, end_time, score, segment_ids}]
+        """
+        ranges: List[Dict[str, Any]] = []
+        for hit in sorted(hits, key=lambda x: x.get("start_time", 0.0)):
+            start_time = hit.get("start_time", 0.0)
+            end_time = hit.get("end_time", 0.0)
+            score = hit.get("similarity", hit.get("score", 0.0))
+            segment_id = hit.get("segment_id")
+
+            if ranges and start_time <= ranges[-1]["end_time"] + self.segment_merge_gap:
+                current = ranges[-1]
+                current["end_time"] = max(current["end_time"], end_time)
+                current["score"] = max(current["score"], score)
+                if segment_id:
+                    current["segment_ids"].append(segment_id)
+            else:
+                ranges.append(
+                    {
+                        "start_time": start_time,
+                        "end_time": end_time,
+                        "score": score,
+                        "segment_ids": [segment_id] if segment_id else [],
+                    }
+                )
+
+        ranges.sort(key=lambda x: x["score"], reverse=True)
+        return ranges[: self.segments_per_video]
+
+    def _lookup_media_paths(
+        self, file_path: Optional[str]
+    ) -> Tuple[Optional[str], Optional[str]]:
+        """
+        从数据库获取文件的缩略图和预览路径
+
+        Args:
+            file_path: 文件路径
+
+        Returns:
+            (缩略图路径, 预览路径)
+        """
+        thumbnail_path = None
+        preview_path = None
+        if file_path:
+            try:
+                # 尝试从数据库获取缩略图路径
+                if hasattr(self, "database_manager") and self.database_manager:
+                    thumbnail_path = self.database_manager.get_thumbnail_by_path(
+                        file_path
+                    )
+                    preview_path = self.database_manager.get_preview_by_path(
+                        file_path
+                    )
+            except Exception as e:
+                logger.warning(f"获取缩略图路径失败: {e}")
+        return thumbnail_path, preview_path
+
+    def _hydrate_media_paths(
+        self, results: List[Dict[str, Any]]
+    ) -> List[Dict[str, Any]]:
+        """
+        为格式化后的结果填充缩略图和预览路径
+
+        Args:
+            results: 格式化后的结果（原地更新）
+
+        Returns:
+            [{file_id, thumbnail_path, preview_path}]
+        """
+        media_paths = []
+        for result in results:
+            thumbnail_path, preview_path = self._lookup_media_paths(
+                result.get("file_path")
+            )
+            result["thumbnail_path"] = thumbnail_path
+            result["preview_path"] = preview_path
+            media_paths.append(
+                {
+                    "file_id": result.get("file_id"),
+                    "thumbnail_path": thumbnail_path,
+                    "preview_path": preview_path,
+                }
+            )
+        return media_paths
+
+    def _format_results(
+        self, results: List[Dict[str, Any]], hydrate: bool = True
+    ) -> List[Dict[str, Any]]:
         """
         结果格式化
 
         Args:
             results: 聚合后的结果
+            hydrate: 是否从数据库填充缩略图和预览路径
 
         Returns:
             格式化后的结果
         """
         formatted = []
         for result in results:
-            # 从数据库获取缩略图路径
-            thumbnail_path = None
-            preview_path = None
-
-            file_path = result.get("file_path")
-            if file_path:
-                try:
-                    # 尝试从数据库获取缩略图路径
-                    if hasattr(self, "database_manager") and self.database_manager:
-                        thumbnail_path = self.database_manager.get_thumbnail_by_path(
-                            file_path
-                        )
-                        preview_path = self.database_manager.get_preview_by_path(
-                            file_path
-                        )
-                except Exception as e:
-                    logger.warning(f"获取缩略图路径失败: {e}")
+            thumbnail_path, preview_path = (
+                self._lookup_media_paths(result.get("file_path"))
+                if hydrate
+                else (None, None)
+            )
 
             # 从modality推断file_type
             file_type = result.get("file_type")
@@ -522,6 +1010,7 @@ class SearchEngine:
                     "preview_path": preview_path,
                     "metadata": result.get("metadata", {}),
                     "timestamp_info": result.get("timestamp_info", {}),
+                    "segments": result.get("segments", []),
                 }
             )
 
@@ -532,6 +1021,7 @@ def create_search_engine(
     embedding_engine: EmbeddingEngine,
     vector_store: VectorStore,
     config: Optional[Dict[str, Any]] = None,
+    relevance_feedback: Optional[RelevanceFeedback] = None,
 ) -> SearchEngine:
     """
     创建SearchEngine实例（工厂函数）
@@ -540,8 +1030,14 @@ def create_search_engine(
         embedding_engine: 向量化引擎
         vector_store: 向量存储
         config: 搜索配置
+        relevance_feedback: 相关性反馈处理器
 
     Returns:
         SearchEngine实例
     """
-    return SearchEngine(embedding_engine, vector_store, config=config)
+    return SearchEngine(
+        embedding_engine,
+        vector_store,
+        config=config,
+        relevance_feedback=relevance_feedback,
+    )
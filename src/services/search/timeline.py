@@ -265,6 +265,9 @@ class VideoTimelineGenerator:
     ) -> VideoTimelineResult:
         """从数据库结果生成时间轴
 
+        视频元数据通过一次批量查询获取。结果中带有segments（合并后的片段区间）
+        时，每个区间生成一个时间轴条目。
+
         Args:
             query: 用户查询
             vector_results: 向量检索结果列表
@@ -278,7 +281,7 @@ class VideoTimelineGenerator:
         # 收集所有视频UUID
         video_uuids = set()
         for vector_result in vector_results:
-            video_uuid = vector_result.get("video_uuid")
+            video_uuid = vector_result.get("video_uuid") or vector_result.get("file_id")
             if video_uuid:
                 video_uuids.add(video_uuid)
 
@@ -286,45 +289,62 @@ class VideoTimelineGenerator:
         metadata_map = {}
         if db_manager and video_uuids:
             try:
-                # 这里需要根据实际的数据库管理器接口进行调整
-                # metadata_map = db_manager.get_video_metadata_batch(list(video_uuids))
-                pass
+                metadata_map = db_manager.get_video_metadata_batch(list(video_uuids))
             except Exception as e:
                 logger.error(f"批量获取视频元数据时出错: {e}")
 
         # 转换为时间轴条目
         for idx, vector_result in enumerate(vector_results):
             try:
-                video_uuid = vector_result.get("video_uuid", "")
-                segment_id = vector_result.get("segment_id", "")
-                start_time = vector_result.get("start_time", 0.0)
-                end_time = vector_result.get("end_time", 0.0)
-                relevance_score = vector_result.get("score", 0.0)
+                video_uuid = (
+                    vector_result.get("video_uuid") or vector_result.get("file_id") or ""
+                )
 
                 # 从元数据获取视频信息
                 video_metadata = metadata_map.get(video_uuid, {})
-                video_name = video_metadata.get("video_name", "")
-                video_path = video_metadata.get("video_path", "")
+                video_name = video_metadata.get(
+                    "video_name", vector_result.get("file_name", "")
+                )
+                video_path = video_metadata.get(
+                    "video_path", vector_result.get("file_path", "")
+                )
                 thumbnail_path = video_metadata.get("thumbnail_path")
                 preview_path = video_metadata.get("preview_path")
 
-                # 创建时间轴条目
-                item = VideoTimelineItem(
-                    video_uuid=video_uuid,
-                    video_name=video_name,
-                    video_path=video_path,
-                    start_time=start_time,
-                    end_time=end_time,
-                    duration=end_time - start_time,
-                    relevance_score=relevance_score,
-                    thumbnail_path=thumbnail_path,
-                    preview_path=preview_path,
-                    scene_info=vector_result.get("scene_info"),
-                    frame_count=vector_result.get("frame_count", 0),
-                    metadata={"segment_id": segment_id},
-                )
+                segments = vector_result.get("segments") or [
+                    {
+                        "start_time": vector_result.get("start_time", 0.0),
+                        "end_time": vector_result.get("end_time", 0.0),
+                        "score": vector_result.get("score", 0.0),
+                        "segment_ids": [vector_result.get("segment_id", "")],
+                    }
+                ]
+
+                for segment in segments:
+                    start_time = segment.get("start_time", 0.0)
+                    end_time = segment.get("end_time", 0.0)
+                    segment_ids = segment.get("segment_ids", [])
+
+                    # 创建时间轴条目
+                    item = VideoTimelineItem(
+                        video_uuid=video_uuid,
+                        video_name=video_name,
+                        video_path=video_path,
+                        start_time=start_time,
+                        end_time=end_time,
+                        duration=end_time - start_time,
+                        relevance_score=segment.get("score", 0.0),
+                        thumbnail_path=thumbnail_path,
+                        preview_path=preview_path,
+                        scene_info=vector_result.get("scene_info"),
+                        frame_count=vector_result.get("frame_count", 0),
+                        metadata={
+                            "segment_id": segment_ids[0] if segment_ids else "",
+                            "segment_ids": segment_ids,
+                        },
+                    )
 
-                result.add_item(item)
+                    result.add_item(item)
 
             except Exception as e:
                 logger.error(f"处理向量结果 {idx} 时出错: {e}")
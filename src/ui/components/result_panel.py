@@ -3,152 +3,328 @@
 显示搜索结果，支持时间轴展示（根据设计文档要求）
 """
 
-from typing import List, Dict, Any, Optional
+import hashlib
+import os
+from typing import List, Dict, Any, Optional, Set
 from pathlib import Path
 from PySide6.QtWidgets import (
     QWidget,
     QVBoxLayout,
     QHBoxLayout,
     QLabel,
-    QListWidget,
-    QListWidgetItem,
-    QPushButton,
-    QScrollArea,
-    QFrame,
-    QGridLayout,
-    QSplitter,
-    QGroupBox,
+    QListView,
+    QAbstractItemView,
+    QStyledItemDelegate,
+    QStyle,
     QCheckBox,
     QComboBox,
     QTabWidget,
 )
-from PySide6.QtCore import Signal, Qt, QSize
-from PySide6.QtGui import QPixmap, QImage, QIcon, QFont
+from PySide6.QtCore import (
+    Signal,
+    Qt,
+    QSize,
+    QRect,
+    QObject,
+    QRunnable,
+    QThreadPool,
+    QAbstractListModel,
+    QModelIndex,
+)
+from PySide6.QtGui import QPixmap, QPixmapCache, QImage, QFont, QColor, QPen
 
 # 导入时间轴面板
 from src.ui.components.timeline_panel import TimelinePanel, TimelineItem
 
+# 缩略图显示尺寸
+THUMBNAIL_SIZE = QSize(120, 90)
 
-class ResultItemWidget(QFrame):
-    """结果项组件"""
+# 缩略图像素缓存上限（KB）
+PIXMAP_CACHE_LIMIT_KB = 64 * 1024
 
-    # 信号定义
-    item_clicked = Signal(dict)
-    item_double_clicked = Signal(dict)
+# 类型过滤选项对应的模态（与filter_combo选项顺序一致）
+FILTER_MODALITIES = [None, "image", "video", "audio"]
+
+
+class _ThumbnailSignals(QObject):
+    """缩略图解码任务的信号（QRunnable不能直接定义信号）"""
+
+    # 缩略图路径、内容哈希、解码后的图像（解码失败时为空图像）
+    loaded = Signal(str, str, QImage)
 
-    def __init__(self, result_data: Dict[str, Any], parent=None):
-        """初始化结果项"""
+
+class _ThumbnailTask(QRunnable):
+    """在线程池中读取并解码缩略图"""
+
+    def __init__(self, path: str, size: QSize, signals: _ThumbnailSignals):
+        super().__init__()
+        self.path = path
+        self.size = size
+        self.signals = signals
+
+    def run(self):
+        try:
+            data = Path(self.path).read_bytes()
+        except OSError:
+            data = b""
+
+        content_hash = hashlib.sha1(data).hexdigest() if data else ""
+        image = QImage()
+        if data and image.loadFromData(data):
+            image = image.scaled(
+                self.size, Qt.KeepAspectRatio, Qt.SmoothTransformation
+            )
+        # QImage可跨线程传递，QPixmap只能在GUI线程创建
+        self.signals.loaded.emit(self.path, content_hash, image)
+
+
+class ThumbnailLoader(QObject):
+    """
+    异步缩略图加载器
+
+    缩略图在后台线程池中解码，结果放入有上限的QPixmapCache，
+    以文件内容哈希为键，内容相同的缩略图只占一份缓存
+    """
+
+    # 缩略图加载完成（缩略图路径）
+    thumbnail_ready = Signal(str)
+
+    def __init__(self, parent=None, max_threads: int = 2):
+        """初始化缩略图加载器"""
         super().__init__(parent)
 
-        self.result_data = result_data
-        self.init_ui()
+        QPixmapCache.setCacheLimit(PIXMAP_CACHE_LIMIT_KB)
 
-    def init_ui(self):
-        """初始化用户界面"""
-        self.setFrameStyle(QFrame.StyledPanel | QFrame.Raised)
-        self.setStyleSheet(
-            """
-            ResultItemWidget {
-                border: 1px solid #ddd;
-                border-radius: 5px;
-                background-color: white;
-                margin: 5px;
-            }
-            ResultItemWidget:hover {
-                border: 1px solid #4CAF50;
-                background-color: #f9f9f9;
-            }
+        self.pool = QThreadPool(self)
+        self.pool.setMaxThreadCount(max_threads)
+
+        # 缩略图路径 -> 内容哈希
+        self._content_keys: Dict[str, str] = {}
+        self._pending: Set[str] = set()
+        self._failed: Set[str] = set()
+
+        self._signals = _ThumbnailSignals()
+        self._signals.loaded.connect(self._on_loaded)
+
+    def pixmap(self, path: str) -> Optional[QPixmap]:
         """
-        )
+        获取缩略图
 
-        layout = QHBoxLayout(self)
-        layout.setContentsMargins(10, 10, 10, 10)
+        缓存命中时直接返回，否则提交后台解码并返回None，
+        解码完成后发出thumbnail_ready信号
 
-        # 缩略图
-        thumbnail_label = QLabel()
-        thumbnail_label.setFixedSize(120, 90)
-        thumbnail_label.setStyleSheet("border: 1px solid #ddd; border-radius: 3px;")
+        Args:
+            path: 缩略图路径
 
-        # 尝试加载缩略图
-        thumbnail_path = self.result_data.get("thumbnail_path")
-        if thumbnail_path and Path(thumbnail_path).exists():
-            pixmap = QPixmap(thumbnail_path)
-            scaled_pixmap = pixmap.scaled(
-                120, 90, Qt.KeepAspectRatio, Qt.SmoothTransformation
-            )
-            thumbnail_label.setPixmap(scaled_pixmap)
+        Returns:
+            缩略图，尚未加载时返回None
+        """
+        content_key = self._content_keys.get(path)
+        if content_key:
+            pixmap = QPixmap()
+            if QPixmapCache.find(content_key, pixmap):
+                return pixmap
+
+        if path not in self._pending and path not in self._failed:
+            self._pending.add(path)
+            self.pool.start(_ThumbnailTask(path, THUMBNAIL_SIZE, self._signals))
+        return None
+
+    def is_failed(self, path: str) -> bool:
+        """缩略图是否无法加载"""
+        return path in self._failed
+
+    def cancel_pending(self):
+        """取消尚未开始的解码任务（切换结果集时调用）"""
+        self.pool.clear()
+        self._pending.clear()
+
+    def _on_loaded(self, path: str, content_hash: str, image: QImage):
+        """解码完成，在GUI线程中放入缓存"""
+        self._pending.discard(path)
+        if image.isNull():
+            self._failed.add(path)
         else:
-            # 使用占位符
-            thumbnail_label.setText("无缩略图")
-            thumbnail_label.setAlignment(Qt.AlignCenter)
-            thumbnail_label.setStyleSheet(
-                """
-                border: 1px solid #ddd;
-                border-radius: 3px;
-                background-color: #f0f0f0;
-                color: #999;
-            """
-            )
+            QPixmapCache.insert(content_hash, QPixmap.fromImage(image))
+            self._content_keys[path] = content_hash
+        self.thumbnail_ready.emit(path)
 
-        layout.addWidget(thumbnail_label)
 
-        # 信息区域
-        info_layout = QVBoxLayout()
+class ResultListModel(QAbstractListModel):
+    """搜索结果列表模型"""
 
-        # 文件名
-        file_name = self.result_data.get("file_name", "未知文件")
-        name_label = QLabel(file_name)
-        name_label.setFont(QFont("Arial", 11, QFont.Bold))
-        name_label.setWordWrap(True)
-        info_layout.addWidget(name_label)
+    # 自定义角色：完整的结果字典
+    ResultRole = Qt.UserRole + 1
 
-        # 文件路径
-        file_path = self.result_data.get("file_path", "")
-        if file_path:
-            path_label = QLabel(Path(file_path).name)
-            path_label.setStyleSheet("color: #666; font-size: 10px;")
-            path_label.setWordWrap(True)
-            info_layout.addWidget(path_label)
+    def __init__(self, parent=None):
+        """初始化结果模型"""
+        super().__init__(parent)
 
-        # 相似度分数
-        score = self.result_data.get("score", 0.0)
-        if score > 0:
-            score_label = QLabel(f"相似度: {score:.2%}")
-            score_label.setStyleSheet("color: #4CAF50; font-weight: bold;")
-            info_layout.addWidget(score_label)
+        self.results: List[Dict[str, Any]] = []
+        # 缩略图路径 -> 行号列表，用于缩略图加载完成后局部刷新
+        self._rows_by_thumbnail: Dict[str, List[int]] = {}
 
-        # 模态类型
-        modality = self.result_data.get("modality", "")
-        if modality:
-            modality_label = QLabel(f"类型: {modality}")
-            modality_label.setStyleSheet("color: #666; font-size: 10px;")
-            info_layout.addWidget(modality_label)
+    def set_results(self, results: List[Dict[str, Any]]):
+        """替换全部结果"""
+        self.beginResetModel()
+        self.results = list(results)
+        self._rows_by_thumbnail = {}
+        for row, result in enumerate(self.results):
+            thumbnail_path = result.get("thumbnail_path")
+            if thumbnail_path:
+                self._rows_by_thumbnail.setdefault(thumbnail_path, []).append(row)
+        self.endResetModel()
+
+    def rowCount(self, parent=QModelIndex()) -> int:
+        if parent.isValid():
+            return 0
+        return len(self.results)
+
+    def data(self, index: QModelIndex, role=Qt.DisplayRole):
+        if not index.isValid() or not 0 <= index.row() < len(self.results):
+            return None
+
+        result = self.results[index.row()]
+        if role == Qt.DisplayRole:
+            return result.get("file_name", "未知文件")
+        if role == Qt.ToolTipRole:
+            return result.get("file_path", "")
+        if role == self.ResultRole:
+            return result
+        return None
+
+    def on_thumbnail_ready(self, path: str):
+        """缩略图加载完成，刷新使用该缩略图的行"""
+        for row in self._rows_by_thumbnail.get(path, []):
+            index = self.index(row)
+            self.dataChanged.emit(index, index)
 
-        # 时间戳（如果是视频）
-        if "start_time" in self.result_data:
-            start_time = self.result_data.get("start_time", 0.0)
-            end_time = self.result_data.get("end_time", 0.0)
-            time_label = QLabel(f"时间: {start_time:.1f}s - {end_time:.1f}s")
-            time_label.setStyleSheet("color: #666; font-size: 10px;")
-            info_layout.addWidget(time_label)
 
-        info_layout.addStretch()
-        layout.addLayout(info_layout)
+class ResultItemDelegate(QStyledItemDelegate):
+    """
+    结果项绘制代理
 
-        # 操作按钮
-        button_layout = QVBoxLayout()
+    只为可见行绘制，缩略图未就绪时先绘制占位符，加载完成后再补绘
+    """
 
-        open_button = QPushButton("打开")
-        open_button.clicked.connect(lambda: self.item_clicked.emit(self.result_data))
-        button_layout.addWidget(open_button)
+    GRID_ITEM_SIZE = QSize(260, 210)
+    LIST_ITEM_HEIGHT = 110
+    MARGIN = 10
 
-        button_layout.addStretch()
-        layout.addLayout(button_layout)
+    def __init__(self, loader: ThumbnailLoader, parent=None):
+        """初始化绘制代理"""
+        super().__init__(parent)
+
+        self.loader = loader
+        self.grid_mode = True
+        self.show_thumbnails = True
 
-    def mouseDoubleClickEvent(self, event):
-        """鼠标双击事件"""
-        self.item_double_clicked.emit(self.result_data)
-        super().mouseDoubleClickEvent(event)
+    def sizeHint(self, option, index) -> QSize:
+        if self.grid_mode:
+            return self.GRID_ITEM_SIZE
+        return QSize(option.rect.width(), self.LIST_ITEM_HEIGHT)
+
+    def paint(self, painter, option, index):
+        result = index.data(ResultListModel.ResultRole)
+        if result is None:
+            return
+
+        painter.save()
+        rect = option.rect.adjusted(5, 5, -5, -5)
+
+        # 背景和边框
+        if option.state & QStyle.State_Selected:
+            background, border = QColor("#E8F3FF"), QColor("#165DFF")
+        elif option.state & QStyle.State_MouseOver:
+            background, border = QColor("#F9F9F9"), QColor("#4CAF50")
+        else:
+            background, border = QColor("#FFFFFF"), QColor("#DDDDDD")
+        painter.setPen(QPen(border))
+        painter.setBrush(background)
+        painter.drawRoundedRect(rect, 5, 5)
+
+        content = rect.adjusted(self.MARGIN, self.MARGIN, -self.MARGIN, -self.MARGIN)
+        if self.show_thumbnails:
+            if self.grid_mode:
+                thumb_rect = QRect(
+                    content.x() + (content.width() - THUMBNAIL_SIZE.width()) // 2,
+                    content.y(),
+                    THUMBNAIL_SIZE.width(),
+                    THUMBNAIL_SIZE.height(),
+                )
+                text_rect = content.adjusted(0, THUMBNAIL_SIZE.height() + 8, 0, 0)
+            else:
+                thumb_rect = QRect(content.topLeft(), THUMBNAIL_SIZE)
+                text_rect = content.adjusted(THUMBNAIL_SIZE.width() + 12, 0, 0, 0)
+            self._paint_thumbnail(painter, thumb_rect, result.get("thumbnail_path"))
+        else:
+            text_rect = content
+
+        self._paint_text(painter, text_rect, result)
+        painter.restore()
+
+    def _paint_thumbnail(self, painter, rect: QRect, thumbnail_path: Optional[str]):
+        """绘制缩略图，未就绪时绘制占位符"""
+        pixmap = self.loader.pixmap(thumbnail_path) if thumbnail_path else None
+        if pixmap is not None:
+            target = QRect(rect)
+            target.setSize(pixmap.size())
+            target.moveCenter(rect.center())
+            painter.drawPixmap(target, pixmap)
+            return
+
+        if thumbnail_path and not self.loader.is_failed(thumbnail_path):
+            placeholder = "加载中..."
+        else:
+            placeholder = "无缩略图"
+        painter.setPen(QPen(QColor("#DDDDDD")))
+        painter.setBrush(QColor("#F0F0F0"))
+        painter.drawRoundedRect(rect, 3, 3)
+        painter.setPen(QColor("#999999"))
+        painter.drawText(rect, Qt.AlignCenter, placeholder)
+
+    def _paint_text(self, painter, rect: QRect, result: Dict[str, Any]):
+        """绘制文件名、相似度、类型和时间段"""
+        name_font = QFont("Arial", 11, QFont.Bold)
+        painter.setFont(name_font)
+        painter.setPen(QColor("#1D2129"))
+        line_height = painter.fontMetrics().height()
+        file_name = painter.fontMetrics().elidedText(
+            result.get("file_name", "未知文件"), Qt.ElideMiddle, rect.width()
+        )
+        painter.drawText(
+            QRect(rect.x(), rect.y(), rect.width(), line_height),
+            Qt.AlignLeft | Qt.AlignVCenter,
+            file_name,
+        )
+
+        lines = []
+        score = result.get("score", 0.0)
+        if score > 0:
+            lines.append((f"相似度: {score:.2%}", QColor("#4CAF50")))
+        modality = result.get("modality", "")
+        if modality:
+            lines.append((f"类型: {modality}", QColor("#666666")))
+        if "start_time" in result:
+            start_time = result.get("start_time", 0.0)
+            end_time = result.get("end_time", 0.0)
+            lines.append(
+                (f"时间: {start_time:.1f}s - {end_time:.1f}s", QColor("#666666"))
+            )
+
+        painter.setFont(QFont("Arial", 9))
+        y = rect.y() + line_height + 4
+        small_height = painter.fontMetrics().height()
+        for text, color in lines:
+            if y + small_height > rect.bottom():
+                break
+            painter.setPen(color)
+            painter.drawText(
+                QRect(rect.x(), y, rect.width(), small_height),
+                Qt.AlignLeft | Qt.AlignVCenter,
+                text,
+            )
+            y += small_height + 2
 
 
 class ResultPanel(QWidget):
@@ -169,6 +345,13 @@ class ResultPanel(QWidget):
         # 时间轴数据（根据设计文档要求）
         self.timeline_items: List[TimelineItem] = []
 
+        # 结果模型和异步缩略图加载
+        self.thumbnail_loader = ThumbnailLoader(self)
+        self.result_model = ResultListModel(self)
+        self.thumbnail_loader.thumbnail_ready.connect(
+            self.result_model.on_thumbnail_ready
+        )
+
         self.init_ui()
 
     def init_ui(self):
@@ -404,14 +587,31 @@ class ResultPanel(QWidget):
         results_layout = QVBoxLayout(self.results_tab)
         results_layout.setContentsMargins(0, 0, 0, 0)
 
-        # 结果显示区域
-        self.scroll_area = QScrollArea()
-        self.scroll_area.setWidgetResizable(True)
-        self.scroll_area.setHorizontalScrollBarPolicy(Qt.ScrollBarAsNeeded)
-        self.scroll_area.setVerticalScrollBarPolicy(Qt.ScrollBarAsNeeded)
-        self.scroll_area.setStyleSheet(
+        # 无结果提示
+        self.empty_label = QLabel("没有找到匹配的结果")
+        self.empty_label.setAlignment(Qt.AlignCenter)
+        self.empty_label.setStyleSheet("color: #999; font-size: 14px;")
+        self.empty_label.hide()
+        results_layout.addWidget(self.empty_label)
+
+        # 结果显示区域：只绘制可见行
+        self.result_view = QListView()
+        self.result_view.setModel(self.result_model)
+        self.result_delegate = ResultItemDelegate(self.thumbnail_loader, self)
+        self.result_view.setItemDelegate(self.result_delegate)
+        self.result_view.setUniformItemSizes(True)
+        self.result_view.setLayoutMode(QListView.Batched)
+        self.result_view.setBatchSize(50)
+        self.result_view.setResizeMode(QListView.Adjust)
+        self.result_view.setMovement(QListView.Static)
+        self.result_view.setSelectionMode(QAbstractItemView.SingleSelection)
+        self.result_view.setVerticalScrollMode(QAbstractItemView.ScrollPerPixel)
+        self.result_view.setMouseTracking(True)
+        self.result_view.clicked.connect(self.on_result_clicked)
+        self.result_view.activated.connect(self.on_result_activated)
+        self.result_view.setStyleSheet(
             """
-            QScrollArea {
+            QListView {
                 border: none;
                 background-color: transparent;
             }
@@ -429,15 +629,9 @@ class ResultPanel(QWidget):
             }
         """
         )
+        self.apply_view_mode()
 
-        # 结果容器
-        self.results_container = QWidget()
-        self.results_layout = QGridLayout(self.results_container)
-        self.results_layout.setAlignment(Qt.AlignTop)
-        self.results_layout.setSpacing(15)
-        self.scroll_area.setWidget(self.results_container)
-
-        results_layout.addWidget(self.scroll_area)
+        results_layout.addWidget(self.result_view)
         self.tab_widget.addTab(self.results_tab, "结果列表")
 
         # 时间轴选项卡
@@ -510,41 +704,19 @@ class ResultPanel(QWidget):
 
     def update_results_display(self):
         """更新结果显示"""
-        # 清除现有结果
-        for i in reversed(range(self.results_layout.count())):
-            widget = self.results_layout.itemAt(i).widget()
-            if widget:
-                widget.setParent(None)
-
         # 应用类型过滤（根据设计文档要求）
-        filter_type = self.filter_combo.currentText()
+        modality = FILTER_MODALITIES[max(self.filter_combo.currentIndex(), 0)]
         filtered_results = self.results
-        if filter_type != "全部":
-            if filter_type == "图像":
-                filtered_results = [
-                    r for r in self.results if r.get("modality") == "image"
-                ]
-            elif filter_type == "视频":
-                filtered_results = [
-                    r for r in self.results if r.get("modality") == "video"
-                ]
-            elif filter_type == "音频":
-                filtered_results = [
-                    r for r in self.results if r.get("modality") == "audio"
-                ]
+        if modality:
+            filtered_results = [r for r in self.results if r.get("modality") == modality]
 
         # 更新统计
         self.stats_label.setText(
             f"共找到 {len(filtered_results)} 个结果 (总计: {len(self.results)})"
         )
 
-        # 显示结果
-        if not filtered_results:
-            no_result_label = QLabel("没有找到匹配的结果")
-            no_result_label.setAlignment(Qt.AlignCenter)
-            no_result_label.setStyleSheet("color: #999; font-size: 14px;")
-            self.results_layout.addWidget(no_result_label, 0, 0)
-            return
+        # 切换结果集时放弃尚未开始的缩略图解码
+        self.thumbnail_loader.cancel_pending()
 
         # 根据视图模式显示结果
         if self.current_view_mode == "grid":
@@ -552,36 +724,42 @@ class ResultPanel(QWidget):
         else:
             self.display_list_results(filtered_results)
 
+        self.empty_label.setVisible(not filtered_results)
+        self.result_view.setVisible(bool(filtered_results))
+
+    def apply_view_mode(self):
+        """根据当前视图模式和缩略图开关设置列表视图"""
+        grid = self.current_view_mode == "grid"
+        self.result_delegate.grid_mode = grid
+        self.result_delegate.show_thumbnails = self.show_thumbnails
+        self.result_view.setViewMode(QListView.IconMode if grid else QListView.ListMode)
+        self.result_view.setFlow(QListView.LeftToRight if grid else QListView.TopToBottom)
+        self.result_view.setWrapping(grid)
+        self.result_view.setSpacing(5 if grid else 0)
+        # 代理尺寸变化后重新布局
+        self.result_view.scheduleDelayedItemsLayout()
+
     def display_grid_results(self, results: List[Dict[str, Any]]):
         """以网格模式显示结果"""
-        columns = 3
-        for idx, result in enumerate(results):
-            row = idx // columns
-            col = idx % columns
-
-            result_widget = ResultItemWidget(result)
-            result_widget.item_clicked.connect(self.result_opened.emit)
-            result_widget.item_double_clicked.connect(self.result_opened.emit)
-
-            self.results_layout.addWidget(result_widget, row, col)
+        self.apply_view_mode()
+        self.result_model.set_results(results)
 
     def display_list_results(self, results: List[Dict[str, Any]]):
         """以列表模式显示结果"""
-        for idx, result in enumerate(results):
-            result_widget = ResultItemWidget(result)
-            result_widget.item_clicked.connect(self.result_opened.emit)
-            result_widget.item_double_clicked.connect(self.result_opened.emit)
-
-            self.results_layout.addWidget(result_widget, idx, 0)
+        self.apply_view_mode()
+        self.result_model.set_results(results)
 
-    def display_list_results(self):
-        """以列表模式显示结果"""
-        for idx, result in enumerate(self.results):
-            result_widget = ResultItemWidget(result)
-            result_widget.item_clicked.connect(self.result_opened.emit)
-            result_widget.item_double_clicked.connect(self.result_opened.emit)
+    def on_result_clicked(self, index: QModelIndex):
+        """结果单击事件"""
+        result = index.data(ResultListModel.ResultRole)
+        if result is not None:
+            self.result_selected.emit(result)
 
-            self.results_layout.addWidget(result_widget, idx, 0)
+    def on_result_activated(self, index: QModelIndex):
+        """结果双击或回车事件"""
+        result = index.data(ResultListModel.ResultRole)
+        if result is not None:
+            self.result_opened.emit(result)
 
     def on_view_mode_changed(self, index):
         """视图模式改变事件"""
@@ -623,9 +801,10 @@ class ResultPanel(QWidget):
 
     def get_selected_result(self) -> Optional[Dict[str, Any]]:
         """获取选中的结果"""
-        # 这里应该实现获取选中结果的逻辑
-        # 暂时返回None
-        return None
+        index = self.result_view.currentIndex()
+        if not index.isValid():
+            return None
+        return index.data(ResultListModel.ResultRole)
 
     def display_results(self, results: List[Dict[str, Any]]):
         """显示搜索结果"""
@@ -3,6 +3,7 @@
 显示任务列表、优先级控制和进度信息
 """
 
+import time
 from typing import List, Dict, Any, Optional
 from PySide6.QtWidgets import (
     QWidget,
@@ -19,6 +20,8 @@ from PySide6.QtWidgets import (
 from PySide6.QtCore import Signal, Qt, QTimer
 from PySide6.QtGui import QColor
 
+from src.api.task_event_subscriber import TaskEventSubscriber
+
 
 class TaskListItem(QListWidgetItem):
     """任务列表项"""
@@ -26,14 +29,18 @@ class TaskListItem(QListWidgetItem):
     def __init__(self, task_data: Dict[str, Any], parent=None):
         """初始化任务列表项"""
         super().__init__(parent)
+        self.update_task(task_data)
+
+    def update_task(self, task_data: Dict[str, Any]):
+        """根据任务数据刷新显示内容"""
         self.task_data = task_data
 
         # 获取任务信息
-        task_id = task_data.get("id", "")[:8]
+        task_id = (task_data.get("id") or task_data.get("task_id") or "")[:8]
         task_type = task_data.get("task_type", "unknown")
         status = task_data.get("status", "pending")
-        priority = task_data.get("priority", 5)
-        progress = task_data.get("progress", 0.0)
+        priority = task_data.get("priority") or 5
+        progress = task_data.get("progress") or 0.0
 
         # 状态图标
         status_icons = {
@@ -82,21 +89,42 @@ class TaskQueuePanel(QWidget):
     tasks_cancelled = Signal()
     priority_changed = Signal(dict)
     task_selected = Signal(dict)
+    stats_changed = Signal(dict)
+    # 订阅线程收到的任务事件，转发到界面线程处理
+    task_event_received = Signal(str, dict)
+
+    # 线程池状态的最小刷新间隔（秒）
+    THREAD_POOL_REFRESH_INTERVAL = 5.0
 
     def __init__(self, api_client=None, parent=None):
         """初始化任务队列面板"""
         super().__init__(parent)
         self.tasks: List[Dict[str, Any]] = []
         self.api_client = api_client
+        self.task_events: Optional[TaskEventSubscriber] = None
+        self._items: Dict[str, TaskListItem] = {}
+        self._thread_pool_refreshed_at = 0.0
         self.init_ui()
 
-        # 模拟数据（暂时使用）
-        self._load_mock_data()
+        self.task_list.itemSelectionChanged.connect(self._on_task_selection_changed)
+        self.task_event_received.connect(self.apply_event)
+
+        if self.api_client is not None and hasattr(self.api_client, "stream_events"):
+            # 订阅任务事件流，任务变化时增量更新列表
+            self.task_events = TaskEventSubscriber(
+                self.api_client.stream_events,
+                self.api_client.get_tasks,
+                on_event=self.task_event_received.emit,
+            )
+            self.task_events.start()
+        else:
+            # 模拟数据（无API客户端时使用）
+            self._load_mock_data()
 
-        # 定时器更新进度
+        # 线程池状态没有事件推送，低频刷新
         self.update_timer = QTimer()
-        self.update_timer.timeout.connect(self._update_progress)
-        self.update_timer.start(1000)  # 每秒更新一次
+        self.update_timer.timeout.connect(self._update_thread_pool_status)
+        self.update_timer.start(int(self.THREAD_POOL_REFRESH_INTERVAL * 1000))
 
     def init_ui(self):
         """初始化用户界面"""
@@ -495,31 +523,85 @@ class TaskQueuePanel(QWidget):
             self.tasks.append(task)
 
         self._refresh_tasks()
-        self._update_progress()
+        self._update_thread_pool_status()
+
+    def set_tasks(self, tasks: List[Dict[str, Any]]):
+        """
+        替换全部任务（事件流重新同步时调用）
+
+        Args:
+            tasks: 任务列表
+        """
+        self.tasks = [self._with_id(task) for task in tasks]
+        self._refresh_tasks()
+
+    def apply_event(self, event_type: str, data: Dict[str, Any]):
+        """
+        应用一个任务事件，只更新受影响的列表项
+
+        Args:
+            event_type: 事件类型（reset/created/started/progress/completed/failed/cancelled）
+            data: 事件数据
+        """
+        if event_type == "reset":
+            if self.task_events is not None:
+                self.set_tasks(self.task_events.get_tasks())
+            return
+
+        task_id = data.get("task_id")
+        if not task_id:
+            return
+
+        task = next((t for t in self.tasks if t["id"] == task_id), None)
+        if task is None:
+            task = {"id": task_id}
+            self.tasks.append(task)
+        task.update(
+            (key, value) for key, value in data.items() if key not in ("seq", "ts")
+        )
+
+        item = self._items.get(task_id)
+        if item is not None and self._matches_filter(task):
+            item.update_task(task)
+            self._update_progress()
+        else:
+            # 新任务或过滤结果变化时才重建列表
+            self._refresh_tasks()
+
+    @staticmethod
+    def _with_id(task: Dict[str, Any]) -> Dict[str, Any]:
+        task = dict(task)
+        task["id"] = task.get("id") or task.get("task_id", "")
+        return task
+
+    def _matches_filter(self, task: Dict[str, Any]) -> bool:
+        """任务是否符合当前过滤条件"""
+        filter_type = self.task_filter.currentText()
+        if filter_type == "全部":
+            return True
+        status_map = {
+            "待处理": "pending",
+            "运行中": "running",
+            "已完成": "completed",
+            "失败": "failed",
+        }
+        return task.get("status") == status_map.get(filter_type)
 
     def _refresh_tasks(self):
         """刷新任务列表"""
         self.task_list.clear()
-
-        filter_type = self.task_filter.currentText()
+        self._items = {}
 
         for task in self.tasks:
             # 应用过滤
-            if filter_type != "全部":
-                status_map = {
-                    "待处理": "pending",
-                    "运行中": "running",
-                    "已完成": "completed",
-                    "失败": "failed",
-                }
-                if task.get("status") != status_map.get(filter_type):
-                    continue
+            if not self._matches_filter(task):
+                continue
 
             item = TaskListItem(task)
             self.task_list.addItem(item)
+            self._items[task["id"]] = item
 
-        # 连接任务选择信号
-        self.task_list.itemSelectionChanged.connect(self._on_task_selection_changed)
+        self._update_progress()
 
     def _filter_tasks(self, filter_type: str):
         """过滤任务"""
@@ -527,30 +609,31 @@ class TaskQueuePanel(QWidget):
 
     def _update_progress(self):
         """更新进度信息"""
+        stats = self.get_stats()
         total = len(self.tasks)
-        running = sum(1 for t in self.tasks if t["status"] == "running")
-        completed = sum(1 for t in self.tasks if t["status"] == "completed")
-
-        # 更新运行中任务的进度
-        for task in self.tasks:
-            if task["status"] == "running":
-                task["progress"] = min(1.0, task["progress"] + 0.1)
-                if task["progress"] >= 1.0:
-                    task["status"] = "completed"
-                    task["progress"] = 1.0
-
-        self._refresh_tasks()
+        running = stats["running"]
 
         # 更新进度标签
         if running > 0:
-            remaining = total - completed
+            remaining = stats["pending"] + running
             self.progress_label.setText(
-                f"处理中: {running}/{total} | 预计剩余: {remaining * 2}秒"
+                f"处理中: {running}/{total} | 剩余任务: {remaining}"
             )
         else:
             self.progress_label.setText(f"处理中: {running}/{total} | 预计剩余: 无")
 
-        # 更新线程池状态（模拟数据）
+        self.stats_changed.emit(stats)
+
+    def _update_thread_pool_status(self):
+        """更新线程池状态（限制刷新频率）"""
+        now = time.monotonic()
+        if now - self._thread_pool_refreshed_at < self.THREAD_POOL_REFRESH_INTERVAL * 0.5:
+            return
+        self._thread_pool_refreshed_at = now
+
+        running = self.get_stats()["running"]
+
+        # 本地估算（无API或API失败时使用）
         max_threads = 8
         active_threads = running
         idle_threads = max_threads - active_threads
@@ -698,12 +781,18 @@ class TaskQueuePanel(QWidget):
     def get_stats(self) -> Dict[str, int]:
         """获取任务统计"""
         return {
-            "pending": sum(1 for t in self.tasks if t["status"] == "pending"),
-            "running": sum(1 for t in self.tasks if t["status"] == "running"),
-            "completed": sum(1 for t in self.tasks if t["status"] == "completed"),
-            "failed": sum(1 for t in self.tasks if t["status"] == "failed"),
+            "pending": sum(1 for t in self.tasks if t.get("status") == "pending"),
+            "running": sum(1 for t in self.tasks if t.get("status") == "running"),
+            "completed": sum(1 for t in self.tasks if t.get("status") == "completed"),
+            "failed": sum(1 for t in self.tasks if t.get("status") == "failed"),
         }
 
+    def stop(self):
+        """停止事件订阅和定时器"""
+        self.update_timer.stop()
+        if self.task_events is not None:
+            self.task_events.stop()
+
     def show_task_dependencies(self, task_id: str) -> Dict[str, Any]:
         """
         显示任务依赖信息
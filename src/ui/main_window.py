@@ -33,7 +33,7 @@ from PySide6.QtGui import QAction
 
 # 导入UI组件
 from src.ui.components.search_panel import SearchPanel
-from src.ui.components.result_panel_updated import ResultPanel
+from src.ui.components.result_panel import ResultPanel
 from src.ui.components.task_manager_panel import TaskManagerPanel
 from src.ui.components.monitored_directories_panel import MonitoredDirectoriesPanel
 from src.ui.components.task_queue_panel import TaskQueuePanel
@@ -45,6 +45,7 @@ try:
     from src.core.vector.vector_store import VectorStore
     from src.core.embedding.embedding_engine import EmbeddingEngine
     from src.services.search.search_engine import SearchEngine
+    from src.services.search.relevance_feedback import RelevanceFeedback
     from src.api.api_client import APIClient
 except ImportError as e:
     print(f"导入核心模块失败: {e}")
@@ -55,6 +56,8 @@ class SearchThread(QThread):
     """后台搜索线程"""
 
     result_ready = Signal(list)
+    # 流式文本搜索的中间结果（最快的模态返回后即发出，之后随合并和缩略图更新）
+    partial_results = Signal(list)
     error_occurred = Signal(str)
 
     def __init__(
@@ -78,6 +81,11 @@ class SearchThread(QThread):
     def run(self):
         """执行搜索任务"""
         try:
+            # 文本搜索使用流式接口，先显示最快返回的结果
+            if not self.is_file_search and self.search_type == "text":
+                self._run_stream_search()
+                return
+
             # 优先使用API客户端（如果可用且启用）
             if self.use_api and self.api_client:
                 search_result = self._search_via_api()
@@ -95,6 +103,50 @@ class SearchThread(QThread):
         except Exception as e:
             self.error_occurred.emit(str(e))
 
+    def _run_stream_search(self):
+        """执行流式文本搜索，逐批发出结果"""
+        results: List[Dict[str, Any]] = []
+        for event in self._stream_events():
+            event_type = event.get("event")
+            if event_type == "results":
+                results = event.get("results", [])
+                self.partial_results.emit(results)
+            elif event_type == "hydrated":
+                media_paths = {
+                    item.get("file_uuid") or item.get("file_id"): item
+                    for item in event.get("paths", [])
+                }
+                for result in results:
+                    item = media_paths.get(result.get("file_uuid") or result.get("file_id"))
+                    if item:
+                        result["thumbnail_path"] = item.get("thumbnail_path")
+                        result["preview_path"] = item.get("preview_path")
+            elif event_type == "error":
+                self.error_occurred.emit(event.get("error", "搜索失败"))
+                return
+        self.result_ready.emit(results)
+
+    def _stream_events(self):
+        """获取流式搜索事件（API优先，否则直接使用搜索引擎）"""
+        if self.use_api and self.api_client:
+            yield from self.api_client.search_text_stream(self.query)
+            return
+
+        import asyncio
+
+        # 在线程自己的事件循环中逐个取出异步事件
+        loop = asyncio.new_event_loop()
+        stream = self.search_engine.search_stream(self.query)
+        try:
+            while True:
+                try:
+                    yield loop.run_until_complete(stream.__anext__())
+                except StopAsyncIteration:
+                    break
+        finally:
+            loop.run_until_complete(stream.aclose())
+            loop.close()
+
     def _search_via_api(self) -> Dict[str, Any]:
         """通过API进行搜索"""
         if self.is_file_search or self.search_type in ["image", "audio"]:
@@ -161,11 +213,6 @@ class MainWindow(QMainWindow):
         self.init_core_components()
         self.connect_signals()
 
-        # 状态更新定时器
-        self.status_timer = QTimer()
-        self.status_timer.timeout.connect(self.update_status)
-        self.status_timer.start(5000)  # 每5秒更新一次状态
-
     def init_ui(self):
         """初始化用户界面"""
         self.setWindowTitle("msearch - 多模态搜索系统")
@@ -445,6 +492,8 @@ class MainWindow(QMainWindow):
         self.task_queue_panel.tasks_resumed.connect(self._on_tasks_resumed)
         self.task_queue_panel.tasks_cancelled.connect(self._on_tasks_cancelled)
         self.task_queue_panel.priority_changed.connect(self._on_priority_changed)
+        # 任务状态由事件流推送，统计变化时更新状态栏
+        self.task_queue_panel.stats_changed.connect(self._on_task_stats_changed)
         layout.addWidget(self.task_queue_panel)
 
         layout.addStretch()
@@ -593,6 +642,7 @@ class MainWindow(QMainWindow):
                 config=search_config,
                 embedding_engine=self.embedding_engine,
                 vector_store=self.vector_store,
+                relevance_feedback=RelevanceFeedback(search_config),
             )
             self.search_engine.initialize()
 
@@ -652,6 +702,7 @@ class MainWindow(QMainWindow):
                 search_type=search_type,
                 use_api=use_api,
             )
+            search_thread.partial_results.connect(self.on_search_partial)
             search_thread.result_ready.connect(self.on_search_completed)
             search_thread.error_occurred.connect(self.on_search_failed)
             search_thread.start()
@@ -710,6 +761,12 @@ class MainWindow(QMainWindow):
         # 为了演示，暂时使用模拟数据
         QTimer.singleShot(1000, lambda: self.search_completed.emit([]))
 
+    def on_search_partial(self, results: List[Dict[str, Any]]):
+        """流式搜索中间结果事件"""
+        self.update_status(f"已找到 {len(results)} 个结果，正在继续搜索...")
+        if hasattr(self.result_panel, "display_results"):
+            self.result_panel.display_results(results)
+
     def on_search_completed(self, results: List[Dict[str, Any]]):
         """搜索完成事件"""
         self.update_status(f"搜索完成，找到 {len(results)} 个结果")
@@ -883,6 +940,13 @@ class MainWindow(QMainWindow):
         else:
             self.update_status("已恢复所有任务(离线模式)")
 
+    def _on_task_stats_changed(self, stats: dict):
+        """任务统计变化事件"""
+        if stats.get("running") or stats.get("pending"):
+            self.update_status(
+                f"任务: 运行中 {stats.get('running', 0)} | 待处理 {stats.get('pending', 0)}"
+            )
+
     def _on_tasks_cancelled(self):
         """任务取消事件"""
         self.update_status("正在取消所有任务...")
@@ -1037,8 +1101,7 @@ class MainWindow(QMainWindow):
 
         if reply == QMessageBox.Yes:
             # 清理资源
-            if self.status_timer:
-                self.status_timer.stop()
+            self.task_queue_panel.stop()
             event.accept()
         else:
             event.ignore()
@@ -0,0 +1,40 @@
+"""
+包级别的延迟导出
+包的__init__只登记导出名称，首次访问时才导入对应子模块，
+导入src.core.config等轻量子模块时不会连带加载lancedb、torch等重依赖
+"""
+
+import importlib
+from typing import Any, Callable, Dict, List, Tuple
+
+
+def lazy_exports(
+    package: str, exports: Dict[str, str]
+) -> Tuple[Callable[[str], Any], Callable[[], List[str]]]:
+    """
+    生成包的__getattr__和__dir__
+
+    Args:
+        package: 包名（在__init__中传入__name__）
+        exports: 导出名称 -> 相对模块路径；名称与模块中的属性不同时写作"模块:属性"
+
+    Returns:
+        (__getattr__, __dir__)
+    """
+    module_globals = importlib.import_module(package).__dict__
+
+    def __getattr__(name: str) -> Any:
+        if name not in exports:
+            raise AttributeError(f"module {package!r} has no attribute {name!r}")
+        module_name, _, attribute = exports[name].partition(":")
+        value = getattr(
+            importlib.import_module(module_name, package), attribute or name
+        )
+        # 缓存到包的命名空间，之后的访问不再经过__getattr__
+        module_globals[name] = value
+        return value
+
+    def __dir__() -> List[str]:
+        return sorted(set(module_globals) | set(exports))
+
+    return __getattr__, __dir__
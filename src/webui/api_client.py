@@ -7,9 +7,11 @@ import os
 import json
 import logging
 import requests
-from typing import List, Dict, Any, Optional
+from typing import List, Dict, Any, Iterator, Optional, Tuple
 from pathlib import Path
 
+from src.api.task_event_subscriber import iter_sse
+
 logger = logging.getLogger(__name__)
 
 
@@ -89,6 +91,66 @@ class APIClient:
 
         return self._make_request("POST", endpoint, json=data)
 
+    def search_text_stream(
+        self, query: str, top_k: int = 20, threshold: Optional[float] = None
+    ) -> Iterator[Dict[str, Any]]:
+        """
+        流式文本搜索（连接断开或出错时抛出异常）
+
+        Args:
+            query: 搜索查询
+            top_k: 返回结果数量
+            threshold: 相似度阈值
+
+        Yields:
+            搜索事件（results/hydrated/done/error）
+        """
+        data = {"query": query, "top_k": top_k}
+        if threshold is not None:
+            data["threshold"] = threshold
+
+        with self.session.post(
+            f"{self.base_url}/api/v1/search/text/stream",
+            json=data,
+            stream=True,
+            timeout=self.timeout,
+        ) as response:
+            response.raise_for_status()
+            for line in response.iter_lines(decode_unicode=True):
+                if line:
+                    yield json.loads(line)
+
+    def submit_feedback(
+        self, query_id: str, result_id: str, feedback: int
+    ) -> Dict[str, Any]:
+        """
+        提交搜索结果反馈
+
+        Args:
+            query_id: 搜索响应中的query_id
+            result_id: 结果的file_uuid
+            feedback: 反馈 (-1: 不相关, 0: 中性, 1: 相关)
+
+        Returns:
+            响应结果
+        """
+        data = {"query_id": query_id, "result_id": result_id, "feedback": feedback}
+        return self._make_request("POST", "/api/v1/search/feedback", json=data)
+
+    def refine_search(self, query_id: str, top_k: int = 20) -> Dict[str, Any]:
+        """
+        根据已提交的反馈精化搜索（在原搜索的候选集上重新排序）
+
+        Args:
+            query_id: 搜索响应中的query_id
+            top_k: 返回结果数量
+
+        Returns:
+            搜索结果
+        """
+        data = {"query_id": query_id, "top_k": top_k}
+        return self._make_request("POST", "/api/v1/search/refine", json=data)
+
     def search_image(self, image_path: str, top_k: int = 20) -> Dict[str, Any]:
         """
         图像搜索
@@ -165,6 +227,84 @@ class APIClient:
 
         return self._make_request("GET", endpoint, params=params)
 
+    def query_tasks(
+        self,
+        statuses: Optional[List[str]] = None,
+        task_types: Optional[List[str]] = None,
+        search: Optional[str] = None,
+        priority: Optional[str] = None,
+        created_after: Optional[float] = None,
+        sort_by: str = "created_at",
+        order: str = "desc",
+        limit: int = 100,
+        cursor: Optional[str] = None,
+        fields: Optional[List[str]] = None,
+    ) -> Dict[str, Any]:
+        """
+        按条件查询任务（过滤、排序和分页在服务端完成）
+
+        Args:
+            statuses: 状态过滤
+            task_types: 任务类型过滤
+            search: 搜索字符串
+            priority: 优先级范围，如 "1-3,8-10"
+            created_after: 只返回该时间戳之后创建的任务
+            sort_by: 排序字段
+            order: 排序方向（asc/desc）
+            limit: 返回数量限制
+            cursor: 上一页返回的next_cursor
+            fields: 额外返回的可选字段
+
+        Returns:
+            任务列表响应（含next_cursor和status_counts）
+        """
+        params = {"sort_by": sort_by, "order": order, "limit": limit}
+        for key, value in (
+            ("status", statuses),
+            ("task_type", task_types),
+            ("fields", fields),
+        ):
+            if value:
+                params[key] = ",".join(value)
+        for key, value in (
+            ("search", search),
+            ("priority", priority),
+            ("created_after", created_after),
+            ("cursor", cursor),
+        ):
+            if value is not None:
+                params[key] = value
+
+        return self._make_request("GET", "/api/v1/tasks", params=params)
+
+    def stream_events(
+        self, since: Optional[int] = None, stream_id: Optional[str] = None
+    ) -> Iterator[Tuple[str, Dict[str, Any], Optional[str]]]:
+        """
+        订阅任务事件流（连接断开或出错时抛出异常，由调用方重连）
+
+        Args:
+            since: 已收到的最后一个事件序号
+            stream_id: 事件流ID
+
+        Yields:
+            (事件类型, 事件数据, 事件ID)
+        """
+        params = {}
+        if since is not None:
+            params["since"] = since
+            params["stream_id"] = stream_id
+
+        with self.session.get(
+            f"{self.base_url}/api/v1/events",
+            params=params,
+            stream=True,
+            # 读超时需大于服务端心跳间隔
+            timeout=(5, 60),
+        ) as response:
+            response.raise_for_status()
+            yield from iter_sse(response.iter_lines(decode_unicode=True))
+
     def get_task_status(self, task_id: str) -> Dict[str, Any]:
         """
         获取任务状态
@@ -299,6 +439,33 @@ class APIClient:
         endpoint = "/api/v1/tasks/stats"
         return self._make_request("GET", endpoint)
 
+    # ==================== 文件相关 ====================
+
+    def get_thumbnails(
+        self,
+        paths: List[str],
+        size: Optional[int] = None,
+        inline: bool = False,
+        known_etags: Optional[Dict[str, str]] = None,
+    ) -> Dict[str, Any]:
+        """
+        批量获取缩略图
+
+        Args:
+            paths: 源文件路径列表
+            size: 缩略图尺寸
+            inline: 是否内联base64数据
+            known_etags: 已缓存的ETag {路径: ETag}
+
+        Returns:
+            缩略图结果列表
+        """
+        endpoint = "/api/v1/files/thumbnails"
+        data = {"paths": paths, "inline": inline, "known_etags": known_etags or {}}
+        if size is not None:
+            data["size"] = size
+        return self._make_request("POST", endpoint, json=data)
+
     # ==================== 系统相关 ====================
 
     def get_system_info(self) -> Dict[str, Any]:
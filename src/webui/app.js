@@ -254,6 +254,7 @@ function renderSearchResults(results) {
         return;
     }
     
+    const thumbnailPaths = [];
     results.forEach(result => {
         const card = document.createElement('div');
         card.className = 'result-card';
@@ -261,33 +262,15 @@ function renderSearchResults(results) {
         const score = result.score || (1 - result._distance);
         const fileName = result.file_name || result.metadata?.file_name || '未知文件';
         const filePath = result.file_path || result.metadata?.file_path || '';
-        const thumbnailPath = result.thumbnail_path || result.metadata?.thumbnail_path || '';
-        const previewPath = result.preview_path || result.metadata?.preview_path || '';
         const fileType = result.file_type || result.metadata?.file_type || result.modality || 'unknown';
         
-        // 判断是否是图像类型
-        const isImage = fileType === 'image' || result.modality === 'image' || 
-                      fileName.match(/\.(jpg|jpeg|png|gif|bmp|webp)$/i);
-        
-        // 生成预览图URL
+        // 生成预览图，图片地址由批量缩略图请求统一填充
         let previewHtml = '';
-        if (isImage && filePath) {
-            // 如果是图像文件，直接使用原图作为预览
+        if (filePath) {
+            thumbnailPaths.push(filePath);
             previewHtml = `
                 <div class="result-preview">
-                    <img src="/api/v1/files/preview?path=${encodeURIComponent(filePath)}" 
-                         alt="${fileName}" 
-                         onerror="this.src='data:image/svg+xml;base64,PHN2ZyB4bWxucz0iaHR0cDovL3d3dy53My5vcmcvMjAwMC9zdmciIHdpZHRoPSIxMjAiIGhlaWdodD0iMTIwIiB2aWV3Qm94PSIwIDAgMTIwIDEyMCI+PHJlY3Qgd2lkdGg9IjEyMCIgaGVpZ2h0PSIxMjAiIGZpbGw9IiNjZjZjNmYiLz48dGV4dCB4PSI2MCIgeT0iNjAiIGR5PSI2MCIgZmlsbD0id2hpdGUiIGZvbnQtc2l6ZT0iMTIiIHRleHQtYW5jaG9yPSJtaWRkbGUiPk5vIFByZXZpZXc8L3RleHQ+PC9zdmc+'">
-                    <div class="preview-overlay">
-                        <span class="preview-type">${fileType.toUpperCase()}</span>
-                    </div>
-                </div>
-            `;
-        } else if (thumbnailPath) {
-            // 如果有缩略图，使用缩略图
-            previewHtml = `
-                <div class="result-preview">
-                    <img src="/api/v1/files/thumbnail?path=${encodeURIComponent(thumbnailPath)}" 
+                    <img data-thumb-path="${encodeURIComponent(filePath)}" 
                          alt="${fileName}" 
                          onerror="this.parentElement.style.display='none'">
                     <div class="preview-overlay">
@@ -328,6 +311,50 @@ function renderSearchResults(results) {
         
         container.appendChild(card);
     });
+    
+    loadThumbnails(container, thumbnailPaths);
+}
+
+// 单次批量缩略图请求的路径数上限（与服务端ThumbnailBatchRequest一致）
+const THUMBNAIL_BATCH_SIZE = 200;
+
+// 批量加载缩略图：按服务端上限分批请求，各批并行取回
+async function loadThumbnails(container, paths) {
+    const batches = [];
+    for (let i = 0; i < paths.length; i += THUMBNAIL_BATCH_SIZE) {
+        batches.push(paths.slice(i, i + THUMBNAIL_BATCH_SIZE));
+    }
+    await Promise.all(batches.map(batch => loadThumbnailBatch(container, batch)));
+}
+
+async function loadThumbnailBatch(container, paths) {
+    try {
+        const response = await fetch('/api/v1/files/thumbnails', {
+            method: 'POST',
+            headers: { 'Content-Type': 'application/json' },
+            body: JSON.stringify({ paths: paths, inline: true })
+        });
+        if (!response.ok) {
+            throw new Error(`HTTP ${response.status}`);
+        }
+        
+        const data = await response.json();
+        data.items.forEach(item => {
+            const img = container.querySelector(`img[data-thumb-path="${encodeURIComponent(item.path)}"]`);
+            if (!img) {
+                return;
+            }
+            if (!item.found) {
+                img.parentElement.style.display = 'none';
+            } else if (item.data) {
+                img.src = `data:${item.media_type};base64,${item.data}`;
+            } else {
+                img.src = item.url;
+            }
+        });
+    } catch (error) {
+        console.error('加载缩略图失败:', error);
+    }
 }
 
 // 打开文件
@@ -20,11 +20,28 @@ sys.path.insert(0, str(project_root))
 
 from core.config.config_manager import ConfigManager
 from webui.api_client import APIClient
+from src.api.task_event_subscriber import TaskEventSubscriber
 from services.file.file_monitor import FileMonitor
 from webui.enhanced_task_manager import EnhancedTaskManager
 
 logger = logging.getLogger(__name__)
 
+# 任务管理器优先级选项对应的优先级范围
+TASK_PRIORITY_RANGES = {"高(1-3)": "1-3", "中(4-7)": "4-7", "低(8-10)": "8-10"}
+
+# 任务管理器排序选项对应的 (排序字段, 排序方向)
+TASK_SORT_OPTIONS = {
+    "创建时间(降序)": ("created_at", "desc"),
+    "创建时间(升序)": ("created_at", "asc"),
+    "优先级(降序)": ("priority", "asc"),
+    "优先级(升序)": ("priority", "desc"),
+    "状态": ("status", "desc"),
+    "进度(降序)": ("progress", "desc"),
+    "进度(升序)": ("progress", "asc"),
+    "耗时(降序)": ("duration", "desc"),
+    "耗时(升序)": ("duration", "asc"),
+}
+
 # 全局线程池
 _thread_pool = ThreadPoolExecutor(max_workers=4)
 
@@ -78,6 +95,12 @@ class MSearchWebUI:
         self.api_client = APIClient(api_base_url)
         logger.info(f"✓ API客户端初始化完成: {api_base_url}")
 
+        # 订阅任务事件流，在本地维护任务列表，刷新界面时不再拉取全量任务
+        self.task_events = TaskEventSubscriber(
+            self.api_client.stream_events, self._fetch_all_tasks
+        )
+        self.task_events.start()
+
         # 初始化文件监控器
         self.file_monitor = FileMonitor(self.config)
 
@@ -206,122 +229,141 @@ class MSearchWebUI:
         """
         文本搜索
 
+        使用流式搜索接口，最快的模态返回后先显示一批结果，之后随合并结果刷新
+
         Args:
             query: 搜索查询
             top_k: 返回结果数量
             similarity_threshold: 相似度阈值，高于此值的结果才会返回
 
-        Returns:
+        Yields:
             搜索结果（Markdown 格式）
         """
+        try:
+            # 输入验证
+            if not query or not query.strip():
+                yield "## ⚠️ 输入错误\n\n请输入搜索关键词"
+                return
 
-        async def _search():
-            try:
-                # 输入验证
-                if not query or not query.strip():
-                    return "## ⚠️ 输入错误\n\n请输入搜索关键词"
+            if len(query.strip()) > 500:
+                yield "## ⚠️ 输入错误\n\n搜索关键词过长，请限制在 500 个字符以内"
+                return
 
-                if len(query.strip()) > 500:
-                    return "## ⚠️ 输入错误\n\n搜索关键词过长，请限制在 500 个字符以内"
+            if top_k < 1 or top_k > 50:
+                yield "## ⚠️ 参数错误\n\n返回结果数量必须在 1-50 之间"
+                return
 
-                if top_k < 1 or top_k > 50:
-                    return "## ⚠️ 参数错误\n\n返回结果数量必须在 1-50 之间"
+            if similarity_threshold < 0.0 or similarity_threshold > 1.0:
+                yield "## ⚠️ 参数错误\n\n相似度阈值必须在 0.0-1.0 之间"
+                return
 
-                if similarity_threshold < 0.0 or similarity_threshold > 1.0:
-                    return "## ⚠️ 参数错误\n\n相似度阈值必须在 0.0-1.0 之间"
+            logger.info(f"文本搜索: {query}, 相似度阈值: {similarity_threshold}")
 
-                logger.info(f"文本搜索: {query}, 相似度阈值: {similarity_threshold}")
+            # 添加到搜索历史
+            self._add_to_history(query, "text")
+
+            # 调用流式API进行搜索
+            results = []
+            for event in self.api_client.search_text_stream(
+                query=query, top_k=top_k, threshold=similarity_threshold
+            ):
+                event_type = event.get("event")
+                if event_type == "results":
+                    results = event.get("results", [])
+                    if event.get("pending"):
+                        yield self._format_text_results(query, results, searching=True)
+                elif event_type == "error":
+                    raise RuntimeError(event.get("error", "搜索失败"))
+
+            logger.info(f"找到 {len(results)} 个结果")
+            yield self._format_text_results(query, results)
+
+        except ValueError as e:
+            logger.error(f"参数错误: {e}", exc_info=True)
+            yield f"## ⚠️ 参数错误\n\n**错误信息**: {e}\n\n请检查输入参数是否正确。"
+        except RuntimeError as e:
+            logger.error(f"运行时错误: {e}", exc_info=True)
+            yield f"## ❌ 系统错误\n\n**错误信息**: {e}\n\n请稍后重试或检查系统日志。"
+        except Exception as e:
+            logger.error(f"搜索失败: {e}", exc_info=True)
+            yield f"## ❌ 搜索失败\n\n**错误信息**: {e}\n\n请检查系统日志获取详细信息。"
 
-                # 添加到搜索历史
-                self._add_to_history(query, "text")
+    def _format_text_results(
+        self, query: str, results: List[Dict[str, Any]], searching: bool = False
+    ) -> str:
+        """
+        将文本搜索结果格式化为Markdown
 
-                # 调用API进行搜索
-                response = self.api_client.search_text(
-                    query=query, top_k=top_k, threshold=similarity_threshold
-                )
+        Args:
+            query: 搜索查询
+            results: 搜索结果
+            searching: 是否仍有模态在搜索中
 
-                results = response.get("results", [])
-                total = response.get("total", len(results))
-                logger.info(f"找到 {total} 个结果")
-
-                # 格式化结果为 Markdown
-                output = f"# 🔍 文本搜索结果: '{query}'\n\n"
-                output += f"**找到 {total} 个结果**\n\n"
-
-                if total == 0:
-                    output += "## ⚠️ 未找到任何结果\n\n"
-                    output += "💡 **提示**:\n"
-                    output += "- 请尝试使用不同的关键词\n"
-                    output += "- 确保数据库中已索引相关文件\n"
-                    output += "- 检查关键词拼写是否正确\n"
-                    return output
-
-                # 按相似度排序
-                sorted_results = sorted(
-                    results, key=lambda x: x.get("similarity", 0), reverse=True
-                )
+        Returns:
+            Markdown文本
+        """
+        total = len(results)
 
-                # 显示所有结果
-                output += "| # | 文件名 | 类型 | 相似度 | 路径 |\n"
-                output += "|---|---|---|---|---|\n"
+        output = f"# 🔍 文本搜索结果: '{query}'\n\n"
+        output += f"**找到 {total} 个结果**"
+        output += "（正在继续搜索...）\n\n" if searching else "\n\n"
 
-                for i, result in enumerate(sorted_results):
-                    file_name = result.get(
-                        "file_name",
-                        result.get("metadata", {}).get(
-                            "file_name", result.get("file_path", "未知")
-                        ),
-                    )
-                    file_path = result.get(
-                        "file_path", result.get("metadata", {}).get("file_path", "未知")
-                    )
-                    modality = result.get("modality", "未知")
-                    similarity = result.get("similarity", 0)
+        if total == 0:
+            if searching:
+                return output
+            output += "## ⚠️ 未找到任何结果\n\n"
+            output += "💡 **提示**:\n"
+            output += "- 请尝试使用不同的关键词\n"
+            output += "- 确保数据库中已索引相关文件\n"
+            output += "- 检查关键词拼写是否正确\n"
+            return output
 
-                    # 格式化相似度为百分比
-                    similarity_percent = (
-                        similarity * 100 if similarity <= 1 else similarity
-                    )
-                    similarity_bar = "█" * int(similarity_percent / 10) + "░" * (
-                        10 - int(similarity_percent / 10)
-                    )
+        # 按相似度排序
+        sorted_results = sorted(
+            results, key=lambda x: x.get("score", x.get("similarity", 0)), reverse=True
+        )
 
-                    # 截断文件名
-                    display_name = (
-                        file_name[:30] + "..." if len(file_name) > 30 else file_name
-                    )
-                    display_path = (
-                        file_path[:40] + "..." if len(file_path) > 40 else file_path
-                    )
+        # 显示所有结果
+        output += "| # | 文件名 | 类型 | 相似度 | 路径 |\n"
+        output += "|---|---|---|---|---|\n"
 
-                    # 根据类型添加图标
-                    type_icon = {
-                        "image": "🖼️",
-                        "video": "🎬",
-                        "audio": "🎵",
-                        "unknown": "📄",
-                    }.get(modality.lower(), "📄")
+        for i, result in enumerate(sorted_results):
+            file_name = result.get(
+                "file_name",
+                result.get("metadata", {}).get(
+                    "file_name", result.get("file_path", "未知")
+                ),
+            )
+            file_path = result.get(
+                "file_path", result.get("metadata", {}).get("file_path", "未知")
+            )
+            modality = result.get("modality", "未知")
+            similarity = result.get("score", result.get("similarity", 0))
 
-                    output += f"| {i+1} | **{display_name}** | {type_icon} {modality} | {similarity_bar} `{similarity:.4f}` | `{display_path}` |\n"
+            # 格式化相似度为百分比
+            similarity_percent = similarity * 100 if similarity <= 1 else similarity
+            similarity_bar = "█" * int(similarity_percent / 10) + "░" * (
+                10 - int(similarity_percent / 10)
+            )
 
-                output += f"\n---\n"
-                output += f"**搜索时间**: {total} 个结果 | **查询**: `{query}`\n"
+            # 截断文件名
+            display_name = file_name[:30] + "..." if len(file_name) > 30 else file_name
+            display_path = file_path[:40] + "..." if len(file_path) > 40 else file_path
 
-                return output
+            # 根据类型添加图标
+            type_icon = {
+                "image": "🖼️",
+                "video": "🎬",
+                "audio": "🎵",
+                "unknown": "📄",
+            }.get(modality.lower(), "📄")
 
-            except ValueError as e:
-                logger.error(f"参数错误: {e}", exc_info=True)
-                return f"## ⚠️ 参数错误\n\n**错误信息**: {e}\n\n请检查输入参数是否正确。"
-            except RuntimeError as e:
-                logger.error(f"运行时错误: {e}", exc_info=True)
-                return (
-                    f"## ❌ 系统错误\n\n**错误信息**: {e}\n\n请稍后重试或检查系统日志。"
-                )
-            except Exception as e:
-                logger.error(f"搜索失败: {e}", exc_info=True)
-                return f"## ❌ 搜索失败\n\n**错误信息**: {e}\n\n请检查系统日志获取详细信息。"
+            output += f"| {i+1} | **{display_name}** | {type_icon} {modality} | {similarity_bar} `{similarity:.4f}` | `{display_path}` |\n"
+
+        output += f"\n---\n"
+        output += f"**搜索时间**: {total} 个结果 | **查询**: `{query}`\n"
 
-        return run_async(_search())
+        return output
 
     def _add_to_history(self, query: str, search_type: str):
         """
@@ -597,6 +639,26 @@ class MSearchWebUI:
                 return 0.0
         return 0.0
 
+    def _fetch_all_tasks(self) -> List[Dict[str, Any]]:
+        """通过API拉取全量任务列表"""
+        response = self.api_client.get_all_tasks()
+        # 处理API响应格式
+        if hasattr(response, 'json'):
+            response_data = response.json()
+        else:
+            response_data = response if isinstance(response, dict) else {}
+        return response_data.get("tasks", [])
+
+    def _get_all_tasks(self) -> List[Dict[str, Any]]:
+        """
+        获取任务列表
+
+        事件流已连接时直接使用本地维护的任务列表，否则回退到拉取全量任务
+        """
+        if self.task_events.connected:
+            return self.task_events.get_tasks()
+        return self._fetch_all_tasks()
+
     def _normalize_tasks(self, tasks: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
         """
         标准化任务列表字段，兼容API返回结构
@@ -688,25 +750,30 @@ class MSearchWebUI:
                     "search_query",
                 ]
 
-            # 调用API获取所有任务
-            response = self.api_client.get_all_tasks()
-            # 处理API响应格式
-            if hasattr(response, 'json'):
-                response_data = response.json()
+            status_counts = None
+            if self.task_events.connected:
+                # 事件流维护了本地任务列表，直接在本地过滤排序
+                all_tasks = self._normalize_tasks(self.task_events.get_tasks())
+                filtered_tasks = self._filter_tasks(
+                    all_tasks,
+                    search_query,
+                    status_filter,
+                    priority_filter,
+                    type_filter,
+                    time_range,
+                )
+                sorted_tasks = self._sort_tasks(filtered_tasks, sort_by)
             else:
-                response_data = response if isinstance(response, dict) else {}
-            all_tasks = self._normalize_tasks(response_data.get("tasks", []))
-
-            filtered_tasks = self._filter_tasks(
-                all_tasks,
-                search_query,
-                status_filter,
-                priority_filter,
-                type_filter,
-                time_range,
-            )
-
-            sorted_tasks = self._sort_tasks(filtered_tasks, sort_by)
+                # 过滤、排序在服务端完成，只拉取一页需要展示的任务
+                tasks, status_counts = self._query_tasks(
+                    search_query,
+                    status_filter,
+                    priority_filter,
+                    type_filter,
+                    time_range,
+                    sort_by,
+                )
+                sorted_tasks = self._normalize_tasks(tasks)
 
             df_data = []
             for task in sorted_tasks:
@@ -727,7 +794,7 @@ class MSearchWebUI:
                     ]
                 )
 
-            stats = self._calculate_task_stats(sorted_tasks)
+            stats = self._calculate_task_stats(sorted_tasks, status_counts)
 
             # 返回12个值以匹配Gradio期望的输出
             return (
@@ -773,7 +840,7 @@ class MSearchWebUI:
         time_range: str,
     ) -> List[Dict]:
         """过滤任务"""
-        from datetime import datetime, timedelta
+        from datetime import datetime
 
         filtered = tasks
 
@@ -805,29 +872,70 @@ class MSearchWebUI:
         if type_filter:
             filtered = [t for t in filtered if t.get("task_type") in type_filter]
 
-        if time_range != "全部":
-            now = datetime.now()
-            if time_range == "最近1小时":
-                cutoff = now - timedelta(hours=1)
-            elif time_range == "今天":
-                cutoff = now.replace(hour=0, minute=0, second=0, microsecond=0)
-            elif time_range == "本周":
-                cutoff = now - timedelta(days=now.weekday())
-                cutoff = cutoff.replace(hour=0, minute=0, second=0, microsecond=0)
-            elif time_range == "本月":
-                cutoff = now.replace(day=1, hour=0, minute=0, second=0, microsecond=0)
-            else:
-                cutoff = None
-
-            if cutoff:
-                filtered = [
-                    t
-                    for t in filtered
-                    if datetime.fromtimestamp(t.get("created_at", 0)) >= cutoff
-                ]
+        cutoff = self._time_range_cutoff(time_range)
+        if cutoff:
+            filtered = [
+                t
+                for t in filtered
+                if datetime.fromtimestamp(t.get("created_at", 0)) >= cutoff
+            ]
 
         return filtered
 
+    def _time_range_cutoff(self, time_range: str):
+        """时间范围对应的起始时间，"全部"或未知范围返回None"""
+        from datetime import datetime, timedelta
+
+        now = datetime.now()
+        if time_range == "最近1小时":
+            return now - timedelta(hours=1)
+        if time_range == "今天":
+            return now.replace(hour=0, minute=0, second=0, microsecond=0)
+        if time_range == "本周":
+            cutoff = now - timedelta(days=now.weekday())
+            return cutoff.replace(hour=0, minute=0, second=0, microsecond=0)
+        if time_range == "本月":
+            return now.replace(day=1, hour=0, minute=0, second=0, microsecond=0)
+        return None
+
+    def _query_tasks(
+        self,
+        search_query: str,
+        status_filter: List[str],
+        priority_filter: List[str],
+        type_filter: List[str],
+        time_range: str,
+        sort_by: str,
+    ) -> tuple:
+        """
+        通过API在服务端过滤、排序任务
+
+        Returns:
+            (任务列表, 各状态数量)
+        """
+        priority = ",".join(
+            TASK_PRIORITY_RANGES[label]
+            for label in priority_filter or []
+            if label in TASK_PRIORITY_RANGES
+        )
+        cutoff = self._time_range_cutoff(time_range)
+        sort_key, order = TASK_SORT_OPTIONS.get(sort_by, ("created_at", "desc"))
+
+        response = self.api_client.query_tasks(
+            statuses=status_filter,
+            task_types=type_filter,
+            search=search_query or None,
+            priority=priority or None,
+            created_after=cutoff.timestamp() if cutoff else None,
+            sort_by=sort_key,
+            order=order,
+            limit=1000,
+            fields=["progress", "file_path", "duration", "tags", "completed_at"],
+        )
+        if not isinstance(response, dict):
+            response = {}
+        return response.get("tasks", []), response.get("status_counts", {})
+
     def _sort_tasks(self, tasks: List[Dict], sort_by: str) -> List[Dict]:
         """排序任务"""
         if not tasks:
@@ -866,8 +974,15 @@ class MSearchWebUI:
 
         return sorted(tasks, key=lambda x: x.get(key, 0), reverse=reverse)
 
-    def _calculate_task_stats(self, tasks: List[Dict]) -> Dict[str, Any]:
-        """计算任务统计"""
+    def _calculate_task_stats(
+        self, tasks: List[Dict], status_counts: Optional[Dict[str, int]] = None
+    ) -> Dict[str, Any]:
+        """
+        计算任务统计
+
+        status_counts为服务端返回的各状态数量，提供时用于总数和状态计数，
+        其余指标按当前任务列表计算
+        """
         from datetime import datetime, timedelta
 
         stats = {
@@ -904,6 +1019,13 @@ class MSearchWebUI:
             elif status == "failed":
                 failed_count += 1
 
+        if status_counts is not None:
+            for status in ("pending", "running", "completed", "failed", "paused", "cancelled"):
+                stats[status] = status_counts.get(status, 0)
+            stats["total"] = sum(status_counts.values())
+            completed_count = stats["completed"]
+            failed_count = stats["failed"]
+
         total_finished = completed_count + failed_count
         if total_finished > 0:
             success_rate = (completed_count / total_finished) * 100
@@ -1184,13 +1306,7 @@ class MSearchWebUI:
             (progress_display, current_operation) 元组
         """
         try:
-            response = self.api_client.get_all_tasks()
-            if hasattr(response, 'json'):
-                response_data = response.json()
-            else:
-                response_data = response if isinstance(response, dict) else {}
-            
-            all_tasks = self._normalize_tasks(response_data.get("tasks", []))
+            all_tasks = self._normalize_tasks(self._get_all_tasks())
             
             running_tasks = [t for t in all_tasks if t.get("status") == "running"]
             
@@ -1493,7 +1609,7 @@ class MSearchWebUI:
             进度信息
         """
         try:
-            tasks = self.api_client.get_all_tasks()
+            tasks = {"tasks": self._get_all_tasks()}
 
             if not tasks.get("tasks"):
                 return "当前没有任务"
@@ -2244,7 +2360,7 @@ class MSearchWebUI:
 
         return demo
 
-    def get_thumbnail(self, file_path: str):
+    def get_thumbnail(self, file_path: str) -> Optional[str]:
         """
         获取文件的缩略图
 
@@ -2252,30 +2368,35 @@ class MSearchWebUI:
             file_path: 文件路径
 
         Returns:
-            缩略图的文件路径
+            带版本令牌的缩略图URL，可被浏览器永久缓存
         """
-        try:
-            # 首先尝试从数据库获取缩略图路径
-            thumbnail_path = self.database_manager.get_thumbnail_by_path(file_path)
+        return self.get_thumbnails([file_path]).get(file_path)
 
-            if thumbnail_path and Path(thumbnail_path).exists():
-                logger.info(f"找到缩略图: {thumbnail_path}")
-                return thumbnail_path
+    def get_thumbnails(self, file_paths: List[str]) -> Dict[str, Optional[str]]:
+        """
+        批量获取缩略图，一次请求覆盖整页结果
 
-            # 如果没有缩略图，尝试获取预览图路径
-            preview_path = self.database_manager.get_preview_by_path(file_path)
+        Args:
+            file_paths: 文件路径列表
 
-            if preview_path and Path(preview_path).exists():
-                logger.info(f"找到预览图: {preview_path}")
-                return preview_path
+        Returns:
+            {文件路径: 缩略图URL}，没有缩略图的值为None
+        """
+        if not file_paths:
+            return {}
 
-            # 如果都没有，返回None
-            logger.warning(f"未找到缩略图: {file_path}")
-            return None
+        try:
+            response = self.api_client.get_thumbnails(file_paths)
+            urls = {
+                item["path"]: f"{self.api_client.base_url}{item['url']}"
+                for item in response.get("items", [])
+                if item.get("found")
+            }
+            return {path: urls.get(path) for path in file_paths}
 
         except Exception as e:
             logger.error(f"获取缩略图失败: {e}")
-            return None
+            return {path: None for path in file_paths}
 
     def run(self, host: str = "0.0.0.0", port: int = 7860, debug: bool = False):
         """
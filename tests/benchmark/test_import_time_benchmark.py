@@ -0,0 +1,96 @@
+"""
+性能基准测试：入口模块的导入耗时
+用python -X importtime在独立进程中导入CLI和API服务器入口，
+检查向量库、模型框架、媒体解码库和WebUI没有在导入时加载，并且总耗时不超过预算
+"""
+
+import importlib.util
+import os
+import subprocess
+import sys
+from pathlib import Path
+
+import pytest
+
+project_root = Path(__file__).parent.parent.parent
+
+# 只应在首次使用时导入的重依赖
+HEAVY_MODULES = (
+    "torch",
+    "transformers",
+    "infinity_emb",
+    "lancedb",
+    "pyarrow",
+    "pandas",
+    "librosa",
+    "soundfile",
+    "cv2",
+    "gradio",
+)
+
+# 入口模块 -> (导入预算（毫秒）, 需要的第三方包)
+ENTRY_POINTS = {
+    "src.cli": (200, ()),
+    "src.api_server": (1500, ("fastapi",)),
+    "src.main": (1500, ("fastapi", "yaml")),
+}
+
+# 预算倍数，较慢的CI机器可以通过环境变量放宽
+BUDGET_SCALE = float(os.environ.get("MSEARCH_IMPORT_BUDGET_SCALE", "1.0"))
+
+
+def measure_import(module: str):
+    """
+    在新进程中导入模块并解析-X importtime的输出
+
+    Returns:
+        (入口模块的累计导入耗时（毫秒）, 导入过的所有模块名)
+    """
+    env = dict(os.environ, PYTHONPATH=os.pathsep.join(sys.path))
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+        cwd=str(project_root),
+        env=env,
+        capture_output=True,
+        text=True,
+        timeout=120,
+    )
+    assert result.returncode == 0, result.stderr[-2000:]
+
+    cumulative_ms = None
+    imported = set()
+    for line in result.stderr.splitlines():
+        if not line.startswith("import time:") or "|" not in line:
+            continue
+        _, cumulative, name = line.split("|", 2)
+        name = name.strip()
+        if not cumulative.strip().isdigit():
+            continue  # 表头
+        imported.add(name)
+        if name == module:
+            cumulative_ms = int(cumulative) / 1000
+    return cumulative_ms, imported
+
+
+@pytest.mark.parametrize("module", list(ENTRY_POINTS))
+def test_entry_point_import_time(module):
+    """测试入口模块不加载重依赖，导入耗时在预算内"""
+    budget_ms, requirements = ENTRY_POINTS[module]
+    for requirement in requirements:
+        if importlib.util.find_spec(requirement) is None:
+            pytest.skip(f"未安装{requirement}")
+
+    # 第一次导入会编译字节码，取第二次的结果
+    measure_import(module)
+    cumulative_ms, imported = measure_import(module)
+
+    print(f"\n{module}: {cumulative_ms:.1f}ms, 导入模块数: {len(imported)}")
+
+    loaded = sorted(
+        name for name in imported if name.split(".")[0] in HEAVY_MODULES
+    )
+    assert not loaded, f"{module}在导入时加载了重依赖: {loaded[:10]}"
+    assert cumulative_ms is not None
+    assert cumulative_ms <= budget_ms * BUDGET_SCALE, (
+        f"{module}导入耗时{cumulative_ms:.1f}ms，超过预算{budget_ms * BUDGET_SCALE:.0f}ms"
+    )
@@ -0,0 +1,186 @@
+"""
+性能基准测试：CPU量化推理
+对比float32和动态int8量化下CLIP/CLAP的向量一致性和吞吐量
+"""
+
+import asyncio
+import json
+import math
+import shutil
+import struct
+import tempfile
+import time
+import wave
+from pathlib import Path
+
+import numpy as np
+import pytest
+from PIL import Image
+
+from src.core.config.config_manager import ConfigManager
+from src.core.models.model_manager import EmbeddingService, ModelManager
+from src.core.models.quantization import embedding_agreement
+
+pytest.importorskip("infinity_emb")
+
+# 量化后与float32向量的最低余弦一致性
+MIN_MEAN_COSINE = 0.98
+MIN_COSINE = 0.95
+
+SAMPLE_TEXTS = [
+    "一只在草地上奔跑的狗",
+    "夜晚城市的街景",
+    "海边的日落",
+    "会议室里的人们",
+    "雨声和雷声",
+    "钢琴独奏",
+    "汽车鸣笛",
+    "鸟在森林里唱歌",
+]
+NUM_IMAGES = 8
+NUM_AUDIOS = 4
+ROUNDS = 3
+
+# (模型ID, 输入类型)
+CASES = [
+    ("chinese_clip_base", "text"),
+    ("chinese_clip_base", "image"),
+    ("audio_model", "text"),
+    ("audio_model", "audio"),
+]
+
+
+@pytest.fixture(scope="module")
+def temp_dir():
+    """创建临时目录"""
+    temp_dir = tempfile.mkdtemp()
+    yield temp_dir
+    shutil.rmtree(temp_dir)
+
+
+@pytest.fixture(scope="module")
+def samples(temp_dir):
+    """生成固定的图像和音频样本"""
+    rng = np.random.default_rng(0)
+    image_paths = []
+    for index in range(NUM_IMAGES):
+        pixels = rng.integers(0, 255, size=(256, 256, 3), dtype=np.uint8)
+        pixels[: 128 + index * 8, :, index % 3] = 255
+        path = Path(temp_dir) / f"sample_{index}.jpg"
+        Image.fromarray(pixels).save(path)
+        image_paths.append(str(path))
+
+    audio_paths = []
+    sample_rate = 48000
+    for index in range(NUM_AUDIOS):
+        frequency = 220.0 * (index + 1)
+        path = Path(temp_dir) / f"sample_{index}.wav"
+        with wave.open(str(path), "wb") as wav_file:
+            wav_file.setnchannels(1)
+            wav_file.setsampwidth(2)
+            wav_file.setframerate(sample_rate)
+            wav_file.writeframes(
+                b"".join(
+                    struct.pack(
+                        "<h", int(8000 * math.sin(2 * math.pi * frequency * i / sample_rate))
+                    )
+                    for i in range(sample_rate * 2)
+                )
+            )
+        audio_paths.append(str(path))
+
+    return {"text": SAMPLE_TEXTS, "image": image_paths, "audio": audio_paths}
+
+
+@pytest.fixture(scope="module")
+def model_configs():
+    """读取float32配置并生成对应的int8配置"""
+    configs = ModelManager.load_configs_from_yaml(ConfigManager().config["models"])
+    pairs = {}
+    for model_id in {model_id for model_id, _ in CASES}:
+        if model_id not in configs:
+            continue
+        float_config = configs[model_id]
+        if not Path(ModelManager._resolve_model_path(float_config)).is_dir():
+            continue
+        float_config.device = "cpu"
+        float_config.dtype = "float32"
+        float_config.quantization = None
+        int8_config = type(float_config)(**{**vars(float_config), "quantization": "int8_dynamic"})
+        pairs[model_id] = (float_config, int8_config)
+    if not pairs:
+        pytest.skip("本地模型不存在")
+    return pairs
+
+
+class TestQuantizationBenchmark:
+    """量化推理基准测试"""
+
+    def test_int8_agreement_and_throughput(self, model_configs, samples, temp_dir):
+        """测试int8量化的向量一致性和吞吐量"""
+
+        async def run():
+            results = []
+            for model_id, (float_config, int8_config) in model_configs.items():
+                for variant, config in (("float32", float_config), ("int8", int8_config)):
+                    manager = ModelManager()
+                    await manager.initialize({model_id: config})
+                    service = EmbeddingService(manager)
+                    for case_model, input_type in CASES:
+                        if case_model != model_id:
+                            continue
+                        inputs = samples[input_type]
+                        # 预热
+                        embeddings = await service.embed(model_id, inputs, input_type)
+                        start_time = time.perf_counter()
+                        for _ in range(ROUNDS):
+                            await service.embed(model_id, inputs, input_type)
+                        elapsed = time.perf_counter() - start_time
+                        results.append(
+                            {
+                                "model": model_id,
+                                "input_type": input_type,
+                                "variant": variant,
+                                "items_per_sec": len(inputs) * ROUNDS / elapsed,
+                                "embeddings": embeddings,
+                            }
+                        )
+                    await manager.shutdown()
+            return results
+
+        results = asyncio.run(run())
+
+        report = []
+        by_case = {}
+        for result in results:
+            by_case.setdefault((result["model"], result["input_type"]), {})[
+                result["variant"]
+            ] = result
+        for (model_id, input_type), variants in by_case.items():
+            agreement = embedding_agreement(
+                variants["float32"]["embeddings"], variants["int8"]["embeddings"]
+            )
+            speedup = variants["int8"]["items_per_sec"] / variants["float32"]["items_per_sec"]
+            report.append(
+                {
+                    "model": model_id,
+                    "input_type": input_type,
+                    "float32_items_per_sec": variants["float32"]["items_per_sec"],
+                    "int8_items_per_sec": variants["int8"]["items_per_sec"],
+                    "speedup": speedup,
+                    **agreement,
+                }
+            )
+            print(
+                f"{model_id}/{input_type}: speedup={speedup:.2f}x "
+                f"mean_cos={agreement['mean_cosine']:.4f} min_cos={agreement['min_cosine']:.4f}"
+            )
+
+        results_file = Path(temp_dir) / "quantization_benchmark.json"
+        with open(results_file, "w", encoding="utf-8") as f:
+            json.dump(report, f, indent=2, ensure_ascii=False)
+
+        # 量化不应明显改变向量：检索结果依赖余弦相似度
+        for entry in report:
+            assert entry["mean_cosine"] >= MIN_MEAN_COSINE, entry
+            assert entry["min_cosine"] >= MIN_COSINE, entry
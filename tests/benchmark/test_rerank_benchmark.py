@@ -0,0 +1,145 @@
+"""
+性能基准测试：两阶段检索
+对比不同 re_rank / re_rank_top_k / nprobes 设置下的召回率和检索延迟
+"""
+
+import pytest
+import tempfile
+import shutil
+import time
+import json
+from pathlib import Path
+
+import numpy as np
+
+from src.core.vector.vector_store import VectorStore
+
+NUM_VECTORS = 20000
+DIMENSION = 256
+NUM_QUERIES = 50
+TOP_K = 10
+
+# (re_rank, re_rank_top_k, nprobes)
+SETTINGS = [
+    (False, 0, 20),
+    (True, 10, 20),
+    (True, 50, 10),
+    (True, 50, 20),
+    (True, 100, 20),
+    (True, 200, 40),
+]
+
+
+@pytest.fixture(scope="module")
+def temp_dir():
+    """创建临时目录"""
+    temp_dir = tempfile.mkdtemp()
+    yield temp_dir
+    shutil.rmtree(temp_dir)
+
+
+@pytest.fixture(scope="module")
+def dataset():
+    """生成带簇结构的归一化向量和查询"""
+    rng = np.random.default_rng(42)
+    centers = rng.normal(size=(64, DIMENSION)).astype(np.float32)
+    labels = rng.integers(0, len(centers), NUM_VECTORS)
+    vectors = centers[labels] + 0.5 * rng.normal(size=(NUM_VECTORS, DIMENSION)).astype(
+        np.float32
+    )
+    vectors /= np.linalg.norm(vectors, axis=1, keepdims=True)
+
+    query_labels = rng.integers(0, len(centers), NUM_QUERIES)
+    queries = centers[query_labels] + 0.5 * rng.normal(
+        size=(NUM_QUERIES, DIMENSION)
+    ).astype(np.float32)
+    queries /= np.linalg.norm(queries, axis=1, keepdims=True)
+
+    # 精确的top-k作为召回率基准
+    ground_truth = np.argsort(-(queries @ vectors.T), axis=1)[:, :TOP_K]
+    return vectors, queries, ground_truth
+
+
+@pytest.fixture(scope="module")
+def vector_store(temp_dir, dataset):
+    """创建已建立IVF_PQ索引的向量存储"""
+    vectors, _, _ = dataset
+    store = VectorStore(
+        {
+            "data_dir": str(Path(temp_dir) / "lancedb"),
+            "collection_name": "rerank_benchmark",
+            "num_partitions": 64,
+        }
+    )
+    store.insert_vectors(
+        [
+            {"id": str(i), "vector": vector, "modality": "image", "file_id": str(i)}
+            for i, vector in enumerate(vectors)
+        ]
+    )
+    assert store.create_index(index_type="ivf_pq")
+    yield store
+    store.close()
+
+
+class TestRerankBenchmark:
+    """两阶段检索基准测试"""
+
+    def test_recall_latency_tradeoff(self, vector_store, dataset, temp_dir):
+        """测试各设置下的召回率和延迟"""
+        _, queries, ground_truth = dataset
+        results = []
+
+        for re_rank, re_rank_top_k, nprobes in SETTINGS:
+            vector_store.re_rank = re_rank
+            vector_store.re_rank_top_k = re_rank_top_k
+            vector_store.nprobes = nprobes
+            vector_store.max_distance = None
+
+            # 预热
+            vector_store.search_vectors(queries[0].tolist(), limit=TOP_K)
+
+            hits = 0
+            latencies = []
+            for query, expected in zip(queries, ground_truth):
+                start_time = time.perf_counter()
+                found = vector_store.search_vectors(query.tolist(), limit=TOP_K)
+                latencies.append(time.perf_counter() - start_time)
+                hits += len({int(r["id"]) for r in found} & set(expected.tolist()))
+
+            result = {
+                "re_rank": re_rank,
+                "re_rank_top_k": re_rank_top_k,
+                "nprobes": nprobes,
+                "recall_at_k": hits / (len(queries) * TOP_K),
+                "p50_ms": float(np.percentile(latencies, 50) * 1000),
+                "p95_ms": float(np.percentile(latencies, 95) * 1000),
+            }
+            results.append(result)
+            print(
+                f"re_rank={re_rank} top_k={re_rank_top_k} nprobes={nprobes}: "
+                f"recall@{TOP_K}={result['recall_at_k']:.3f} "
+                f"p50={result['p50_ms']:.2f}ms p95={result['p95_ms']:.2f}ms"
+            )
+
+        results_file = Path(temp_dir) / "rerank_benchmark.json"
+        with open(results_file, "w", encoding="utf-8") as f:
+            json.dump(results, f, indent=2, ensure_ascii=False)
+
+        # 精确重排不应降低召回率，候选越多召回率越高
+        baseline = results[0]["recall_at_k"]
+        reranked = {(r["re_rank_top_k"], r["nprobes"]): r["recall_at_k"] for r in results[1:]}
+        assert reranked[(50, 20)] >= baseline
+        assert reranked[(200, 40)] >= reranked[(10, 20)]
+
+    def test_max_distance_early_termination(self, vector_store, dataset):
+        """测试max_distance截断：超过阈值的候选不进入结果"""
+        _, queries, _ = dataset
+        vector_store.re_rank = True
+        vector_store.re_rank_top_k = 100
+        vector_store.max_distance = 0.5
+
+        found = vector_store.search_vectors(queries[0].tolist(), limit=100)
+
+        assert all(r["distance"] <= 0.5 for r in found)
+        assert [r["distance"] for r in found] == sorted(r["distance"] for r in found)
@@ -0,0 +1,138 @@
+"""
+性能基准测试：向量存储精度
+对比float32、float16和int8存储下的磁盘占用、召回率和检索延迟
+"""
+
+import pytest
+import tempfile
+import shutil
+import time
+import json
+from pathlib import Path
+
+import numpy as np
+
+from src.core.vector.vector_store import VectorStore
+
+NUM_VECTORS = 10000
+DIMENSION = 512
+NUM_QUERIES = 50
+TOP_K = 10
+
+# (存储精度, 是否保留全精度副本)
+SETTINGS = [
+    ("float32", False),
+    ("float16", False),
+    ("int8", False),
+    ("int8", True),
+]
+
+# 相对float32的最低召回率
+MIN_RECALL = {"float16": 0.99, "int8": 0.95}
+
+
+@pytest.fixture(scope="module")
+def temp_dir():
+    """创建临时目录"""
+    temp_dir = tempfile.mkdtemp()
+    yield temp_dir
+    shutil.rmtree(temp_dir)
+
+
+@pytest.fixture(scope="module")
+def dataset():
+    """生成带簇结构的归一化向量和查询"""
+    rng = np.random.default_rng(42)
+    centers = rng.normal(size=(64, DIMENSION)).astype(np.float32)
+    labels = rng.integers(0, len(centers), NUM_VECTORS)
+    vectors = centers[labels] + 0.5 * rng.normal(size=(NUM_VECTORS, DIMENSION)).astype(
+        np.float32
+    )
+    vectors /= np.linalg.norm(vectors, axis=1, keepdims=True)
+
+    query_labels = rng.integers(0, len(centers), NUM_QUERIES)
+    queries = centers[query_labels] + 0.5 * rng.normal(
+        size=(NUM_QUERIES, DIMENSION)
+    ).astype(np.float32)
+    queries /= np.linalg.norm(queries, axis=1, keepdims=True)
+
+    # 精确的top-k作为召回率基准
+    ground_truth = np.argsort(-(queries @ vectors.T), axis=1)[:, :TOP_K]
+    return vectors, queries, ground_truth
+
+
+def directory_size(path: Path) -> int:
+    return sum(f.stat().st_size for f in path.rglob("*") if f.is_file())
+
+
+class TestVectorPrecisionBenchmark:
+    """向量存储精度基准测试"""
+
+    def test_footprint_recall_latency(self, dataset, temp_dir):
+        """测试各存储精度的磁盘占用、召回率和延迟"""
+        vectors, queries, ground_truth = dataset
+        results = []
+
+        for precision, keep_full_precision in SETTINGS:
+            data_dir = Path(temp_dir) / f"lancedb_{precision}_{keep_full_precision}"
+            store = VectorStore(
+                {
+                    "data_dir": str(data_dir),
+                    "collection_name": "precision_benchmark",
+                    "vector_precision": precision,
+                    "keep_full_precision": keep_full_precision,
+                    "search": {"re_rank": True, "re_rank_top_k": 50},
+                }
+            )
+            store.insert_vectors(
+                [
+                    {"id": str(i), "vector": vector, "modality": "image", "file_id": str(i)}
+                    for i, vector in enumerate(vectors)
+                ]
+            )
+            store.table.optimize()
+
+            # 预热
+            store.search_vectors(queries[0].tolist(), limit=TOP_K)
+
+            hits = 0
+            latencies = []
+            for query, expected in zip(queries, ground_truth):
+                start_time = time.perf_counter()
+                found = store.search_vectors(query.tolist(), limit=TOP_K)
+                latencies.append(time.perf_counter() - start_time)
+                hits += len({int(r["id"]) for r in found} & set(expected.tolist()))
+
+            result = {
+                "precision": precision,
+                "keep_full_precision": keep_full_precision,
+                "disk_bytes": directory_size(data_dir),
+                "bytes_per_vector": store.get_stats()["bytes_per_vector"],
+                "recall_at_k": hits / (len(queries) * TOP_K),
+                "p50_ms": float(np.percentile(latencies, 50) * 1000),
+                "p95_ms": float(np.percentile(latencies, 95) * 1000),
+            }
+            results.append(result)
+            store.close()
+            print(
+                f"{precision} full={keep_full_precision}: disk={result['disk_bytes'] / 1e6:.1f}MB "
+                f"recall@{TOP_K}={result['recall_at_k']:.3f} "
+                f"p50={result['p50_ms']:.2f}ms p95={result['p95_ms']:.2f}ms"
+            )
+
+        results_file = Path(temp_dir) / "vector_precision_benchmark.json"
+        with open(results_file, "w", encoding="utf-8") as f:
+            json.dump(results, f, indent=2, ensure_ascii=False)
+
+        by_setting = {(r["precision"], r["keep_full_precision"]): r for r in results}
+        baseline = by_setting[("float32", False)]
+
+        # 紧凑存储明显减少磁盘占用
+        assert by_setting[("float16", False)]["disk_bytes"] < 0.6 * baseline["disk_bytes"]
+        assert by_setting[("int8", False)]["disk_bytes"] < 0.35 * baseline["disk_bytes"]
+
+        # 召回率回退有限，全精度副本重排后与float32一致
+        for precision, min_recall in MIN_RECALL.items():
+            recall = by_setting[(precision, False)]["recall_at_k"]
+            assert recall >= min_recall * baseline["recall_at_k"]
+        assert by_setting[("int8", True)]["recall_at_k"] >= baseline["recall_at_k"]
@@ -0,0 +1,123 @@
+#!/usr/bin/env python3
+"""
+测试API服务器的后台启动：端口绑定后/health立即响应，组件就绪前其余API返回503
+"""
+
+import asyncio
+import sys
+import time
+from pathlib import Path
+
+import pytest
+
+# 添加项目根目录到Python路径
+project_root = Path(__file__).parent.parent.parent
+sys.path.insert(0, str(project_root))
+
+pytest.importorskip("fastapi")
+pytest.importorskip("httpx")
+
+from fastapi.testclient import TestClient
+
+import src.api_server as api_server_module
+from src.api_server import APIServer
+
+
+class FakeConfigManager:
+    def __init__(self):
+        self.config = {"logging": {"level": "INFO"}}
+
+    def get(self, key, default=None):
+        return self.config.get(key, default)
+
+
+class FakeEmbeddingEngine:
+    async def initialize(self):
+        return True
+
+
+class FakeVectorStore:
+    collection_name = "unified_vectors"
+    vector_dimension = 512
+
+    def get_collection_stats(self):
+        return {"total_vectors": 0}
+
+
+def wait_for(predicate, timeout=5.0):
+    deadline = time.time() + timeout
+    while time.time() < deadline:
+        if predicate():
+            return True
+        time.sleep(0.01)
+    return False
+
+
+@pytest.fixture
+def slow_components(monkeypatch):
+    """组件创建被阻塞，直到测试放行"""
+    import threading
+
+    release = threading.Event()
+
+    def build_components(config):
+        release.wait(timeout=5)
+        return {
+            "database_manager": object(),
+            "vector_store": FakeVectorStore(),
+            "embedding_engine": FakeEmbeddingEngine(),
+            "task_manager": object(),
+            "search_engine": object(),
+            "file_indexer": object(),
+        }
+
+    async def no_background_services(self):
+        pass
+
+    monkeypatch.setattr(api_server_module, "build_components", build_components)
+    monkeypatch.setattr(
+        APIServer, "_start_background_services", no_background_services
+    )
+    return release
+
+
+class TestBackgroundStartup:
+    """后台启动测试"""
+
+    def test_health_answers_before_components_are_ready(self, slow_components):
+        """测试组件创建期间/health可用，其余API返回503，就绪后恢复"""
+        server = APIServer(config=FakeConfigManager())
+
+        with TestClient(server.app) as client:
+            health = client.get("/api/v1/health").json()
+            assert health["status"] == "healthy"
+            assert health["ready"] is False
+            assert health["startup"]["components"]["vector_store"] is False
+
+            response = client.get("/api/v1/vector/stats")
+            assert response.status_code == 503
+            assert response.headers["Retry-After"] == "1"
+
+            slow_components.set()
+            assert wait_for(lambda: server.startup_state == "ready")
+
+            health = client.get("/api/v1/health").json()
+            assert health["ready"] is True
+            assert all(health["startup"]["components"].values())
+            assert client.get("/api/v1/vector/stats").status_code == 200
+
+    def test_failed_warm_up_is_reported(self, monkeypatch):
+        """测试组件创建失败时/health报告失败原因"""
+
+        def build_components(config):
+            raise RuntimeError("向量库无法打开")
+
+        monkeypatch.setattr(api_server_module, "build_components", build_components)
+        server = APIServer(config=FakeConfigManager())
+
+        assert asyncio.run(server.warm_up()) is False
+
+        with TestClient(server.app) as client:
+            health = client.get("/api/v1/health").json()
+        assert health["status"] == "unhealthy"
+        assert health["startup"]["error"] == "向量库无法打开"
@@ -0,0 +1,165 @@
+"""
+缓存管理器单元测试
+"""
+
+import threading
+
+from src.services.cache.cache_manager import CacheConfig, CacheManager
+
+
+def _make_manager(tmp_path, max_size_gb: float = 1.0) -> CacheManager:
+    config = CacheConfig(max_size_gb=max_size_gb)
+    return CacheManager(config, cache_dir=str(tmp_path))
+
+
+def test_lru_eviction_evicts_least_recently_used(tmp_path):
+    """LRU淘汰最久未访问的缓存项"""
+    manager = _make_manager(tmp_path)
+    manager.config.thumbnails.max_size_gb = 350 / 1024**3
+    manager.set("a", "x", "thumbnails", size_bytes=100)
+    manager.set("b", "x", "thumbnails", size_bytes=100)
+    manager.set("c", "x", "thumbnails", size_bytes=100)
+
+    manager.get("a", "thumbnails")
+    manager.set("d", "x", "thumbnails", size_bytes=100)
+
+    assert manager.get("b", "thumbnails") is None
+    assert manager.get("a", "thumbnails") == "x"
+    assert manager.get_stats("thumbnails")["eviction_count"] == 1
+
+
+def test_lfu_eviction_evicts_least_frequently_used(tmp_path):
+    """LFU淘汰访问次数最少的缓存项"""
+    manager = _make_manager(tmp_path)
+    manager.config.vectors.max_size_gb = 350 / 1024**3
+    manager.config.vectors.hot_data_threshold = 1000
+    for key in ("a", "b", "c"):
+        manager.set(key, "x", "vectors", size_bytes=100)
+    for _ in range(3):
+        manager.get("a", "vectors")
+        manager.get("c", "vectors")
+
+    manager.set("d", "x", "vectors", size_bytes=100)
+
+    assert manager.get("b", "vectors") is None
+    assert manager.get("a", "vectors") == "x"
+    assert manager.get("c", "vectors") == "x"
+
+
+def test_protected_keys_are_skipped_by_eviction(tmp_path):
+    """受保护的缓存项不会被优先淘汰"""
+    manager = _make_manager(tmp_path)
+    manager.config.thumbnails.max_size_gb = 250 / 1024**3
+    manager.set("a", "x", "thumbnails", size_bytes=100)
+    manager.set("b", "x", "thumbnails", size_bytes=100)
+    manager.protect("a", "thumbnails")
+
+    manager.set("c", "x", "thumbnails", size_bytes=100)
+
+    assert manager.is_protected("a", "thumbnails")
+    assert manager.get("a", "thumbnails") == "x"
+    assert manager.get("b", "thumbnails") is None
+
+
+def test_global_budget_evicts_lowest_priority_type_first(tmp_path):
+    """全局预算不足时按保护优先级从低到高跨类型淘汰"""
+    manager = _make_manager(tmp_path, max_size_gb=3000 / 1024**3)
+    manager.set("p", "x", "preprocessing", size_bytes=250)
+    manager.set("v", "x", "vectors", size_bytes=250)
+    manager.protect("v", "vectors")
+
+    for i in range(11):
+        manager.set(f"m{i}", "x", "vectors", size_bytes=250)
+        manager.protect(f"m{i}", "vectors")
+
+    assert manager.get("p", "preprocessing") is None
+    assert manager.total_size_bytes <= 3000
+
+
+def test_get_stats_reports_lock_contention(tmp_path):
+    """统计信息包含各分片锁的竞争指标"""
+    manager = _make_manager(tmp_path)
+
+    def worker(cache_type):
+        for i in range(200):
+            manager.set(f"{cache_type}{i}", "x", cache_type, size_bytes=10)
+            manager.get(f"{cache_type}{i}", cache_type)
+
+    threads = [
+        threading.Thread(target=worker, args=(t,)) for t in ("vectors", "thumbnails")
+    ]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+
+    stats = manager.get_stats()
+    assert stats["lock_stats"]["acquisitions"] > 0
+    assert "contentions" in stats["type_stats"]["vectors"]["lock_stats"]
+    assert stats["total_entries"] == 400
+    assert stats["total_size_bytes"] == 4000
+
+
+def test_l1_overflow_demotes_values_to_l2(tmp_path):
+    """L1超限时值降级到L2，再次访问从L2读回"""
+    config = CacheConfig(max_size_gb=1.0, l1_max_size_mb=250 / 1024**2)
+    manager = CacheManager(config, cache_dir=str(tmp_path))
+    manager.set("a", b"a" * 100, "thumbnails")
+    manager.set("b", b"b" * 100, "thumbnails")
+    manager.set("c", b"c" * 100, "thumbnails")
+
+    value = manager.get("a", "thumbnails")
+
+    assert value == b"a" * 100
+    assert manager.get_stats("thumbnails")["l2_hit_count"] == 1
+    assert manager.l1_size_bytes <= 250
+
+
+def test_l2_entries_survive_restart(tmp_path):
+    """L2条目在重启后可通过索引恢复"""
+    manager = _make_manager(tmp_path)
+    manager.set("q", {"vector": [0.1, 0.2]}, "vectors")
+    manager.set("r", {"results": []}, "search_results")
+    manager.shutdown()
+
+    restarted = _make_manager(tmp_path)
+    restarted.initialize()
+
+    assert restarted.get("q", "vectors") == {"vector": [0.1, 0.2]}
+    assert restarted.get("r", "search_results") is None
+    restarted.shutdown()
+
+
+def test_identical_content_is_stored_once(tmp_path):
+    """相同内容在L2中只保存一个数据块"""
+    manager = _make_manager(tmp_path)
+
+    manager.set("a", b"same", "thumbnails")
+    manager.set("b", b"same", "previews")
+    path = manager.get_path("a", "thumbnails")
+
+    assert path is not None and path.read_bytes() == b"same"
+    assert manager.store.get_stats()["objects"] == 1
+    manager.delete("a", "thumbnails")
+    assert path.exists()
+    manager.delete("b", "previews")
+    assert not path.exists()
+
+
+def test_admission_rejects_one_off_key_over_hot_vector(tmp_path):
+    """一次性缩略图不能挤掉高频访问的查询向量"""
+    manager = _make_manager(tmp_path, max_size_gb=1000 / 1024**3)
+    manager.set("hot", "v" * 90, "vectors", size_bytes=90)
+    manager.protect("hot", "vectors")
+    for i in range(10):
+        manager.get("hot", "vectors")
+    for i in range(10):
+        manager.set(f"t{i}", b"x", "vectors", size_bytes=90)
+        manager.get(f"t{i}", "vectors")
+        manager.get(f"t{i}", "vectors")
+
+    admitted = manager.set("one-off", b"y", "thumbnails", size_bytes=90)
+
+    assert admitted is False
+    assert manager.get("hot", "vectors") is not None
+    assert manager.get_stats()["admission"]["rejected"] >= 1
@@ -0,0 +1,83 @@
+"""
+并发管理器单元测试
+"""
+
+from src.core.task.concurrency_manager import (
+    ConcurrencyConfig,
+    OptimizedConcurrencyManager,
+    SystemResources,
+)
+
+
+def _resources(memory_percent: float = 30.0) -> SystemResources:
+    return SystemResources(
+        cpu_percent=95.0,
+        memory_percent=memory_percent,
+        memory_available_gb=8.0,
+        gpu_memory_available_gb=0.0,
+        gpu_memory_percent=0.0,
+        disk_io_read_mb_per_sec=0.0,
+        disk_io_write_mb_per_sec=0.0,
+        timestamp=0.0,
+    )
+
+
+def _manager(**kwargs) -> OptimizedConcurrencyManager:
+    config = ConcurrencyConfig.from_task_config(
+        {
+            "max_concurrent_tasks": 8,
+            "max_concurrent_by_type": {"file_embed_video": 2, "thumbnail_generate": 4},
+            **kwargs,
+        }
+    )
+    return OptimizedConcurrencyManager(config)
+
+
+def _run_window(manager, task_type: str, completed: int, items: int = 1) -> None:
+    lane = manager.lanes[task_type]
+    lane.window_start -= 1.0
+    for _ in range(completed):
+        assert manager.try_acquire(task_type)
+        manager.release(task_type, items=items)
+
+
+def test_lanes_honor_per_type_limits():
+    """每种任务类型的并发不超过配置上限"""
+    manager = _manager(concurrency_mode="static", base_concurrent_tasks=8)
+
+    assert [manager.try_acquire("file_embed_video") for _ in range(3)] == [True, True, False]
+    assert sum(manager.try_acquire("thumbnail_generate") for _ in range(5)) == 4
+    assert manager.get_statistics()["lanes"]["file_embed_video"]["saturated"]
+
+
+def test_saturated_lane_grows_until_throughput_stops_improving():
+    """槽位已满时加性增大，增大后吞吐量没有提升则乘性减小"""
+    manager = _manager()
+    manager.try_acquire("thumbnail_generate")
+    manager.release("thumbnail_generate")
+    lane = manager.lanes["thumbnail_generate"]
+    assert lane.limit == 2
+
+    # 高CPU不影响决策，只看吞吐量
+    lane.saturated = True
+    _run_window(manager, "thumbnail_generate", completed=10)
+    manager._adjust_concurrent_count(_resources())
+    assert lane.limit == 3
+
+    lane.saturated = True
+    _run_window(manager, "thumbnail_generate", completed=10)
+    manager._adjust_concurrent_count(_resources())
+    assert lane.limit == 2
+
+    decisions = manager.get_statistics()["recent_decisions"]
+    assert [d["reason"] for d in decisions] == ["saturated", "no_throughput_gain"]
+
+
+def test_memory_pressure_shrinks_global_limit():
+    """内存超过目标时全局上限乘性减小"""
+    manager = _manager()
+
+    manager._adjust_concurrent_count(_resources(memory_percent=95.0))
+
+    assert manager.current_concurrent == 6
+    assert manager.get_statistics()["recent_decisions"][0]["reason"] == "memory_pressure"
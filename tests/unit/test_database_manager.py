@@ -89,6 +89,33 @@ class TestDatabaseManager:
         # 关闭数据库连接
         db_manager.close()
     
+    def test_list_files_keyset_pagination(self, temp_dir):
+        """测试文件列表键集分页和计数缓存"""
+        db_manager = DatabaseManager(str(Path(temp_dir) / "test.db"))
+        for i in range(5):
+            db_manager.insert_file_metadata({
+                'file_path': f'/test/path/file{i}.jpg',
+                'file_name': f'file{i}.jpg',
+                'file_type': 'image' if i < 4 else 'video',
+                'file_size': 100 * (i + 1),
+                'file_hash': f'hash_{i}',
+            })
+
+        first = db_manager.list_files(file_type='image', limit=3, sort_by='file_size')
+        assert [f['file_size'] for f in first] == [400, 300, 200]
+
+        after = (first[-1]['file_size'], first[-1]['id'])
+        rest = db_manager.list_files(
+            file_type='image', limit=3, sort_by='file_size', after=after
+        )
+        assert [f['file_size'] for f in rest] == [100]
+
+        assert db_manager.count_files(file_type='image') == 4
+        with pytest.raises(ValueError):
+            db_manager.list_files(sort_by='file_hash')
+
+        db_manager.close()
+
     def test_update_file_metadata(self, temp_dir):
         """测试更新文件元数据"""
         # 创建临时数据库路径
@@ -169,6 +196,34 @@ class TestDatabaseManager:
         # 关闭数据库连接
         db_manager.close()
     
+    def test_get_video_metadata_batch(self, temp_dir):
+        """测试批量获取视频元数据"""
+        db_manager = DatabaseManager(str(Path(temp_dir) / "test.db"))
+        file_ids = []
+        for i in range(3):
+            file_id = db_manager.insert_file_metadata({
+                'file_path': f'/test/path/video{i}.mp4',
+                'file_name': f'video{i}.mp4',
+                'file_type': 'video',
+                'file_size': 1024,
+                'file_hash': f'video_hash_{i}',
+            })
+            db_manager.insert_video_metadata(file_id, {
+                'duration': 60.0 * (i + 1),
+                'width': 1920,
+                'height': 1080,
+                'fps': 30.0,
+            })
+            file_ids.append(file_id)
+
+        metadata_map = db_manager.get_video_metadata_batch(file_ids + ['missing'])
+
+        assert set(metadata_map) == set(file_ids)
+        assert metadata_map[file_ids[1]]['video_name'] == 'video1.mp4'
+        assert metadata_map[file_ids[1]]['duration'] == 120.0
+
+        db_manager.close()
+
     def test_insert_video_segment(self, temp_dir):
         """测试插入视频片段"""
         # 创建临时数据库路径
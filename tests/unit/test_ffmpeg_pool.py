@@ -0,0 +1,91 @@
+"""
+FFmpeg工作池单元测试
+"""
+
+import sys
+import threading
+
+from src.data.generators.ffmpeg_pool import (
+    PRIORITY_BACKGROUND,
+    PRIORITY_DEFAULT,
+    PRIORITY_VISIBLE,
+    FFmpegWorkerPool,
+)
+
+
+def _python_cmd(code: str):
+    return [sys.executable, "-c", code]
+
+
+def _occupy(pool, seconds=0.3):
+    """提交一个占住唯一工作线程的命令，等它开始执行后返回"""
+    future = pool.submit(_python_cmd(f"import time; time.sleep({seconds})"))
+    while pool.get_stats()["running"] == 0:
+        threading.Event().wait(0.01)
+    return future
+
+
+def test_commands_run_in_priority_order():
+    """排队中的命令按优先级执行，同优先级按提交顺序"""
+    pool = FFmpegWorkerPool(max_workers=1, timeout=30)
+    gate = _occupy(pool)
+
+    order = []
+    lock = threading.Lock()
+
+    def record(name):
+        def _done(_):
+            with lock:
+                order.append(name)
+        return _done
+
+    futures = []
+    for name, priority in (("background", PRIORITY_BACKGROUND),
+                           ("default", PRIORITY_DEFAULT),
+                           ("visible", PRIORITY_VISIBLE),
+                           ("default2", PRIORITY_DEFAULT)):
+        future = pool.submit(_python_cmd("pass"), priority)
+        future.add_done_callback(record(name))
+        futures.append(future)
+
+    for future in [gate] + futures:
+        future.result(timeout=10)
+    pool.shutdown()
+
+    assert order == ["visible", "default", "default2", "background"]
+
+
+def test_reprioritize_moves_queued_command_ahead():
+    """调整优先级后排队中的命令提前执行"""
+    pool = FFmpegWorkerPool(max_workers=1, timeout=30)
+    gate = _occupy(pool)
+
+    order = []
+    first = pool.submit(_python_cmd("pass"), PRIORITY_DEFAULT, key="first")
+    second = pool.submit(_python_cmd("pass"), PRIORITY_BACKGROUND, key="second")
+    first.add_done_callback(lambda _: order.append("first"))
+    second.add_done_callback(lambda _: order.append("second"))
+
+    assert pool.reprioritize("second", PRIORITY_VISIBLE)
+    for future in (gate, first, second):
+        future.result(timeout=10)
+    pool.shutdown()
+
+    assert order == ["second", "first"]
+    assert not pool.reprioritize("second", PRIORITY_VISIBLE)
+
+
+def test_same_key_is_merged_and_binary_output_is_kept():
+    """同一key未执行的命令只执行一次；text=False时输出为字节"""
+    pool = FFmpegWorkerPool(max_workers=1, timeout=30)
+    gate = _occupy(pool, 0.2)
+
+    cmd = _python_cmd("import sys; sys.stdout.buffer.write(bytes([0xff, 0xd8]))")
+    first = pool.submit(cmd, key="thumb", text=False)
+    second = pool.submit(cmd, PRIORITY_VISIBLE, key="thumb", text=False)
+
+    gate.result(timeout=10)
+    assert first is second
+    assert first.result(timeout=10).stdout == b"\xff\xd8"
+    pool.shutdown()
+    assert pool.get_stats()["completed"] == 2
@@ -0,0 +1,69 @@
+#!/usr/bin/env python3
+"""
+测试图像预处理：按模型输入分辨率解码
+"""
+
+import asyncio
+import sys
+from pathlib import Path
+
+import pytest
+
+# 添加项目根目录到Python路径
+project_root = Path(__file__).parent.parent.parent
+sys.path.insert(0, str(project_root))
+
+Image = pytest.importorskip("PIL.Image")
+
+from src.services.media.image_preprocessor import (
+    ImagePreprocessor,
+    decode_image_for_model,
+)
+
+
+@pytest.fixture
+def large_jpeg(tmp_path):
+    """创建一张大尺寸JPEG"""
+    path = tmp_path / "large.jpg"
+    Image.new("RGB", (4000, 3000), (200, 30, 30)).save(path, quality=90)
+    return str(path)
+
+
+class TestImagePreprocessor:
+    """图像预处理测试"""
+
+    def test_decode_scales_short_side_to_target(self, large_jpeg):
+        """测试短边缩放到模型输入分辨率并保持宽高比"""
+        data, size = decode_image_for_model(large_jpeg, 224)
+
+        assert size == (299, 224)
+        assert len(data) == size[0] * size[1] * 3
+
+    def test_load_images_for_model(self, large_jpeg, tmp_path):
+        """测试在进程池中解码，缺失文件报错"""
+        preprocessor = ImagePreprocessor({"processing": {"image": {"decode_workers": 2}}})
+        try:
+            images = asyncio.run(
+                preprocessor.load_images_for_model([large_jpeg, large_jpeg], 224)
+            )
+            assert [image.size for image in images] == [(299, 224), (299, 224)]
+            red, green, blue = images[0].getpixel((100, 100))
+            assert red > 150 and green < 80 and blue < 80
+
+            with pytest.raises(FileNotFoundError):
+                asyncio.run(
+                    preprocessor.load_images_for_model([str(tmp_path / "missing.jpg")])
+                )
+        finally:
+            preprocessor.shutdown()
+
+    def test_configured_resolution_overrides_model(self, large_jpeg):
+        """测试processing.image.input_resolution优先于模型输入分辨率"""
+        preprocessor = ImagePreprocessor(
+            {"processing": {"image": {"decode_workers": 1, "input_resolution": 120}}}
+        )
+        try:
+            images = asyncio.run(preprocessor.load_images_for_model([large_jpeg], 224))
+            assert images[0].size == (160, 120)
+        finally:
+            preprocessor.shutdown()
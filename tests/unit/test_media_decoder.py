@@ -0,0 +1,94 @@
+#!/usr/bin/env python3
+"""
+测试媒体解码调度：解码不阻塞事件循环，按媒体类型限制并发
+"""
+
+import asyncio
+import sys
+from pathlib import Path
+
+import pytest
+
+# 添加项目根目录到Python路径
+project_root = Path(__file__).parent.parent.parent
+sys.path.insert(0, str(project_root))
+
+Image = pytest.importorskip("PIL.Image")
+
+from src.services.media.media_decoder import MediaDecoder
+
+
+@pytest.fixture
+def jpegs(tmp_path):
+    """创建若干大尺寸JPEG"""
+    paths = []
+    for index in range(6):
+        path = tmp_path / f"large_{index}.jpg"
+        Image.new("RGB", (4000, 3000), (30, 30 * index, 200)).save(path, quality=90)
+        paths.append(str(path))
+    return paths
+
+
+def make_decoder(image_concurrency):
+    return MediaDecoder(
+        {
+            "processing": {
+                "decode": {
+                    "process_workers": 2,
+                    "io_workers": 2,
+                    "concurrency": {"image": image_concurrency},
+                }
+            }
+        }
+    )
+
+
+class TestMediaDecoder:
+    """媒体解码调度测试"""
+
+    def test_event_loop_keeps_running_during_decode(self, jpegs):
+        """测试解码期间事件循环仍能调度其他协程"""
+        decoder = make_decoder(image_concurrency=2)
+
+        async def run():
+            ticks = 0
+            stop = asyncio.Event()
+
+            async def ticker():
+                nonlocal ticks
+                while not stop.is_set():
+                    ticks += 1
+                    await asyncio.sleep(0.001)
+
+            task = asyncio.create_task(ticker())
+            images = await decoder.decode_images(jpegs, 224)
+            stop.set()
+            await task
+            return images, ticks
+
+        try:
+            images, ticks = asyncio.run(run())
+            assert [image.size for image in images] == [(299, 224)] * len(jpegs)
+            assert ticks > len(jpegs)
+        finally:
+            decoder.shutdown()
+
+    def test_concurrency_limit_and_missing_files(self, jpegs, tmp_path):
+        """测试并发名额为1时仍按顺序返回全部结果，缺失文件报错"""
+        decoder = make_decoder(image_concurrency=1)
+        missing = str(tmp_path / "missing.wav")
+
+        async def run():
+            images = await decoder.decode_images(jpegs[:3], 224)
+            assert decoder._limiter("image")._value == 1
+            assert await decoder.find_missing([jpegs[0], missing]) == [missing]
+            with pytest.raises(FileNotFoundError):
+                await decoder.decode_audios([missing])
+            return images
+
+        try:
+            images = asyncio.run(run())
+            greens = [image.getpixel((10, 10))[1] for image in images]
+            assert greens == sorted(greens)
+        finally:
+            decoder.shutdown()
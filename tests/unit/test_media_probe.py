@@ -0,0 +1,117 @@
+"""
+媒体探测服务单元测试
+"""
+
+import json
+import os
+import subprocess
+
+import pytest
+
+from src.services.media import media_probe as media_probe_module
+from src.services.media.media_probe import MediaProbe
+
+_PROBE_OUTPUT = json.dumps(
+    {
+        "streams": [
+            {
+                "codec_type": "video",
+                "codec_name": "h264",
+                "width": 1280,
+                "height": 720,
+                "avg_frame_rate": "30/1",
+            },
+            {"codec_type": "audio", "codec_name": "aac", "sample_rate": "44100"},
+        ],
+        "format": {"duration": "12.5", "format_name": "mp4", "bit_rate": "800000"},
+    }
+)
+
+
+@pytest.fixture
+def ffprobe_calls(monkeypatch):
+    calls = []
+
+    def fake_run(cmd, **kwargs):
+        calls.append(cmd)
+        return subprocess.CompletedProcess(cmd, 0, stdout=_PROBE_OUTPUT, stderr="")
+
+    monkeypatch.setattr(media_probe_module.subprocess, "run", fake_run)
+    return calls
+
+
+def test_probe_runs_ffprobe_once_per_file_version(tmp_path, ffprobe_calls):
+    """同一文件版本只调用一次ffprobe"""
+    video = tmp_path / "a.mp4"
+    video.write_bytes(b"x")
+    probe = MediaProbe(str(tmp_path / "probe.db"))
+
+    info = probe.probe(str(video))
+    probe.probe(str(video))
+    duration = probe.get_duration(str(video))
+
+    assert len(ffprobe_calls) == 1
+    assert "-show_streams" in ffprobe_calls[0] and "-show_format" in ffprobe_calls[0]
+    assert info["width"] == 1280 and info["fps"] == 30.0
+    assert duration == 12.5
+
+
+def test_probe_results_persist_across_instances(tmp_path, ffprobe_calls):
+    """探测结果持久化到SQLite，新实例无需重新探测"""
+    video = tmp_path / "a.mp4"
+    video.write_bytes(b"x")
+    MediaProbe(str(tmp_path / "probe.db")).probe(str(video))
+
+    restarted = MediaProbe(str(tmp_path / "probe.db"))
+    info = restarted.probe(str(video))
+
+    assert len(ffprobe_calls) == 1
+    assert info["video_codec"] == "h264"
+    assert restarted.get_stats()["db_hits"] == 1
+
+
+def test_modified_file_is_probed_again(tmp_path, ffprobe_calls):
+    """文件大小或修改时间变化后重新探测"""
+    video = tmp_path / "a.mp4"
+    video.write_bytes(b"x")
+    probe = MediaProbe(str(tmp_path / "probe.db"))
+    probe.probe(str(video))
+
+    video.write_bytes(b"xy")
+    stat = os.stat(video)
+    os.utime(video, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000))
+    probe.probe(str(video))
+
+    assert len(ffprobe_calls) == 2
+
+
+def test_failed_probe_returns_none(tmp_path, monkeypatch):
+    """ffprobe失败时返回None"""
+    monkeypatch.setattr(
+        media_probe_module.subprocess,
+        "run",
+        lambda cmd, **kwargs: subprocess.CompletedProcess(cmd, 1, stdout="", stderr="bad"),
+    )
+    text = tmp_path / "a.mp4"
+    text.write_text("not a video")
+
+    probe = MediaProbe(None)
+
+    assert probe.probe(str(text)) is None
+    assert probe.probe(str(tmp_path / "missing.mp4")) is None
+
+
+def test_uninitialized_global_probe_is_memory_only(tmp_path, monkeypatch):
+    """未按配置初始化时不在工作目录下创建数据库；初始化后使用配置的路径"""
+    monkeypatch.chdir(tmp_path)
+    monkeypatch.setattr(media_probe_module, "_media_probe", None)
+
+    assert media_probe_module.get_media_probe().db_path is None
+    assert not (tmp_path / "data").exists()
+
+    db_path = tmp_path / "cache" / "probe.db"
+    probe = media_probe_module.initialize_media_probe(str(db_path))
+    assert media_probe_module.get_media_probe() is probe
+    assert db_path.exists()
+    probe.close()
+    monkeypatch.setattr(media_probe_module, "_media_probe", None)
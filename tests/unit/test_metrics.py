@@ -0,0 +1,60 @@
+"""
+运行指标单元测试
+"""
+
+import gc
+import random
+
+import pytest
+
+from src.core.utils.metrics import LatencyHistogram, MetricsRegistry
+
+
+def test_histogram_quantiles_with_fixed_memory():
+    """直方图分位数误差在一个桶宽以内，内存不随观测次数增长"""
+    rng = random.Random(0)
+    values = [rng.lognormvariate(-4, 1) for _ in range(20000)]
+    histogram = LatencyHistogram()
+    bucket_count = len(histogram._counts)
+    for value in values:
+        histogram.observe(value)
+
+    values.sort()
+    for q in (0.5, 0.95, 0.99):
+        exact = values[int(q * len(values)) - 1]
+        assert histogram.quantile(q) == pytest.approx(exact, rel=0.2)
+    assert len(histogram._counts) == bucket_count
+    assert histogram.count == 20000
+    assert histogram.max == values[-1]
+
+    merged = LatencyHistogram.merged([histogram, histogram])
+    assert merged.count == 40000
+    assert merged.quantile(0.5) == histogram.quantile(0.5)
+
+
+def test_registry_renders_prometheus_text():
+    """注册表按Prometheus文本格式导出直方图、计数器和采集函数的指标"""
+    registry = MetricsRegistry()
+    histogram = registry.histogram("op_seconds", "耗时", operation="embed", model=None)
+    assert registry.histogram("op_seconds", operation="embed") is histogram
+    histogram.observe(0.01)
+    registry.counter("items_total", "条数", modality='te"xt').inc(3)
+
+    class Queue:
+        def collect(self):
+            yield ("queue_depth", "gauge", "队列长度", {"task_type": "image"}, 2)
+
+    queue = Queue()
+    registry.register_collector("queue", queue.collect)
+
+    text = registry.render()
+    assert "# TYPE op_seconds summary" in text
+    assert 'op_seconds{operation="embed",quantile="0.5"} 0.01' in text
+    assert 'op_seconds_count{operation="embed"} 1' in text
+    assert 'items_total{modality="te\\"xt"} 3.0' in text
+    assert 'queue_depth{task_type="image"} 2.0' in text
+
+    # 采集函数以弱引用保存，对象回收后不再导出
+    del queue
+    gc.collect()
+    assert "queue_depth" not in registry.render()
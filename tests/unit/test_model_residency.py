@@ -0,0 +1,184 @@
+#!/usr/bin/env python3
+"""
+测试模型常驻管理
+
+测试内存预算下的LRU驱逐、驱逐后按需重新加载、并发加载合并以及并行加载和预热
+"""
+
+import asyncio
+import sys
+import time
+from pathlib import Path
+
+import pytest
+
+# 添加项目根目录到Python路径
+project_root = Path(__file__).parent.parent.parent
+sys.path.insert(0, str(project_root))
+
+from src.core.models.model_manager import ModelConfig, ModelManager, EmbeddingService
+from src.core.utils.model_memory_manager import ModelMemoryManager
+
+MODEL_SIZES_GB = {"clip": 1.0, "clap": 1.0}
+
+
+class FakeEngine:
+    """模拟Infinity引擎，记录启动和停止次数"""
+
+    started = []
+    stopped = []
+    warmup_batches = []
+    load_seconds = 0.0
+    capabilities = {"embed"}
+
+    def __init__(self, args):
+        self.name = args.model_name_or_path
+        self.running = False
+
+    @classmethod
+    def from_args(cls, args):
+        # 与Infinity一致：权重在构造时同步加载
+        time.sleep(cls.load_seconds)
+        return cls(args)
+
+    async def astart(self):
+        await asyncio.sleep(0.01)
+        self.running = True
+        FakeEngine.started.append(self.name)
+
+    async def astop(self):
+        self.running = False
+        FakeEngine.stopped.append(self.name)
+
+    async def embed(self, inputs):
+        assert self.running, "引擎已停止"
+        if inputs[0] == "warmup":
+            FakeEngine.warmup_batches.append((self.name, len(inputs)))
+        await asyncio.sleep(0.01)
+        return [[1.0, 0.0] for _ in inputs], len(inputs)
+
+
+class FakeEngineArgs:
+    def __init__(self, model_name_or_path, **kwargs):
+        self.model_name_or_path = model_name_or_path
+
+
+@pytest.fixture
+def manager(monkeypatch):
+    FakeEngine.started = []
+    FakeEngine.stopped = []
+    FakeEngine.warmup_batches = []
+    FakeEngine.load_seconds = 0.0
+    monkeypatch.setattr(ModelManager, "_AsyncEmbeddingEngine", FakeEngine)
+    monkeypatch.setattr(ModelManager, "_EngineArgs", FakeEngineArgs)
+    monkeypatch.setattr(ModelManager, "_measure_memory_gb", staticmethod(lambda: None))
+    monkeypatch.setattr(
+        ModelManager,
+        "_estimate_model_size_gb",
+        classmethod(lambda cls, config: MODEL_SIZES_GB[config.name]),
+    )
+    return ModelManager(
+        memory_manager=ModelMemoryManager(
+            max_models_in_memory=None, inactive_timeout=None, memory_budget_gb=1.5
+        )
+    )
+
+
+def make_configs():
+    return {
+        model_type: ModelConfig(
+            name=model_type, device="cpu", dtype="float32", batch_size=4
+        )
+        for model_type in MODEL_SIZES_GB
+    }
+
+
+class TestModelResidency:
+    """模型常驻管理测试"""
+
+    def test_budget_evicts_lru_and_reloads_on_demand(self, manager):
+        """测试超出预算时驱逐最久未使用的模型，下次使用时并发请求只加载一次"""
+
+        async def run():
+            await manager.initialize(make_configs())
+            assert manager.get_loaded_models() == ["clap"]
+            assert FakeEngine.stopped == ["clip"]
+            assert sorted(manager.get_registered_models()) == ["clap", "clip"]
+
+            service = EmbeddingService(manager)
+            results = await asyncio.gather(
+                *[service.embed_text(f"query {i}", "clip") for i in range(5)]
+            )
+
+            assert all(result == [[1.0, 0.0]] for result in results)
+            assert FakeEngine.started == ["clip", "clap", "clip"]
+            assert FakeEngine.stopped == ["clip", "clap"]
+            assert manager.get_loaded_models() == ["clip"]
+
+            stats = manager.memory_manager.get_memory_stats()
+            assert stats["total_memory_gb"] == 1.0
+            assert stats["models"]["clip"]["load_count"] == 2
+            assert stats["models"]["clip"]["usage_count"] == 5
+
+            await manager.shutdown()
+
+        asyncio.run(run())
+
+    def test_model_in_use_is_not_evicted(self, manager):
+        """测试正在推理的模型不会被驱逐"""
+
+        async def run():
+            manager.memory_manager.memory_budget_gb = None
+            await manager.initialize(make_configs())
+
+            async with manager.use_model("clip"):
+                assert not await manager.evict_model("clip")
+                assert await manager.evict_model("clap")
+
+            assert await manager.evict_model("clip")
+            assert manager.get_loaded_models() == []
+            await manager.shutdown()
+
+        asyncio.run(run())
+
+    def test_idle_models_are_unloaded(self, manager):
+        """测试空闲超时的模型被真正停止"""
+
+        async def run():
+            manager.memory_manager.memory_budget_gb = None
+            manager.memory_manager.inactive_timeout = 0
+            await manager.initialize(make_configs())
+            await asyncio.sleep(0.01)
+
+            await manager.memory_manager.cleanup_inactive_models()
+
+            assert manager.get_loaded_models() == []
+            assert sorted(FakeEngine.stopped) == ["clap", "clip"]
+            assert await manager.get_model("clap") is not None
+            await manager.shutdown()
+
+        asyncio.run(run())
+
+    def test_models_load_in_parallel_and_warm_up(self, manager):
+        """测试没有常驻限制时模型并行加载，并按单条和满批两种形状预热"""
+
+        async def run():
+            manager.memory_manager.memory_budget_gb = None
+            manager.warmup = True
+            FakeEngine.load_seconds = 0.2
+
+            start_time = time.perf_counter()
+            await manager.initialize(make_configs())
+            elapsed = time.perf_counter() - start_time
+
+            assert sorted(manager.get_loaded_models()) == ["clap", "clip"]
+            assert elapsed < 2 * FakeEngine.load_seconds
+            assert sorted(FakeEngine.warmup_batches) == [
+                ("clap", 1),
+                ("clap", 4),
+                ("clip", 1),
+                ("clip", 4),
+            ]
+            await manager.shutdown()
+
+        asyncio.run(run())
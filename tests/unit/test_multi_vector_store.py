@@ -0,0 +1,144 @@
+#!/usr/bin/env python3
+"""
+测试多向量存储：MaxSim打分、token级预筛选和按文件删除
+"""
+
+import asyncio
+import sys
+from pathlib import Path
+from unittest.mock import AsyncMock, Mock
+
+import numpy as np
+import pytest
+
+# 添加项目根目录到Python路径
+project_root = Path(__file__).parent.parent.parent
+sys.path.insert(0, str(project_root))
+
+pytest.importorskip("lancedb")
+
+from src.core.vector.multi_vector_store import (
+    MultiVectorStore,
+    maxsim_scores,
+    normalize_rows,
+)
+from src.services.search.search_engine import SearchEngine
+
+DIMENSION = 32
+
+
+@pytest.fixture
+def documents():
+    rng = np.random.default_rng(0)
+    return [
+        rng.normal(size=(int(rng.integers(5, 20)), DIMENSION)).astype(np.float32)
+        for _ in range(50)
+    ]
+
+
+def exact_maxsim(query, document):
+    return float((normalize_rows(query) @ normalize_rows(document).T).max(axis=1).sum())
+
+
+class TestMaxSim:
+    """MaxSim打分测试"""
+
+    def test_matches_per_document_loop(self, documents):
+        """测试按offsets分段的向量化计算与逐条目计算一致"""
+        query = np.random.default_rng(1).normal(size=(4, DIMENSION))
+        doc_vectors = normalize_rows(np.concatenate(documents))
+        offsets = np.cumsum([0] + [len(d) for d in documents[:-1]])
+
+        scores = maxsim_scores(normalize_rows(query), doc_vectors, offsets)
+
+        expected = [exact_maxsim(query, d) for d in documents]
+        np.testing.assert_allclose(scores, expected, rtol=1e-5)
+
+
+class TestMultiVectorStore:
+    """多向量存储测试"""
+
+    @pytest.mark.parametrize("precision", ["float32", "float16"])
+    def test_search_ranks_by_maxsim(self, tmp_path, documents, precision):
+        """测试检索结果按MaxSim排序，查询token取自的条目排在第一位"""
+        store = MultiVectorStore(
+            {"data_dir": str(tmp_path), "vector_precision": precision, "candidate_limit": 10}
+        )
+        store.insert_items(
+            [
+                {
+                    "id": f"item_{i}",
+                    "vectors": vectors,
+                    "modality": "image" if i % 2 == 0 else "video",
+                    "file_id": f"file_{i}",
+                    "metadata": {"file_path": f"/data/{i}.jpg"},
+                }
+                for i, vectors in enumerate(documents)
+            ]
+        )
+
+        query = documents[10][:3]
+        results = store.search(query, limit=5)
+
+        assert results[0]["id"] == "item_10"
+        assert results[0]["file_path"] == "/data/10.jpg"
+        assert results[0]["similarity"] == pytest.approx(1.0, abs=1e-2)
+        assert [r["maxsim"] for r in results] == sorted(
+            (r["maxsim"] for r in results), reverse=True
+        )
+
+        filtered = store.search(query, limit=5, filter={"modality": "video"})
+        assert filtered and all(r["modality"] == "video" for r in filtered)
+
+        stats = store.get_stats()
+        assert stats["item_count"] == len(documents)
+        assert stats["token_count"] == sum(len(d) for d in documents)
+
+        store.delete_by_file_id("file_10")
+        assert all(r["id"] != "item_10" for r in store.search(query, limit=5))
+        store.close()
+
+    def test_int8_is_rejected(self, tmp_path):
+        """测试token表不支持int8存储"""
+        with pytest.raises(ValueError):
+            MultiVectorStore({"data_dir": str(tmp_path), "vector_precision": "int8"})
+
+
+class TestSearchEngineRouting:
+    """搜索引擎使用多向量存储的测试"""
+
+    def test_text_search_uses_maxsim_for_images(self, tmp_path, documents):
+        """测试文本检索时图像走MaxSim，视频仍在单向量表中检索"""
+        store = MultiVectorStore({"data_dir": str(tmp_path), "candidate_limit": 10})
+        store.insert_items(
+            [
+                {
+                    "id": f"item_{i}",
+                    "vectors": vectors,
+                    "modality": "image",
+                    "file_id": f"file_{i}",
+                    "file_path": f"/data/{i}.jpg",
+                }
+                for i, vectors in enumerate(documents)
+            ]
+        )
+        engine = Mock()
+        engine.embed_multi_vector = AsyncMock(return_value=[documents[7][:3]])
+        engine.embed_text = AsyncMock(return_value=[0.1] * DIMENSION)
+        vector_store = Mock()
+        vector_store.search = Mock(
+            return_value=[
+                {"id": "clip", "modality": "video", "file_path": "/data/a.mp4", "similarity": 0.3}
+            ]
+        )
+        search_engine = SearchEngine(engine, vector_store, multi_vector_store=store)
+
+        results = asyncio.run(
+            search_engine._search_visual_with_text("query", 5, ["image", "video"])
+        )
+
+        assert results[0]["id"] == "item_7"
+        assert "clip" in [r["id"] for r in results]
+        engine.embed_multi_vector.assert_awaited_once_with("query", input_type="text")
+        assert vector_store.search.call_args.kwargs["filter"] == {"modality": ["video"]}
+        store.close()
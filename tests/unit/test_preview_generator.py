@@ -3,8 +3,12 @@
 """
 
 import pytest
+import subprocess
 import tempfile
+import threading
+from concurrent.futures import Future
 from pathlib import Path
+from src.data.generators.ffmpeg_pool import PRIORITY_BACKGROUND, PRIORITY_VISIBLE
 from src.data.generators.preview_generator import PreviewGenerator, PreviewType
 
 
@@ -84,4 +88,127 @@ class TestPreviewType:
         assert PreviewType.LARGE_PREVIEW == "large"
         assert PreviewType.GIF_PREVIEW == "gif"
         assert PreviewType.VIDEO_PREVIEW == "video"
-        assert PreviewType.AUDIO_WAVEFORM == "waveform"
\ No newline at end of file
+        assert PreviewType.AUDIO_WAVEFORM == "waveform"
+
+class FakePool:
+    """记录提交的命令，由测试决定何时完成"""
+
+    max_workers = 2
+
+    def __init__(self):
+        self.submitted = {}
+        self.reprioritized = []
+
+    def submit(self, cmd, priority=5, key=None, text=True, timeout=None):
+        if key in self.submitted:
+            return self.submitted[key][2]
+        future = Future()
+        self.submitted[key] = (cmd, priority, future)
+        return future
+
+    def reprioritize(self, key, priority):
+        if key not in self.submitted or self.submitted[key][2].done():
+            return False
+        self.reprioritized.append((key, priority))
+        return True
+
+    def finish(self, key):
+        cmd, _, future = self.submitted[key]
+        future.set_result(subprocess.CompletedProcess(cmd, 0, stdout="", stderr=""))
+
+
+VIDEO_PROBE = {'duration': 40.0, 'width': 1920, 'height': 1080}
+
+
+@pytest.fixture
+def video_file(temp_cache_dir):
+    path = temp_cache_dir / "clip.mp4"
+    path.write_bytes(b"video")
+    return str(path)
+
+
+class TestAssetBatching:
+    """测试共享工作池上的缩略图/预览生成"""
+
+    def test_requests_with_different_outputs_are_not_merged(self, temp_cache_dir, video_file):
+        """只要缩略图的任务排队时，同时要预览的请求提交独立的命令"""
+        pool = FakePool()
+        generator = PreviewGenerator({'output_dir': str(temp_cache_dir)}, pool=pool)
+
+        thumb_only = generator.submit_assets(video_file, preview=False, probe=VIDEO_PROBE)
+        both = generator.submit_assets(video_file, probe=VIDEO_PROBE)
+        again = generator.submit_assets(video_file, preview=False, probe=VIDEO_PROBE)
+
+        assert len(pool.submitted) == 2
+        for key in list(pool.submitted):
+            pool.finish(key)
+
+        assert thumb_only.result()['preview_path'] is None
+        assert again.result()['preview_path'] is None
+        assert both.result()['preview_path'].endswith('_preview.mp4')
+        assert generator._priorities == {}
+
+    def test_prioritize_reaches_all_pending_commands(self, temp_cache_dir, video_file):
+        """可见结果的提权作用于该文件所有排队中的命令"""
+        pool = FakePool()
+        generator = PreviewGenerator({'output_dir': str(temp_cache_dir)}, pool=pool)
+
+        generator.submit_assets(video_file, preview=False, probe=VIDEO_PROBE,
+                                priority=PRIORITY_BACKGROUND)
+        generator.submit_assets(video_file, probe=VIDEO_PROBE, priority=PRIORITY_BACKGROUND)
+
+        assert generator.prioritize([video_file]) == 2
+        assert {priority for _, priority in pool.reprioritized} == {PRIORITY_VISIBLE}
+
+        for key in list(pool.submitted):
+            pool.finish(key)
+        assert generator.prioritize([video_file]) == 0
+
+    def test_build_assets_cmd(self, temp_cache_dir):
+        """一次解码输出两路；只要缩略图时在输入端seek"""
+        generator = PreviewGenerator({'output_dir': str(temp_cache_dir), 'duration': 10},
+                                     pool=FakePool())
+
+        thumb_only = generator._build_assets_cmd('in.mp4', 'video', VIDEO_PROBE,
+                                                 'thumb.jpg', None)
+        assert thumb_only[thumb_only.index('-ss') + 1] == '4.000'
+        assert thumb_only.index('-ss') < thumb_only.index('-i')
+        assert thumb_only[-1] == 'thumb.jpg'
+
+        both = generator._build_assets_cmd('in.mp4', 'video', VIDEO_PROBE,
+                                           'thumb.jpg', 'preview.mp4')
+        assert both.count('-i') == 1
+        graph = both[both.index('-filter_complex') + 1]
+        assert 'split=2' in graph and 'setpts=0.25*PTS' in graph
+        assert both.index('thumb.jpg') < both.index('preview.mp4')
+
+        audio = generator._build_assets_cmd('in.wav', 'audio', {}, 'wave.png', None)
+        assert 'showwavespic' in audio[audio.index('-filter_complex') + 1]
+        assert audio[-1] == 'wave.png'
+
+    def test_media_info_comes_from_shared_probe(self, temp_cache_dir, video_file):
+        """未提供媒体信息时使用共享的MediaProbe，结果随生成结果返回"""
+
+        class FakeProbe:
+            def __init__(self):
+                self.paths = []
+
+            def probe(self, path):
+                self.paths.append(path)
+                return VIDEO_PROBE
+
+        pool = FakePool()
+        media_probe = FakeProbe()
+        generator = PreviewGenerator({'output_dir': str(temp_cache_dir)}, pool=pool,
+                                     media_probe=media_probe)
+
+        future = generator.submit_assets(video_file, preview=False)
+        for _ in range(500):
+            if pool.submitted:
+                break
+            threading.Event().wait(0.01)
+        pool.finish(next(iter(pool.submitted)))
+
+        assert future.result(timeout=5)['probe'] == VIDEO_PROBE
+        assert media_probe.paths == [video_file]
+        assert generator.probe(video_file)['duration'] == 40.0
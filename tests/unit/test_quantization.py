@@ -0,0 +1,78 @@
+#!/usr/bin/env python3
+"""
+测试CPU量化推理配置和精度检查
+"""
+
+import sys
+from pathlib import Path
+from types import SimpleNamespace
+
+import numpy as np
+import pytest
+
+# 添加项目根目录到Python路径
+project_root = Path(__file__).parent.parent.parent
+sys.path.insert(0, str(project_root))
+
+from src.core.models.model_manager import ModelConfig, ModelManager
+from src.core.models.quantization import embedding_agreement, quantize_engine
+
+
+class TestQuantization:
+    """量化推理测试"""
+
+    def test_config_validation(self):
+        """测试量化只接受CPU上的float32 torch模型"""
+        config = ModelConfig(
+            name="clip", device="cpu", dtype="float32", quantization="int8_dynamic"
+        )
+        assert config.quantization == "int8_dynamic"
+
+        with pytest.raises(ValueError):
+            ModelConfig(name="clip", device="cpu", dtype="float32", quantization="int4")
+        with pytest.raises(ValueError):
+            ModelConfig(name="clip", device="cuda", dtype="float32", quantization="int8_dynamic")
+        with pytest.raises(ValueError):
+            ModelConfig(name="clip", device="cpu", dtype="float16", quantization="int8_dynamic")
+
+        configs = ModelManager.load_configs_from_yaml(
+            {
+                "active_models": ["clip"],
+                "available_models": {
+                    "clip": {"device": "cpu", "quantization": "int8_dynamic"}
+                },
+            }
+        )
+        assert configs["clip"].quantization == "int8_dynamic"
+
+    def test_embedding_agreement(self):
+        """测试余弦一致性计算"""
+        reference = np.eye(3)
+        assert embedding_agreement(reference, reference * 2) == {
+            "mean_cosine": 1.0,
+            "min_cosine": 1.0,
+        }
+
+        candidate = reference.copy()
+        candidate[2] = [0.0, 1.0, 0.0]
+        agreement = embedding_agreement(reference, candidate)
+        assert agreement["min_cosine"] == 0.0
+        assert agreement["mean_cosine"] == pytest.approx(2 / 3)
+
+    def test_quantize_engine_keeps_embeddings_close(self):
+        """测试动态int8量化后输出与浮点模型一致"""
+        torch = pytest.importorskip("torch")
+        torch.manual_seed(0)
+        model = torch.nn.Sequential(
+            torch.nn.Linear(64, 128), torch.nn.GELU(), torch.nn.Linear(128, 32)
+        )
+        inputs = torch.randn(16, 64)
+        with torch.no_grad():
+            reference = model(inputs).numpy()
+
+        client = SimpleNamespace(_model_replicas=[SimpleNamespace(model=model)])
+        assert quantize_engine(client, "int8_dynamic") == 1
+
+        with torch.no_grad():
+            quantized = client._model_replicas[0].model(inputs).numpy()
+        assert embedding_agreement(reference, quantized)["mean_cosine"] > 0.99
@@ -0,0 +1,89 @@
+#!/usr/bin/env python3
+"""
+测试相关性反馈
+
+测试反馈持久化、Rocchio精化和历史反馈提升
+"""
+
+import asyncio
+import sys
+from pathlib import Path
+
+import numpy as np
+import pytest
+
+# 添加项目根目录到Python路径
+project_root = Path(__file__).parent.parent.parent
+sys.path.insert(0, str(project_root))
+
+from src.services.search.relevance_feedback import RelevanceFeedback
+
+
+def make_candidates():
+    """构造候选结果：a与查询最接近，c与b方向相同"""
+    return [
+        {"id": "a", "file_id": "a", "modality": "image", "vector": [1.0, 0.1, 0.0]},
+        {"id": "b", "file_id": "b", "modality": "image", "vector": [0.6, 0.8, 0.0]},
+        {"id": "c", "file_id": "c", "modality": "image", "vector": [0.5, 0.85, 0.1]},
+        {"id": "d", "file_id": "d", "modality": "image", "vector": [0.7, 0.0, 0.7]},
+    ]
+
+
+class TestRelevanceFeedback:
+    """相关性反馈测试"""
+
+    @pytest.fixture
+    def db_path(self, tmp_path):
+        return str(tmp_path / "feedback.db")
+
+    def test_feedback_persists_across_instances(self, db_path):
+        """测试反馈在重启后仍然存在"""
+        feedback = RelevanceFeedback({"feedback_db_path": db_path})
+        asyncio.run(feedback.record_feedback("q1", "a", 1, query_text="Sunset Beach"))
+        feedback.close()
+
+        reopened = RelevanceFeedback({"feedback_db_path": db_path})
+        records = asyncio.run(reopened.get_feedback_for_query("q1"))
+        assert [(r["result_id"], r["user_feedback"]) for r in records] == [("a", 1)]
+        assert reopened.get_history_boosts("  sunset   beach ") == {"a": 0.1}
+
+        asyncio.run(reopened.clear_feedback("q1"))
+        assert asyncio.run(reopened.get_feedback_for_query("q1")) == []
+        reopened.close()
+
+    def test_refine_moves_query_towards_relevant(self, db_path):
+        """测试Rocchio精化：标注相关的方向上的候选排名上升"""
+        feedback = RelevanceFeedback({"feedback_db_path": db_path})
+        feedback.cache_candidates("q1", "query", {"visual": ([1.0, 0.0, 0.0], make_candidates())})
+
+        def ranking(rows):
+            return [r["file_id"] for r in sorted(rows, key=lambda r: r["score"], reverse=True)]
+
+        assert ranking(feedback.refine("q1")) == ["a", "d", "b", "c"]
+
+        asyncio.run(feedback.record_feedback("q1", "b", 1))
+        asyncio.run(feedback.record_feedback("q1", "d", -1))
+        refined = feedback.refine("q1")
+
+        scores = {r["file_id"]: r["score"] for r in refined}
+        # 标注相关的b及同方向的c超过标注不相关的d
+        assert ranking(refined) == ["a", "b", "c", "d"]
+        assert scores["b"] > 0.85 and scores["d"] < 0.6
+        assert all("vector" not in r for r in refined)
+        # 查询文本从候选缓存中补全，用于之后的历史提升
+        assert feedback.get_history_boosts("query") == {"b": 0.1, "d": -0.1}
+        feedback.close()
+
+    def test_candidate_cache_is_bounded(self, db_path):
+        """测试候选缓存按LRU淘汰"""
+        feedback = RelevanceFeedback(
+            {"feedback_db_path": db_path, "candidate_cache_size": 2}
+        )
+        for query_id in ("q1", "q2", "q3"):
+            feedback.cache_candidates(
+                query_id, query_id, {"visual": (np.ones(3), make_candidates())}
+            )
+
+        assert feedback.refine("q1") is None
+        assert feedback.get_cached_query("q3") == "q3"
+        feedback.close()
@@ -0,0 +1,62 @@
+"""
+资源采样器单元测试
+"""
+
+import time
+from unittest.mock import MagicMock, patch
+
+from src.core.utils.resource_monitor import ResourceMonitor, ResourceSampler
+
+
+def test_sampler_publishes_snapshots_with_bounded_history():
+    """采样线程按周期发布新快照，历史保存在固定大小的环形缓冲区中"""
+    sampler = ResourceSampler(interval=0.01, history_size=5)
+    first = sampler.snapshot()
+    assert first.memory_total_gb > 0 and first.process_rss_mb > 0
+
+    sampler.start()
+    deadline = time.time() + 2.0
+    while len(sampler.history()) < 5 and time.time() < deadline:
+        time.sleep(0.01)
+    sampler.stop()
+
+    history = sampler.history()
+    assert len(history) == 5
+    assert sampler.snapshot() is history[-1]
+    assert [s.timestamp for s in history] == sorted(s.timestamp for s in history)
+    assert sampler.history(seconds=0) == []
+
+
+def test_consumers_read_snapshot_without_sampling():
+    """读取方只读取快照，不直接调用psutil"""
+    sampler = ResourceSampler(interval=60)
+    with patch(
+        "src.core.utils.resource_monitor.get_resource_sampler", return_value=sampler
+    ), patch("src.core.utils.resource_monitor.psutil") as mock_psutil:
+        usage = ResourceMonitor().get_resource_usage()
+
+    assert usage.memory_percent == sampler.snapshot().memory_percent
+    mock_psutil.cpu_percent.assert_not_called()
+    mock_psutil.virtual_memory.assert_not_called()
+
+
+def test_gpu_utilization_is_sampled_when_torch_is_loaded():
+    """torch已加载且GPU可用时采样GPU使用率，并传递到ResourceUsage"""
+    torch = MagicMock()
+    torch.cuda.is_available.return_value = True
+    torch.cuda.current_device.return_value = 0
+    torch.cuda.get_device_properties.return_value.total_memory = 8 * 1024**3
+    torch.cuda.memory_allocated.return_value = 2 * 1024**3
+    torch.cuda.memory_reserved.return_value = 4 * 1024**3
+    torch.cuda.utilization.return_value = 37
+
+    with patch.dict("sys.modules", {"torch": torch}):
+        sampler = ResourceSampler(interval=60)
+    with patch(
+        "src.core.utils.resource_monitor.get_resource_sampler", return_value=sampler
+    ):
+        usage = ResourceMonitor().get_resource_usage()
+
+    assert sampler.snapshot().gpu_percent == 37.0
+    assert sampler.snapshot().gpu_memory_percent == 25.0
+    assert usage.gpu_percent == 37.0
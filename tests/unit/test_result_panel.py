@@ -0,0 +1,153 @@
+#!/usr/bin/env python3
+"""
+测试结果面板的列表模型和异步缩略图加载
+"""
+
+import os
+import sys
+import time
+from pathlib import Path
+
+import pytest
+
+# 添加项目根目录到Python路径
+project_root = Path(__file__).parent.parent.parent
+sys.path.insert(0, str(project_root))
+
+os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+pytest.importorskip("PySide6.QtWidgets")
+
+from PySide6.QtCore import Qt
+from PySide6.QtGui import QImage
+from PySide6.QtWidgets import QApplication
+
+from src.ui.components.result_panel import (
+    THUMBNAIL_SIZE,
+    ResultListModel,
+    ResultPanel,
+    ThumbnailLoader,
+)
+
+
+@pytest.fixture(scope="module")
+def qapp():
+    return QApplication.instance() or QApplication([])
+
+
+def wait_until(qapp, predicate, timeout=5.0):
+    deadline = time.time() + timeout
+    while time.time() < deadline:
+        qapp.processEvents()
+        if predicate():
+            return True
+        time.sleep(0.01)
+    return False
+
+
+def make_image(path, color):
+    image = QImage(640, 480, QImage.Format_RGB32)
+    image.fill(color)
+    assert image.save(str(path), "PNG")
+    return str(path)
+
+
+def make_results(count, thumbnail_path=None):
+    return [
+        {
+            "file_name": f"file_{i}.jpg",
+            "file_path": f"/media/file_{i}.jpg",
+            "modality": "image",
+            "score": 1.0 - i / count,
+            "thumbnail_path": thumbnail_path,
+        }
+        for i in range(count)
+    ]
+
+
+class TestResultListModel:
+    """结果列表模型测试"""
+
+    def test_rows_and_roles(self, qapp):
+        """测试行数和各角色的数据"""
+        model = ResultListModel()
+        results = make_results(10000)
+        model.set_results(results)
+
+        assert model.rowCount() == 10000
+        index = model.index(42)
+        assert model.data(index, Qt.DisplayRole) == "file_42.jpg"
+        assert model.data(index, Qt.ToolTipRole) == "/media/file_42.jpg"
+        assert model.data(index, ResultListModel.ResultRole) is results[42]
+        assert model.data(model.index(10000), Qt.DisplayRole) is None
+
+    def test_thumbnail_ready_refreshes_only_matching_rows(self, qapp):
+        """测试缩略图加载完成后只刷新使用它的行"""
+        model = ResultListModel()
+        results = make_results(5)
+        results[1]["thumbnail_path"] = "/thumbs/a.png"
+        results[3]["thumbnail_path"] = "/thumbs/a.png"
+        results[4]["thumbnail_path"] = "/thumbs/b.png"
+        model.set_results(results)
+
+        changed = []
+        model.dataChanged.connect(lambda top, bottom: changed.append(top.row()))
+        model.on_thumbnail_ready("/thumbs/a.png")
+
+        assert changed == [1, 3]
+
+
+class TestThumbnailLoader:
+    """异步缩略图加载测试"""
+
+    def test_decodes_in_background_and_caches(self, qapp, tmp_path):
+        """测试首次请求返回None，解码完成后从缓存返回缩放后的缩略图"""
+        loader = ThumbnailLoader()
+        path = make_image(tmp_path / "red.png", Qt.red)
+        ready = []
+        loader.thumbnail_ready.connect(ready.append)
+
+        assert loader.pixmap(path) is None
+        assert wait_until(qapp, lambda: ready == [path])
+
+        pixmap = loader.pixmap(path)
+        assert pixmap is not None
+        assert pixmap.width() <= THUMBNAIL_SIZE.width()
+        assert pixmap.height() <= THUMBNAIL_SIZE.height()
+        assert ready == [path]
+
+    def test_same_content_shares_cache_entry_and_failures_are_remembered(
+        self, qapp, tmp_path
+    ):
+        """测试内容相同的缩略图共用缓存，无法解码的文件不重复提交"""
+        loader = ThumbnailLoader()
+        first = make_image(tmp_path / "a.png", Qt.blue)
+        second = tmp_path / "b.png"
+        second.write_bytes(Path(first).read_bytes())
+        broken = tmp_path / "broken.png"
+        broken.write_bytes(b"not an image")
+
+        for path in (first, str(second), str(broken)):
+            loader.pixmap(path)
+        assert wait_until(
+            qapp, lambda: loader.is_failed(str(broken)) and not loader._pending
+        )
+
+        assert loader._content_keys[first] == loader._content_keys[str(second)]
+        assert loader.pixmap(str(broken)) is None
+        assert not loader._pending
+
+
+class TestResultPanel:
+    """结果面板测试"""
+
+    def test_display_results_populates_model(self, qapp):
+        """测试主窗口调用的display_results填充列表模型并按类型过滤"""
+        panel = ResultPanel()
+        results = make_results(3)
+        results[2]["modality"] = "video"
+        panel.display_results(results)
+        assert panel.result_model.rowCount() == 3
+
+        panel.filter_combo.setCurrentIndex(2)
+        assert panel.result_model.rowCount() == 1
+        assert panel.result_model.results[0]["modality"] == "video"
@@ -224,6 +224,60 @@ def test_aggregate_results():
     print("  ✓ 结果聚合 测试通过")
 
 
+def test_aggregate_results_keeps_video_segments():
+    """测试结果聚合保留视频片段，相邻片段合并为连续区间"""
+    search_engine = SearchEngine(
+        create_mock_embedding_engine(), create_mock_vector_store(), config={"segments_per_video": 2}
+    )
+
+    test_results = [
+        {'score': 0.9, 'file_id': 'v1', 'modality': 'video', 'start_time': 10.0, 'end_time': 15.0, 'segment_id': 's3'},
+        {'score': 0.6, 'file_id': 'v1', 'modality': 'video', 'start_time': 15.5, 'end_time': 20.0, 'segment_id': 's4'},
+        {'score': 0.8, 'file_id': 'v1', 'modality': 'video', 'start_time': 60.0, 'end_time': 65.0, 'segment_id': 's12'},
+        {'score': 0.5, 'file_id': 'v1', 'modality': 'video', 'start_time': 90.0, 'end_time': 95.0, 'segment_id': 's18'},
+        {'score': 0.7, 'file_id': 'i1', 'modality': 'image'},
+    ]
+
+    aggregated = {r['file_id']: r for r in search_engine._aggregate_results(test_results)}
+
+    assert aggregated['v1']['score'] == 0.9
+    assert [(s['start_time'], s['end_time'], s['score']) for s in aggregated['v1']['segments']] == [
+        (10.0, 20.0, 0.9),
+        (60.0, 65.0, 0.8),
+    ]
+    assert aggregated['v1']['segments'][0]['segment_ids'] == ['s3', 's4']
+    assert 'segments' not in aggregated['i1']
+
+
+@pytest.mark.asyncio
+async def test_visual_search_over_fetches_only_video_segments():
+    """测试视频片段单独多取候选且不去重，图片仍按k检索"""
+    mock_vector_store = create_mock_vector_store()
+
+    def fake_search(query_vector, limit, filter, **kwargs):
+        if filter['modality'] == ['video']:
+            return [
+                {'similarity': 0.9 - i * 0.1, 'file_id': f'v{i // 2}', 'modality': 'video'}
+                for i in range(6)
+            ]
+        return [{'similarity': 0.95, 'file_id': 'i1', 'modality': 'image'}]
+
+    mock_vector_store.search = Mock(side_effect=fake_search)
+    search_engine = SearchEngine(
+        create_mock_embedding_engine(), mock_vector_store, config={"segments_per_video": 3}
+    )
+
+    results = await search_engine._search_visual_with_text("q", 2, ["image", "video"])
+
+    calls = {tuple(c.kwargs['filter']['modality']): c.kwargs for c in mock_vector_store.search.call_args_list}
+    assert calls[('image',)]['limit'] == 2
+    assert 'dedupe_files' not in calls[('image',)]
+    assert calls[('video',)]['limit'] == 6
+    assert calls[('video',)]['dedupe_files'] is False
+    assert {r['file_id'] for r in results if r['modality'] == 'video'} == {'v0', 'v1'}
+    assert results[0]['file_id'] == 'i1'
+
+
 def test_format_results():
     """测试结果格式化"""
     print("\n=== 测试结果格式化 ===")
@@ -253,6 +307,85 @@ def test_format_results():
     print("  ✓ 结果格式化 测试通过")
 
 
+@pytest.mark.asyncio
+async def test_search_stream():
+    """测试流式搜索：每个模态返回后推送一次合并结果，最后补充缩略图路径"""
+    mock_embedding_engine = create_mock_embedding_engine()
+    mock_vector_store = create_mock_vector_store()
+
+    def search(query_vector, limit=10, filter=None, **kwargs):
+        if filter["modality"] == "audio":
+            return [{'file_id': 'a1', 'score': 0.5, 'file_path': '/test/a1.mp3', 'modality': 'audio'}]
+        return [{'file_id': 'i1', 'score': 0.9, 'file_path': '/test/i1.jpg', 'modality': 'image'}]
+
+    mock_vector_store.search = Mock(side_effect=search)
+
+    search_engine = SearchEngine(mock_embedding_engine, mock_vector_store)
+    search_engine.database_manager = Mock()
+    search_engine.database_manager.get_thumbnail_by_path = Mock(
+        side_effect=lambda path: f"{path}.thumb.jpg"
+    )
+    search_engine.database_manager.get_preview_by_path = Mock(return_value=None)
+
+    events = [event async for event in search_engine.search_stream('test query', k=5)]
+
+    assert [event['event'] for event in events] == ['results', 'results', 'hydrated', 'done']
+    assert len(events[0]['results']) == 1 and len(events[0]['pending']) == 1
+    assert events[1]['pending'] == []
+    # 权重只应用一次，合并结果按分数排序
+    assert [(r['file_id'], r['score']) for r in events[1]['results']] == [('i1', 0.9), ('a1', 0.5)]
+    assert all(r['thumbnail_path'] is None for r in events[1]['results'])
+    assert {p['file_id']: p['thumbnail_path'] for p in events[2]['paths']} == {
+        'i1': '/test/i1.jpg.thumb.jpg',
+        'a1': '/test/a1.mp3.thumb.jpg',
+    }
+    assert events[3]['total'] == 2
+
+
+@pytest.mark.asyncio
+async def test_refine_search(tmp_path):
+    """测试反馈精化：在缓存的候选集上重新排序，不再访问向量库"""
+    from src.services.search.relevance_feedback import RelevanceFeedback
+
+    mock_embedding_engine = create_mock_embedding_engine()
+    mock_embedding_engine.embed_text = AsyncMock(return_value=[1.0, 0.0])
+    mock_vector_store = create_mock_vector_store()
+    mock_vector_store.search = Mock(return_value=[
+        {'file_id': 'i1', 'similarity': 0.9, 'modality': 'image', 'vector': [1.0, 0.1]},
+        {'file_id': 'i2', 'similarity': 0.5, 'modality': 'image', 'vector': [0.5, 0.9]},
+    ])
+    feedback = RelevanceFeedback({
+        "feedback_db_path": str(tmp_path / "feedback.db"),
+        "rocchio_beta": 1.5,
+        "rocchio_gamma": 0.5,
+    })
+
+    search_engine = SearchEngine(
+        mock_embedding_engine, mock_vector_store, relevance_feedback=feedback
+    )
+    response = await search_engine.search('test query', k=5, modalities=['image'])
+    assert [r['file_id'] for r in response['results']] == ['i1', 'i2']
+
+    await feedback.record_feedback(response['query_id'], 'i2', 1)
+    await feedback.record_feedback(response['query_id'], 'i1', -1)
+    refined = await search_engine.refine_search(response['query_id'], k=5)
+
+    assert refined['status'] == 'success'
+    assert [r['file_id'] for r in refined['results']] == ['i2', 'i1']
+    assert mock_vector_store.search.call_count == 1
+
+    # 同一查询再次搜索时使用历史反馈提升
+    response = await search_engine.search('test query', k=5, modalities=['image'])
+    assert [(r['file_id'], pytest.approx(r['score'])) for r in response['results']] == [
+        ('i1', 0.8),
+        ('i2', 0.6),
+    ]
+
+    missing = await search_engine.refine_search('unknown')
+    assert missing['status'] == 'error'
+    feedback.close()
+
+
 def main():
     """主函数"""
     print("=" * 60)
@@ -267,10 +400,12 @@ def main():
         asyncio.run(test_search())
         asyncio.run(test_image_search())
         asyncio.run(test_audio_search())
+        asyncio.run(test_search_stream())
         
         # 同步测试
         test_rank_results()
         test_aggregate_results()
+        test_aggregate_results_keeps_video_segments()
         test_format_results()
         
         print("\n" + "=" * 60)
@@ -0,0 +1,100 @@
+"""
+任务事件流单元测试
+"""
+
+from src.api.task_event_subscriber import TaskEventSubscriber, iter_sse
+from src.core.task.task import Task
+from src.core.task.task_event_stream import TaskEventStream
+from src.core.task.task_monitor import OptimizedTaskMonitor
+
+
+def test_read_resumes_after_sequence_number():
+    """按序号续读，只返回之后的事件"""
+    stream = TaskEventStream()
+    for i in range(5):
+        stream.publish("created", {"task_id": f"t{i}"})
+
+    events, reset = stream.read(2)
+
+    assert not reset
+    assert [e["seq"] for e in events] == [3, 4, 5]
+    assert stream.read(5) == ([], False)
+
+
+def test_read_requests_reset_when_events_were_dropped():
+    """序号已被挤出缓冲区或来自其他事件流时要求重新同步"""
+    stream = TaskEventStream(buffer_size=3)
+    for i in range(6):
+        stream.publish("created", {"task_id": f"t{i}"})
+
+    assert stream.read(1) == ([], True)
+    assert stream.read(100) == ([], True)
+    events, reset = stream.read(3)
+    assert not reset and [e["seq"] for e in events] == [4, 5, 6]
+
+
+def test_progress_events_are_coalesced():
+    """同一任务的进度事件在间隔内合并，状态事件丢弃未推送的进度"""
+    stream = TaskEventStream(progress_interval=60)
+    stream.publish("progress", {"task_id": "t1", "progress": 0.1})
+    for progress in (0.2, 0.3, 0.4):
+        stream.publish("progress", {"task_id": "t1", "progress": progress})
+
+    events, _ = stream.read(0)
+    assert [e["data"]["progress"] for e in events] == [0.1]
+
+    stream.publish("completed", {"task_id": "t1", "progress": 1.0})
+    events, _ = stream.read(0)
+    assert [e["type"] for e in events] == ["progress", "completed"]
+    assert stream.get_stats()["coalesced"] == 3
+    stream.close()
+
+
+def test_monitor_transitions_are_published():
+    """监控器的状态和进度变化转换为事件"""
+    monitor = OptimizedTaskMonitor()
+    stream = TaskEventStream(progress_interval=0)
+    stream.attach(monitor)
+
+    task = Task(task_type="file_embed_image", file_path="/tmp/a.jpg")
+    monitor.add_task(task)
+    monitor.update_task_status(task.id, "running")
+    monitor.update_task_progress(task.id, 0.5)
+    monitor.update_task_status(task.id, "completed", progress=1.0)
+
+    events, _ = stream.read(0)
+    assert [e["type"] for e in events] == ["created", "started", "progress", "completed"]
+    assert events[-1]["data"]["progress"] == 1.0
+    assert "completed_at" in events[-1]["data"]
+
+
+def test_subscriber_applies_sse_deltas_after_reset():
+    """订阅器在reset时加载快照，之后只应用增量事件"""
+    lines = [
+        "id: s1-2",
+        "event: reset",
+        'data: {"stream_id": "s1", "seq": 2}',
+        "",
+        ": keepalive",
+        "",
+        "id: s1-3",
+        "event: progress",
+        'data: {"task_id": "t1", "progress": 0.5, "seq": 3, "ts": 0}',
+        "",
+        "id: s1-4",
+        "event: created",
+        'data: {"task_id": "t2", "status": "pending", "seq": 4, "ts": 0}',
+        "",
+    ]
+    subscriber = TaskEventSubscriber(
+        lambda since=None, stream_id=None: iter_sse(lines),
+        lambda: [{"task_id": "t1", "status": "running", "progress": 0.1}],
+    )
+
+    for event in subscriber.stream_factory():
+        subscriber.apply(*event)
+
+    tasks = {t["task_id"]: t for t in subscriber.get_tasks()}
+    assert tasks["t1"]["progress"] == 0.5 and tasks["t1"]["status"] == "running"
+    assert tasks["t2"]["status"] == "pending"
+    assert (subscriber.stream_id, subscriber.last_seq) == ("s1", 4)
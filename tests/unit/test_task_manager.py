@@ -216,6 +216,37 @@ async def test_task_scheduler_queue():
         await scheduler.stop()
 
 
+@pytest.mark.asyncio
+async def test_task_scheduler_skips_excluded_types():
+    """测试跳过的任务类型留在队列中，放回的任务保持原优先级"""
+    scheduler = TaskScheduler({"dynamic_priority": False})
+    await scheduler.start()
+
+    try:
+        video = Task(id="video_001", task_type="video_preprocess", task_data={}, priority=1)
+        image = Task(id="image_001", task_type="image_preprocess", task_data={}, priority=5)
+        await scheduler.enqueue_task(video)
+        await scheduler.enqueue_task(image)
+
+        dequeued_task = await scheduler.dequeue_task({video.task_type})
+        assert dequeued_task.id == image.id
+        assert await scheduler.get_queue_size() == 1
+
+        blocked_task = await scheduler.dequeue_task()
+        assert blocked_task.id == video.id
+        priority = blocked_task.priority
+        assert await scheduler.requeue_task(blocked_task) is True
+        assert await scheduler.get_queue_size() == 1
+
+        # 放回的任务仍可被取消
+        assert await scheduler.remove_task(video.id) is True
+        assert await scheduler.dequeue_task() is None
+        assert blocked_task.priority == priority
+
+    finally:
+        await scheduler.stop()
+
+
 @pytest.mark.asyncio
 async def test_task_executor():
     """测试任务执行器"""
@@ -0,0 +1,150 @@
+"""
+任务监控器单元测试
+"""
+
+from unittest.mock import Mock
+
+from src.core.task.central_task_manager import CentralTaskManager
+from src.core.task.task import Task
+from src.core.task.task_archive import TaskArchive
+from src.core.task.task_monitor import OptimizedTaskMonitor
+
+
+def _add(monitor, task_type="file_embed_image", file_id=None) -> Task:
+    task = Task(task_type=task_type, file_id=file_id)
+    monitor.add_task(task)
+    return task
+
+
+def test_indexes_follow_status_changes():
+    """状态索引和计数随状态变化增量更新"""
+    monitor = OptimizedTaskMonitor()
+    first = _add(monitor, file_id="f1")
+    second = _add(monitor, task_type="file_embed_video", file_id="f1")
+    _add(monitor, file_id="f2")
+
+    monitor.update_task_status(first.id, "running")
+    monitor.update_task_status(second.id, "completed")
+
+    assert [t.id for t in monitor.get_running_tasks()] == [first.id]
+    assert monitor.get_task_count_by_status() == {"pending": 1, "running": 1, "completed": 1}
+    assert {t.id for t in monitor.get_tasks_by_file("f1")} == {first.id, second.id}
+    assert list(monitor.get_all_tasks(status="completed", task_type="file_embed_video")) == [
+        second.id
+    ]
+    assert monitor.get_statistics()["running_count"] == 1
+
+
+def test_terminal_tasks_are_archived_beyond_window(tmp_path):
+    """超出内存窗口的已结束任务移入归档，仍可按需查询"""
+    monitor = OptimizedTaskMonitor(
+        max_terminal_tasks=2, archive_path=str(tmp_path / "archive.db")
+    )
+    tasks = [_add(monitor, file_id="f1") for _ in range(4)]
+    for task in tasks:
+        monitor.update_task_status(task.id, "completed", progress=1.0)
+
+    assert len(monitor.tasks) == 2
+    assert tasks[0].id not in monitor.tasks
+    archived = monitor.get_task(tasks[0].id)
+    assert archived is not None and archived.status == "completed"
+    assert len(monitor.get_tasks_by_file("f1")) == 2
+    assert len(monitor.get_tasks_by_file("f1", include_archived=True)) == 4
+    assert monitor.get_task_count_by_status(include_archived=True) == {"completed": 4}
+    monitor.close()
+
+    restarted = OptimizedTaskMonitor(archive_path=str(tmp_path / "archive.db"))
+    assert restarted.get_task_count_by_status(include_archived=True) == {"completed": 2}
+    restarted.close()
+
+
+def test_retried_task_leaves_terminal_window():
+    """失败后重试的任务不再计入已结束任务窗口"""
+    monitor = OptimizedTaskMonitor(max_terminal_tasks=1)
+    retried = _add(monitor)
+    monitor.update_task_status(retried.id, "failed")
+    monitor.update_task_status(retried.id, "pending")
+
+    finished = _add(monitor)
+    monitor.update_task_status(finished.id, "completed")
+
+    assert retried.id in monitor.tasks
+    assert monitor.clear_completed_tasks() == 1
+    assert monitor.get_task_count_by_status() == {"pending": 1}
+
+
+def test_query_tasks_filters_sorts_and_pages():
+    """查询在服务端过滤排序，游标翻页不重复不遗漏"""
+    monitor = OptimizedTaskMonitor()
+    tasks = [_add(monitor) for _ in range(5)]
+    _add(monitor, task_type="file_embed_video")
+    for priority, task in enumerate(tasks, start=1):
+        task.priority = priority
+    monitor.update_task_status(tasks[0].id, "failed", error="decode error")
+
+    page, cursor, total, counts = monitor.query_tasks(
+        task_types=["file_embed_image"], sort_by="priority", descending=False, limit=2
+    )
+    assert [t.id for t in page] == [tasks[0].id, tasks[1].id]
+    assert total == 5
+    assert counts == {"failed": 1, "pending": 4}
+
+    page, cursor, _, _ = monitor.query_tasks(
+        task_types=["file_embed_image"],
+        sort_by="priority",
+        descending=False,
+        after=cursor,
+        limit=10,
+    )
+    assert [t.id for t in page] == [t.id for t in tasks[2:]]
+    assert cursor is None
+
+    page, _, total, _ = monitor.query_tasks(
+        statuses=["pending"], priority_ranges=[(2, 3)], limit=10
+    )
+    assert {t.id for t in page} == {tasks[1].id, tasks[2].id}
+    assert [t.id for t in monitor.query_tasks(search="DECODE")[0]] == [tasks[0].id]
+
+
+def test_query_tasks_duration_sort_only_returns_finished_tasks():
+    """按耗时排序时只返回已结束的任务，运行中任务的耗时不作为游标"""
+    monitor = OptimizedTaskMonitor()
+    running = _add(monitor)
+    finished = _add(monitor)
+    monitor.update_task_status(running.id, "running")
+    monitor.update_task_status(finished.id, "running")
+    monitor.update_task_status(finished.id, "completed")
+
+    page, _, total, counts = monitor.query_tasks(sort_by="duration")
+    assert [t.id for t in page] == [finished.id]
+    assert total == 1
+    assert counts == {"running": 1, "completed": 1}
+    assert monitor.query_tasks(statuses=["running"], sort_by="duration")[0] == []
+
+
+def test_archived_counts_follow_type_and_search_filters(tmp_path):
+    """归档任务的总数和状态计数与返回的任务使用相同的过滤条件"""
+    archive = TaskArchive(str(tmp_path / "archive.db"))
+    image = Task(task_type="file_embed_image")
+    video = Task(task_type="file_embed_video")
+    failed = Task(task_type="file_embed_image")
+    for task, status in ((image, "completed"), (video, "completed"), (failed, "failed")):
+        task.status = status
+    failed.error = "decode error"
+    archive.add_tasks([image, video, failed])
+
+    assert archive.count_by_status() == {"completed": 2, "failed": 1}
+    assert archive.count_by_status(task_types=["file_embed_image"]) == {
+        "completed": 1,
+        "failed": 1,
+    }
+    assert archive.count_by_status(search="decode") == {"failed": 1}
+
+    manager = CentralTaskManager({}, Mock(), Mock(), Mock(archive=archive), Mock())
+    result = manager.query_tasks(
+        statuses=["completed"], task_types=["file_embed_image"], archived=True
+    )
+    assert [t["id"] for t in result["tasks"]] == [image.id]
+    assert result["total"] == 1
+    assert result["status_counts"] == {"completed": 1, "failed": 1}
+    archive.close()
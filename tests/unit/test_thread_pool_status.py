@@ -24,7 +24,7 @@ class MockTaskScheduler(TaskSchedulerInterface):
         self.tasks.append(task)
         return True
 
-    def dequeue_task(self) -> Optional[Task]:
+    def dequeue_task(self, exclude_types=None) -> Optional[Task]:
         if self.tasks:
             return self.tasks.pop(0)
         return None
@@ -0,0 +1,184 @@
+"""
+缩略图服务单元测试
+"""
+
+import os
+import subprocess
+import threading
+import time
+from concurrent.futures import Future
+from pathlib import Path
+
+from PIL import Image
+
+from src.data.generators.ffmpeg_pool import PRIORITY_BACKGROUND, PRIORITY_VISIBLE
+from src.services.cache.cache_manager import CacheConfig, CacheManager
+from src.services.media.thumbnail_service import ThumbnailService
+
+
+def _make_service(tmp_path) -> ThumbnailService:
+    cache_manager = CacheManager(CacheConfig(), cache_dir=str(tmp_path / "cache"))
+    return ThumbnailService({}, cache_manager=cache_manager)
+
+
+def _make_image(path, size=(800, 600)) -> str:
+    Image.new("RGB", size, (200, 30, 30)).save(path, format="JPEG")
+    return str(path)
+
+
+def test_thumbnail_is_rendered_once_and_served_from_cache(tmp_path):
+    """首次访问渲染，之后返回缓存的数据块"""
+    service = _make_service(tmp_path)
+    image_path = _make_image(tmp_path / "a.jpg")
+
+    first = service.get_thumbnail(image_path, 200)
+    second = service.get_thumbnail(image_path, 200)
+
+    assert first.path is not None and first.path == second.path
+    assert first.etag == second.etag
+    assert service.get_stats()["render_count"] == 1
+    with Image.open(first.path) as img:
+        assert max(img.size) == 256
+
+
+def test_version_changes_when_source_changes(tmp_path):
+    """源文件修改后版本令牌和ETag随之变化"""
+    service = _make_service(tmp_path)
+    image_path = _make_image(tmp_path / "a.jpg")
+    before = service.get_thumbnail(image_path)
+
+    _make_image(tmp_path / "a.jpg", size=(300, 900))
+    stat = os.stat(image_path)
+    os.utime(image_path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000))
+    after = service.get_thumbnail(image_path)
+
+    assert before.version != after.version
+    assert before.etag != after.etag
+
+
+def test_batch_returns_none_for_missing_and_unsupported(tmp_path):
+    """批量请求中不存在或不支持的文件返回None"""
+    service = _make_service(tmp_path)
+    image_path = _make_image(tmp_path / "a.jpg")
+    (tmp_path / "notes.txt").write_text("x")
+
+    results = service.get_thumbnails(
+        [image_path, str(tmp_path / "missing.jpg"), str(tmp_path / "notes.txt")]
+    )
+
+    assert results[image_path] is not None
+    assert results[str(tmp_path / "missing.jpg")] is None
+    assert results[str(tmp_path / "notes.txt")] is None
+    service.shutdown()
+
+
+class _FakePool:
+    """记录提交的命令，第一个命令阻塞到测试放行"""
+
+    def __init__(self):
+        self.calls = []
+        self.reprioritized = []
+        self.started = threading.Event()
+        self.release = threading.Event()
+
+    def run(self, cmd, priority, key=None, text=True, timeout=None):
+        self.calls.append((key, priority, text))
+        self.started.set()
+        self.release.wait(timeout=5)
+        return subprocess.CompletedProcess(cmd, 0, stdout=b"\xff\xd8jpeg", stderr=b"")
+
+    def reprioritize(self, key, priority):
+        self.reprioritized.append((key, priority))
+        return True
+
+
+def test_visible_request_promotes_background_render(tmp_path):
+    """索引阶段的预渲染以后台优先级排队，可见请求到达时提前执行"""
+    cache_manager = CacheManager(CacheConfig(), cache_dir=str(tmp_path / "cache"))
+    pool = _FakePool()
+    service = ThumbnailService({}, cache_manager=cache_manager, pool=pool)
+    video_path = tmp_path / "clip.mp4"
+    video_path.write_bytes(b"video")
+
+    assert service.prerender([str(video_path), str(tmp_path / "notes.txt")]) == 1
+    assert pool.started.wait(timeout=5)
+    key, priority, text = pool.calls[0]
+    assert priority == PRIORITY_BACKGROUND and text is False
+
+    visible = threading.Thread(target=service.get_thumbnail, args=(str(video_path),))
+    visible.start()
+    deadline = time.time() + 5
+    while not pool.reprioritized and time.time() < deadline:
+        time.sleep(0.01)
+    pool.release.set()
+    visible.join(timeout=5)
+
+    assert pool.reprioritized == [(key, PRIORITY_VISIBLE)]
+    assert len(pool.calls) == 1
+    assert service.get_thumbnail(str(video_path)).path is not None
+    service.shutdown()
+
+
+class _FakePreviewGenerator:
+    """记录多路输出的提交，由测试决定何时完成"""
+
+    thumbnail_size = 256
+
+    def __init__(self, output_dir):
+        self.output_dir = output_dir
+        self.submitted = []
+        self.prioritized = []
+        self.job = Future()
+
+    def get_asset_paths(self, media_path, output_format="mp4"):
+        return (str(self.output_dir / "thumb.jpg"), str(self.output_dir / "preview.mp4"))
+
+    def submit_assets(self, media_path, thumbnail=True, preview=True, priority=5):
+        self.submitted.append((media_path, thumbnail, preview, priority))
+        return self.job
+
+    def prioritize(self, media_paths, priority):
+        self.prioritized.append((list(media_paths), priority))
+        return 1
+
+    def finish(self):
+        thumbnail_path, preview_path = self.get_asset_paths(None)
+        Path(thumbnail_path).write_bytes(b"\xff\xd8jpeg")
+        Path(preview_path).write_bytes(b"mp4")
+        self.job.set_result({"thumbnail_path": thumbnail_path, "preview_path": preview_path})
+
+
+def test_video_prerender_generates_thumbnail_and_preview_in_one_job(tmp_path):
+    """视频预渲染交给预览生成器一次解码输出两者，可见请求提前并复用该任务"""
+    cache_manager = CacheManager(CacheConfig(), cache_dir=str(tmp_path / "cache"))
+    pool = _FakePool()
+    generator = _FakePreviewGenerator(tmp_path)
+    service = ThumbnailService(
+        {}, cache_manager=cache_manager, pool=pool, preview_generator=generator
+    )
+    video_path = tmp_path / "clip.mp4"
+    video_path.write_bytes(b"video")
+
+    assert service.prerender([str(video_path)]) == 1
+    assert generator.submitted == [(str(video_path), True, True, PRIORITY_BACKGROUND)]
+    assert service.get_preview(str(video_path)) is None
+
+    results = []
+    visible = threading.Thread(
+        target=lambda: results.append(service.get_thumbnail(str(video_path)))
+    )
+    visible.start()
+    deadline = time.time() + 5
+    while not generator.prioritized and time.time() < deadline:
+        time.sleep(0.01)
+    generator.finish()
+    visible.join(timeout=5)
+
+    assert generator.prioritized == [([str(video_path)], PRIORITY_VISIBLE)]
+    assert results[0].path.read_bytes() == b"\xff\xd8jpeg"
+    assert pool.calls == []
+    assert service.get_preview(str(video_path)) == tmp_path / "preview.mp4"
+    # 两者都已生成，再次预渲染不会重复提交
+    assert service.prerender([str(video_path)]) == 1
+    assert len(generator.submitted) == 1
+    service.shutdown()
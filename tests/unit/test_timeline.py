@@ -3,6 +3,7 @@
 """
 
 import pytest
+from unittest.mock import Mock
 from src.services.search.timeline import (
     VideoTimelineItem,
     VideoTimelineResult,
@@ -393,4 +394,36 @@ class TestVideoTimelineGenerator:
         merged = generator.merge_timeline_results([result1], merge_strategy="union")
         
         assert merged.total_results == 1
-        assert merged.get_video_count() == 1
\ No newline at end of file
+        assert merged.get_video_count() == 1    
+    def test_from_database_results_batches_metadata(self, generator):
+        """测试从数据库结果生成时间轴：元数据一次批量获取，片段区间逐个展开"""
+        db_manager = Mock()
+        db_manager.get_video_metadata_batch.return_value = {
+            f"video-{i:03d}": {
+                "video_name": f"video{i}.mp4",
+                "video_path": f"/path/to/video{i}.mp4",
+                "thumbnail_path": f"/path/to/thumb{i}.jpg",
+            }
+            for i in range(100)
+        }
+        vector_results = [
+            {
+                "file_id": f"video-{i:03d}",
+                "score": 0.9,
+                "segments": [
+                    {"start_time": 0.0, "end_time": 10.0, "score": 0.9, "segment_ids": ["s1", "s2"]},
+                    {"start_time": 30.0, "end_time": 35.0, "score": 0.7, "segment_ids": ["s7"]},
+                ],
+            }
+            for i in range(100)
+        ]
+        
+        result = generator.from_database_results("test query", vector_results, db_manager)
+        
+        db_manager.get_video_metadata_batch.assert_called_once()
+        assert result.get_video_count() == 100
+        assert result.total_results == 200
+        items = result.get_items_by_video("video-005")
+        assert [(item.start_time, item.end_time) for item in items] == [(0.0, 10.0), (30.0, 35.0)]
+        assert items[0].video_name == "video5.mp4"
+        assert items[0].metadata["segment_ids"] == ["s1", "s2"]
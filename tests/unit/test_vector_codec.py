@@ -0,0 +1,71 @@
+#!/usr/bin/env python3
+"""
+测试向量存储精度的编码和反量化
+"""
+
+import sys
+from pathlib import Path
+
+import numpy as np
+import pytest
+
+# 添加项目根目录到Python路径
+project_root = Path(__file__).parent.parent.parent
+sys.path.insert(0, str(project_root))
+
+pytest.importorskip("pyarrow")
+
+from src.core.vector.vector_codec import (
+    bytes_per_vector,
+    decode_vectors,
+    encode_vector,
+    validate_precision,
+)
+
+
+@pytest.fixture
+def vectors():
+    rng = np.random.default_rng(0)
+    vectors = rng.normal(size=(100, 512)).astype(np.float32)
+    return vectors / np.linalg.norm(vectors, axis=1, keepdims=True)
+
+
+class TestVectorCodec:
+    """向量编码测试"""
+
+    @pytest.mark.parametrize(
+        "precision, dtype, min_cosine",
+        [("float32", np.float32, 1.0), ("float16", np.float16, 0.9999), ("int8", np.int8, 0.999)],
+    )
+    def test_round_trip_keeps_direction(self, vectors, precision, dtype, min_cosine):
+        """测试编码后再反量化的向量与原向量方向一致"""
+        encoded = [encode_vector(vector, precision) for vector in vectors]
+        assert all(stored.dtype == dtype for stored, _ in encoded)
+
+        scales = None
+        if precision == "int8":
+            scales = np.array([scale for _, scale in encoded], dtype=np.float32)
+        decoded = decode_vectors(np.stack([stored for stored, _ in encoded]), scales)
+
+        cosines = np.sum(decoded * vectors, axis=1) / np.linalg.norm(decoded, axis=1)
+        assert decoded.dtype == np.float32
+        assert cosines.min() >= min_cosine - 1e-6
+
+    def test_int8_zero_vector(self):
+        """测试零向量不会产生无效的缩放系数"""
+        codes, scale = encode_vector(np.zeros(8, dtype=np.float32), "int8")
+
+        assert scale == 1.0
+        assert not codes.any()
+
+    def test_bytes_per_vector(self):
+        """测试存储占用：float16减半，int8约为1/4"""
+        assert bytes_per_vector(4096, "float32") == 16384
+        assert bytes_per_vector(4096, "float16") == 8192
+        assert bytes_per_vector(4096, "int8") == 4100
+        assert bytes_per_vector(4096, "int8", keep_full_precision=True) == 4100 + 16384
+
+    def test_unsupported_precision(self):
+        """测试不支持的存储精度"""
+        with pytest.raises(ValueError):
+            validate_precision("int4")
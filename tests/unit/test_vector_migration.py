@@ -0,0 +1,259 @@
+#!/usr/bin/env python3
+"""
+测试按模型分表和重嵌入迁移：内容哈希复用、迁移期间旧表检索和覆盖率达标后的切换
+"""
+
+import asyncio
+import sys
+from pathlib import Path
+
+import numpy as np
+import pytest
+
+# 添加项目根目录到Python路径
+project_root = Path(__file__).parent.parent.parent
+sys.path.insert(0, str(project_root))
+
+pytest.importorskip("lancedb")
+
+from src.core.vector.table_registry import VectorTableRegistry
+from src.core.vector.vector_store import VectorStore, open_audio_vector_store
+from src.services.migration import ReembeddingMigration
+
+OLD_DIM = 8
+NEW_DIM = 12
+
+
+def fake_vector(path, dimension):
+    seed = sum(path.encode())
+    return np.random.default_rng(seed).normal(size=dimension).astype(np.float32).tolist()
+
+
+class FakeEmbeddingEngine:
+    """只记录调用的向量化引擎，向量由文件路径决定"""
+
+    def __init__(self):
+        self.default_model = "old_model"
+        self.embedded_paths = []
+        self.release = None
+
+    async def ensure_model_registered(self, model_id):
+        pass
+
+    def get_embedding_dim(self, model_type=None):
+        return NEW_DIM if model_type == "new_model" else OLD_DIM
+
+    async def embed_images(self, paths, model_type=None):
+        if self.release is not None:
+            await self.release.wait()
+        self.embedded_paths.extend(paths)
+        return [fake_vector(path, NEW_DIM) for path in paths]
+
+    def set_default_visual_model(self, model_id):
+        self.default_model = model_id
+
+
+class FakeDatabaseManager:
+    def __init__(self, hashes):
+        self.hashes = hashes
+
+    def get_file_metadata(self, file_id):
+        return {"file_hash": self.hashes[file_id]}
+
+
+@pytest.fixture
+def source(tmp_path):
+    """旧模型表：三张图片，其中两张内容相同"""
+    images = []
+    for name in ("a.jpg", "b.jpg", "a_copy.jpg"):
+        path = tmp_path / name
+        path.write_bytes(b"image")
+        images.append(str(path))
+
+    config = {"data_dir": str(tmp_path / "lancedb")}
+    store = VectorStore.for_model(config, "old_model", OLD_DIM)
+    store.insert_vectors(
+        [
+            {
+                "id": f"vec_{i}",
+                "vector": fake_vector(path, OLD_DIM),
+                "modality": "image",
+                "file_id": f"file_{i}",
+                "file_path": path,
+                "metadata": {"file_path": path, "file_name": Path(path).name},
+            }
+            for i, path in enumerate(images)
+        ]
+    )
+    db_manager = FakeDatabaseManager(
+        {"file_0": "hash_a", "file_1": "hash_b", "file_2": "hash_a"}
+    )
+    return store, images, db_manager
+
+
+class TestTablePerModel:
+    """按模型分表测试"""
+
+    def test_table_name_contains_model_and_dimension(self, tmp_path):
+        """测试表名包含模型ID和维度，不同模型使用不同的表"""
+        config = {"data_dir": str(tmp_path)}
+        base = VectorStore.for_model(config, "chinese_clip_base", 512)
+        large = VectorStore.for_model(config, "chinese-clip/large", 768)
+
+        assert base.collection_name == "unified_vectors__chinese_clip_base_512"
+        assert large.collection_name == "unified_vectors__chinese_clip_large_768"
+        assert base.base_collection_name == large.base_collection_name
+
+    def test_audio_table_is_separate_from_visual_tables(self, tmp_path):
+        """测试音频向量使用按音频模型和维度命名的单独表，并登记在注册表中"""
+        config = {"data_dir": str(tmp_path)}
+        audio = open_audio_vector_store(config, "clap_htsat", 512)
+
+        assert audio.collection_name == "unified_vectors_audio__clap_htsat_512"
+        assert VectorTableRegistry(str(tmp_path)).get_active("unified_vectors_audio")[
+            "table"
+        ] == audio.collection_name
+
+
+class TestReembeddingMigration:
+    """重嵌入迁移测试"""
+
+    def test_migration_reuses_content_hash_and_cuts_over(self, source):
+        """测试内容相同的文件只向量化一次，完成后切换检索表和默认模型"""
+        store, images, db_manager = source
+        engine = FakeEmbeddingEngine()
+        migration = ReembeddingMigration(store, engine, db_manager)
+
+        status = asyncio.run(migration.run("new_model"))
+
+        assert status["state"] == "completed"
+        assert sorted(engine.embedded_paths) == sorted(images[:2])
+        assert status["embedded"] == 2 and status["reused"] == 1
+        assert status["incompatible"] == 0
+        assert status["coverage"] == 1.0
+
+        assert store.collection_name == "unified_vectors__new_model_12"
+        assert engine.default_model == "new_model"
+        active = VectorTableRegistry(str(store.data_dir)).get_active("unified_vectors")
+        assert active["model_id"] == "new_model" and active["dimension"] == NEW_DIM
+
+        results = store.search(fake_vector(images[1], NEW_DIM), limit=1)
+        assert results[0]["id"] == "vec_1"
+        assert results[0]["metadata"]["file_name"] == "b.jpg"
+
+    def test_old_table_serves_search_during_migration(self, source):
+        """测试迁移完成前检索仍使用旧表，迁移期间新增的条目也会被迁移"""
+        store, images, db_manager = source
+        engine = FakeEmbeddingEngine()
+        migration = ReembeddingMigration(store, engine, db_manager)
+
+        async def run():
+            engine.release = asyncio.Event()
+            migration.start("new_model")
+            await asyncio.sleep(0.05)
+
+            assert migration.get_status()["state"] == "running"
+            results = store.search(fake_vector(images[0], OLD_DIM), limit=1)
+            assert results[0]["id"] == "vec_0"
+
+            store.insert_vectors(
+                [
+                    {
+                        "id": "vec_new",
+                        "vector": fake_vector(images[1], OLD_DIM),
+                        "modality": "image",
+                        "file_id": "file_1",
+                        "file_path": images[1],
+                    }
+                ]
+            )
+            engine.release.set()
+            await migration._task
+            return migration.get_status()
+
+        status = asyncio.run(run())
+
+        assert status["state"] == "completed"
+        assert status["migrated"] == 4
+        assert store.collection_name == "unified_vectors__new_model_12"
+        assert store.get_vector("vec_new") is not None
+
+    def test_missing_coverage_keeps_old_table(self, source):
+        """测试覆盖率不足时不切换"""
+        store, images, db_manager = source
+        engine = FakeEmbeddingEngine()
+
+        async def failing_embed(paths, model_type=None):
+            raise RuntimeError("向量化失败")
+
+        engine.embed_images = failing_embed
+        migration = ReembeddingMigration(store, engine, db_manager)
+
+        status = asyncio.run(migration.run("new_model"))
+
+        assert status["state"] == "incomplete"
+        assert status["failed"] == 3
+        assert store.collection_name == "unified_vectors__old_model_8"
+        assert engine.default_model == "old_model"
+
+    def test_incompatible_audio_blocks_cutover(self, source, tmp_path):
+        """测试音频向量维度与新模型不同时不切换，音频在旧表中仍可检索"""
+        store, images, db_manager = source
+        audio_vector = fake_vector("audio", OLD_DIM)
+        store.insert_vectors(
+            [
+                {
+                    "id": "vec_audio",
+                    "vector": audio_vector,
+                    "modality": "audio",
+                    "file_id": "file_audio",
+                    "file_path": str(tmp_path / "a.wav"),
+                }
+            ]
+        )
+        engine = FakeEmbeddingEngine()
+        migration = ReembeddingMigration(store, engine, db_manager)
+
+        status = asyncio.run(migration.run("new_model"))
+
+        assert status["state"] == "incomplete"
+        assert status["incompatible"] == 1
+        assert "error" in status
+        assert store.collection_name == "unified_vectors__old_model_8"
+        assert engine.default_model == "old_model"
+        assert VectorTableRegistry(str(store.data_dir)).get_active("unified_vectors") is None
+
+        results = store.search(audio_vector, limit=1, filter={"modality": "audio"})
+        assert results[0]["id"] == "vec_audio"
+
+    def test_audio_rows_move_to_audio_table(self, source, tmp_path):
+        """测试旧表中的音频条目移入音频专用表，不阻止切换"""
+        store, images, db_manager = source
+        audio_vector = fake_vector("audio", OLD_DIM)
+        store.insert_vectors(
+            [
+                {
+                    "id": "vec_audio",
+                    "vector": audio_vector,
+                    "modality": "audio",
+                    "file_id": "file_audio",
+                    "file_path": str(tmp_path / "a.wav"),
+                }
+            ]
+        )
+        audio_store = open_audio_vector_store(store.config, "audio_model", OLD_DIM)
+        engine = FakeEmbeddingEngine()
+        migration = ReembeddingMigration(
+            store, engine, db_manager, audio_vector_store=audio_store
+        )
+
+        status = asyncio.run(migration.run("new_model"))
+
+        assert status["state"] == "completed"
+        assert status["relocated"] == 1
+        assert status["incompatible"] == 0
+        assert store.collection_name == "unified_vectors__new_model_12"
+        assert store.get_vector("vec_audio") is None
+
+        results = audio_store.search(audio_vector, limit=1, filter={"modality": "audio"})
+        assert results[0]["id"] == "vec_audio"
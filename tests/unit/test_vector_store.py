@@ -211,3 +211,76 @@ class TestVectorStore:
         result3 = store3.create_index()
         assert result3 is True
         store3.close()
+
+
+def _vector_with_similarity(query, similarity, rng):
+    """构造与query余弦相似度恰为similarity的单位向量"""
+    noise = rng.standard_normal(query.shape[0])
+    noise -= noise.dot(query) * query
+    noise /= np.linalg.norm(noise)
+    return similarity * query + np.sqrt(1 - similarity ** 2) * noise
+
+
+def test_rerank_keeps_clip_range_scores(vector_store_config):
+    """测试按发布配置重排时，CLIP典型的0.2~0.35相似度结果不会被截断"""
+    config = dict(vector_store_config, search={
+        'max_distance': None, 're_rank': True, 're_rank_top_k': 50,
+    })
+    store = VectorStore(config)
+    rng = np.random.default_rng(0)
+    query = rng.standard_normal(512)
+    query /= np.linalg.norm(query)
+
+    scores = [0.35, 0.31, 0.28, 0.24, 0.2]
+    store.insert_vectors([
+        {
+            'id': f'clip_{i}',
+            'vector': _vector_with_similarity(query, score, rng).tolist(),
+            'file_path': f'/photos/{i}.jpg',
+            'modality': 'image',
+        }
+        for i, score in enumerate(scores)
+    ])
+
+    results = store.search_vectors(query.tolist(), limit=10)
+    assert [r['id'] for r in results] == [f'clip_{i}' for i in range(len(scores))]
+    assert [round(r['similarity'], 2) for r in results] == scores
+
+    # 调用方给出的相似度阈值决定截断位置
+    results = store.search_vectors(query.tolist(), limit=10, similarity_threshold=0.25)
+    assert [r['id'] for r in results] == ['clip_0', 'clip_1', 'clip_2']
+    store.close()
+
+
+def test_int8_filtered_search_uses_cached_codes(vector_store_config):
+    """测试int8存储下带模态过滤的检索复用量化码缓存，过滤在内存中完成"""
+    config = dict(vector_store_config, vector_precision='int8', vector_dimension=16)
+    store = VectorStore(config)
+    rng = np.random.default_rng(1)
+    store.insert_vectors([
+        {
+            'id': f'{modality}_{i}',
+            'vector': rng.standard_normal(16).tolist(),
+            'modality': modality,
+            'file_id': f'file_{i % 2}',
+            'file_path': f'/media/{modality}_{i}',
+        }
+        for modality in ('image', 'audio')
+        for i in range(4)
+    ])
+    query = rng.standard_normal(16).tolist()
+
+    results = store.search_vectors(query, limit=10, filter={'modality': 'image'})
+    assert sorted(r['id'] for r in results) == [f'image_{i}' for i in range(4)]
+    cache = store._quantized_cache
+    assert cache is not None
+
+    results = store.search_vectors(
+        query, limit=10, filter={'modality': ['audio'], 'file_id': 'file_1'}
+    )
+    assert sorted(r['id'] for r in results) == ['audio_1', 'audio_3']
+    # 不在缓存中的列通过where子句过滤
+    results = store.search_vectors(query, limit=10, filter={'file_path': '/media/image_2'})
+    assert [r['id'] for r in results] == ['image_2']
+    assert store._quantized_cache is cache
+    store.close()
@@ -0,0 +1,55 @@
+#!/usr/bin/env python3
+"""
+测试转换后模型权重的磁盘缓存
+"""
+
+import json
+import sys
+from pathlib import Path
+
+# 添加项目根目录到Python路径
+project_root = Path(__file__).parent.parent.parent
+sys.path.insert(0, str(project_root))
+
+from src.core.models.weight_cache import WeightCache
+
+
+def make_model(model_dir: Path, weight_file: str, torch_dtype: str) -> Path:
+    model_dir.mkdir(parents=True)
+    (model_dir / "config.json").write_text(json.dumps({"torch_dtype": torch_dtype}))
+    (model_dir / "tokenizer.json").write_text("{}")
+    (model_dir / weight_file).write_bytes(b"\0" * 16)
+    return model_dir
+
+
+class TestWeightCache:
+    """权重缓存测试"""
+
+    def test_matching_safetensors_are_used_directly(self, tmp_path):
+        """测试源权重已是目标精度的safetensors时不转换"""
+        model_dir = make_model(tmp_path / "clip", "model.safetensors", "float32")
+        cache = WeightCache(str(tmp_path / "converted"))
+
+        assert cache.resolve(str(model_dir), "torch", "float32") == str(model_dir)
+        assert cache.needs_conversion(model_dir, "float16")
+        assert cache.resolve(str(model_dir), "optimum", "float16") == str(model_dir)
+
+    def test_cache_hit_and_invalidation(self, tmp_path):
+        """测试缓存命中，源权重变化后缓存失效"""
+        model_dir = make_model(tmp_path / "clap", "pytorch_model.bin", "float32")
+        cache = WeightCache(str(tmp_path / "converted"))
+
+        # 模拟一次已完成的转换
+        cached_dir = cache.cached_path(model_dir, "float32")
+        cached_dir.mkdir(parents=True)
+        (cached_dir / "model.safetensors").write_bytes(b"\0" * 16)
+        (cached_dir / WeightCache.MARKER_FILE).write_text(
+            json.dumps(cache._cache_key(model_dir, "float32"))
+        )
+
+        assert cache.resolve(str(model_dir), "torch", "float32") == str(cached_dir)
+
+        (model_dir / "pytorch_model.bin").write_bytes(b"\0" * 32)
+        assert cache.lookup(model_dir, "float32") is None
+        # 伪造的权重无法转换，回退到源路径
+        assert cache.resolve(str(model_dir), "torch", "float32") == str(model_dir)